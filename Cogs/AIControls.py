@@ -7,6 +7,7 @@ from AI.OpenAIClient import OpenAIClient
 from logger import AppLogger
 from Dao.GuildDao import GuildDao
 from Dao.AIImageDao import AIImageDao
+from Services.CooldownService import AI_MENTION_BUCKET, get_cooldown_service
 from utils.premium_checker import PremiumChecker
 import asyncio
 
@@ -23,9 +24,7 @@ class AIControls(commands.Cog):
         # Format: {guild_id: {channel_id: [(user_name, message, is_bot, timestamp), ...]}}
         self.conversation_history = {}
 
-        # Mention rate limiting (prevents spam mentions)
-        # Format: {user_id:guild_id: datetime}
-        self.mention_cooldowns = {}
+        # Mention rate limiting (prevents spam mentions), tracked by the shared CooldownService
         self.mention_cooldown_seconds = 3  # Cooldown between mentions
 
         # Configuration
@@ -42,31 +41,11 @@ class AIControls(commands.Cog):
 
     def is_on_mention_cooldown(self, user_id: int, guild_id: int) -> bool:
         """Check if user is on mention cooldown"""
-        now = datetime.now()
-
-        # Auto-cleanup: remove expired cooldown entries to prevent memory leak
-        expired_keys = [
-            key for key, timestamp in self.mention_cooldowns.items()
-            if (now - timestamp).total_seconds() > self.mention_cooldown_seconds
-        ]
-        for key in expired_keys:
-            del self.mention_cooldowns[key]
-
-        # Check current user's cooldown
-        cooldown_key = f"{user_id}:{guild_id}"
-
-        if cooldown_key not in self.mention_cooldowns:
-            return False
-
-        last_mention_time = self.mention_cooldowns[cooldown_key]
-        time_since_last = (now - last_mention_time).total_seconds()
-
-        return time_since_last < self.mention_cooldown_seconds
+        return get_cooldown_service().on_cooldown(AI_MENTION_BUCKET, guild_id, user_id)
 
     def set_mention_cooldown(self, user_id: int, guild_id: int):
         """Set user on mention cooldown"""
-        cooldown_key = f"{user_id}:{guild_id}"
-        self.mention_cooldowns[cooldown_key] = datetime.now()
+        get_cooldown_service().trigger(AI_MENTION_BUCKET, guild_id, user_id, self.mention_cooldown_seconds)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
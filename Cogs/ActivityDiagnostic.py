@@ -3,6 +3,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from logger import AppLogger
+from Services.EntityResolver import get_entity_resolver
 
 logger = AppLogger(__name__).get_logger()
 
@@ -29,8 +30,11 @@ class ActivityDiagnostic(commands.Cog):
                 await interaction.followup.send(f"User {user.mention} not found in member cache.", ephemeral=True)
                 return
 
-            # Also fetch from REST API for comparison
-            fetched_member = await interaction.guild.fetch_member(user.id)
+            # Also fetch from REST API for comparison (cached briefly, so repeat checks don't refetch)
+            fetched_member = await get_entity_resolver().fetch_member(interaction.guild, user.id)
+            if not fetched_member:
+                await interaction.followup.send(f"User {user.mention} could not be fetched from the API.", ephemeral=True)
+                return
 
             # Build embed with activity information
             embed = discord.Embed(
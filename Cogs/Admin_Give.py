@@ -4,6 +4,7 @@ from discord import app_commands
 from Dao.UserDao import UserDao
 from Dao.GuildUserDao import GuildUserDao
 from Leveling import LevelingSystem
+from Services.CurrencyLedger import get_currency_ledger
 import typing
 
 from logger import AppLogger
@@ -48,11 +49,18 @@ class Admin_Give(commands.Cog):
                     await interaction.response.send_message("Failed to get user data.", ephemeral=True)
                     return
 
-                # Add currency to guild user with global sync
-                guild_user_dao.update_currency_with_global_sync(target.id, interaction.guild.id, amount)
+                # Add currency through the ledger
+                result = await get_currency_ledger().transfer(
+                    interaction.guild.id,
+                    {target.id: amount},
+                    idempotency_key=f"admin-give:{interaction.id}"
+                )
+                if not result.success:
+                    await interaction.response.send_message("Failed to give credits.", ephemeral=True)
+                    return
 
                 # Update local object for display
-                target_guild_user.currency += amount
+                target_guild_user.currency = result.balances.get(target.id, target_guild_user.currency + amount)
 
                 await interaction.response.send_message(
                     f'### {interaction.user.name} has given {target.mention} {amount:,.0f} credits! 🎰'
@@ -74,7 +82,8 @@ class Admin_Give(commands.Cog):
 
                 # Calculate new level
                 lvl = LevelingSystem(self.bot)
-                new_level = lvl.calc_level(target_guild_user.exp)
+                config = await lvl.get_leveling_config(interaction.guild.id)
+                new_level = lvl.calc_level(target_guild_user.exp, config)
                 old_level = target_guild_user.level
                 target_guild_user.level = new_level
 
@@ -2,8 +2,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.LotteryEventDao import LotteryEventDao
-from Dao.GuildDao import GuildDao  # Changed from VaultDao to GuildDao
 from Entities.LotteryEvent import LotteryEvent
+from Services.LotteryService import get_lottery_service
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
@@ -64,11 +64,8 @@ class Admin_Start_Lotto(commands.Cog):
                 ephemeral=True
             )
 
-            # Get guild-specific vault credits (you'll need to implement this)
-            # For now, using the old VaultDao - update this based on your vault system
-            from Dao.GuildDao import GuildDao
-            guild_dao = GuildDao()
-            vault_credits = guild_dao.get_vault_currency(interaction.guild_id)
+            # Get guild-specific vault credits (stored vault plus pending game losses)
+            vault_credits = await get_lottery_service().get_vault_total(interaction.guild_id, use_cache=False)
 
             # Send lottery announcement to the target channel
             await target_channel.send(
@@ -97,6 +94,7 @@ class Admin_Start_Lotto(commands.Cog):
 
             await message.pin()
             le_dao.add_new_event(new_le)
+            get_lottery_service().invalidate_event(interaction.guild_id)
 
             # Convert to Discord timestamp format (shows in each user's local time automatically)
             unix_timestamp = int(end_time.timestamp())
@@ -1,7 +1,9 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.UserDao import UserDao
+from Services.GlobalStatsService import get_global_stats_service
 from logger import AppLogger
 
 
@@ -19,24 +21,27 @@ class Admin_Stats(commands.Cog):
         if not interaction.guild:
             await interaction.response.send_message("This command can only be used in servers.", ephemeral=True)
             return
-        uDao = UserDao()
         try:
-            total_users = uDao.get_total_active_users()
-            total_messages = uDao.get_total_messages()
-            total_reactions = uDao.get_total_reactions()
-            total_currency = uDao.get_total_currency()
-            total_exp = uDao.get_total_exp()
+            # Running totals from Redis; a single scan of Users until the first reconcile
+            totals = await get_global_stats_service().get_totals()
+            if totals is None:
+                uDao = UserDao()
+                try:
+                    totals = await asyncio.to_thread(uDao.get_global_totals)
+                finally:
+                    uDao.close()
+            if totals is None:
+                raise RuntimeError("stats unavailable")
 
             await interaction.response.send_message(f'# Acosmicord Stats:\
-                                                    \n## Active Users: {total_users:,.0f}\
-                                                    \n## Messages: {total_messages:,.0f}\
-                                                    \n## Reactions: {total_reactions:,.0f}\
-                                                    \n## Currency: {total_currency:,.0f}\
-                                                    \n## XP: {total_exp:,.0f}')
+                                                    \n## Active Users: {totals["active_users"]:,.0f}\
+                                                    \n## Messages: {totals["messages"]:,.0f}\
+                                                    \n## Reactions: {totals["reactions"]:,.0f}\
+                                                    \n## Currency: {totals["currency"]:,.0f}\
+                                                    \n## XP: {totals["exp"]:,.0f}')
         except Exception as e:
             logger.info(f'/stats command - {e}.')
             await interaction.response.send_message(f'An error occurred while fetching stats. {e}.', ephemeral=True)
-        uDao.close()
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Admin_Stats(bot))
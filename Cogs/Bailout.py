@@ -4,6 +4,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.GuildUserDao import GuildUserDao
+from Services.CurrencyLedger import get_currency_ledger
 from logger import AppLogger
 
 class Bailout(commands.Cog):
@@ -39,9 +40,10 @@ class Bailout(commands.Cog):
             if target is None:
                 for role in interaction.user.roles:
                     if role.name == "Inmate":
+                        if not await self._pay_bail(interaction, bail):
+                            return
                         await interaction.user.remove_roles(role)
                         await interaction.user.add_roles(first_role)
-                        guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -bail)
                         await interaction.response.send_message(f"{interaction.user.name} paid {bail:,.0f} credits to get out of jail.")
                         await general_channel.send(f"## {interaction.user.name} paid {bail:,.0f} credits to get out of jail.")
                         return
@@ -52,18 +54,35 @@ class Bailout(commands.Cog):
             else:
 
                 if inmate_role in target.roles:
+                    if not await self._pay_bail(interaction, bail):
+                        return
                     await target.remove_roles(inmate_role)
                     if first_role not in target.roles:
                         await target.add_roles(first_role)
 
-                    guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -bail)
                     await interaction.response.send_message(f"{interaction.user.name} paid {bail:,.0f} credits to get {target.name} out of jail.")
                     await general_channel.send(f"## {interaction.user.name} paid {bail:,.0f} credits to get {target.name} out of jail.")
                     return
                 else:
                     await interaction.response.send_message(f"{target.name} is not in jail.", ephemeral=True)
                     return
-                
+
+    async def _pay_bail(self, interaction: discord.Interaction, bail: int) -> bool:
+        """Charge the bail through the ledger; tells the user and returns False if it wasn't paid."""
+        result = await get_currency_ledger().transfer(
+            interaction.guild.id,
+            {interaction.user.id: -bail},
+            idempotency_key=f"bailout:{interaction.id}"
+        )
+        if result.success:
+            return True
+
+        if result.error == "insufficient_funds":
+            await interaction.response.send_message("You do not have enough credits for /bail.", ephemeral=True)
+        else:
+            await interaction.response.send_message("Failed to pay the bail.", ephemeral=True)
+        return False
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Bailout(bot))
\ No newline at end of file
@@ -7,6 +7,7 @@ from Dao.GuildUserDao import GuildUserDao
 from Dao.BankTransactionDao import BankTransactionDao
 from Dao.GuildDao import GuildDao
 from Dao.GlobalSettingsDao import GlobalSettingsDao
+from Services.CurrencyLedger import get_currency_ledger
 from logger import AppLogger
 import typing
 from datetime import datetime
@@ -140,6 +141,11 @@ class Bank(commands.Cog):
                 await interaction.followup.send("❌ The bank system is not enabled in this server.", ephemeral=True)
                 return
 
+            # The transfer runs in MySQL, so no session may hold a cached wallet balance
+            if not await get_currency_ledger().settle(interaction.guild.id, interaction.user.id):
+                await interaction.followup.send("❌ Your balance is still being saved, please try again in a moment.", ephemeral=True)
+                return
+
             # Get user data using context managers
             with UserDao() as user_dao, GuildUserDao() as guild_user_dao:
                 user = user_dao.get_user(interaction.user.id)
@@ -236,6 +242,11 @@ class Bank(commands.Cog):
                 await interaction.followup.send("❌ The bank system is not enabled in this server.", ephemeral=True)
                 return
 
+            # The transfer runs in MySQL, so no session may hold a cached wallet balance
+            if not await get_currency_ledger().settle(interaction.guild.id, interaction.user.id):
+                await interaction.followup.send("❌ Your balance is still being saved, please try again in a moment.", ephemeral=True)
+                return
+
             # Get user data using context managers
             with UserDao() as user_dao, GuildUserDao() as guild_user_dao:
                 user = user_dao.get_user(interaction.user.id)
@@ -9,6 +9,7 @@ from Dao.GuildUserDao import GuildUserDao
 from Dao.UserDao import UserDao
 from Dao.GuildDao import GuildDao
 from Views.Blackjack_View import Blackjack_View
+from Services.CurrencyLedger import get_currency_ledger
 from Services.SessionManager import get_session_manager
 from logger import AppLogger
 
@@ -178,16 +179,21 @@ class Blackjack(commands.Cog):
             )
             return
 
-        # Try to update currency in session
-        session_updated = await session_manager.update_currency(
-            guild_id=interaction.guild.id,
-            user_id=interaction.user.id,
-            amount=-cost
+        # Take the bet through the ledger; the funds check there is the authoritative one
+        transfer = await get_currency_ledger().transfer(
+            interaction.guild.id,
+            {interaction.user.id: -cost},
+            idempotency_key=f"blackjack:bet:{interaction.id}"
         )
-
-        if not session_updated:
-            # Fallback to immediate DB write
-            guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -cost)
+        if transfer.error == "insufficient_funds":
+            await interaction.response.send_message(
+                "You don't have enough credits to place this bet.",
+                ephemeral=True
+            )
+            return
+        if not transfer.success:
+            await interaction.response.send_message("An error occurred while placing your bet.", ephemeral=True)
+            return
 
         current_guild_user.currency -= cost  # Update local object
 
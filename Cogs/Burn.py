@@ -3,6 +3,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.GuildUserDao import GuildUserDao
+from Services.CurrencyLedger import get_currency_ledger
+from Services.SessionManager import get_session_manager
 from logger import AppLogger
 
 
@@ -29,9 +31,9 @@ class Burn(commands.Cog):
                 return
 
             if column == "currency":
-                # Calculate how much we're burning to sync global stats
-                currency_delta = -target_user.currency
-                guild_user_dao.update_currency_with_global_sync(target.id, interaction.guild.id, currency_delta)
+                if not await self._burn_currency(interaction, target, target_user.currency):
+                    await interaction.response.send_message("Failed to burn the user's credits.", ephemeral=True)
+                    return
 
             if column == "exp":
                 target_user.exp = 0
@@ -46,7 +48,7 @@ class Burn(commands.Cog):
                 target_user.level = 0
 
             try:
-                # Only update if not currency (currency already updated via update_currency_with_global_sync)
+                # Only update if not currency (currency already updated via the currency ledger)
                 if column != "currency":
                     guild_user_dao.update_guild_user(target_user)
                 await interaction.response.send_message(f"{interaction.user.name} has burned {target.mention}'s {column} to 0! <a:pepesith:1165101386921418792>")
@@ -55,6 +57,31 @@ class Burn(commands.Cog):
         else:
             await interaction.response.send_message(f'only {role} can run this command. <:FeelsNaughty:1199732493792858214>', ephemeral=True)
    
-                
+
+    async def _burn_currency(self, interaction: discord.Interaction, target: discord.Member, stored_balance: int) -> bool:
+        """Debit the target's whole balance through the ledger, retrying if it moves under us."""
+        balance = await get_session_manager().get_currency(interaction.guild.id, target.id)
+        if balance is None:
+            balance = stored_balance
+
+        for attempt in range(3):
+            if balance <= 0:
+                return True
+            result = await get_currency_ledger().transfer(
+                interaction.guild.id,
+                {target.id: -balance},
+                idempotency_key=f"burn:{interaction.id}:{attempt}"
+            )
+            if result.success or result.error == "insufficient_funds":
+                # Burn whatever is left: the rest of a balance that grew meanwhile,
+                # or the current balance if it shrank
+                balance = result.balances.get(target.id, 0)
+            else:
+                logger.error(f'/admin-burn ledger transfer failed for {target.name}: {result.error}')
+                return False
+
+        return balance <= 0
+
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Burn(bot))
\ No newline at end of file
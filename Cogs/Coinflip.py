@@ -4,7 +4,7 @@ from discord import app_commands
 from Dao.UserDao import UserDao
 from Dao.GuildUserDao import GuildUserDao
 from Dao.GamesDao import GamesDao
-from Dao.GuildDao import GuildDao
+from Services.CurrencyLedger import get_currency_ledger
 from Services.SessionManager import get_session_manager
 
 import random
@@ -77,25 +77,22 @@ class Coinflip(commands.Cog):
 
         embed = discord.Embed()
 
+        ledger = get_currency_ledger()
+
         if result == call:
-            # User wins - update currency in session or DB
+            # User wins
             amount_won = cost
             amount_lost = 0
 
-            # Try to update currency in session
-            session_updated = await session_manager.update_currency(
-                guild_id=interaction.guild.id,
-                user_id=interaction.user.id,
-                amount=cost
+            transfer = await ledger.transfer(
+                interaction.guild.id,
+                {interaction.user.id: cost},
+                idempotency_key=f"coinflip:{interaction.id}"
             )
-
-            if session_updated:
-                # Get updated currency from session
-                current_currency = await session_manager.get_currency(interaction.guild.id, interaction.user.id)
-            else:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, cost)
-                current_currency = guild_user.currency + cost
+            if not transfer.success:
+                await interaction.response.send_message("An error occurred while updating your balance.", ephemeral=True)
+                return
+            current_currency = transfer.balances.get(interaction.user.id, current_currency + cost)
 
             embed.title = f":white_check_mark: {interaction.user.display_name} called {call}! :white_check_mark:"
             embed.description = f"# {result.upper()}! | {interaction.user.display_name} won {cost:,.0f} credits! <:PepeDank:1200292095131406388>"
@@ -103,51 +100,35 @@ class Coinflip(commands.Cog):
             embed.add_field(name="New Balance", value=f"{current_currency:,} credits", inline=True)
 
         else:
-            # User loses - update currency in session or DB
+            # User loses; 10% of the lost credits go to the vault in the same transfer
             amount_won = 0
             amount_lost = cost
+            vgain = int(cost * 0.1)
 
-            # Try to update currency in session
-            session_updated = await session_manager.update_currency(
-                guild_id=interaction.guild.id,
-                user_id=interaction.user.id,
-                amount=-cost
+            transfer = await ledger.transfer(
+                interaction.guild.id,
+                {interaction.user.id: -cost},
+                vault_delta=vgain,
+                idempotency_key=f"coinflip:{interaction.id}"
             )
 
-            if session_updated:
-                # Get updated currency from session
-                current_currency = await session_manager.get_currency(interaction.guild.id, interaction.user.id)
-            else:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -cost)
-                current_currency = guild_user.currency - cost
-
-            # Add to vault (10% of lost credits)
-            try:
-                vgain = int(cost * 0.1)  # 10% of the lost credits
-
-                # Try to add to vault cache first
-                vault_cached = await session_manager.add_vault_currency(interaction.guild.id, vgain)
-
-                if not vault_cached:
-                    # Fallback to immediate DB write if cache unavailable
-                    guild_dao = GuildDao()
-                    guild_dao.add_vault_currency(interaction.guild.id, vgain)
-                    guild_dao.close()
-
-                embed.title = f":x: {interaction.user.display_name} called {call}! :x:"
-                embed.description = f"# {result.upper()}! | {interaction.user.display_name} lost {cost:,.0f} credits. <a:giggle:1165098258968879134>\n\n{vgain:,.0f} Credits have been added to the vault! 🏦"
-                embed.colour = discord.Color.red()
-                embed.add_field(name="New Balance", value=f"{current_currency:,} credits", inline=True)
-                embed.add_field(name="Vault Gained", value=f"{vgain:,} credits", inline=True)
-
-            except Exception as e:
-                logger.error(f"Error updating vault: {e}")
-                # Still proceed with the game even if vault update fails
-                embed.title = f"🪙 {interaction.user.display_name} called {call}! 🪙"
-                embed.description = f"# {result.upper()}! | {interaction.user.display_name} lost {cost:,.0f} credits."
-                embed.colour = discord.Color.red()
-                embed.add_field(name="New Balance", value=f"{current_currency:,} credits", inline=True)
+            if transfer.error == "insufficient_funds":
+                # Balance changed since the check above (e.g. a concurrent game)
+                await interaction.response.send_message(
+                    f"You don't have enough credits. You have {transfer.balances.get(interaction.user.id, 0):,} credits but need {cost:,}.",
+                    ephemeral=True)
+                return
+            if not transfer.success:
+                await interaction.response.send_message("An error occurred while updating your balance.", ephemeral=True)
+                return
+
+            current_currency = transfer.balances.get(interaction.user.id, current_currency - cost)
+
+            embed.title = f":x: {interaction.user.display_name} called {call}! :x:"
+            embed.description = f"# {result.upper()}! | {interaction.user.display_name} lost {cost:,.0f} credits. <a:giggle:1165098258968879134>\n\n{vgain:,.0f} Credits have been added to the vault! 🏦"
+            embed.colour = discord.Color.red()
+            embed.add_field(name="New Balance", value=f"{current_currency:,} credits", inline=True)
+            embed.add_field(name="Vault Gained", value=f"{vgain:,} credits", inline=True)
 
         # Log the game result
         game_result = "win" if amount_won > 0 else "lose"
@@ -183,10 +164,10 @@ class Coinflip(commands.Cog):
             if not game_id:
                 logger.error("Failed to log coinflip game")
 
-        # Note: Currency already updated via update_currency_with_global_sync() above
+        # Note: Currency already updated via the currency ledger above
         # No additional database updates needed here
 
-        # Commented out old manual update code - now handled by update_currency_with_global_sync()
+        # Commented out old manual update code - now handled by the currency ledger
         # try:
         #     guild_user_dao.update_guild_user(guild_user)
         #     user_dao = UserDao()
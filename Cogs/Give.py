@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.GuildUserDao import GuildUserDao
+from Services.CurrencyLedger import get_currency_ledger
 from logger import AppLogger
 
 logger = AppLogger(__name__).get_logger()
@@ -51,29 +52,34 @@ class Give(commands.Cog):
                     await interaction.response.send_message("Failed to get user data.", ephemeral=True)
                     return
 
-                # Check if giver has enough credits
-                if amount > giving_user.currency:
+                # Debit and credit in one atomic ledger transfer; the funds check happens there too
+                result = await get_currency_ledger().transfer(
+                    interaction.guild.id,
+                    {interaction.user.id: -amount, target.id: amount},
+                    idempotency_key=f"give:{interaction.id}"
+                )
+
+                if result.error == "insufficient_funds":
+                    balance = result.balances.get(interaction.user.id, giving_user.currency)
                     await interaction.response.send_message(
                         f"{interaction.user.name}, your heart is bigger than your wallet. "
                         f"You don't have {amount:,.0f} Credits to give. "
-                        f"(You have {giving_user.currency:,.0f}) "
+                        f"(You have {balance:,.0f}) "
                         f"<:FeelsBigSad:1199734765230768139>"
                     )
                     logger.info(
                         f"{interaction.user.name} tried to give {amount:,.0f} Credits to {target.name} but didn't have enough Credits.")
                     return
 
-                # Perform the transfer with global sync
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -amount)
-                guild_user_dao.update_currency_with_global_sync(target.id, interaction.guild.id, amount)
+                if not result.success:
+                    await interaction.response.send_message("Failed to transfer credits.", ephemeral=True)
+                    return
 
-                # Update local objects for display
-                giving_user.currency -= amount
-                target_user.currency += amount
+                giver_balance = result.balances.get(interaction.user.id, giving_user.currency - amount)
 
                 await interaction.response.send_message(
                     f'### {interaction.user.name} has given {target.mention} {amount:,.0f} credits! <:PepePimp:1200268145693302854>\n'
-                    f'*{interaction.user.name} now has {giving_user.currency:,.0f} credits.*'
+                    f'*{interaction.user.name} now has {giver_balance:,.0f} credits.*'
                 )
 
                 logger.info(
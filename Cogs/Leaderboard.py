@@ -6,6 +6,8 @@ from Dao.GuildUserDao import GuildUserDao
 from Dao.SlotsDao import SlotsDao
 from Dao.CoinflipDao import CoinflipDao
 from logger import AppLogger
+from Services.ConfigCache import get_config_cache
+from utils.level_curve import get_default_level_curve, level_curve_for_config
 import typing
 
 logger = AppLogger(__name__).get_logger()
@@ -32,15 +34,20 @@ class Leaderboard(commands.Cog):
 
         if stat == 'Currency' or stat == 'Exp' or stat == 'Level':
             guild_dao = GuildUserDao()
-            # Map stat names to database column names
+            # Map stat names to database column names (levels rank by exp and are read off the guild's curve)
             column_map = {
                 'Currency': 'currency',
                 'Exp': 'exp',
-                'Level': 'level'
+                'Level': 'exp'
             }
             column = column_map[stat]
             leaders = guild_dao.get_top_guild_users(interaction.guild.id, column)
 
+            if stat == 'Level':
+                level_curve = level_curve_for_config(await get_config_cache().get_leveling_config(interaction.guild.id))
+                leaders = [(user_id, name, nickname, level_curve.level_for_exp(exp))
+                           for user_id, name, nickname, exp in leaders]
+
             embed = discord.Embed(title=f"Top Users by {stat.upper()}", color=interaction.user.color)
             leaderboard_text = ""
 
@@ -64,7 +71,10 @@ class Leaderboard(commands.Cog):
             if stat == 'Global Exp':
                 leaders = dao.get_top_users_by_global_exp()
             elif stat == 'Global Level':
-                leaders = dao.get_top_users_by_global_level()
+                # Levels rank by exp; read them off the default curve
+                level_curve = get_default_level_curve()
+                leaders = [(user_id, username, global_name, level_curve.level_for_exp(global_exp), global_exp)
+                           for user_id, username, global_name, global_exp, _ in dao.get_top_users_by_global_exp()]
             else:  # Global Currency
                 leaders = dao.get_top_users_by_currency()
 
@@ -1,23 +1,39 @@
+import asyncio
 import discord
 from discord.ext import commands
-import time
+from cachetools import TTLCache
+
+from Services.ConfigCache import get_config_cache
+from Services.ModerationLogBatcher import ModerationLogBatcher
+
+# How long on_member_remove waits for a matching kick/ban audit log entry
+AUDIT_CORRELATION_SECONDS = 3
 
-from Dao.GuildDao import GuildDao
 
 class ModerationLog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.guild_dao = GuildDao()
+        self.batcher = ModerationLogBatcher(flush_interval=2.0)
+
+        # (guild_id, target_id) -> AuditLogAction for recent kicks/bans, fed by on_audit_log_entry_create
+        self.recent_removals = TTLCache(maxsize=10000, ttl=60)
 
-    def _get_moderation_settings(self, guild_id):
-        """Fetches the moderation settings for a given guild."""
+    async def cog_unload(self):
+        await self.batcher.flush_all()
+
+    async def _get_moderation_settings(self, guild_id):
+        """Fetches the moderation settings for a given guild (cached)."""
         if guild_id is None:
             return None
-        settings = self.guild_dao.get_guild_settings(guild_id)
+        settings = await get_config_cache().get_guild_settings(guild_id)
         if settings is None:
             return None
         return settings.get("moderation")
 
+    def _was_kicked_or_banned(self, guild_id, member_id):
+        """Check whether a kick/ban audit log entry has been seen for this member."""
+        return (guild_id, member_id) in self.recent_removals
+
     async def _get_log_channel(self, channel_id):
         """Fetches a channel object from an ID."""
         if not channel_id:
@@ -49,7 +65,7 @@ class ModerationLog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        mod_settings = self._get_moderation_settings(member.guild.id)
+        mod_settings = await self._get_moderation_settings(member.guild.id)
         if not mod_settings or not mod_settings.get("enabled") or not mod_settings.get("events", {}).get("on_member_join", {}).get("enabled"):
             return
 
@@ -71,27 +87,21 @@ class ModerationLog(commands.Cog):
             embed.add_field(name="Account Created", value=f"<t:{int(member.created_at.timestamp())}:R>")
             embed.add_field(name="Time", value=f"<t:{int(discord.utils.utcnow().timestamp())}:F> (<t:{int(discord.utils.utcnow().timestamp())}:R>)")
             embed.set_footer(text=f"ID: {member.id}")
-            await log_channel.send(embed=embed)
+            self.batcher.enqueue(log_channel, embed)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        mod_settings = self._get_moderation_settings(member.guild.id)
+        mod_settings = await self._get_moderation_settings(member.guild.id)
         if not mod_settings or not mod_settings.get("enabled") or not mod_settings.get("events", {}).get("on_member_remove", {}).get("enabled"):
             return
 
         # Check if user was kicked or banned - if so, skip the "left" message
-        # since those actions have their own log entries
-        try:
-            async for entry in member.guild.audit_logs(limit=5):
-                # Only check recent entries (within last 5 seconds)
-                if (discord.utils.utcnow() - entry.created_at).total_seconds() > 5:
-                    break
-                # If this member was kicked or banned, don't post "left" message
-                if entry.target and entry.target.id == member.id:
-                    if entry.action in (discord.AuditLogAction.kick, discord.AuditLogAction.ban):
-                        return  # Skip - the kick/ban handler will log this
-        except discord.Forbidden:
-            pass  # Bot doesn't have audit log permission, continue normally
+        # since those actions have their own log entries. The audit log entry
+        # can arrive before or after this event, so give it a moment.
+        if not self._was_kicked_or_banned(member.guild.id, member.id):
+            await asyncio.sleep(AUDIT_CORRELATION_SECONDS)
+        if self._was_kicked_or_banned(member.guild.id, member.id):
+            return  # Skip - the kick/ban handler will log this
 
         event_settings = mod_settings["events"]["on_member_remove"]
         # Use event-specific channel or fall back to member_activity_channel_id
@@ -110,14 +120,14 @@ class ModerationLog(commands.Cog):
             embed.add_field(name="Time", value=f"<t:{int(discord.utils.utcnow().timestamp())}:F> (<t:{int(discord.utils.utcnow().timestamp())}:R>)")
             embed.set_thumbnail(url=member.display_avatar.url)
             embed.set_footer(text=f"ID: {member.id}")
-            await log_channel.send(embed=embed)
+            self.batcher.enqueue(log_channel, embed)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
         if message.author.bot:
             return
 
-        mod_settings = self._get_moderation_settings(message.guild.id)
+        mod_settings = await self._get_moderation_settings(message.guild.id)
         if not mod_settings or not mod_settings.get("enabled") or not mod_settings.get("events", {}).get("on_message_delete", {}).get("enabled"):
             return
 
@@ -135,14 +145,14 @@ class ModerationLog(commands.Cog):
                 embed.add_field(name="Content", value=message.content[:1024], inline=False)
             embed.add_field(name="Time", value=f"<t:{int(discord.utils.utcnow().timestamp())}:F> (<t:{int(discord.utils.utcnow().timestamp())}:R>)")
             embed.set_footer(text=f"Author ID: {message.author.id} | Message ID: {message.id}")
-            await log_channel.send(embed=embed)
+            self.batcher.enqueue(log_channel, embed)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
         if before.author.bot or before.content == after.content:
             return
 
-        mod_settings = self._get_moderation_settings(before.guild.id)
+        mod_settings = await self._get_moderation_settings(before.guild.id)
         if not mod_settings or not mod_settings.get("enabled") or not mod_settings.get("events", {}).get("on_message_edit", {}).get("enabled"):
             return
 
@@ -160,11 +170,11 @@ class ModerationLog(commands.Cog):
             embed.add_field(name="After", value=after.content[:1024], inline=False)
             embed.add_field(name="Time", value=f"<t:{int(discord.utils.utcnow().timestamp())}:F> (<t:{int(discord.utils.utcnow().timestamp())}:R>)")
             embed.set_footer(text=f"Author ID: {before.author.id} | Message ID: {after.id}")
-            await log_channel.send(embed=embed)
+            self.batcher.enqueue(log_channel, embed)
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
-        mod_settings = self._get_moderation_settings(before.guild.id)
+        mod_settings = await self._get_moderation_settings(before.guild.id)
         if not mod_settings or not mod_settings.get("enabled"):
             return
 
@@ -185,11 +195,15 @@ class ModerationLog(commands.Cog):
                 embed.add_field(name="After", value=after.nick or after.name, inline=False)
                 embed.add_field(name="Time", value=f"<t:{int(discord.utils.utcnow().timestamp())}:F> (<t:{int(discord.utils.utcnow().timestamp())}:R>)")
                 embed.set_footer(text=f"ID: {before.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
     @commands.Cog.listener()
     async def on_audit_log_entry_create(self, entry):
-        mod_settings = self._get_moderation_settings(entry.guild.id)
+        # Remember kicks/bans so on_member_remove can skip its "left" message
+        if entry.action in (discord.AuditLogAction.kick, discord.AuditLogAction.ban) and entry.target:
+            self.recent_removals[(entry.guild.id, entry.target.id)] = entry.action
+
+        mod_settings = await self._get_moderation_settings(entry.guild.id)
         if not mod_settings or not mod_settings.get("enabled"):
             return
 
@@ -210,7 +224,7 @@ class ModerationLog(commands.Cog):
                 )
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"Target ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
         # Member Unbanned
         elif entry.action == discord.AuditLogAction.unban and audit_events.get("unban", {}).get("enabled"):
@@ -227,7 +241,7 @@ class ModerationLog(commands.Cog):
                 )
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"Target ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
         # Member Kicked
         elif entry.action == discord.AuditLogAction.kick and audit_events.get("kick", {}).get("enabled"):
@@ -243,7 +257,7 @@ class ModerationLog(commands.Cog):
                 )
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"Target ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
         # Member Muted (Timeout)
         elif entry.action == discord.AuditLogAction.member_update and entry.after.timed_out_until and audit_events.get("mute", {}).get("enabled"):
@@ -259,7 +273,7 @@ class ModerationLog(commands.Cog):
                 )
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"Target ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
         # Member Unmuted (Timeout Removed)
         elif entry.action == discord.AuditLogAction.member_update and entry.before.timed_out_until and not entry.after.timed_out_until and audit_events.get("mute", {}).get("enabled"):
@@ -275,7 +289,7 @@ class ModerationLog(commands.Cog):
                 )
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"Target ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
         # Role Changes
         elif entry.action == discord.AuditLogAction.member_role_update and audit_events.get("role_change", {}).get("enabled"):
@@ -303,7 +317,7 @@ class ModerationLog(commands.Cog):
 
                 embed.add_field(name="Time", value=f"<t:{int(entry.created_at.timestamp())}:F> (<t:{int(entry.created_at.timestamp())}:R>)")
                 embed.set_footer(text=f"ID: {entry.target.id}")
-                await log_channel.send(embed=embed)
+                self.batcher.enqueue(log_channel, embed)
 
 
 async def setup(bot):
@@ -6,10 +6,8 @@ from discord.ext import commands
 from datetime import datetime
 from Dao.GuildDao import GuildDao
 from Dao.GuildUserDao import GuildUserDao
-from Dao.UserDao import UserDao
 from Entities.Guild import Guild
-from Entities.GuildUser import GuildUser
-from Entities.User import User
+from Services.MemberImporter import get_member_importer
 from logger import AppLogger
 import os
 from dotenv import load_dotenv
@@ -164,6 +162,11 @@ class On_Guild_Join(commands.Cog):
         super().__init__()
         self.bot = bot
 
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Resume member imports that were interrupted by a restart."""
+        await get_member_importer().resume_pending(self.bot)
+
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
         """
@@ -175,14 +178,12 @@ class On_Guild_Join(commands.Cog):
 
             # Initialize DAOs
             guild_dao = GuildDao()
-            guild_user_dao = GuildUserDao()
-            user_dao = UserDao()
 
             # Create guild record
             await self._create_guild_record(guild, guild_dao)
 
             # Add all existing members to the database (both global and guild-specific)
-            await self._add_guild_members(guild, guild_user_dao, user_dao)
+            self._add_guild_members(guild)
 
             # Send welcome message to a general channel if possible
             # await self._send_welcome_message(guild)
@@ -233,93 +234,16 @@ class On_Guild_Join(commands.Cog):
         except Exception as e:
             logger.error(f"Error creating guild record for {guild.name}: {e}")
 
-    async def _add_guild_members(self, guild: discord.Guild, guild_user_dao: GuildUserDao, user_dao: UserDao):
+    def _add_guild_members(self, guild: discord.Guild):
         """
         Add all current guild members to the database (both global and guild-specific).
-        Uses bulk operations for performance with large member counts.
+        Streams members in chunks through the MemberImporter so large guilds
+        don't block the event loop or run one huge transaction. The import runs
+        as a background task (the importer keeps the reference in active_imports),
+        so the join handler doesn't wait for it.
         """
         try:
-            # Prepare lists for bulk operations
-            global_users_to_upsert = []
-            guild_users_to_upsert = []
-
-            formatted_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Build lists of users to upsert (no database calls yet)
-            for member in guild.members:
-                if member.bot:
-                    continue  # Skip bots
-
-                # Prepare global user
-                try:
-                    account_created = member.created_at.strftime("%Y-%m-%d %H:%M:%S") if member.created_at else formatted_now
-                except Exception:
-                    account_created = formatted_now
-
-                global_user = User(
-                    id=member.id,
-                    discord_username=member.name,
-                    global_name=member.global_name if hasattr(member, 'global_name') else member.name,
-                    avatar_url=str(member.avatar.url) if member.avatar else None,
-                    is_bot=member.bot,
-                    global_exp=0,
-                    global_level=0,
-                    total_currency=0,
-                    total_messages=0,
-                    total_reactions=0,
-                    account_created=account_created,
-                    first_seen=formatted_now,
-                    last_seen=formatted_now,
-                    privacy_settings=None,
-                    global_settings=None
-                )
-                global_users_to_upsert.append(global_user)
-
-                # Prepare guild user
-                try:
-                    joined_at = member.joined_at.strftime("%Y-%m-%d %H:%M:%S") if member.joined_at else formatted_now
-                except Exception:
-                    joined_at = formatted_now
-
-                guild_user = GuildUser(
-                    user_id=member.id,
-                    guild_id=guild.id,
-                    name=member.name,
-                    nickname=member.display_name,
-                    level=0,
-                    streak=0,
-                    highest_streak=0,
-                    exp=0,
-                    exp_gained=0,
-                    exp_lost=0,
-                    currency=1000,  # Starting currency for new users
-                    messages_sent=0,
-                    reactions_sent=0,
-                    joined_at=joined_at,
-                    last_active=formatted_now,
-                    daily=0,
-                    last_daily=None,
-                    is_active=True
-                )
-                guild_users_to_upsert.append(guild_user)
-
-            # Perform bulk operations in separate thread to avoid blocking event loop
-            def bulk_db_operations():
-                success_global = user_dao.bulk_upsert_users(global_users_to_upsert)
-                success_guild = guild_user_dao.bulk_upsert_guild_users(guild_users_to_upsert)
-                return success_global, success_guild
-
-            # Run blocking database operations in thread pool
-            success_global, success_guild = await asyncio.to_thread(bulk_db_operations)
-
-            if success_global and success_guild:
-                logger.info(
-                    f"Member processing complete for {guild.name}: "
-                    f"Processed {len(global_users_to_upsert)} global users and {len(guild_users_to_upsert)} guild users in bulk"
-                )
-            else:
-                logger.error(f"Some bulk operations failed for {guild.name}")
-
+            get_member_importer().start_import(guild)
         except Exception as e:
             logger.error(f"Error adding guild members for {guild.name}: {e}")
 
@@ -421,6 +345,9 @@ class On_Guild_Join(commands.Cog):
             guild_dao = GuildDao()
             guild_user_dao = GuildUserDao()
 
+            # Stop any member import still running for this guild
+            await get_member_importer().cancel_import(guild.id)
+
             # Deactivate guild
             existing_guild = guild_dao.get_guild(guild.id)
             if existing_guild:
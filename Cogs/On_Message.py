@@ -1,6 +1,5 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
-import os
-import json
 import math
 import random
 from typing import Optional
@@ -13,7 +12,10 @@ from Dao.UserDao import UserDao
 from Entities.GuildUser import GuildUser
 from Entities.User import User
 from logger import AppLogger
+from Services.ConfigCache import get_config_cache
+from Services.CurrencyLedger import get_currency_ledger
 from Services.DailyCheckCache import get_daily_check_cache
+from utils.word_filter import get_default_word_filter
 
 # Load environment variables from .env file
 load_dotenv()
@@ -28,11 +30,8 @@ class On_Message(commands.Cog):
         self.guildUserDao = GuildUserDao()
         self.userDao = UserDao()
         load_dotenv()
-        inappropriate_words_str = os.getenv('INAPPROPRIATE_WORDS')
-        if inappropriate_words_str:
-            self.inappropriate_words = json.loads(inappropriate_words_str)
-        else:
-            self.inappropriate_words = []
+        # Compile the bot-wide word list once at load
+        get_default_word_filter()
 
     def find_channel_by_name(self, guild: discord.Guild, channel_names: list) -> discord.TextChannel:
         """Find a channel by name in the guild, accounting for emojis and special characters"""
@@ -85,7 +84,6 @@ class On_Message(commands.Cog):
 
     async def get_leveling_config(self, guild_id):
         """Get leveling configuration from guild settings (cached)"""
-        from Services.ConfigCache import get_config_cache
         return await get_config_cache().get_leveling_config(guild_id)
 
     @commands.Cog.listener()
@@ -118,8 +116,11 @@ class On_Message(commands.Cog):
         guild_user_dao = GuildUserDao()
         user_dao = UserDao()
 
-        current_guild_user = guild_user_dao.get_or_create_guild_user_from_discord(message.author, message.guild.id)
-        current_user = user_dao.get_or_create_user_from_discord(message.author)
+        # DAO calls run in worker threads so a busy pool never stalls the event loop
+        current_guild_user = await asyncio.to_thread(
+            guild_user_dao.get_or_create_guild_user_from_discord, message.author, message.guild.id
+        )
+        current_user = await asyncio.to_thread(user_dao.get_or_create_user_from_discord, message.author)
 
         if current_guild_user is None:
             # Failed to get/create guild user - log error and return
@@ -148,13 +149,12 @@ class On_Message(commands.Cog):
             # Note: last_active and last_seen are now managed by XP sessions
             # and only persisted during periodic flushes (every 5 minutes)
 
-            # CHECK FOR INAPPROPRIATE WORDS
-            message_content_lower = message.content.lower()
-            for word in self.inappropriate_words:
-                if word.lower() in message_content_lower:
-                    logger.info(f'{message.author.name} - INAPPROPRIATE WORD DETECTED in {message.guild.name}')
-                    await message.delete()
-                    return
+            # CHECK FOR INAPPROPRIATE WORDS (one pass over the message)
+            word_filter = await get_config_cache().get_word_filter(message.guild.id)
+            if word_filter and word_filter.find(message.content):
+                logger.info(f'{message.author.name} - INAPPROPRIATE WORD DETECTED in {message.guild.name}')
+                await message.delete()
+                return
 
             # CHECK IF - DAILY REWARD (optimized with daily check cache)
             from Services.PerformanceMonitor import get_performance_monitor
@@ -178,9 +178,9 @@ class On_Message(commands.Cog):
                 perf_monitor = get_performance_monitor()
                 await perf_monitor.record_daily_reward()
 
-                # ONLY save to database after daily reward
-                guild_user_dao.update_guild_user(current_guild_user)
-                user_dao.update_user(current_user)
+                # ONLY save to database after daily reward (process_daily_reward
+                # saved the claim itself; currency and XP belong to the ledger/sessions)
+                await asyncio.to_thread(user_dao.update_user, current_user)
                 logger.info(f'{message.author} database updated after daily reward in guild {message.guild.name}')
 
             # Note: Regular messages no longer trigger DB writes!
@@ -204,7 +204,7 @@ class On_Message(commands.Cog):
         try:
             # Get the global user for bank balance
             user_dao = UserDao()
-            global_user = user_dao.get_user(member.id)
+            global_user = await asyncio.to_thread(user_dao.get_user, member.id)
             if not global_user:
                 logger.error(f"Could not find global user for {member.name} during daily reward.")
                 # Create a temporary user object to prevent crashes, though interest will be 0
@@ -241,7 +241,9 @@ class On_Message(commands.Cog):
                 if potential_interest > 0:
                     # This method checks if interest was already paid today and only pays once
                     # Pass guild_id to track which server triggered the interest payout
-                    interest_paid = user_dao.add_bank_interest(member.id, potential_interest, member.guild.id)
+                    interest_paid = await asyncio.to_thread(
+                        user_dao.add_bank_interest, member.id, potential_interest, member.guild.id
+                    )
                     if interest_paid:
                         interest_amount = potential_interest
                         logger.info(f"Paid {interest_amount} interest to user {member.name} (ID: {member.id})")
@@ -256,21 +258,25 @@ class On_Message(commands.Cog):
             streak_bonus = math.floor(base_daily * streak_bonus_percentage)
             calculated_daily_reward = base_daily + streak_bonus
 
-            # Update currency with global sync
-            guild_user_dao = GuildUserDao()
-            guild_user_dao.update_currency_with_global_sync(
-                member.id,
+            # Pay the reward through the ledger; keyed on the day so it's paid once
+            result = await get_currency_ledger().transfer(
                 member.guild.id,
-                calculated_daily_reward
+                {member.id: calculated_daily_reward},
+                idempotency_key=f"daily:{member.guild.id}:{member.id}:{today.isoformat()}"
             )
-            guild_user.currency += calculated_daily_reward
-            
+            if not result.success:
+                logger.error(f"Daily reward for {member.name} in {member.guild.name} failed: {result.error}")
+                return
+
             # Set daily and last_daily
             guild_user.daily = 1
             guild_user.last_daily = datetime.now(timezone.utc).replace(tzinfo=None).strftime("%Y-%m-%d %H:%M:%S")
 
-            # Save other updated fields (currency already saved by sync method)
-            guild_user_dao.update_guild_user(guild_user)
+            # Save only the claim; the reward reaches MySQL with the ledger's session flush
+            guild_user_dao = GuildUserDao()
+            if not await asyncio.to_thread(guild_user_dao.update_daily_claim, guild_user):
+                logger.error(f"Could not save daily claim for {member.name} in {member.guild.name}")
+            guild_user.currency = result.balances.get(member.id, guild_user.currency + calculated_daily_reward)
 
             # Send daily reward message using custom template
             if daily_channel:
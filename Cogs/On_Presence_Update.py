@@ -0,0 +1,42 @@
+import discord
+from discord.ext import commands
+
+from Services.StreamingPresenceIndex import get_streaming_presence_index
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+
+class On_Presence_Update(commands.Cog):
+    """Keeps the streaming presence index in step with the gateway."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        super().__init__()
+        self.bot = bot
+        self.index = get_streaming_presence_index()
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        self.index.update_member(after)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        """Seed from the member cache; presence updates may have been missed while the guild was away."""
+        try:
+            events = self.index.seed_guild(guild)
+            if events:
+                logger.debug(f"Guild {guild.name}: streaming index reseeded with {events} changes")
+        except Exception as e:
+            logger.error(f"Error seeding streaming index for guild {guild.id}: {e}")
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        self.index.forget_member(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.index.forget_guild(guild.id)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(On_Presence_Update(bot))
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 import discord
 from discord.ext import commands
 from Dao.GuildUserDao import GuildUserDao
-from Dao.GuildDao import GuildDao
+from Services.CurrencyLedger import get_currency_ledger
 from logger import AppLogger
 
 logger = AppLogger(__name__).get_logger()
@@ -27,8 +27,13 @@ class On_Raw_Member_Remove(commands.Cog):
             logger.info(f"{user.name} left the server {guild.name}.")
             # mod_channel = self.bot.get_channel(1155580804269867170)  # Removed hardcoded legacy logging
 
+            # Persist and drop any session first so the database balance is current
+            ledger = get_currency_ledger()
+            if not await ledger.settle(guild.id, user.id):
+                logger.error(f"Could not settle {user.name}'s session in guild {guild.name}, leaving their balance untouched")
+                return
+
             guild_user_dao = GuildUserDao()
-            guild_dao = GuildDao()
 
             # Retrieve the guild-specific user from the database
             guild_user = guild_user_dao.get_guild_user(user.id, guild.id)
@@ -37,11 +42,8 @@ class On_Raw_Member_Remove(commands.Cog):
                 currency_to_confiscate = guild_user.currency
 
                 if currency_to_confiscate > 0:
-                    # Add the confiscated currency to the GUILD'S vault
-                    guild_dao.add_vault_currency(guild.id, currency_to_confiscate)
-
-                    # Use global sync to remove the currency from the user
-                    guild_user_dao.update_currency_with_global_sync(user.id, guild.id, -currency_to_confiscate)
+                    # Move the currency from the user to the GUILD'S vault in one transaction
+                    await ledger.write_through(guild.id, {user.id: -currency_to_confiscate}, vault_delta=currency_to_confiscate)
 
                     # Logging is now handled by ModerationLog.py
                     # if mod_channel:
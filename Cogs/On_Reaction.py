@@ -1,10 +1,9 @@
+import asyncio
 from discord.ext import commands
 from Dao.UserDao import UserDao
 from Dao.GuildUserDao import GuildUserDao
-from Dao.LotteryParticipantDao import LotteryParticipantDao
-from Dao.LotteryEventDao import LotteryEventDao
-from Dao.GuildDao import GuildDao  # Use GuildDao instead of VaultDao for per-guild vaults
-from Entities.LotteryParticipant import LotteryParticipant
+from Services.EntityResolver import get_entity_resolver
+from Services.LotteryService import get_lottery_service
 from logger import AppLogger
 import discord
 
@@ -24,13 +23,17 @@ class On_Reaction(commands.Cog):
         Reaction counts are buffered in memory and flushed to DB every 30 seconds
         to reduce database load.
         """
-        if payload.member and payload.member.bot:
+        if payload.guild_id is None or payload.member is None:
+            return  # Only guild reactions are tracked
+        if payload.member.bot:
             return  # Skip bot reactions
 
         try:
-            channel = self.bot.get_channel(payload.channel_id)
-            message = await channel.fetch_message(payload.message_id)
-            user = await self.bot.fetch_user(payload.user_id)
+            # The payload carries the guild, channel and message IDs, so the
+            # reacted-to message itself is never fetched
+            user = await get_entity_resolver().get_user(self.bot, payload.user_id)
+            if user is None:
+                return
             emoji = payload.emoji
 
             # Ensure user records exist (creates if first time)
@@ -38,8 +41,10 @@ class On_Reaction(commands.Cog):
             user_dao = UserDao()
             guild_user_dao = GuildUserDao()
 
-            global_user = user_dao.get_or_create_user_from_discord(user)
-            guild_user = guild_user_dao.get_or_create_guild_user_from_discord(payload.member, message.guild.id)
+            global_user = await asyncio.to_thread(user_dao.get_or_create_user_from_discord, user)
+            guild_user = await asyncio.to_thread(
+                guild_user_dao.get_or_create_guild_user_from_discord, payload.member, payload.guild_id
+            )
 
             if not global_user or not guild_user:
                 logging.error(f"Failed to get/create user records for {user.name}")
@@ -48,17 +53,17 @@ class On_Reaction(commands.Cog):
             # Track reaction in unified session (will be flushed to DB every 5 minutes)
             from Services.SessionManager import get_session_manager
             session_manager = get_session_manager()
-            await session_manager.track_reaction_activity(message.guild.id, user.id)
+            await session_manager.track_reaction_activity(payload.guild_id, user.id)
 
-            logging.debug(f"{user.name} added {emoji} to {message.author}'s message [SESSION]")
+            logging.debug(f"{user.name} added {emoji} to message {payload.message_id} [SESSION]")
 
             # LOTTERY EVENT HANDLING
-            await self.handle_lottery_reaction(payload, message, user, emoji, channel)
+            await self.handle_lottery_reaction(payload, user, emoji)
 
         except Exception as e:
             logging.error(f'on_raw_reaction_add() - Error processing reaction: {e}')
 
-    async def handle_lottery_reaction(self, payload, message, user, emoji, channel):
+    async def handle_lottery_reaction(self, payload, user, emoji):
         """
         Handle lottery-related reactions.
         """
@@ -67,48 +72,37 @@ class On_Reaction(commands.Cog):
             if str(emoji) != '🎟️':
                 return
 
-            le_dao = LotteryEventDao()
-            guild_dao = GuildDao()
+            lottery = get_lottery_service()
 
-            # Get current lottery for this specific guild
-            current_lottery = le_dao.get_current_event(message.guild.id)
+            # Get current lottery for this specific guild (cached)
+            current_lottery = await lottery.get_current_event(payload.guild_id)
 
             if current_lottery is None:
                 logging.debug('There is no current lottery event in this guild')
                 return
 
-            logging.info(f'current_lottery: {current_lottery.message_id}')
-            logging.info(f'message.id: {message.id}')
-
             # Check if this reaction is on the lottery message
-            if message.id != current_lottery.message_id:
+            if payload.message_id != current_lottery.message_id:
                 return
 
-            # Check if user is already a participant
-            lpd = LotteryParticipantDao()
-            participants = lpd.get_participants(current_lottery.id)  # ✅ Use event_id, not message_id
-            participant_ids = [participant.participant_id for participant in participants]
-
-            if user.id in participant_ids:
-                logging.info(f'{user.name} has already entered the lottery!')
-                return
-
-            # Add user to lottery
+            # Add user to lottery (the entrant set rejects repeat entries)
             try:
-                # Get guild vault credits
-                vault_credits = guild_dao.get_vault_currency(message.guild.id)
-
-                # Add participant to database
-                new_participant = LotteryParticipant(current_lottery.id, user.id)  # ✅ Use event_id, not message_id
-                lpd.add_new_participant(new_participant)
+                if not await lottery.enter(current_lottery.id, user.id):
+                    logging.info(f'{user.name} has already entered the lottery!')
+                    return
                 logging.info(f'{user.name} has entered the lottery!')
 
+                # Get guild vault credits (stored vault plus pending game losses)
+                vault_credits = await lottery.get_vault_total(payload.guild_id)
+
                 # Add lottery role if it exists
-                lottery_role = discord.utils.get(message.guild.roles, name="LotteryParticipant")
+                lottery_role = discord.utils.get(payload.member.guild.roles, name="LotteryParticipant")
                 if lottery_role:
                     await payload.member.add_roles(lottery_role)
 
                 # Send confirmation message
+                channel = self.bot.get_channel(payload.channel_id)
+                message = get_entity_resolver().partial_message(channel, payload.message_id)
                 await channel.send(
                     f'## {user.display_name} has entered the lottery for a chance to win {vault_credits:,.0f} Credits! \n'
                     f'## 🎰 Good Luck! Enter here -> {message.jump_url}'
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from Dao.GuildUserDao import GuildUserDao
-from Dao.GuildDao import GuildDao
+from Services.CurrencyLedger import get_currency_ledger
 from logger import AppLogger
 
 logger = AppLogger(__name__).get_logger()
@@ -41,7 +41,6 @@ class Polymorph(commands.Cog):
         #     return
 
         guild_user_dao = GuildUserDao()
-        guild_dao = GuildDao()
         cost = 10000
 
         # Check if user is trying to rename themselves
@@ -57,24 +56,27 @@ class Polymorph(commands.Cog):
 
         target_original_name = target.display_name  # Get current display name
 
-        if user.currency >= cost:
+        # Charge first (10% goes to the guild vault); refunded below if the rename fails
+        ledger = get_currency_ledger()
+        vault_gain = int(cost * 0.1)
+        transfer = await ledger.transfer(
+            interaction.guild.id,
+            {interaction.user.id: -cost},
+            vault_delta=vault_gain,
+            idempotency_key=f"polymorph:{interaction.id}"
+        )
+        if transfer.error == "insufficient_funds":
+            user.currency = transfer.balances.get(interaction.user.id, user.currency)
+        elif not transfer.success:
+            await interaction.response.send_message("Failed to charge for the polymorph.", ephemeral=True)
+            return
+
+        if transfer.success:
+            renamed = False
             try:
                 # Store original name for the message
                 await target.edit(nick=rename, reason=f"Polymorphed by {interaction.user.name}")
-
-                # Deduct cost from user's guild currency
-                user.currency -= cost
-                guild_user_dao.update_guild_user(user)
-
-                # Add credits to guild vault (10% goes to vault)
-                from Services.SessionManager import get_session_manager
-                vault_gain = int(cost * 0.1)
-                session_manager = get_session_manager()
-                vault_cached = await session_manager.add_vault_currency(interaction.guild.id, vault_gain)
-
-                if not vault_cached:
-                    # Fallback to immediate DB write
-                    guild_dao.add_vault_currency(interaction.guild.id, vault_gain)
+                renamed = True
 
                 embed=discord.Embed(
                     title=f"Polymorph :sheep:",
@@ -98,6 +100,7 @@ class Polymorph(commands.Cog):
                 logger.info(f'{interaction.user.name} used /polymorph on {target.name} in {interaction.guild.name}')
 
             except discord.Forbidden:
+                await self._refund(interaction, cost, vault_gain)
                 await interaction.response.send_message(
                     "I don't have permission to change that user's nickname. They might have higher permissions than me!",
                     ephemeral=True
@@ -105,6 +108,7 @@ class Polymorph(commands.Cog):
                 logger.warning(f'{interaction.user.name} tried to polymorph {target.name} but bot lacks permissions')
 
             except discord.HTTPException as e:
+                await self._refund(interaction, cost, vault_gain)
                 await interaction.response.send_message(
                     f"Failed to change nickname: {str(e)}",
                     ephemeral=True
@@ -112,6 +116,8 @@ class Polymorph(commands.Cog):
                 logger.error(f'{interaction.user.name} tried to polymorph {target.name} - HTTPException: {e}')
 
             except Exception as e:
+                if not renamed:
+                    await self._refund(interaction, cost, vault_gain)
                 await interaction.response.send_message(
                     "An unexpected error occurred while changing the nickname.",
                     ephemeral=True
@@ -127,5 +133,18 @@ class Polymorph(commands.Cog):
             )
 
 
+    async def _refund(self, interaction: discord.Interaction, cost: int, vault_gain: int):
+        """Give back the polymorph charge when the rename didn't happen."""
+        refund = await get_currency_ledger().transfer(
+            interaction.guild.id,
+            {interaction.user.id: cost},
+            vault_delta=-vault_gain,
+            idempotency_key=f"polymorph:refund:{interaction.id}",
+            require_funds=False
+        )
+        if not refund.success:
+            logger.error(f'Polymorph refund of {cost} to {interaction.user.name} failed: {refund.error}')
+
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Polymorph(bot))
\ No newline at end of file
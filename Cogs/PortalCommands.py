@@ -10,6 +10,8 @@ from Dao.CrossServerPortalDao import CrossServerPortalDao
 from Dao.GuildDao import GuildDao
 from Dao.UserDao import UserDao
 from Entities.CrossServerPortal import CrossServerPortal
+from Services.CurrencyLedger import get_currency_ledger
+from Services.EntityResolver import get_entity_resolver
 from logger import AppLogger
 
 
@@ -178,12 +180,28 @@ class PortalCommands(commands.Cog):
                 await interaction.followup.send(f"You need {portal_cost} credits in this server to open a portal. You have {guild_user.currency if guild_user else 0} credits.", ephemeral=True)
                 return
 
-            # Deduct credits using the correct, synced method
-            success = guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, -portal_cost)
-            if not success:
+            # Deduct credits through the ledger; its funds check is the authoritative one
+            ledger = get_currency_ledger()
+            fee = await ledger.transfer(
+                interaction.guild.id,
+                {interaction.user.id: -portal_cost},
+                idempotency_key=f"portal:{interaction.id}"
+            )
+            if fee.error == "insufficient_funds":
+                await interaction.followup.send(f"You need {portal_cost} credits in this server to open a portal. You have {fee.balances.get(interaction.user.id, 0)} credits.", ephemeral=True)
+                return
+            if not fee.success:
                 await interaction.followup.send("Failed to process portal fee. Please try again.", ephemeral=True)
                 return
 
+            async def refund():
+                await ledger.transfer(
+                    interaction.guild.id,
+                    {interaction.user.id: portal_cost},
+                    idempotency_key=f"portal:refund:{interaction.id}",
+                    require_funds=False
+                )
+
             # Create portal session
             now = datetime.now()
             closes_at = now + timedelta(minutes=2)
@@ -203,7 +221,7 @@ class PortalCommands(commands.Cog):
             created_portal = self.portal_dao.create_portal(portal)
             if not created_portal:
                 # Refund credits on failure
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, portal_cost)
+                await refund()
                 await interaction.followup.send("Failed to create portal. Credits have been refunded.", ephemeral=True)
                 return
 
@@ -213,7 +231,7 @@ class PortalCommands(commands.Cog):
 
             if not source_channel or not target_channel:
                 self.portal_dao.close_portal(created_portal.id)
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, portal_cost)
+                await refund()
                 await interaction.followup.send("Could not access portal channels. Credits have been refunded.", ephemeral=True)
                 return
 
@@ -252,6 +270,10 @@ class PortalCommands(commands.Cog):
             source_message = await source_channel.send(embed=source_embed)
             target_message = await target_channel.send(embed=target_embed)
 
+            # The countdown updater edits these every few seconds; keep them resolvable without a fetch
+            get_entity_resolver().remember_message(source_message)
+            get_entity_resolver().remember_message(target_message)
+
             # Update portal with message IDs
             self.portal_dao.update_portal_messages(created_portal.id, source_message.id, target_message.id)
 
@@ -290,12 +312,15 @@ class PortalCommands(commands.Cog):
                 try:
                     channel = self.bot.get_channel(channel_id)
                     if channel and message_id:
-                        message = await channel.fetch_message(message_id)
+                        message = await get_entity_resolver().get_message(self.bot, channel, message_id)
+                        if message is None:
+                            continue
                         embed = message.embeds[0]
                         embed.title = "🔒 Portal Closed"
                         embed.color = discord.Color.dark_gray()
                         embed.description = embed.description.replace("Portal Opened!", "Portal Closed!")
                         await message.edit(embed=embed)
+                        get_entity_resolver().forget_message(message_id)
                 except Exception as e:
                     self.logger.error(f"Error updating portal message: {e}")
 
@@ -6,6 +6,7 @@ from typing import Dict, List
 import asyncio
 
 from Dao.CrossServerPortalDao import CrossServerPortalDao
+from Services.EntityResolver import get_entity_resolver
 from logger import AppLogger
 
 
@@ -59,7 +60,10 @@ class PortalMessageListener(commands.Cog):
                     if not channel or not message_id:
                         continue
 
-                    message = await channel.fetch_message(message_id)
+                    message = await get_entity_resolver().get_message(self.bot, channel, message_id)
+                    if message is None:
+                        self.logger.warning(f"Portal message not found: {message_id}")
+                        continue
                     embed = message.embeds[0]
 
                     # Get the appropriate message list for this guild
@@ -88,9 +92,10 @@ class PortalMessageListener(commands.Cog):
 
                     embed.set_field_at(0, name="📝 Messages", value=messages_text, inline=False)
 
-                    await message.edit(embed=embed)
+                    get_entity_resolver().remember_message(await message.edit(embed=embed))
 
                 except discord.NotFound:
+                    get_entity_resolver().forget_message(message_id)
                     self.logger.warning(f"Portal message not found: {message_id}")
                 except Exception as e:
                     self.logger.error(f"Error updating portal message: {e}")
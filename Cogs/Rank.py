@@ -11,6 +11,7 @@ from Entities.GuildUser import GuildUser
 from Entities.User import User
 from logger import AppLogger
 from Leveling import LevelingSystem
+from utils.level_curve import get_default_level_curve, level_curve_for_config
 
 logger = AppLogger(__name__).get_logger()
 
@@ -67,9 +68,11 @@ class Rank(commands.Cog):
                     current_global_user.global_exp = session["global_exp"]
 
             if user_rank is not None and current_guild_user is not None:
+                config = await self.leveling_system.get_leveling_config(interaction.guild.id)
+
                 # Create the rank card image
                 img_path = self.create_rank_card(target_user, current_guild_user, current_global_user, user_rank[-1],
-                                                 interaction.guild)
+                                                 interaction.guild, level_curve_for_config(config))
                 await interaction.response.send_message(file=discord.File(img_path))
 
                 # Clean up the image file
@@ -94,8 +97,10 @@ class Rank(commands.Cog):
             logger.error(f"Error in /rank command for {target_user.name} in {interaction.guild.name}: {e}")
             await interaction.response.send_message("An error occurred while generating the rank card.", ephemeral=True)
 
-    def create_rank_card(self, user, current_guild_user, current_global_user, rank, guild):
+    def create_rank_card(self, user, current_guild_user, current_global_user, rank, guild, level_curve=None):
         try:
+            level_curve = level_curve or get_default_level_curve()
+
             # Create RankCards directory if it doesn't exist
             rank_cards_dir = "RankCards"
             if not os.path.exists(rank_cards_dir):
@@ -202,7 +207,7 @@ class Rank(commands.Cog):
             d.text((text_start_x, 20), guild_text, font=font_guild, fill=(150, 150, 150))
 
             # Global level in top right corner (small and subtle)
-            global_level = current_global_user.global_level if current_global_user else 0
+            global_level = get_default_level_curve().level_for_exp(current_global_user.global_exp) if current_global_user else 0
             global_text = f"Global Lvl {global_level}"
             global_bbox = d.textbbox((0, 0), global_text, font=font_global)
             global_width = global_bbox[2] - global_bbox[0]
@@ -215,14 +220,16 @@ class Rank(commands.Cog):
             username_text = f"{display_name}"
             d.text((text_start_x, 50), username_text, font=font_username, fill=(255, 255, 255))
 
+            # Use guild exp for XP display (updated from season_exp)
+            current_exp = current_guild_user.exp
+            level = level_curve.level_for_exp(current_exp)
+
             # Rank and Level on same line (original style)
             rank_text = f"RANK  #{rank}"
-            level_text = f"LVL  {current_guild_user.level}"
+            level_text = f"LVL  {level}"
 
-            # Use guild exp for XP display (updated from season_exp)
-            current_exp = current_guild_user.exp
-            current_level_exp = self.leveling_system.calculate_exp_for_level(current_guild_user.level)
-            next_level_exp = self.leveling_system.calculate_exp_for_level(current_guild_user.level + 1)
+            current_level_exp = level_curve.exp_for_level(level)
+            next_level_exp = level_curve.exp_for_level(level + 1)
             exp_progress = current_exp - current_level_exp
             exp_needed = next_level_exp - current_level_exp
 
@@ -4,6 +4,7 @@ from discord import app_commands
 from datetime import datetime, timedelta, timezone
 from Dao.ReminderDao import ReminderDao
 from Entities.Reminder import Reminder
+from Services.ReminderScheduler import get_reminder_scheduler
 from logger import AppLogger
 import re
 
@@ -79,6 +80,9 @@ class ReminderCommand(commands.Cog):
         success = self.reminder_dao.add_reminder(reminder)
 
         if success:
+            # Hand it to the scheduler so it fires on time without waiting for a refresh
+            await get_reminder_scheduler().reminder_created(reminder)
+
             # Calculate time difference for display
             time_diff = remind_at - datetime.now(timezone.utc)
             time_str = self.format_timedelta(time_diff)
@@ -147,6 +151,7 @@ class ReminderCommand(commands.Cog):
         success = self.reminder_dao.delete_reminder(reminder_id, interaction.user.id)
 
         if success:
+            await get_reminder_scheduler().reminder_cancelled(reminder_id)
             await interaction.response.send_message(
                 f"✅ Reminder #{reminder_id} has been cancelled.",
                 ephemeral=True
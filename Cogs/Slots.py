@@ -11,6 +11,7 @@ from Dao.GamesDao import GamesDao
 from Dao.GuildUserDao import GuildUserDao
 from Dao.UserDao import UserDao
 from Dao.GuildDao import GuildDao
+from Services.CurrencyLedger import get_currency_ledger
 from Services.SessionManager import get_session_manager
 from logger import AppLogger
 from Dao.SlotsDao import SlotsDao
@@ -535,41 +536,33 @@ class Slots(commands.Cog):
                 # End bonus - pay out ALL winnings
                 summary = self.end_bonus_round(user, guild_user_dao)
 
-                # Try to update currency in session
-                session_updated = await session_manager.update_currency(
-                    guild_id=interaction.guild.id,
-                    user_id=interaction.user.id,
-                    amount=summary['total_won']
+                transfer = await get_currency_ledger().transfer(
+                    interaction.guild.id,
+                    {interaction.user.id: summary['total_won']},
+                    idempotency_key=f"slots:bonus:{interaction.id}",
+                    require_funds=False
                 )
-
-                if not session_updated:
-                    # Fallback to immediate DB write
-                    guild_user_dao.update_currency_with_global_sync(
-                        user.user_id, user.guild_id, summary['total_won']
-                    )
+                if not transfer.success:
+                    logger.error(f"Slots bonus payout of {summary['total_won']} to {interaction.user.id} failed: {transfer.error}")
         else:
             # REGULAR SPIN: Update currency in session
             net = amount_won - amount_lost
 
-            # Try to update currency in session
-            session_updated = await session_manager.update_currency(
-                guild_id=interaction.guild.id,
-                user_id=interaction.user.id,
-                amount=net
-            )
-
-            if not session_updated:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(interaction.user.id, interaction.guild.id, net)
-
-            # Add vault currency (10% of loss) - try cache first
+            # Settle the spin and add 10% of the loss to the vault in one ledger transfer
             vault_gain = int(amount_lost * 0.1)
-            vault_cached = await session_manager.add_vault_currency(interaction.guild_id, vault_gain)
-            if not vault_cached:
-                # Fallback to immediate DB write
-                guild_dao_vault = GuildDao()
-                guild_dao_vault.add_vault_currency(interaction.guild_id, vault_gain)
-                guild_dao_vault.close()
+            transfer = await get_currency_ledger().transfer(
+                interaction.guild.id,
+                {interaction.user.id: net},
+                vault_delta=vault_gain,
+                idempotency_key=f"slots:{interaction.id}"
+            )
+            if transfer.error == "insufficient_funds":
+                # Balance changed since the check above (e.g. a concurrent game)
+                await interaction.response.send_message("You don't have enough credits!", ephemeral=True)
+                return
+            if not transfer.success:
+                await interaction.response.send_message("An error occurred while updating your balance.", ephemeral=True)
+                return
 
             # Check if scatter triggered bonus
             if scatter_free_spins > 0:
@@ -37,6 +37,7 @@ __all__ = [
     "On_Reaction",
     "On_Member_Join",
     "On_Raw_Member_Remove",
+    "On_Presence_Update",
     "On_Guild_Join",
     "AIControls",
     "PortalCommands",
@@ -62,3 +63,13 @@ __all__ = [
     # "Admin_Stats",
     # "DeleteAiThread",
 ]
+
+# Cogs with heavy imports (image rendering, AI clients, scrapers, media tools).
+# With DEFER_HEAVY_COGS on (the default) these load after READY instead of
+# before the gateway connects; their commands are synced once they're loaded.
+DEFERRED_COGS = {
+    "AIControls",
+    "Nasa",
+    "Rank",
+    "RipAudio",
+}
@@ -56,7 +56,7 @@ class AIImageDao(BaseDao):
             )
 
             # Get connection for INSERT
-            connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+            connection = self.db._get_pooled_connection()
             if not connection:
                 logger.error("Failed to get database connection")
                 return None
@@ -2,7 +2,7 @@
 """Data Access Object for AIUsage entity"""
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from Dao.BaseDao import BaseDao
+from Dao.BaseDao import BaseDao, read_intent
 from Entities.AIUsage import AIUsage
 from logger import AppLogger
 
@@ -145,6 +145,7 @@ class AIUsageDao(BaseDao):
                 return result[0] or 0
         return 0
 
+    @read_intent()
     def get_usage_stats(
         self,
         guild_id: str,
@@ -7,7 +7,7 @@ Handles logging and retrieval of administrative actions
 import json
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from Dao.BaseDao import BaseDao
+from Dao.BaseDao import BaseDao, read_intent
 from Entities.AuditLog import AuditLog
 from logger import AppLogger
 from database import Database
@@ -350,6 +350,7 @@ class AuditLogDao(BaseDao[AuditLog]):
             logger.error(f"Error deleting old logs: {e}")
             return 0
 
+    @read_intent()
     def search_logs(
         self,
         search_term: str,
@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional, TypeVar, Generic, Type, Union, Tuple
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Generic, Type, Union, Tuple
+from contextvars import ContextVar
 from database import Database, get_database
 from Entities.BaseEntity import BaseEntity
 from dotenv import load_dotenv
+import functools
 import os
 import logging
 from mysql.connector import Error as MySQLError, OperationalError, InterfaceError
@@ -9,6 +11,38 @@ from mysql.connector import Error as MySQLError, OperationalError, InterfaceErro
 # Type variable for entity classes
 T = TypeVar('T', bound=BaseEntity)
 
+# Set while a @read_intent method runs; holds the replica lag it tolerates (None = default)
+_NO_READ_INTENT = object()
+_read_intent: ContextVar = ContextVar('read_intent', default=_NO_READ_INTENT)
+
+# DAOs are constructed per operation; .env is read and each CREATE TABLE
+# statement run once per process rather than on every construction
+_env_loaded = False
+_created_tables = set()
+
+
+def read_intent(max_lag_seconds: Optional[float] = None):
+    """
+    Mark a DAO method as read-only analytics: its SELECTs go to the read
+    replica pool when one is configured and healthy, otherwise the primary.
+
+    Only use it for queries that tolerate slightly stale data (leaderboards,
+    totals, reports), never for reads that must see the caller's own writes.
+
+    Args:
+        max_lag_seconds: Replica lag tolerated (defaults to DB_REPLICA_MAX_LAG)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _read_intent.set(max_lag_seconds)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _read_intent.reset(token)
+        return wrapper
+    return decorator
+
 
 class BaseDao(Generic[T]):
     """
@@ -27,7 +61,11 @@ class BaseDao(Generic[T]):
         """
         self.entity_class = entity_class
         self.table_name = table_name
-        load_dotenv()
+
+        global _env_loaded
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
 
         # Load database configuration
         self.db_host = os.getenv('db_host')
@@ -60,7 +98,8 @@ class BaseDao(Generic[T]):
 
     from mysql.connector.errors import OperationalError, InterfaceError
 
-    def execute_query(self, query: str, params: Optional[tuple] = None, commit: bool = False, return_description: bool = False) -> Union[
+    def execute_query(self, query: str, params: Optional[tuple] = None, commit: bool = False, return_description: bool = False,
+                      replica: bool = False, max_lag_seconds: Optional[float] = None) -> Union[
         Optional[List[tuple]], bool, Tuple[Optional[List[tuple]], Optional[List]]]:
         """
         Execute a SQL query with error handling and connection recovery.
@@ -73,6 +112,8 @@ class BaseDao(Generic[T]):
             params (Optional[tuple], optional): Query parameters. Defaults to None.
             commit (bool, optional): Whether to commit the transaction. Defaults to False.
             return_description (bool, optional): Whether to return cursor description with results. Defaults to False.
+            replica (bool, optional): Read from the replica pool if healthy (also implied inside @read_intent). Defaults to False.
+            max_lag_seconds (Optional[float], optional): Replica lag tolerated for this read. Defaults to DB_REPLICA_MAX_LAG.
 
         Returns:
             Union[Optional[List[tuple]], bool]: Query results for SELECT queries, True for successful commits, None/False on error
@@ -82,10 +123,16 @@ class BaseDao(Generic[T]):
         connection = None
         cursor = None
 
+        # Route by intent: writes always go to the primary
+        intent = _read_intent.get()
+        read_only = not commit and (replica or intent is not _NO_READ_INTENT)
+        if read_only and not replica:
+            max_lag_seconds = intent
+
         for attempt in range(max_retries + 1):
             try:
                 # Acquire connection from pool for this query
-                connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+                connection = self.db._get_pooled_connection(read_only=read_only, max_lag_seconds=max_lag_seconds)
                 if not connection:
                     raise MySQLError("Failed to get connection from pool")
 
@@ -113,6 +160,10 @@ class BaseDao(Generic[T]):
                 self.logger.error(f"Query: {query}")
                 self.logger.error(f"Params: {params}")
 
+                # Lost connections are discarded instead of going back to the pool
+                if err.errno in (2006, 2013, 2014):
+                    self.db.mark_broken(connection)
+
                 # Check if it's a connection error that we can retry
                 if err.errno in (2006, 2013, 2014) and attempt < max_retries:  # Connection lost errors
                     self.logger.info(f"Connection error detected, retrying... (attempt {attempt + 1})")
@@ -164,6 +215,58 @@ class BaseDao(Generic[T]):
         if not params_list:
             return True
 
+        return self._execute_batch(query, params_list, commit, many=True,
+                                   operation="executemany", logged_query=query, row_count=len(params_list))
+
+    def execute_multi_row_insert(self, insert_clause: str, rows: List[tuple], suffix: str = "", commit: bool = True) -> bool:
+        """
+        Insert many rows with a single multi-row VALUES statement.
+
+        Builds `<insert_clause> VALUES (...), (...), ... <suffix>` and executes it
+        in one round trip. Callers are responsible for keeping each batch under
+        the server's max_allowed_packet (a few thousand rows is safe).
+
+        Args:
+            insert_clause (str): Statement up to (not including) VALUES, e.g. "INSERT INTO t (a, b)"
+            rows (List[tuple]): Row tuples, all the same width
+            suffix (str, optional): Trailing clause such as ON DUPLICATE KEY UPDATE ...
+            commit (bool, optional): Whether to commit the transaction. Defaults to True.
+
+        Returns:
+            bool: True if successful, False on error
+        """
+        if not rows:
+            return True
+
+        row_placeholder = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+        query = f"{insert_clause} VALUES {', '.join([row_placeholder] * len(rows))} {suffix}"
+        params = tuple(value for row in rows for value in row)
+
+        return self._execute_batch(query, params, commit, many=False,
+                                   operation="multi-row insert", logged_query=f"{insert_clause} ... {suffix}",
+                                   row_count=len(rows))
+
+    def _execute_batch(self, query: str, params, commit: bool, many: bool,
+                       operation: str, logged_query: str, row_count: int) -> bool:
+        """
+        Run one bulk write statement with per-query connection acquisition.
+
+        Shared by execute_many (cursor.executemany over params) and
+        execute_multi_row_insert (one cursor.execute with flattened params):
+        lost connections are discarded and retried, other errors roll back.
+
+        Args:
+            query (str): SQL statement
+            params: Parameter tuples (many=True) or one flat parameter tuple
+            commit (bool): Whether to commit the transaction
+            many (bool): Use cursor.executemany instead of cursor.execute
+            operation (str): Operation name for error logs
+            logged_query (str): Query text for error logs
+            row_count (int): Number of rows, for error logs
+
+        Returns:
+            bool: True if successful, False on error
+        """
         max_retries = 2
         connection = None
         cursor = None
@@ -171,26 +274,28 @@ class BaseDao(Generic[T]):
         for attempt in range(max_retries + 1):
             try:
                 # Acquire connection from pool for this query
-                connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+                connection = self.db._get_pooled_connection()
                 if not connection:
                     raise MySQLError("Failed to get connection from pool")
 
-                # Create cursor
                 cursor = connection.cursor()
-
-                # Execute many with all parameter sets
-                cursor.executemany(query, params_list)
+                if many:
+                    cursor.executemany(query, params)
+                else:
+                    cursor.execute(query, params)
 
                 if commit:
                     connection.commit()
-                    return True
-                else:
-                    return True
+                return True
 
             except MySQLError as err:
-                self.logger.error(f"Database error in executemany (attempt {attempt + 1}): {err}")
-                self.logger.error(f"Query: {query}")
-                self.logger.error(f"Number of parameter sets: {len(params_list)}")
+                self.logger.error(f"Database error in {operation} (attempt {attempt + 1}): {err}")
+                self.logger.error(f"Query: {logged_query}")
+                self.logger.error(f"Number of rows: {row_count}")
+
+                # Lost connections are discarded instead of going back to the pool
+                if err.errno in (2006, 2013, 2014):
+                    self.db.mark_broken(connection)
 
                 # Check if it's a connection error that we can retry
                 if err.errno in (2006, 2013, 2014) and attempt < max_retries:  # Connection lost errors
@@ -247,27 +352,35 @@ class BaseDao(Generic[T]):
         Returns:
             bool: True if successful, False otherwise
         """
+        if create_table_sql in _created_tables:
+            return True
+
         try:
             result = self.execute_query(create_table_sql, commit=True)
+            if result == True:
+                _created_tables.add(create_table_sql)
             return result == True
         except Exception as e:
             self.logger.error(f"Failed to create table: {e}")
             return False
 
-    def execute_read(self, query: str, params: Optional[tuple] = None) -> Optional[List[tuple]]:
+    def execute_read(self, query: str, params: Optional[tuple] = None, replica: bool = False,
+                     max_lag_seconds: Optional[float] = None) -> Optional[List[tuple]]:
         """
         Execute a SELECT query (convenience method for read operations).
 
         Args:
             query (str): SQL SELECT query with placeholders
             params (Optional[tuple], optional): Query parameters. Defaults to None.
+            replica (bool, optional): Read from the replica pool if healthy. Defaults to False.
+            max_lag_seconds (Optional[float], optional): Replica lag tolerated. Defaults to DB_REPLICA_MAX_LAG.
 
         Returns:
             Optional[List[tuple]]: Query results, or None on error
         """
-        return self.execute_query(query, params, commit=False)
+        return self.execute_query(query, params, commit=False, replica=replica, max_lag_seconds=max_lag_seconds)
 
-    def execute_write(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
+    def execute_write(self, query: str, params: Optional[tuple] = None, return_rowcount: bool = False) -> Optional[int]:
         """
         Execute an INSERT, UPDATE, or DELETE query (convenience method for write operations).
         For INSERT queries, returns the last insert ID.
@@ -276,9 +389,11 @@ class BaseDao(Generic[T]):
         Args:
             query (str): SQL INSERT/UPDATE/DELETE query with placeholders
             params (Optional[tuple], optional): Query parameters. Defaults to None.
+            return_rowcount (bool, optional): Return the number of affected rows instead. Defaults to False.
 
         Returns:
-            Optional[int]: Last insert ID for INSERT queries, True for UPDATE/DELETE, None on error
+            Optional[int]: Last insert ID for INSERT queries, True for UPDATE/DELETE,
+            affected rows if return_rowcount is set, None on error
         """
         max_retries = 2
         connection = None
@@ -288,7 +403,7 @@ class BaseDao(Generic[T]):
         for attempt in range(max_retries + 1):
             try:
                 # Acquire connection from pool for this query
-                connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+                connection = self.db._get_pooled_connection()
                 if not connection:
                     raise MySQLError("Failed to get connection from pool")
 
@@ -304,6 +419,9 @@ class BaseDao(Generic[T]):
                 # Commit
                 connection.commit()
 
+                if return_rowcount:
+                    return cursor.rowcount
+
                 # For INSERT, get lastrowid from cursor (connection-specific)
                 if is_insert:
                     last_id = cursor.lastrowid
@@ -316,6 +434,10 @@ class BaseDao(Generic[T]):
                 self.logger.error(f"Query: {query}")
                 self.logger.error(f"Params: {params}")
 
+                # Lost connections are discarded instead of going back to the pool
+                if err.errno in (2006, 2013, 2014):
+                    self.db.mark_broken(connection)
+
                 # Check if it's a connection error that we can retry
                 if err.errno in (2006, 2013, 2014) and attempt < max_retries:
                     self.logger.info(f"Connection error detected, retrying... (attempt {attempt + 1})")
@@ -371,6 +493,18 @@ class BaseDao(Generic[T]):
             self.logger.error(f"Error finding entity by ID: {e}")
             return None
 
+    def _row_hydrator(self, columns: List[str]) -> Callable[[tuple], T]:
+        """
+        Get a row -> entity function for a result shape.
+
+        Uses the entity's cached from_row hydrator unless the entity customises
+        from_dict, in which case rows go through from_dict as before.
+        """
+        entity_class = self.entity_class
+        if not issubclass(entity_class, BaseEntity) or entity_class.from_dict.__func__ is not BaseEntity.from_dict.__func__:
+            return lambda row: entity_class.from_dict(dict(zip(columns, row)))
+        return entity_class.row_hydrator(columns)
+
     def find_all(self) -> List[T]:
         """
         Find all entities in the table.
@@ -382,14 +516,11 @@ class BaseDao(Generic[T]):
             query = f"SELECT * FROM {self.table_name}"
             results, description = self.execute_query(query, return_description=True)
 
-            entities = []
             if results and description:
-                columns = [column[0] for column in description]
-                for row in results:
-                    entity_dict = dict(zip(columns, row))
-                    entities.append(self.entity_class.from_dict(entity_dict))
+                hydrate = self._row_hydrator([column[0] for column in description])
+                return [hydrate(row) for row in results]
 
-            return entities
+            return []
 
         except Exception as e:
             self.logger.error(f"Error finding all entities: {e}")
@@ -1,7 +1,7 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from database import Database
-from Dao.BaseDao import BaseDao
+from Dao.BaseDao import BaseDao, read_intent
 import json
 
 
@@ -347,6 +347,7 @@ class GamesDao(BaseDao):
             self.logger.error(f"Error getting {game_type} stats: {e}")
             return {}
 
+    @read_intent()
     def get_leaderboard(self, guild_id: Optional[int] = None,
                         game_type: Optional[str] = None,
                         stat_type: str = 'net_profit',
@@ -2,7 +2,7 @@ from typing import Optional, List, Dict, Any, Tuple, Union
 
 from Entities.GuildUser import GuildUser
 from database import Database
-from Dao.BaseDao import BaseDao
+from Dao.BaseDao import BaseDao, read_intent
 from Entities.Guild import Guild
 from datetime import datetime
 import json
@@ -206,6 +206,38 @@ class GuildDao(BaseDao[Guild]):
             self.logger.error(f"Error getting guild settings for guild {guild_id}: {e}")
             return None
 
+    def get_guild_settings_bulk(self, guild_ids: List[int], chunk_size: int = 1000) -> Optional[Dict[int, Optional[Dict[str, Any]]]]:
+        """
+        Get the settings JSON of many guilds, a chunk of guilds per query.
+
+        Args:
+            guild_ids (List[int]): Guild IDs
+            chunk_size (int, optional): Guild IDs per query. Defaults to 1000.
+
+        Returns:
+            Optional[Dict[int, Optional[Dict[str, Any]]]]: Settings (or None)
+            for each guild found in the database, or None if a query failed
+        """
+        settings = {}
+
+        for start in range(0, len(guild_ids), chunk_size):
+            chunk = tuple(guild_ids[start:start + chunk_size])
+            placeholders = ", ".join(["%s"] * len(chunk))
+            sql = f"SELECT id, settings FROM Guilds WHERE id IN ({placeholders})"
+
+            try:
+                rows = self.execute_query(sql, chunk)
+                if rows is None:
+                    # execute_query reports DB errors as None; an empty list means no rows
+                    return None
+                for guild_id, settings_json in rows:
+                    settings[guild_id] = json.loads(settings_json) if settings_json else None
+            except Exception as e:
+                self.logger.error(f"Error getting guild settings for {len(chunk)} guilds: {e}")
+                return None
+
+        return settings
+
     def update_guild_settings(self, guild_id: int, settings: Dict[str, Any]) -> bool:
         """
         Update the complete settings JSON for a guild.
@@ -383,18 +415,20 @@ class GuildDao(BaseDao[Guild]):
 
     def add_vault_currency(self, guild_id: int, amount: int) -> bool:
         """
-        Add currency to the guild's vault.
+        Add currency to the guild's vault in a single atomic UPDATE.
 
         Args:
             guild_id (int): Guild ID
-            amount (int): Amount to add
+            amount (int): Amount to add (negative to take from the vault)
 
         Returns:
             bool: True if successful, False otherwise
         """
+        sql = 'UPDATE Guilds SET vault_currency = vault_currency + %s WHERE id = %s'
+
         try:
-            current = self.get_vault_currency(guild_id)
-            return self.update_vault_currency(guild_id, current + amount)
+            # execute_query reports DB errors as False instead of raising
+            return self.execute_query(sql, (amount, guild_id), commit=True) is True
         except Exception as e:
             self.logger.error(f"Error adding currency to vault for guild {guild_id}: {e}")
             return False
@@ -439,6 +473,7 @@ class GuildDao(BaseDao[Guild]):
             self.logger.error(f"Error getting active member count: {e}")
             return 0
 
+    @read_intent()
     def get_total_messages_in_guild(self, guild_id: int) -> int:
         """
         Get total messages sent in a guild.
@@ -458,6 +493,7 @@ class GuildDao(BaseDao[Guild]):
             self.logger.error(f"Error getting total messages in guild: {e}")
             return 0
 
+    @read_intent()
     def get_total_exp_in_guild(self, guild_id: int) -> int:
         """
         Get total experience distributed in a guild.
@@ -648,6 +684,7 @@ class GuildDao(BaseDao[Guild]):
             self.logger.error(f"Error getting user rank in guild: {e}")
             return None
 
+    @read_intent()
     def get_guild_level_distribution(self, guild_id: int) -> List[Dict]:
         """
         Get level distribution for a guild (useful for charts).
@@ -702,6 +739,7 @@ class GuildDao(BaseDao[Guild]):
             self.logger.error(f"Error getting guild level distribution: {e}")
             return []
 
+    @read_intent()
     def get_recent_activity_in_guild(self, guild_id: int, days: int = 7) -> List[Dict]:
         """
         Get recent activity statistics for a guild.
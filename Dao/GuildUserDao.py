@@ -15,6 +15,15 @@ class GuildUserDao(BaseDao[GuildUser]):
     Provides methods to interact with the GuildUsers table in the database.
     """
 
+    # Full GuildUsers column order, used for row tuples in bulk reads and upserts
+    GUILD_USER_ROW_COLUMNS = (
+        'user_id', 'guild_id', 'name', 'nickname', 'level',
+        'streak', 'highest_streak', 'exp', 'exp_gained', 'exp_lost', 'currency',
+        'slots_free_spins_remaining', 'slots_locked_bet_amount', 'slots_bonus_total_won',
+        'messages_sent', 'reactions_sent', 'joined_at', 'last_active',
+        'daily', 'last_daily', 'is_active'
+    )
+
     def __init__(self, db: Optional[Database] = None):
         """
         Initialize the GuildUserDao with connection parameters.
@@ -120,6 +129,40 @@ class GuildUserDao(BaseDao[GuildUser]):
             self.logger.error(f"Error adding guild user: {e}")
             return False
 
+    def update_daily_claim(self, guild_user: GuildUser) -> bool:
+        """
+        Save a daily reward claim: daily, last_daily and the streak columns.
+
+        Leaves currency, XP and counters alone; the ledger and session
+        flushes own those, and a full-row write would overwrite them with
+        the values read before the claim.
+
+        Args:
+            guild_user (GuildUser): Guild user with the updated claim fields
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        sql = """
+            UPDATE GuildUsers
+            SET daily = %s, last_daily = %s, streak = %s, highest_streak = %s
+            WHERE user_id = %s AND guild_id = %s
+        """
+        values = (
+            guild_user.daily,
+            guild_user.last_daily,
+            guild_user.streak,
+            guild_user.highest_streak,
+            guild_user.user_id,
+            guild_user.guild_id,
+        )
+
+        try:
+            return self.execute_query(sql, values, commit=True) is True
+        except Exception as e:
+            self.logger.error(f"Error saving daily claim for user {guild_user.user_id} in guild {guild_user.guild_id}: {e}")
+            return False
+
     def update_guild_user(self, updated_guild_user: GuildUser) -> bool:
         """
         Update an existing guild user in the database.
@@ -209,6 +252,44 @@ class GuildUserDao(BaseDao[GuildUser]):
             self.logger.error(f"Error resetting streak: {e}")
             return False
 
+    def reset_daily_for_guilds(self, guild_ids: List[int], chunk_size: int = 1000) -> Tuple[int, int]:
+        """
+        Run the midnight daily reset for many guilds with set-based updates.
+
+        Clears the daily flag and resets the streak of everyone whose last
+        daily claim is older than yesterday (UTC), a chunk of guilds per
+        statement instead of one lookup per member.
+
+        Args:
+            guild_ids (List[int]): Guilds to reset
+            chunk_size (int, optional): Guild IDs per statement. Defaults to 1000.
+
+        Returns:
+            Tuple[int, int]: (daily flags cleared, streaks reset)
+        """
+        daily_resets = 0
+        streak_resets = 0
+
+        for start in range(0, len(guild_ids), chunk_size):
+            chunk = tuple(guild_ids[start:start + chunk_size])
+            placeholders = ", ".join(["%s"] * len(chunk))
+
+            streak_sql = f'''
+                UPDATE GuildUsers SET streak = 0
+                WHERE guild_id IN ({placeholders})
+                  AND streak > 0
+                  AND last_daily < UTC_DATE() - INTERVAL 1 DAY
+            '''
+            daily_sql = f'UPDATE GuildUsers SET daily = 0 WHERE guild_id IN ({placeholders}) AND daily <> 0'
+
+            try:
+                streak_resets += self.execute_write(streak_sql, chunk, return_rowcount=True) or 0
+                daily_resets += self.execute_write(daily_sql, chunk, return_rowcount=True) or 0
+            except Exception as e:
+                self.logger.error(f"Error resetting daily status for {len(chunk)} guilds: {e}")
+
+        return daily_resets, streak_resets
+
     def get_guild_user(self, user_id: int, guild_id: int) -> Optional[GuildUser]:
         """
         Get a guild user by their user ID and guild ID.
@@ -361,34 +442,10 @@ class GuildUserDao(BaseDao[GuildUser]):
         try:
             results = self.execute_query(sql, (guild_id,))
 
-            guild_users = []
-            if results:
-                for user_data in results:
-                    guild_users.append(GuildUser(
-                        user_id=user_data[0],
-                        guild_id=user_data[1],
-                        name=user_data[2],
-                        nickname=user_data[3],
-                        level=user_data[4],
-                        streak=user_data[5],
-                        highest_streak=user_data[6],
-                        exp=user_data[7],
-                        exp_gained=user_data[8],
-                        exp_lost=user_data[9],
-                        currency=user_data[10],
-                        slots_free_spins_remaining=user_data[11],
-                        slots_locked_bet_amount=user_data[12],
-                        slots_bonus_total_won=user_data[13],
-                        messages_sent=user_data[14],
-                        reactions_sent=user_data[15],
-                        joined_at=user_data[16],
-                        last_active=user_data[17],
-                        daily=user_data[18],
-                        last_daily=user_data[19],
-                        is_active=bool(user_data[20])
-                    ))
-
-            return guild_users
+            if not results:
+                return []
+            hydrate = GuildUser.row_hydrator(self.GUILD_USER_ROW_COLUMNS)
+            return [hydrate(row) for row in results]
 
         except Exception as e:
             self.logger.error(f"Error getting guild users: {e}")
@@ -420,34 +477,10 @@ class GuildUserDao(BaseDao[GuildUser]):
         try:
             results = self.execute_query(sql, (user_id,))
 
-            guild_users = []
-            if results:
-                for user_data in results:
-                    guild_users.append(GuildUser(
-                        user_id=user_data[0],
-                        guild_id=user_data[1],
-                        name=user_data[2],
-                        nickname=user_data[3],
-                        level=user_data[4],
-                        streak=user_data[5],
-                        highest_streak=user_data[6],
-                        exp=user_data[7],
-                        exp_gained=user_data[8],
-                        exp_lost=user_data[9],
-                        currency=user_data[10],
-                        slots_free_spins_remaining=user_data[11],
-                        slots_locked_bet_amount=user_data[12],
-                        slots_bonus_total_won=user_data[13],
-                        messages_sent=user_data[14],
-                        reactions_sent=user_data[15],
-                        joined_at=user_data[16],
-                        last_active=user_data[17],
-                        daily=user_data[18],
-                        last_daily=user_data[19],
-                        is_active=bool(user_data[20])
-                    ))
-
-            return guild_users
+            if not results:
+                return []
+            hydrate = GuildUser.row_hydrator(self.GUILD_USER_ROW_COLUMNS)
+            return [hydrate(row) for row in results]
 
         except Exception as e:
             self.logger.error(f"Error getting user guilds: {e}")
@@ -736,6 +769,36 @@ class GuildUserDao(BaseDao[GuildUser]):
             self.logger.error(f"Error bulk upserting guild users: {e}")
             return False
 
+    def bulk_upsert_guild_user_rows(self, rows: List[tuple]) -> bool:
+        """
+        Upsert pre-built guild user rows with a single multi-row INSERT.
+
+        Same semantics as bulk_upsert_guild_users, but takes plain tuples in
+        GUILD_USER_ROW_COLUMNS order so large imports don't need GuildUser
+        objects. Keep batches to a few thousand rows.
+
+        Args:
+            rows (List[tuple]): Row tuples in GUILD_USER_ROW_COLUMNS order
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not rows:
+            return True
+
+        success = self.execute_multi_row_insert(
+            f"INSERT INTO GuildUsers ({', '.join(self.GUILD_USER_ROW_COLUMNS)})",
+            rows,
+            """ON DUPLICATE KEY UPDATE
+                name = VALUES(name),
+                nickname = VALUES(nickname),
+                is_active = VALUES(is_active),
+                last_active = VALUES(last_active)"""
+        )
+        if not success:
+            self.logger.error(f"Error bulk upserting {len(rows)} guild user rows")
+        return success
+
     def update_currency_with_global_sync(self, user_id: int, guild_id: int, currency_delta: int) -> bool:
         """
         Update guild user currency and synchronize with global user stats.
@@ -753,7 +816,7 @@ class GuildUserDao(BaseDao[GuildUser]):
         cursor = None
         try:
             # Get a dedicated connection for the transaction
-            connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+            connection = self.db._get_pooled_connection()
             if not connection:
                 self.logger.error(f"Could not get a connection to update currency for user {user_id}")
                 return False
@@ -799,6 +862,69 @@ class GuildUserDao(BaseDao[GuildUser]):
             if connection:
                 connection.close()
 
+    def apply_currency_deltas(self, member_deltas: Dict[Tuple[int, int], int],
+                              vault_deltas: Optional[Dict[int, int]] = None) -> bool:
+        """
+        Apply a batch of currency changes in a single transaction.
+
+        Updates guild wallets, the matching global totals and guild vaults;
+        either every change is written or none is.
+
+        Args:
+            member_deltas (Dict[Tuple[int, int], int]): (guild_id, user_id) -> currency delta
+            vault_deltas (Optional[Dict[int, int]]): guild_id -> vault delta
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        global_deltas: Dict[int, int] = {}
+        for (guild_id, user_id), delta in member_deltas.items():
+            global_deltas[user_id] = global_deltas.get(user_id, 0) + delta
+
+        connection = None
+        cursor = None
+        try:
+            connection = self.db._get_pooled_connection()
+            if not connection:
+                self.logger.error("Could not get a connection to apply currency deltas")
+                return False
+
+            cursor = connection.cursor()
+
+            if member_deltas:
+                cursor.executemany(
+                    "UPDATE GuildUsers SET currency = currency + %s WHERE user_id = %s AND guild_id = %s",
+                    [(delta, user_id, guild_id) for (guild_id, user_id), delta in member_deltas.items() if delta]
+                )
+                cursor.executemany(
+                    "UPDATE Users SET total_currency = total_currency + %s, last_seen = NOW() WHERE id = %s",
+                    [(delta, user_id) for user_id, delta in global_deltas.items() if delta]
+                )
+            if vault_deltas:
+                cursor.executemany(
+                    "UPDATE Guilds SET vault_currency = vault_currency + %s WHERE id = %s",
+                    [(delta, guild_id) for guild_id, delta in vault_deltas.items() if delta]
+                )
+
+            connection.commit()
+
+            self.logger.debug(f"Applied currency deltas for {len(member_deltas)} members and {len(vault_deltas or {})} vaults")
+            return True
+
+        except Exception as e:
+            if connection:
+                try:
+                    connection.rollback()
+                except Exception as rb_e:
+                    self.logger.error(f"Error rolling back transaction: {rb_e}")
+            self.logger.error(f"Error applying currency deltas: {e}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+
     def update_slots_bonus_state(self, user_id: int, guild_id: int,
                                  free_spins_remaining: int,
                                  locked_bet_amount: int = 0,
@@ -959,7 +1085,7 @@ class GuildUserDao(BaseDao[GuildUser]):
                 balance_after = balance_before + net_deposit
 
             # Start atomic transaction with dedicated connection
-            connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+            connection = self.db._get_pooled_connection()
             if not connection:
                 return {'success': False, 'message': 'Failed to get database connection'}
 
@@ -1091,7 +1217,7 @@ class GuildUserDao(BaseDao[GuildUser]):
                 balance_after = balance_before - total_needed
 
             # Start atomic transaction with dedicated connection
-            connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+            connection = self.db._get_pooled_connection()
             if not connection:
                 return {'success': False, 'message': 'Failed to get database connection'}
 
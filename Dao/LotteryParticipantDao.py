@@ -62,6 +62,72 @@ class LotteryParticipantDao(BaseDao[LotteryParticipant]):
             self.logger.error(f"Error adding lottery participant: {e}")
             return False
     
+    def try_add_participant(self, event_id: int, participant_id: int) -> bool:
+        """
+        Add a participant unless they have already entered the event.
+
+        Args:
+            event_id (int): Lottery event ID
+            participant_id (int): Participant ID
+
+        Returns:
+            bool: True if the participant was added, False if already entered or on error
+        """
+        sql = """
+            INSERT IGNORE INTO LotteryParticipants (event_id, participant_id)
+            VALUES (%s, %s)
+        """
+
+        inserted = self.execute_write(sql, (event_id, participant_id), return_rowcount=True)
+        return bool(inserted)
+
+    def add_participants(self, event_id: int, participant_ids: List[int]) -> bool:
+        """
+        Add many participants to an event with a single multi-row INSERT.
+
+        Participants already entered are skipped.
+
+        Args:
+            event_id (int): Lottery event ID
+            participant_ids (List[int]): Participant IDs to add
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not participant_ids:
+            return True
+
+        success = self.execute_multi_row_insert(
+            "INSERT IGNORE INTO LotteryParticipants (event_id, participant_id)",
+            [(event_id, participant_id) for participant_id in participant_ids]
+        )
+        if not success:
+            self.logger.error(f"Error adding {len(participant_ids)} lottery participants")
+        return success
+
+    def get_participant_ids(self, event_id: int) -> List[int]:
+        """
+        Get the IDs of all participants for a specific lottery event.
+
+        Args:
+            event_id (int): Lottery event ID
+
+        Returns:
+            List[int]: Participant IDs
+        """
+        sql = """
+            SELECT participant_id
+            FROM LotteryParticipants
+            WHERE event_id = %s
+        """
+
+        try:
+            results = self.execute_query(sql, (event_id,))
+            return [row[0] for row in results] if results else []
+        except Exception as e:
+            self.logger.error(f"Error getting participant IDs: {e}")
+            return []
+
     def get_participants(self, event_id: int) -> List[LotteryParticipant]:
         """
         Get all participants for a specific lottery event.
@@ -113,7 +113,11 @@ class ReminderDao(BaseDao[Reminder]):
         )
 
         try:
-            self.execute_query(sql, values, commit=True)
+            reminder_id = self.execute_write(sql, values)
+            if not reminder_id:
+                return False
+            # Expose the new ID so the reminder can be scheduled immediately
+            reminder.id = reminder_id
             return True
         except Exception as e:
             self.logger.error(f"Error adding reminder: {e}")
@@ -123,6 +127,18 @@ class ReminderDao(BaseDao[Reminder]):
         """
         Get all reminders that are due and not completed.
         """
+        return self.get_reminders_due_before(datetime.now(timezone.utc))
+
+    def get_reminders_due_before(self, until: datetime) -> List[Reminder]:
+        """
+        Get all incomplete reminders due at or before a point in time.
+
+        Args:
+            until (datetime): Upper bound for remind_at (naive values are treated as UTC)
+
+        Returns:
+            List[Reminder]: Reminders ordered by remind_at
+        """
         sql = """
               SELECT id, \
                      user_id, \
@@ -140,14 +156,13 @@ class ReminderDao(BaseDao[Reminder]):
               """
 
         try:
-            now_utc_naive = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            until_utc_naive = until.astimezone(timezone.utc).replace(tzinfo=None, microsecond=0) if until.tzinfo else until.replace(microsecond=0)
 
-            results = self.execute_query(sql, (now_utc_naive,))
+            results = self.execute_query(sql, (until_utc_naive,))
 
             reminders = []
             if results:
                 for row in results:
-                    self.logger.info(f"[get_due_reminders] Found due reminder: id={row[0]} remind_at={row[5]} user_id={row[1]}")
                     reminder = Reminder(
                         id=row[0],
                         user_id=row[1],
@@ -164,7 +179,7 @@ class ReminderDao(BaseDao[Reminder]):
             return reminders
 
         except Exception as e:
-            self.logger.error(f"[get_due_reminders] Error: {e}", exc_info=True)
+            self.logger.error(f"[get_reminders_due_before] Error: {e}", exc_info=True)
             return []
 
     def mark_completed(self, reminder_id: int) -> bool:
@@ -186,6 +201,29 @@ class ReminderDao(BaseDao[Reminder]):
             self.logger.error(f"Error marking reminder as completed: {e}")
             return False
 
+    def mark_completed_bulk(self, reminder_ids: List[int]) -> bool:
+        """
+        Mark several reminders as completed in a single UPDATE.
+
+        Args:
+            reminder_ids (List[int]): IDs of the reminders to mark as completed
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not reminder_ids:
+            return True
+
+        placeholders = ", ".join(["%s"] * len(reminder_ids))
+        sql = f"UPDATE Reminders SET completed = 1 WHERE id IN ({placeholders})"
+
+        try:
+            result = self.execute_query(sql, tuple(reminder_ids), commit=True)
+            return result == True
+        except Exception as e:
+            self.logger.error(f"Error marking reminders as completed: {e}")
+            return False
+
     def get_user_reminders(self, user_id: int, guild_id: int, include_completed: bool = False) -> List[Reminder]:
         """
         Get all reminders for a specific user in a guild.
@@ -1,7 +1,7 @@
 from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 from database import Database
-from Dao.BaseDao import BaseDao
+from Dao.BaseDao import BaseDao, read_intent
 from Entities.User import User
 from dotenv import load_dotenv
 import os
@@ -485,6 +485,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting top users by messages: {e}")
             return []
 
+    @read_intent()
     def get_total_messages(self) -> int:
         """
         Get the total number of messages sent by all users.
@@ -501,6 +502,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total messages: {e}")
             return 0
 
+    @read_intent()
     def get_total_reactions(self) -> int:
         """
         Get the total number of reactions sent by all users.
@@ -517,6 +519,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total reactions: {e}")
             return 0
 
+    @read_intent()
     def get_total_currency(self) -> int:
         """
         Get the total amount of currency held by all users.
@@ -533,6 +536,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total currency: {e}")
             return 0
 
+    @read_intent()
     def get_total_global_exp(self) -> int:
         """
         Get the total amount of global experience points earned by all users.
@@ -549,6 +553,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total global experience: {e}")
             return 0
 
+    @read_intent()
     def get_total_users(self) -> int:
         """
         Get the total number of users (excluding bots).
@@ -565,6 +570,7 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total users: {e}")
             return 0
 
+    @read_intent()
     def get_total_active_users(self, hours: int = 24) -> int:
         """
         Get the total number of active users in the last specified hours.
@@ -589,6 +595,44 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error getting total active users: {e}")
             return 0
 
+    @read_intent()
+    def get_global_totals(self, hours: int = 24) -> Optional[dict]:
+        """
+        Get all global stat totals in a single scan of Users.
+
+        Args:
+            hours (int, optional): Activity window for active users. Defaults to 24.
+
+        Returns:
+            dict: messages, reactions, currency, exp and active_users totals,
+            or None on error
+        """
+        sql = '''
+              SELECT COALESCE(SUM(total_messages), 0),
+                     COALESCE(SUM(total_reactions), 0),
+                     COALESCE(SUM(total_currency), 0),
+                     COALESCE(SUM(global_exp), 0),
+                     COALESCE(SUM(last_seen > DATE_SUB(NOW(), INTERVAL %s HOUR)), 0)
+              FROM Users
+              WHERE is_bot = FALSE \
+              '''
+
+        try:
+            result = self.execute_query(sql, (hours,))
+            if not result:
+                return None
+            messages, reactions, currency, exp, active_users = result[0]
+            return {
+                "messages": int(messages),
+                "reactions": int(reactions),
+                "currency": int(currency),
+                "exp": int(exp),
+                "active_users": int(active_users),
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting global totals: {e}")
+            return None
+
     def get_users_by_date_range(self, start_date: datetime, end_date: datetime) -> List[User]:
         """
         Get users who first joined within a date range.
@@ -849,6 +893,45 @@ class UserDao(BaseDao[User]):
             self.logger.error(f"Error bulk upserting users: {e}")
             return False
 
+    # Column order for bulk_upsert_user_rows tuples
+    USER_ROW_COLUMNS = (
+        'id', 'discord_username', 'global_name', 'avatar_url', 'is_bot',
+        'global_exp', 'global_level', 'total_currency', 'bank_balance',
+        'daily_transfer_amount', 'last_transfer_reset', 'last_interest_payout_date',
+        'total_messages', 'total_reactions', 'account_created', 'first_seen', 'last_seen',
+        'privacy_settings', 'global_settings'
+    )
+
+    def bulk_upsert_user_rows(self, rows: List[tuple]) -> bool:
+        """
+        Upsert pre-built user rows with a single multi-row INSERT.
+
+        Same semantics as bulk_upsert_users, but takes plain tuples in
+        USER_ROW_COLUMNS order so large imports don't need User objects.
+        Keep batches to a few thousand rows.
+
+        Args:
+            rows (List[tuple]): Row tuples in USER_ROW_COLUMNS order
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not rows:
+            return True
+
+        success = self.execute_multi_row_insert(
+            f"INSERT INTO Users ({', '.join(self.USER_ROW_COLUMNS)})",
+            rows,
+            """ON DUPLICATE KEY UPDATE
+                discord_username = VALUES(discord_username),
+                global_name = VALUES(global_name),
+                avatar_url = COALESCE(VALUES(avatar_url), avatar_url),
+                last_seen = VALUES(last_seen)"""
+        )
+        if not success:
+            self.logger.error(f"Error bulk upserting {len(rows)} user rows")
+        return success
+
     def save(self, user: User) -> Optional[User]:
         """
         Save a user to the database (insert if new, update if exists).
@@ -1011,7 +1094,7 @@ class UserDao(BaseDao[User]):
             balance_before = int(balance_result[0][0])
 
             # Get connection to check rowcount
-            connection = self.db._get_pooled_connection(retries=3, retry_delay=0.05)
+            connection = self.db._get_pooled_connection()
             if not connection:
                 self.logger.error(f"Failed to get database connection for user {user_id}")
                 return False
@@ -1,6 +1,6 @@
 from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 import json
 
 import logging
@@ -175,15 +175,16 @@ class YoutubeDao:
         })
         await self.session.commit()
 
-    async def get_unprocessed_webhook_events(self) -> List[Tuple[int, str, str, str, str, dict]]:
-        """Retrieves unprocessed YouTube webhook events."""
-        query = text("""
+    async def get_unprocessed_webhook_events(self, limit: Optional[int] = None) -> List[Tuple[int, str, str, str, str, dict]]:
+        """Retrieves unprocessed YouTube webhook events, oldest first (at most `limit` if given)."""
+        query = text(f"""
             SELECT id, event_id, channel_id, video_id, event_type, payload
             FROM YouTubeWebhookEvents
             WHERE processed_at IS NULL
             ORDER BY received_at ASC
+            {"LIMIT :limit" if limit else ""}
         """)
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, {"limit": limit} if limit else {})
         rows = result.fetchall()
         # Deserialize JSON payload back to dict
         return [(row[0], row[1], row[2], row[3], row[4], json.loads(row[5])) for row in rows]
@@ -198,6 +199,18 @@ class YoutubeDao:
         await self.session.execute(query, {"id": event_id})
         await self.session.commit()
 
+    async def mark_webhook_events_as_processed(self, event_ids: List[int]) -> None:
+        """Marks several YouTube webhook events as processed in one statement."""
+        if not event_ids:
+            return
+        query = text("""
+            UPDATE YouTubeWebhookEvents
+            SET processed_at = CURRENT_TIMESTAMP
+            WHERE id IN :ids
+        """).bindparams(bindparam("ids", expanding=True))
+        await self.session.execute(query, {"ids": list(event_ids)})
+        await self.session.commit()
+
     async def get_all_unique_subscribed_channels(self) -> List[Tuple[str, str]]:
         """Retrieves all unique YouTube channel IDs and names that have active subscriptions."""
         query = text("""
@@ -291,6 +304,35 @@ class YoutubeDao:
         result = await self.session.execute(query, {"channel_id": channel_id})
         return result.fetchall()
 
+    async def get_guilds_subscribed_to_channels(self, channel_ids: List[str]) -> List[Tuple[str, int, str]]:
+        """
+        Retrieves the subscribed guilds of several YouTube channels in one query.
+
+        Args:
+            channel_ids: YouTube channel IDs
+
+        Returns:
+            List of tuples (channel_id, guild_id, channel_name)
+        """
+        if not channel_ids:
+            return []
+        query = text("""
+            SELECT
+                channel_id,
+                CAST(guild_id_json AS UNSIGNED) as guild_id,
+                channel_name
+            FROM YouTubeSubscriptions
+            CROSS JOIN JSON_TABLE(
+                tracked_guild_ids,
+                '$[*]' COLUMNS (guild_id_json VARCHAR(50) PATH '$')
+            ) AS guilds
+            WHERE channel_id IN :channel_ids
+              AND guild_count > 0
+            ORDER BY channel_id, guild_id
+        """).bindparams(bindparam("channel_ids", expanding=True))
+        result = await self.session.execute(query, {"channel_ids": list(channel_ids)})
+        return result.fetchall()
+
     async def get_youtube_poll_tracking(self, channel_id: str) -> Optional[dict]:
         """Retrieves the poll tracking state for a YouTube channel."""
         query = text("""
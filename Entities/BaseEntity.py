@@ -1,14 +1,34 @@
-from typing import Any, Dict, TypeVar, Generic, Optional
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple, TypeVar, Generic, Optional
 from datetime import datetime
 
 T = TypeVar('T')
 
+# Row hydrators compiled per (entity class, column list), see BaseEntity.from_row
+_row_hydrators: Dict[Tuple[type, Tuple[str, ...]], Callable] = {}
+
+
 class BaseEntity:
     """
     Base class for all entity models.
     Provides common functionality for all entities.
+
+    Subclasses may declare __slots__ (the underscore-prefixed attribute names)
+    to drop the per-instance __dict__ for entities loaded in bulk.
     """
-    
+
+    __slots__ = ()
+
+    # Column -> conversion applied by from_row (e.g. MySQL 0/1 -> bool)
+    ROW_CONVERTERS: Dict[str, Callable[[Any], Any]] = {}
+
+    def _field_items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (attribute, value) pairs from __dict__ and/or __slots__."""
+        for cls in type(self).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot != '__dict__' and hasattr(self, slot):
+                    yield slot, getattr(self, slot)
+        yield from getattr(self, '__dict__', {}).items()
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the entity to a dictionary.
@@ -17,7 +37,7 @@ class BaseEntity:
         Returns:
             Dict[str, Any]: Dictionary representation of the entity
         """
-        return {key.lstrip('_'): value for key, value in self.__dict__.items()}
+        return {key.lstrip('_'): value for key, value in self._field_items()}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BaseEntity':
@@ -35,6 +55,68 @@ class BaseEntity:
         for key, value in data.items():
             setattr(instance, f"_{key}", value)
         return instance
+
+    @classmethod
+    def from_row(cls, columns: Sequence[str], row: Sequence[Any]) -> 'BaseEntity':
+        """
+        Create an entity straight from a database row tuple.
+
+        Fast path for bulk reads: skips the intermediate dict and per-column
+        setattr of from_dict. The column-to-attribute assignment is compiled
+        once per (entity class, column list) and reused for every row of that
+        query shape. Columns the entity doesn't define (e.g. computed ranks)
+        are ignored on slotted entities.
+
+        Args:
+            columns (Sequence[str]): Column names, in row order
+            row (Sequence[Any]): Row values
+
+        Returns:
+            BaseEntity: New entity instance
+        """
+        return cls.row_hydrator(columns)(row)
+
+    @classmethod
+    def row_hydrator(cls, columns: Sequence[str]) -> Callable[[Sequence[Any]], 'BaseEntity']:
+        """
+        Get the cached row -> entity function for a column list.
+
+        Callers hydrating many rows should fetch this once and call it per row.
+        """
+        key = (cls, tuple(columns))
+        hydrator = _row_hydrators.get(key)
+        if hydrator is None:
+            hydrator = _row_hydrators[key] = cls._compile_row_hydrator(key[1])
+        return hydrator
+
+    @classmethod
+    def _compile_row_hydrator(cls, columns: Tuple[str, ...]) -> Callable:
+        """Build a function that unpacks a row tuple straight into attributes."""
+        slotted = all('__slots__' in klass.__dict__ for klass in cls.__mro__ if klass is not object)
+        slots = {slot for klass in cls.__mro__ for slot in klass.__dict__.get('__slots__', ())}
+
+        targets = []
+        conversions = []
+        namespace = {'new': cls.__new__, 'cls': cls}
+        for column in columns:
+            attribute = f"_{column}"
+            if not column.isidentifier() or (slotted and attribute not in slots):
+                targets.append('_')
+                continue
+            targets.append(f"instance.{attribute}")
+            if column in cls.ROW_CONVERTERS:
+                namespace[f"convert_{column}"] = cls.ROW_CONVERTERS[column]
+                conversions.append(f"    instance.{attribute} = convert_{column}(instance.{attribute})\n")
+
+        source = (
+            "def hydrate(row):\n"
+            "    instance = new(cls)\n"
+            f"    {', '.join(targets)}, = row\n"
+            + ''.join(conversions) +
+            "    return instance\n"
+        )
+        exec(source, namespace)
+        return namespace['hydrate']
     
     def __str__(self) -> str:
         """
@@ -43,5 +125,5 @@ class BaseEntity:
         Returns:
             str: String representation
         """
-        attributes = ', '.join(f"{key.lstrip('_')}={value}" for key, value in self.__dict__.items())
+        attributes = ', '.join(f"{key.lstrip('_')}={value}" for key, value in self._field_items())
         return f"{self.__class__.__name__}({attributes})"
\ No newline at end of file
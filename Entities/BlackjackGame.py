@@ -2,6 +2,7 @@
 import random
 from typing import List, Tuple, Optional
 from Entities.BlackjackShoe import BlackjackShoe
+from utils.blackjack_cards import CARD_POINTS, CARD_STRINGS, evaluate_hand, new_shoe_codes
 
 
 class BlackjackGame:
@@ -26,7 +27,7 @@ class BlackjackGame:
         self.num_decks = num_decks
         self.guild_id = guild_id
         self.use_persistent_shoe = use_persistent_shoe
-        self.deck: List[str] = []
+        self.deck = bytearray()
         self.player_hand: List[str] = []
         self.dealer_hand: List[str] = []
         self.game_over = False
@@ -57,11 +58,7 @@ class BlackjackGame:
 
     def _initialize_deck(self):
         """Create and shuffle a multi-deck shoe"""
-        self.deck = []
-        for _ in range(self.num_decks):
-            for suit in self.SUITS:
-                for rank in self.RANKS:
-                    self.deck.append(f"{rank}{suit}")
+        self.deck = new_shoe_codes(self.num_decks)
         random.shuffle(self.deck)
 
     def deal_card(self, hand: List[str]) -> str:
@@ -73,7 +70,7 @@ class BlackjackGame:
             # Using local deck
             if not self.deck:
                 self._initialize_deck()  # Reshuffle if deck is empty
-            card = self.deck.pop()
+            card = CARD_STRINGS[self.deck.pop()]
 
         hand.append(card)
         return card
@@ -83,28 +80,8 @@ class BlackjackGame:
         Calculate the value of a hand.
         Returns (value, is_soft) where is_soft indicates if hand contains a usable Ace as 11
         """
-        value = 0
-        aces = 0
-
-        for card in hand:
-            rank = card[:-1]  # Remove suit symbol
-            if rank in ['J', 'Q', 'K']:
-                value += 10
-            elif rank == 'A':
-                aces += 1
-                value += 11  # Start by counting Ace as 11
-            else:
-                value += int(rank)
-
-        # Adjust for Aces if hand would bust
-        while value > 21 and aces > 0:
-            value -= 10  # Convert an Ace from 11 to 1
-            aces -= 1
-
-        # Hand is "soft" if it contains an Ace counted as 11
-        is_soft = aces > 0
-
-        return value, is_soft
+        # Precomputed per-card points table, no string parsing
+        return evaluate_hand(hand)
 
     def get_hand_value(self, hand: List[str]) -> int:
         """Get the numeric value of a hand"""
@@ -129,15 +106,20 @@ class BlackjackGame:
         """Check if player can split (two cards of same rank)"""
         if len(self.player_hand) != 2:
             return False
-        rank1 = self.player_hand[0][:-1]
-        rank2 = self.player_hand[1][:-1]
-        # Consider 10, J, Q, K as same rank for splitting
-        if rank1 in ['10', 'J', 'Q', 'K'] and rank2 in ['10', 'J', 'Q', 'K']:
-            return True
-        return rank1 == rank2
+        # Consider 10, J, Q, K as same rank for splitting (all worth 10 points)
+        return CARD_POINTS[self.player_hand[0]] == CARD_POINTS[self.player_hand[1]]
 
     def deal_initial_hands(self):
         """Deal initial 2 cards to player and dealer"""
+        if self.shoe:
+            # One atomic deal for all four cards (a single round trip for shared shoes)
+            first, second, third, fourth = (CARD_STRINGS[code] for code in self.shoe.deal_codes(4))
+            self.player_hand.append(first)
+            self.dealer_hand.append(second)
+            self.player_hand.append(third)
+            self.dealer_hand.append(fourth)
+            return
+
         self.deal_card(self.player_hand)
         self.deal_card(self.dealer_hand)
         self.deal_card(self.player_hand)
@@ -464,7 +446,8 @@ class BlackjackGame:
 
         return total_won, total_lost, details
 
-    def _calculate_hand_payout(self, bet: int, winner: str) -> Tuple[int, int]:
+    @staticmethod
+    def _calculate_hand_payout(bet: int, winner: str) -> Tuple[int, int]:
         """Calculate payout for a single hand"""
         if winner == "player_blackjack":
             # Blackjack pays 3:2
@@ -1,7 +1,11 @@
 #! /usr/bin/python3.10
 import random
-from typing import List
 import threading
+from typing import List
+
+from cachetools import TTLCache
+
+from utils.blackjack_cards import CARD_STRINGS, new_shoe_codes
 
 
 class BlackjackShoe:
@@ -9,10 +13,17 @@ class BlackjackShoe:
     Manages a persistent multi-deck shoe for blackjack games.
     The shoe persists across multiple games until 75% of cards are dealt (penetration),
     then it's reshuffled. This simulates real casino shoe behavior.
+
+    Cards are stored as one-byte integer codes (see utils.blackjack_cards) and
+    only converted to display strings as they are dealt.
+
+    Guild shoes are served from the Redis-backed ShoeStore when it is
+    available, so they survive restarts and are shared by every bot process.
+    Otherwise they are kept in process memory and evicted after an hour idle.
     """
 
-    # Class-level storage for guild shoes (guild_id -> BlackjackShoe instance)
-    _guild_shoes = {}
+    # In-process fallback storage for guild shoes (guild_id -> BlackjackShoe instance)
+    _guild_shoes = TTLCache(maxsize=1000, ttl=3600)
     _lock = threading.Lock()
 
     # Card values
@@ -29,7 +40,7 @@ class BlackjackShoe:
         """
         self.num_decks = num_decks
         self.penetration = penetration
-        self.shoe: List[str] = []
+        self.shoe = bytearray()
         self.cards_dealt = 0
         self.total_cards = num_decks * 52
         self.reshuffle_point = int(self.total_cards * penetration)
@@ -38,29 +49,39 @@ class BlackjackShoe:
 
     def _initialize_shoe(self):
         """Create and shuffle a multi-deck shoe"""
-        self.shoe = []
-        for _ in range(self.num_decks):
-            for suit in self.SUITS:
-                for rank in self.RANKS:
-                    self.shoe.append(f"{rank}{suit}")
+        self.shoe = new_shoe_codes(self.num_decks)
         random.shuffle(self.shoe)
         self.cards_dealt = 0
 
-    def deal_card(self) -> str:
+    def deal_code(self) -> int:
         """
-        Deal a card from the shoe.
+        Deal a card from the shoe as an integer card code.
         Automatically reshuffles if penetration point is reached.
 
         Returns:
-            Card string (e.g., "A♠", "K♥")
+            Card code (0-51)
         """
         # Check if we need to reshuffle
         if self.cards_dealt >= self.reshuffle_point or len(self.shoe) == 0:
             self._initialize_shoe()
 
-        card = self.shoe.pop()
+        code = self.shoe.pop()
         self.cards_dealt += 1
-        return card
+        return code
+
+    def deal_codes(self, count: int) -> List[int]:
+        """Deal several card codes at once"""
+        return [self.deal_code() for _ in range(count)]
+
+    def deal_card(self) -> str:
+        """
+        Deal a card from the shoe.
+        Automatically reshuffles if penetration point is reached.
+
+        Returns:
+            Card string (e.g., "A♠", "K♥")
+        """
+        return CARD_STRINGS[self.deal_code()]
 
     def get_remaining_cards(self) -> int:
         """Get the number of cards remaining in the shoe"""
@@ -75,10 +96,31 @@ class BlackjackShoe:
         self._initialize_shoe()
 
     @classmethod
-    def get_guild_shoe(cls, guild_id: int, num_decks: int = 6, penetration: float = 0.75) -> 'BlackjackShoe':
+    def get_guild_shoe(cls, guild_id: int, num_decks: int = 6, penetration: float = 0.75):
         """
         Get or create a persistent shoe for a guild.
 
+        Args:
+            guild_id: Discord guild ID
+            num_decks: Number of decks (only used when creating new shoe)
+            penetration: Penetration percentage (only used when creating new shoe)
+
+        Returns:
+            SharedShoe handle if the shoe store is available, otherwise the
+            in-process BlackjackShoe instance for the guild
+        """
+        from Services.ShoeStore import get_shoe_store, SharedShoe
+
+        store = get_shoe_store()
+        if store.redis_available:
+            return SharedShoe(store, guild_id, num_decks, penetration)
+        return cls.get_local_guild_shoe(guild_id, num_decks, penetration)
+
+    @classmethod
+    def get_local_guild_shoe(cls, guild_id: int, num_decks: int = 6, penetration: float = 0.75) -> 'BlackjackShoe':
+        """
+        Get or create the in-process shoe for a guild.
+
         Args:
             guild_id: Discord guild ID
             num_decks: Number of decks (only used when creating new shoe)
@@ -88,9 +130,12 @@ class BlackjackShoe:
             BlackjackShoe instance for the guild
         """
         with cls._lock:
-            if guild_id not in cls._guild_shoes:
-                cls._guild_shoes[guild_id] = cls(num_decks, penetration)
-            return cls._guild_shoes[guild_id]
+            shoe = cls._guild_shoes.get(guild_id)
+            if shoe is None:
+                shoe = cls(num_decks, penetration)
+            # Re-insert on every access so active guilds don't expire
+            cls._guild_shoes[guild_id] = shoe
+            return shoe
 
     @classmethod
     def reshuffle_guild_shoe(cls, guild_id: int) -> bool:
@@ -103,6 +148,12 @@ class BlackjackShoe:
         Returns:
             True if shoe existed and was reshuffled, False otherwise
         """
+        from Services.ShoeStore import get_shoe_store
+
+        store = get_shoe_store()
+        if store.redis_available:
+            return store.reshuffle(guild_id)
+
         with cls._lock:
             if guild_id in cls._guild_shoes:
                 cls._guild_shoes[guild_id].force_reshuffle()
@@ -120,6 +171,12 @@ class BlackjackShoe:
         Returns:
             Dictionary with shoe statistics, or None if shoe doesn't exist
         """
+        from Services.ShoeStore import get_shoe_store
+
+        store = get_shoe_store()
+        if store.redis_available:
+            return store.get_shoe_stats(guild_id)
+
         with cls._lock:
             if guild_id not in cls._guild_shoes:
                 return None
@@ -145,6 +202,12 @@ class BlackjackShoe:
         Returns:
             True if shoe existed and was removed, False otherwise
         """
+        from Services.ShoeStore import get_shoe_store
+
+        store = get_shoe_store()
+        if store.redis_available:
+            return store.clear(guild_id)
+
         with cls._lock:
             if guild_id in cls._guild_shoes:
                 del cls._guild_shoes[guild_id]
@@ -9,6 +9,17 @@ class GuildUser(BaseEntity):
     Stores guild-specific user information, statistics, and game-related data.
     """
 
+    # Slotted: guild member lists and leaderboards load these in bulk
+    __slots__ = (
+        '_user_id', '_guild_id', '_name', '_nickname', '_level',
+        '_streak', '_highest_streak', '_exp', '_exp_gained', '_exp_lost', '_currency',
+        '_slots_free_spins_remaining', '_slots_locked_bet_amount', '_slots_bonus_total_won',
+        '_messages_sent', '_reactions_sent', '_joined_at', '_last_active',
+        '_daily', '_last_daily', '_is_active'
+    )
+
+    ROW_CONVERTERS = {'is_active': bool}
+
     def __init__(
             self,
             user_id: int,
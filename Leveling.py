@@ -2,10 +2,12 @@ import discord
 from discord.ext import commands
 from Dao.GuildUserDao import GuildUserDao
 from Dao.UserDao import UserDao
-from Dao.GuildDao import GuildDao
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from logger import AppLogger
-import json
+from Services.CooldownService import XP_BUCKET, get_cooldown_service
+from Services.CurrencyLedger import get_currency_ledger
+from utils.level_curve import level_curve_for_config
 import math
 import sys
 from pathlib import Path
@@ -23,7 +25,8 @@ logger = AppLogger(__name__).get_logger()
 class LevelingSystem:
     def __init__(self, bot):
         self.bot = bot
-        self.user_cooldowns = {}  # Track user cooldowns per guild
+        # (guild_id, user_id) -> (level, role plan version) whose roles are already in place
+        self.verified_roles = TTLCache(maxsize=50000, ttl=3600)
 
         # Default configuration
         self.default_config = {
@@ -47,53 +50,29 @@ class LevelingSystem:
         from Services.ConfigCache import get_config_cache
         return await get_config_cache().get_leveling_config(guild_id)
 
-    def calculate_level_from_exp(self, exp):
-        """Calculate level from experience points using standard formula"""
-        if exp < 0:
-            return 0
-        # Using formula: level = floor(sqrt(exp / 100))
-        # This means: level 1 = 100 exp, level 2 = 400 exp, level 3 = 900 exp, etc.
-        return math.floor(math.sqrt(exp / 100))
+    def calculate_level_from_exp(self, exp, config=None):
+        """Calculate level from experience points using the guild's level curve (default curve if no config)"""
+        return level_curve_for_config(config).level_for_exp(exp)
 
-    def calculate_exp_for_level(self, level):
-        """Calculate experience needed for a specific level"""
-        return level * level * 100
+    def calculate_exp_for_level(self, level, config=None):
+        """Calculate total experience needed for a specific level using the guild's level curve"""
+        return level_curve_for_config(config).exp_for_level(level)
 
-    def calc_exp_required(self, level):
+    def calc_exp_required(self, level, config=None):
         """Legacy method name for compatibility with rank cog"""
-        return self.calculate_exp_for_level(level)
+        return self.calculate_exp_for_level(level, config)
 
-    def calc_level(self, exp):
+    def calc_level(self, exp, config=None):
         """Legacy method name for compatibility with rank cog"""
-        return self.calculate_level_from_exp(exp)
+        return self.calculate_level_from_exp(exp, config)
 
-    def is_user_on_cooldown(self, user_id, guild_id, cooldown_seconds):
+    def is_user_on_cooldown(self, user_id, guild_id):
         """Check if user is on experience cooldown"""
-        now = datetime.now()
+        return get_cooldown_service().on_cooldown(XP_BUCKET, guild_id, user_id)
 
-        # Auto-cleanup: remove expired cooldown entries to prevent memory leak
-        expired_keys = [
-            key for key, timestamp in self.user_cooldowns.items()
-            if (now - timestamp).total_seconds() > cooldown_seconds
-        ]
-        for key in expired_keys:
-            del self.user_cooldowns[key]
-
-        # Check current user's cooldown
-        cooldown_key = f"{guild_id}_{user_id}"
-
-        if cooldown_key not in self.user_cooldowns:
-            return False
-
-        last_exp_time = self.user_cooldowns[cooldown_key]
-        time_since_last = (now - last_exp_time).total_seconds()
-
-        return time_since_last < cooldown_seconds
-
-    def set_user_cooldown(self, user_id, guild_id):
+    def set_user_cooldown(self, user_id, guild_id, cooldown_seconds):
         """Set user on experience cooldown"""
-        cooldown_key = f"{guild_id}_{user_id}"
-        self.user_cooldowns[cooldown_key] = datetime.now()
+        get_cooldown_service().trigger(XP_BUCKET, guild_id, user_id, cooldown_seconds)
 
     async def process_message_exp(self, message):
         """
@@ -155,18 +134,16 @@ class LevelingSystem:
                 premium_multiplier = PremiumChecker.get_xp_multiplier(message.guild.id)
 
                 # Grant XP to session (checks cooldown internally)
-                level_up, new_level, xp_gained, updated_session = await session_manager.grant_xp(
+                levels_gained, new_level, xp_gained, updated_session = await session_manager.grant_xp(
                     guild_id=guild_id,
                     user_id=user_id,
                     xp_amount=xp_with_streak,
                     cooldown_seconds=config["exp_cooldown_seconds"],
-                    premium_multiplier=premium_multiplier
+                    premium_multiplier=premium_multiplier,
+                    level_curve=level_curve_for_config(config)
                 )
 
                 if xp_gained > 0:
-                    # Set cooldown in memory
-                    self.set_user_cooldown(user_id, guild_id)
-
                     # Record XP grant
                     await perf_monitor.record_xp_grant()
 
@@ -180,17 +157,15 @@ class LevelingSystem:
                         logger.info(f'{message.author.name} in {message.guild.name} - EXP GAINED = {xp_gained} [SESSION]')
 
                     # Handle level up if it occurred
-                    if level_up:
+                    if levels_gained:
                         # Load guild_user for level-up handler (needs streak, currency, etc.)
                         guild_user = guild_user_dao.get_guild_user(user_id, guild_id)
                         if guild_user:
-                            old_level = new_level - 1  # We know they just leveled up
+                            old_level = new_level - levels_gained
                             await self.handle_level_up(message, guild_user, old_level, new_level, config)
                     else:
-                        # Check for missing roles
-                        guild_user = guild_user_dao.get_guild_user(user_id, guild_id)
-                        if guild_user:
-                            await self.check_and_apply_missing_roles(message, guild_user, new_level)
+                        # Check for missing roles (only needs the level, not the DB row)
+                        await self.check_and_apply_missing_roles(message, None, new_level)
 
                 return  # Session-based processing complete
 
@@ -220,7 +195,7 @@ class LevelingSystem:
             )
 
             # Check cooldown
-            if self.is_user_on_cooldown(user_id, guild_id, config["exp_cooldown_seconds"]):
+            if self.is_user_on_cooldown(user_id, guild_id):
                 return
 
             # Update activity
@@ -228,7 +203,8 @@ class LevelingSystem:
             global_user.last_seen = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # Calculate XP with streak
-            old_level = self.calculate_level_from_exp(guild_user.exp)
+            level_curve = level_curve_for_config(config)
+            old_level = guild_user.level
             base_exp = config["exp_per_message"]
             streak = min(guild_user.streak, config["max_streak_bonus"])
             streak_multiplier = config["streak_multiplier"]
@@ -245,7 +221,7 @@ class LevelingSystem:
             global_user.global_exp += exp_gained
 
             # Calculate new level
-            new_level = self.calculate_level_from_exp(guild_user.exp)
+            new_level = level_curve.level_for_exp(guild_user.exp)
             guild_user.level = new_level
             global_user.global_level = self.calculate_level_from_exp(global_user.global_exp)
 
@@ -254,7 +230,7 @@ class LevelingSystem:
             user_dao.update_user(global_user)
 
             # Set cooldown
-            self.set_user_cooldown(user_id, guild_id)
+            self.set_user_cooldown(user_id, guild_id, config["exp_cooldown_seconds"])
 
             # Record XP grant
             await perf_monitor.record_xp_grant()
@@ -290,7 +266,6 @@ class LevelingSystem:
 
     async def handle_level_up(self, message, guild_user, old_level, new_level, config):
         """Handle level up event"""
-        guild_user_dao = None
         try:
             # Record level-up in performance monitor
             from Services.PerformanceMonitor import get_performance_monitor
@@ -308,18 +283,17 @@ class LevelingSystem:
             streak_bonus = math.floor(base_reward * streak_bonus_percentage)
             calculated_reward = base_reward + streak_bonus
 
-            # Update currency with global sync
-            guild_user_dao = GuildUserDao()
-            try:
-                guild_user_dao.update_currency_with_global_sync(
-                    user.id,
-                    guild.id,
-                    calculated_reward
-                )
-                # Refresh guild_user object to reflect updated currency
-                guild_user = guild_user_dao.get_guild_user(user.id, guild.id)
-            finally:
-                guild_user_dao.close()
+            # Pay the reward through the ledger; keyed on the message so a retry can't pay twice
+            result = await get_currency_ledger().transfer(
+                guild.id,
+                {user.id: calculated_reward},
+                idempotency_key=f"levelup:{message.id}"
+            )
+            if result.success:
+                # Reflect the updated currency on the guild_user object
+                guild_user.currency = result.balances.get(user.id, guild_user.currency + calculated_reward)
+            else:
+                logger.error(f"Level-up reward for {user.name} in {guild.name} failed: {result.error}")
 
             # Send level up announcement if enabled
             if config["level_up_announcements"]:
@@ -367,82 +341,61 @@ class LevelingSystem:
         except Exception as e:
             logger.error(f"Error handling level up: {e}")
 
+    async def get_role_plan(self, guild_id):
+        """Get the compiled level -> role plan for a guild (cached)"""
+        from Services.ConfigCache import get_config_cache
+        return await get_config_cache().get_role_plan(guild_id)
+
+    def _plan_role_changes(self, plan, guild, member, level):
+        """Resolve which roles a member is missing or should lose at a level"""
+        granted, withheld = plan.roles_for_level(level)
+
+        roles_to_add = []
+        for role_id in granted:
+            if member.get_role(role_id) is None:
+                role = guild.get_role(role_id)
+                if role:
+                    roles_to_add.append(role)
+
+        roles_to_remove = []
+        for role_id in withheld:
+            role = member.get_role(role_id)
+            if role:
+                roles_to_remove.append(role)
+
+        return roles_to_add, roles_to_remove
+
+    def _mark_roles_verified(self, guild_id, user_id, level, plan):
+        """Remember that a member's roles match the plan at this level"""
+        self.verified_roles[(guild_id, user_id)] = (level, plan.version)
+
+    def _roles_verified(self, guild_id, user_id, level, plan):
+        """Whether a member's roles were already checked at this level with this plan"""
+        return self.verified_roles.get((guild_id, user_id)) == (level, plan.version)
+
     async def handle_role_assignment(self, message, guild_user, new_level):
         """Handle automatic role assignment based on level"""
-        guild_dao = None
         try:
             guild = message.guild
             user = message.author
             guild_id = guild.id
 
-            # Get guild settings for role configuration
-            guild_dao = GuildDao()
-            try:
-                guild_obj = guild_dao.get_guild(guild_id)
-
-                if not guild_obj or not guild_obj.settings:
-                    return
-
-                settings = json.loads(guild_obj.settings) if isinstance(guild_obj.settings, str) else guild_obj.settings
-                roles_config = settings.get("roles", {})
-            finally:
-                guild_dao.close()
-
-            # Skip if roles system is disabled
-            if not roles_config.get("enabled", False):
-                return
-
-            role_mappings = roles_config.get("role_mappings", {})
-            if not role_mappings:
+            plan = await self.get_role_plan(guild_id)
+            if plan is None:
                 return
 
-            # Find roles for this level
-            roles_to_add = []
-            roles_to_remove = []
-
-            for level_str, role_data in role_mappings.items():
-                level_threshold = int(level_str)
-
-                # Handle both old array format and new object format
-                if isinstance(role_data, dict):
-                    role_ids = role_data.get("role_ids", [])
-                else:
-                    role_ids = role_data  # Old format (array)
-
-                if new_level >= level_threshold:
-                    # User qualifies for these roles
-                    for role_id in role_ids:
-                        role = guild.get_role(int(role_id))
-                        if role and role not in user.roles:
-                            roles_to_add.append(role)
-                else:
-                    # Handle role removal based on mode
-                    mode = roles_config.get("mode", "cumulative")
-                    if mode == "progressive":
-                        # Remove roles from lower levels
-                        for role_id in role_ids:
-                            role = guild.get_role(int(role_id))
-                            if role and role in user.roles:
-                                roles_to_remove.append(role)
+            roles_to_add, roles_to_remove = self._plan_role_changes(plan, guild, user, new_level)
+            added = removed = False
 
             # Apply role changes
             if roles_to_add:
                 try:
                     await user.add_roles(*roles_to_add, reason=f"Level up to {new_level}")
+                    added = True
 
                     # Send role announcement if enabled
-                    if roles_config.get("role_announcement", False):
-                        # Get custom announcement message for this level or use default
-                        role_mapping_entry = roles_config.get("role_mappings", {}).get(str(new_level))
-
-                        if isinstance(role_mapping_entry, dict):
-                            # New format with custom message
-                            template = role_mapping_entry.get("announcement_message",
-                                "🎉 {mention} reached level {level} and earned the {role} role!")
-                        else:
-                            # Fallback for old format
-                            template = roles_config.get("role_announcement_message",
-                                "🎉 {mention} reached level {level} and earned the {role} role!")
+                    if plan.role_announcement:
+                        template = plan.announcement_template(new_level)
 
                         # Format role mentions
                         role_mentions = [role.mention for role in roles_to_add]
@@ -462,8 +415,8 @@ class LevelingSystem:
 
                         # Determine announcement channel
                         announcement_channel = message.channel
-                        if roles_config.get("announcement_channel_id"):
-                            channel = guild.get_channel(int(roles_config["announcement_channel_id"]))
+                        if plan.announcement_channel_id:
+                            channel = guild.get_channel(plan.announcement_channel_id)
                             if channel:
                                 announcement_channel = channel
 
@@ -477,76 +430,47 @@ class LevelingSystem:
             if roles_to_remove:
                 try:
                     await user.remove_roles(*roles_to_remove, reason=f"Progressive role removal at level {new_level}")
+                    removed = True
                 except discord.Forbidden:
                     logger.warning(f"No permission to remove roles from user {user.id} in guild {guild_id}")
                 except Exception as e:
                     logger.error(f"Error removing roles: {e}")
 
+            # Only remember the level once the roles are really in place, so a failure is retried
+            if (added or not roles_to_add) and (removed or not roles_to_remove):
+                self._mark_roles_verified(guild_id, user.id, new_level, plan)
+
         except Exception as e:
             logger.error(f"Error handling role assignment: {e}")
 
     async def check_and_apply_missing_roles(self, message, guild_user, current_level):
-        """Check if user is missing any roles for their current level and apply them"""
-        guild_dao = None
+        """
+        Check if user is missing any roles for their current level and apply them.
+
+        Skipped entirely once a member has been verified at this level against
+        the guild's current role plan; the check runs again after a level change,
+        a role mapping change, or when the memo expires.
+        """
         try:
             guild = message.guild
             user = message.author
             guild_id = guild.id
 
-            # Get guild settings for role configuration
-            guild_dao = GuildDao()
-            try:
-                guild_obj = guild_dao.get_guild(guild_id)
-
-                if not guild_obj or not guild_obj.settings:
-                    return
-
-                settings = json.loads(guild_obj.settings) if isinstance(guild_obj.settings, str) else guild_obj.settings
-                roles_config = settings.get("roles", {})
-            finally:
-                guild_dao.close()
-
-            # Skip if roles system is disabled
-            if not roles_config.get("enabled", False):
+            plan = await self.get_role_plan(guild_id)
+            if plan is None:
                 return
 
-            role_mappings = roles_config.get("role_mappings", {})
-            if not role_mappings:
+            if self._roles_verified(guild_id, user.id, current_level, plan):
                 return
 
-            # Find roles user should have based on current level
-            roles_to_add = []
-            roles_to_remove = []
-
-            for level_str, role_data in role_mappings.items():
-                level_threshold = int(level_str)
-
-                # Handle both old array format and new object format
-                if isinstance(role_data, dict):
-                    role_ids = role_data.get("role_ids", [])
-                else:
-                    role_ids = role_data  # Old format (array)
-
-                if current_level >= level_threshold:
-                    # User qualifies for these roles
-                    for role_id in role_ids:
-                        role = guild.get_role(int(role_id))
-                        if role and role not in user.roles:
-                            roles_to_add.append(role)
-                else:
-                    # Handle role removal based on mode
-                    mode = roles_config.get("mode", "cumulative")
-                    if mode == "progressive":
-                        # Remove roles from lower levels
-                        for role_id in role_ids:
-                            role = guild.get_role(int(role_id))
-                            if role and role in user.roles:
-                                roles_to_remove.append(role)
+            roles_to_add, roles_to_remove = self._plan_role_changes(plan, guild, user, current_level)
+            added = removed = False
 
             # Apply role changes silently (no announcements for catchup)
             if roles_to_add:
                 try:
                     await user.add_roles(*roles_to_add, reason=f"Role catchup for level {current_level}")
+                    added = True
                     logger.info(
                         f"Applied missing roles to {user.name} for level {current_level}: {[role.name for role in roles_to_add]}")
                 except discord.Forbidden:
@@ -558,6 +482,7 @@ class LevelingSystem:
                 try:
                     await user.remove_roles(*roles_to_remove,
                                             reason=f"Progressive role cleanup for level {current_level}")
+                    removed = True
                     logger.info(
                         f"Removed outdated roles from {user.name} for level {current_level}: {[role.name for role in roles_to_remove]}")
                 except discord.Forbidden:
@@ -565,5 +490,9 @@ class LevelingSystem:
                 except Exception as e:
                     logger.error(f"Error removing outdated roles: {e}")
 
+            # Only remember the level once the roles are really in place, so a failure is retried
+            if (added or not roles_to_add) and (removed or not roles_to_remove):
+                self._mark_roles_verified(guild_id, user.id, current_level, plan)
+
         except Exception as e:
             logger.error(f"Error checking and applying missing roles: {e}")
@@ -0,0 +1,235 @@
+"""
+Stream Announcement Render Store
+
+Keeps the embed of each live-stream announcement so viewer-count and title
+updates don't have to read the message back from Discord first.
+
+- The first update of an announcement fetches the message once and stores
+  its embed (embed.to_dict()) in Redis; later updates rebuild the embed from
+  the stored copy and edit through a PartialMessage, one REST call instead
+  of two
+- Updates are skipped when the title is unchanged and the viewer count moved
+  by less than STREAM_VIEWER_UPDATE_THRESHOLD (fraction, default 0.05)
+- Stored embeds expire after STREAM_RENDER_TTL seconds (default 6 hours);
+  an expired or missing entry just costs one fetch
+- Falls back to an in-process TTL cache if Redis is unavailable
+"""
+
+import json
+import os
+from typing import Optional
+
+import discord
+from cachetools import TTLCache
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+
+def _parse_viewers(value: str) -> Optional[int]:
+    """Parse a rendered Viewers field value ("1,234") back to an int."""
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+
+class AnnouncementRenderStore:
+    """
+    Stored announcement embeds, keyed by platform and announcement id.
+
+    Usage:
+        store = get_announcement_render_store()
+        edited = await store.update_stream_announcement(bot, "twitch", announcement, viewers, title, link)
+    """
+
+    def __init__(self):
+        self.render_ttl = int(os.getenv('STREAM_RENDER_TTL', '21600'))
+        self.viewer_threshold = float(os.getenv('STREAM_VIEWER_UPDATE_THRESHOLD', '0.05'))
+
+        # Used when Redis is unavailable
+        self.local_cache = TTLCache(maxsize=5000, ttl=self.render_ttl)
+
+        # Monitoring counters
+        self.edits = 0
+        self.skipped = 0
+        self.fetches = 0
+
+    def _render_key(self, platform: str, announcement_id: int) -> str:
+        """Generate Redis key for an announcement's stored embed."""
+        return f"announcement_render:{platform}:{announcement_id}"
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    async def get(self, platform: str, announcement_id: int) -> Optional[dict]:
+        """Get the stored embed dict for an announcement."""
+        key = self._render_key(platform, announcement_id)
+        redis = self._redis()
+        if redis is None:
+            return self.local_cache.get(key)
+        try:
+            data = await redis.get(key)
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.warning(f"Could not read stored embed for {key}: {e}")
+            return None
+
+    async def save(self, platform: str, announcement_id: int, embed_dict: dict):
+        """Store the embed dict last rendered for an announcement."""
+        key = self._render_key(platform, announcement_id)
+        redis = self._redis()
+        if redis is None:
+            self.local_cache[key] = embed_dict
+            return
+        try:
+            await redis.setex(key, self.render_ttl, json.dumps(embed_dict))
+        except Exception as e:
+            logger.warning(f"Could not store embed for {key}: {e}")
+
+    async def discard(self, platform: str, announcement_id: int):
+        """Forget an announcement's stored embed."""
+        key = self._render_key(platform, announcement_id)
+        self.local_cache.pop(key, None)
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Could not discard stored embed for {key}: {e}")
+
+    def viewer_change_is_significant(self, old_count: Optional[int], new_count: int) -> bool:
+        """Whether a viewer count change is worth an edit."""
+        if old_count is None:
+            return True
+        if old_count == new_count:
+            return False
+        return abs(new_count - old_count) >= max(1, old_count * self.viewer_threshold)
+
+    async def _load_embed(self, channel, platform: str, announcement: dict) -> Optional[dict]:
+        """Get the stored embed, fetching the message once if nothing is stored."""
+        embed_dict = await self.get(platform, announcement['id'])
+        if embed_dict is not None:
+            return embed_dict
+
+        self.fetches += 1
+        try:
+            message = await channel.fetch_message(announcement['message_id'])
+        except discord.NotFound:
+            logger.warning(f"Message {announcement['message_id']} not found (may have been deleted)")
+            return None
+        except discord.Forbidden:
+            logger.warning(f"No permission to fetch message {announcement['message_id']}")
+            return None
+
+        if not message.embeds:
+            logger.debug(f"Message {announcement['message_id']} has no embeds")
+            return None
+
+        return message.embeds[0].to_dict()
+
+    async def update_stream_announcement(
+        self,
+        bot,
+        platform: str,
+        announcement: dict,
+        new_viewer_count: int,
+        new_title: Optional[str],
+        stream_link: str
+    ) -> bool:
+        """
+        Apply a viewer count/title update to a stream announcement.
+
+        Args:
+            bot: Discord bot
+            platform: "twitch" or "kick"
+            announcement: Announcement row (id, guild_id, channel_id, message_id, streamer_username)
+            new_viewer_count: Current viewer count
+            new_title: Current stream title, if known
+            stream_link: Link used for the title in the description
+
+        Returns:
+            True if the message was edited, False if skipped or not found
+        """
+        guild = bot.get_guild(announcement['guild_id'])
+        if not guild:
+            logger.debug(f"Guild {announcement['guild_id']} not found")
+            return False
+
+        channel = guild.get_channel(announcement['channel_id'])
+        if not channel:
+            logger.debug(f"Channel {announcement['channel_id']} not found")
+            return False
+
+        embed_dict = await self._load_embed(channel, platform, announcement)
+        if embed_dict is None:
+            return False
+
+        embed = discord.Embed.from_dict(embed_dict)
+
+        # Update the description (stream title) if it changed
+        title_changed = False
+        if new_title:
+            description = f"### [{new_title}]({stream_link})"
+            if embed.description != description:
+                embed.description = description
+                title_changed = True
+
+        # Update the Viewers field if the change is large enough to show
+        viewers_changed = False
+        for i, field in enumerate(embed.fields):
+            if field.name == "Viewers":
+                if self.viewer_change_is_significant(_parse_viewers(field.value), new_viewer_count):
+                    embed.set_field_at(i, name="Viewers", value=f"{new_viewer_count:,}", inline=False)
+                    viewers_changed = True
+                break
+
+        if not title_changed and not viewers_changed:
+            self.skipped += 1
+            # Keep the fetched copy so the next check doesn't fetch again
+            await self.save(platform, announcement['id'], embed_dict)
+            return False
+
+        try:
+            await channel.get_partial_message(announcement['message_id']).edit(embed=embed)
+        except discord.NotFound:
+            logger.warning(f"Message {announcement['message_id']} not found (may have been deleted)")
+            await self.discard(platform, announcement['id'])
+            return False
+
+        self.edits += 1
+        await self.save(platform, announcement['id'], embed.to_dict())
+
+        log_parts = []
+        if viewers_changed:
+            log_parts.append(f"viewer count to {new_viewer_count:,}")
+        if title_changed:
+            log_parts.append(f"title to '{new_title}'")
+        logger.debug(f"Updated {' and '.join(log_parts)} for stream {announcement['streamer_username']}")
+        return True
+
+    def get_stats(self) -> dict:
+        """Get render store statistics for monitoring."""
+        return {
+            "edits": self.edits,
+            "skipped": self.skipped,
+            "fetches": self.fetches,
+            "local_entries": len(self.local_cache),
+        }
+
+
+# Singleton instance
+_announcement_render_store = None
+
+
+def get_announcement_render_store() -> AnnouncementRenderStore:
+    """Get the singleton AnnouncementRenderStore instance."""
+    global _announcement_render_store
+    if _announcement_render_store is None:
+        _announcement_render_store = AnnouncementRenderStore()
+    return _announcement_render_store
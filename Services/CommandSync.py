@@ -0,0 +1,192 @@
+"""
+Slash Command Sync
+
+Uploads the application command tree only when it has changed.
+
+- The commands in a scope (global, or one guild) are serialized the way
+  tree.sync() sends them and hashed (SHA-256 of the sorted JSON)
+- The hash of the last successful sync is kept in Redis under
+  command_tree_hash:{application_id}:{scope}, and in a local JSON file
+  (COMMAND_SYNC_STATE_FILE, default .command_sync.json) for when Redis is
+  unavailable
+- sync() uploads only if the hash differs from the stored one, so restarts,
+  reconnects and every process of a sharded deployment skip the upload
+  when nothing changed. FORCE_COMMAND_SYNC=1 always uploads
+- DEV_GUILD_IDS (comma-separated) switches to dev sync: global commands are
+  copied into those guilds and synced there, where changes show up at once,
+  and the global tree is left alone
+- Every sync logs how long it took; get_stats() keeps the last results
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional
+
+import discord
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+
+class CommandSync:
+    """
+    Hash-gated command tree sync.
+
+    Usage:
+        await get_command_sync().sync_all(bot)
+    """
+
+    def __init__(self):
+        self.state_file = os.getenv('COMMAND_SYNC_STATE_FILE', '.command_sync.json')
+        self.force = os.getenv('FORCE_COMMAND_SYNC', '0') == '1'
+        self.dev_guild_ids = [
+            int(guild_id) for guild_id in os.getenv('DEV_GUILD_IDS', '').split(',') if guild_id.strip()
+        ]
+
+        self.last_results: List[dict] = []
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    def _scope(self, guild: Optional[discord.abc.Snowflake]) -> str:
+        return str(guild.id) if guild else "global"
+
+    def _hash_key(self, application_id: int, scope: str) -> str:
+        """Generate Redis key holding the last synced hash for a scope."""
+        return f"command_tree_hash:{application_id}:{scope}"
+
+    def tree_hash(self, tree: discord.app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+        """Hash the commands tree.sync() would upload for a scope."""
+        payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+        payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _read_state_file(self) -> dict:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read command sync state from {self.state_file}: {e}")
+            return {}
+
+    def _write_state_file(self, key: str, tree_hash: str):
+        state = self._read_state_file()
+        state[key] = tree_hash
+        try:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"Could not write command sync state to {self.state_file}: {e}")
+
+    async def get_stored_hash(self, application_id: int, scope: str) -> Optional[str]:
+        """Get the hash of the last successful sync of a scope."""
+        key = self._hash_key(application_id, scope)
+        redis = self._redis()
+        if redis is not None:
+            try:
+                stored = await redis.get(key)
+                if stored:
+                    return stored
+            except Exception as e:
+                logger.warning(f"Could not read command tree hash from Redis: {e}")
+
+        return (await asyncio.to_thread(self._read_state_file)).get(key)
+
+    async def store_hash(self, application_id: int, scope: str, tree_hash: str):
+        """Record a successful sync in Redis and the state file."""
+        key = self._hash_key(application_id, scope)
+        redis = self._redis()
+        if redis is not None:
+            try:
+                await redis.set(key, tree_hash)
+            except Exception as e:
+                logger.warning(f"Could not store command tree hash in Redis: {e}")
+
+        await asyncio.to_thread(self._write_state_file, key, tree_hash)
+
+    async def sync(self, bot, guild: Optional[discord.abc.Snowflake] = None, force: bool = False) -> dict:
+        """
+        Sync one scope's commands if they changed since the last sync.
+
+        Returns:
+            Result dict: scope, synced (bool), commands, hash, seconds
+        """
+        tree = bot.tree
+        scope = self._scope(guild)
+        started = time.perf_counter()
+
+        tree_hash = self.tree_hash(tree, guild)
+        stored_hash = None if (force or self.force) else await self.get_stored_hash(bot.application_id, scope)
+
+        result = {"scope": scope, "hash": tree_hash[:12], "synced": False}
+        if stored_hash == tree_hash:
+            result["commands"] = len(tree.get_commands(guild=guild))
+        else:
+            synced = await tree.sync(guild=guild)
+            await self.store_hash(bot.application_id, scope, tree_hash)
+            result["synced"] = True
+            result["commands"] = len(synced)
+
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        self.last_results.append(result)
+        self.last_results = self.last_results[-10:]
+
+        if result["synced"]:
+            logger.info(f"Synced {result['commands']} slash commands ({scope}) in {result['seconds']}s")
+        else:
+            logger.info(
+                f"Slash commands ({scope}) unchanged, skipped sync of {result['commands']} commands "
+                f"(checked in {result['seconds']}s)"
+            )
+        return result
+
+    async def sync_all(self, bot, force: bool = False) -> List[dict]:
+        """
+        Sync the global tree, or with DEV_GUILD_IDS set, each dev guild.
+
+        Returns:
+            One result dict per scope
+        """
+        if not self.dev_guild_ids:
+            return [await self.sync(bot, force=force)]
+
+        results = []
+        for guild_id in self.dev_guild_ids:
+            guild = discord.Object(id=guild_id)
+            bot.tree.copy_global_to(guild=guild)
+            try:
+                results.append(await self.sync(bot, guild=guild, force=force))
+            except discord.HTTPException as e:
+                logger.error(f"Dev command sync to guild {guild_id} failed: {e}")
+        return results
+
+    def get_stats(self) -> dict:
+        """Get recent sync results for monitoring."""
+        return {
+            "dev_guild_ids": self.dev_guild_ids,
+            "last_results": list(self.last_results),
+        }
+
+
+# Singleton instance
+_command_sync = None
+
+
+def get_command_sync() -> CommandSync:
+    """Get the singleton CommandSync instance."""
+    global _command_sync
+    if _command_sync is None:
+        _command_sync = CommandSync()
+    return _command_sync
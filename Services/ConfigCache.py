@@ -13,7 +13,10 @@ import redis.asyncio as aioredis
 import json
 import os
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from logger import AppLogger
+from utils.role_plan import RolePlan, compile_role_plan
+from utils.word_filter import WordFilter, compile_guild_word_filter
 
 logger = AppLogger(__name__).get_logger()
 
@@ -32,6 +35,15 @@ class GuildConfigCache:
     def __init__(self):
         # Local in-memory cache (TTL as backup if Redis fails)
         self.cache = TTLCache(maxsize=1000, ttl=300)  # 5 min TTL as fallback
+
+        # Full guild settings JSON, invalidated together with the leveling config
+        self.settings_cache = TTLCache(maxsize=1000, ttl=300)
+
+        # Compiled level -> role plans (None cached for guilds without role rewards)
+        self.role_plan_cache = TTLCache(maxsize=1000, ttl=300)
+
+        # Compiled inappropriate-word filters (the bot-wide filter for guilds without their own list)
+        self.word_filter_cache = TTLCache(maxsize=1000, ttl=300)
         self.lock = asyncio.Lock()
 
         # Redis connection for pub/sub
@@ -114,6 +126,9 @@ class GuildConfigCache:
                             guild_id = int(message['data'])
                             async with self.lock:
                                 removed = self.cache.pop(guild_id, None) is not None
+                                removed = self.settings_cache.pop(guild_id, None) is not None or removed
+                                removed = self.role_plan_cache.pop(guild_id, None) is not None or removed
+                                removed = self.word_filter_cache.pop(guild_id, None) is not None or removed
 
                             if removed:
                                 logger.info(f"⚡ Cache invalidated for guild {guild_id} via Redis pub/sub")
@@ -178,23 +193,19 @@ class GuildConfigCache:
         except:
             pass  # Don't fail if monitor not available
 
-        # Cache miss - fetch from DB
+        # Cache miss - fetch from DB (off the event loop)
         from Dao.GuildDao import GuildDao
 
         guild_dao = GuildDao()
         try:
-            guild = guild_dao.get_guild(guild_id)
+            guild = await asyncio.to_thread(guild_dao.get_guild, guild_id)
 
             if not guild or not guild.settings:
                 config = self.default_config.copy()
                 logger.debug(f"Using default config for guild {guild_id}")
             else:
                 settings = json.loads(guild.settings) if isinstance(guild.settings, str) else guild.settings
-                leveling_settings = settings.get("leveling", {})
-
-                # Merge with defaults
-                config = self.default_config.copy()
-                config.update(leveling_settings)
+                config = self._merge_leveling_config(settings)
                 logger.debug(f"Loaded custom config for guild {guild_id}")
 
             # Store in cache
@@ -210,6 +221,166 @@ class GuildConfigCache:
         finally:
             guild_dao.close()
 
+    def _merge_leveling_config(self, settings: Optional[dict]) -> dict:
+        """Apply a guild's leveling settings on top of the defaults."""
+        config = self.default_config.copy()
+        if settings:
+            config.update(settings.get("leveling", {}))
+        return config
+
+    async def get_leveling_configs(self, guild_ids: List[int]) -> Dict[int, dict]:
+        """
+        Get leveling configuration for many guilds at once.
+
+        Cached guilds are served from memory; the rest are loaded with one
+        bulk query in a worker thread and cached like get_leveling_config.
+
+        Args:
+            guild_ids: Discord guild IDs
+
+        Returns:
+            {guild_id: leveling config with defaults applied}
+        """
+        configs = {}
+        async with self.lock:
+            for guild_id in guild_ids:
+                if guild_id in self.cache:
+                    configs[guild_id] = self.cache[guild_id].copy()
+
+        missing = [guild_id for guild_id in guild_ids if guild_id not in configs]
+        if not missing:
+            return configs
+
+        from Dao.GuildDao import GuildDao
+
+        guild_dao = GuildDao()
+        try:
+            settings = await asyncio.to_thread(guild_dao.get_guild_settings_bulk, missing)
+        except Exception as e:
+            logger.error(f"Error fetching configs for {len(missing)} guilds: {e}")
+            settings = None
+        finally:
+            guild_dao.close()
+
+        if settings is None:
+            # Defaults for this call only; don't cache them
+            for guild_id in missing:
+                configs[guild_id] = self.default_config.copy()
+            return configs
+
+        loaded = {guild_id: self._merge_leveling_config(settings.get(guild_id)) for guild_id in missing}
+        async with self.lock:
+            self.cache.update(loaded)
+
+        configs.update({guild_id: config.copy() for guild_id, config in loaded.items()})
+        logger.debug(f"💾 Loaded leveling configs for {len(missing)} guilds in one query")
+        return configs
+
+    async def get_guild_settings(self, guild_id: int) -> Optional[dict]:
+        """
+        Get the complete settings JSON for a guild.
+
+        Same cache-then-DB flow as get_leveling_config. The returned dict is
+        shared with the cache, so callers must treat it as read-only.
+
+        Args:
+            guild_id: Discord guild ID
+
+        Returns:
+            Settings dict, or None if the guild has no settings or they
+            could not be loaded
+        """
+        _, settings = await self._load_guild_settings(guild_id)
+        return settings
+
+    async def _load_guild_settings(self, guild_id: int) -> Tuple[bool, Optional[dict]]:
+        """
+        Cache-then-DB lookup behind get_guild_settings.
+
+        The query runs in a worker thread. A failed load is not cached, so
+        the next call retries instead of serving "no settings" for the TTL.
+
+        Returns:
+            (loaded, settings) - loaded is False if the database query failed
+        """
+        async with self.lock:
+            if guild_id in self.settings_cache:
+                return True, self.settings_cache[guild_id]
+
+        from Dao.GuildDao import GuildDao
+
+        guild_dao = GuildDao()
+        try:
+            rows = await asyncio.to_thread(guild_dao.get_guild_settings_bulk, [guild_id])
+        except Exception as e:
+            logger.error(f"Error fetching settings for guild {guild_id}: {e}")
+            rows = None
+        finally:
+            guild_dao.close()
+
+        if rows is None:
+            logger.warning(f"Could not load settings for guild {guild_id}, will retry on next use")
+            return False, None
+
+        settings = rows.get(guild_id)
+        async with self.lock:
+            self.settings_cache[guild_id] = settings
+
+        return True, settings
+
+    async def get_role_plan(self, guild_id: int) -> Optional[RolePlan]:
+        """
+        Get the compiled level -> role plan for a guild.
+
+        Compiled from the cached guild settings on first use and dropped
+        together with them on invalidation.
+
+        Args:
+            guild_id: Discord guild ID
+
+        Returns:
+            RolePlan, or None if role rewards are disabled or unconfigured
+        """
+        async with self.lock:
+            if guild_id in self.role_plan_cache:
+                return self.role_plan_cache[guild_id]
+
+        loaded, settings = await self._load_guild_settings(guild_id)
+        plan = compile_role_plan(settings.get("roles") if settings else None)
+
+        if loaded:
+            async with self.lock:
+                self.role_plan_cache[guild_id] = plan
+
+        return plan
+
+    async def get_word_filter(self, guild_id: int) -> WordFilter:
+        """
+        Get the compiled inappropriate-word filter for a guild.
+
+        Guilds without moderation.word_filter settings share the bot-wide
+        filter; custom lists are compiled once and cached with the settings.
+
+        Args:
+            guild_id: Discord guild ID
+
+        Returns:
+            WordFilter (falsy if there are no words to filter)
+        """
+        async with self.lock:
+            if guild_id in self.word_filter_cache:
+                return self.word_filter_cache[guild_id]
+
+        loaded, settings = await self._load_guild_settings(guild_id)
+        filter_config = settings.get("moderation", {}).get("word_filter") if settings else None
+        word_filter = compile_guild_word_filter(filter_config)
+
+        if loaded:
+            async with self.lock:
+                self.word_filter_cache[guild_id] = word_filter
+
+        return word_filter
+
     async def invalidate_local(self, guild_id: int):
         """
         Manually invalidate cache for a guild (local only, no Redis broadcast).
@@ -218,6 +389,9 @@ class GuildConfigCache:
         """
         async with self.lock:
             removed = self.cache.pop(guild_id, None) is not None
+            removed = self.settings_cache.pop(guild_id, None) is not None or removed
+            removed = self.role_plan_cache.pop(guild_id, None) is not None or removed
+            removed = self.word_filter_cache.pop(guild_id, None) is not None or removed
 
         if removed:
             logger.info(f"🗑️  Manually invalidated cache for guild {guild_id}")
@@ -228,6 +402,9 @@ class GuildConfigCache:
         async with self.lock:
             return {
                 "size": len(self.cache),
+                "settings_size": len(self.settings_cache),
+                "role_plan_size": len(self.role_plan_cache),
+                "word_filter_size": len(self.word_filter_cache),
                 "maxsize": self.cache.maxsize,
                 "ttl": self.cache.ttl,
                 "redis_available": self.redis_available,
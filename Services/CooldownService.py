@@ -0,0 +1,135 @@
+"""
+Shared Per-User Cooldowns
+
+One in-process cooldown tracker for everything rate limited per member:
+XP grants, AI mentions, and any game or command that needs a cooldown.
+
+- Keyed by integer (guild_id, user_id) tuples in named buckets, no string keys
+- Stores monotonic float deadlines, so checks are a dict lookup and a compare
+- Expired entries are swept by a timing wheel with one slot per second of
+  deadline: each check only visits the slots that elapsed since the last
+  sweep, so cleanup is amortized O(1) instead of a scan of every entry
+
+Cooldowns are local to the process. XP sessions still record the last grant
+in Redis, so a member moving between processes can't double dip.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Bucket names
+XP_BUCKET = "xp"
+AI_MENTION_BUCKET = "ai_mention"
+
+CooldownKey = Tuple[int, int]
+
+
+class CooldownService:
+    """
+    Cooldown tracker with timing-wheel expiry.
+
+    Usage:
+        cooldowns = get_cooldown_service()
+        if cooldowns.try_acquire(AI_MENTION_BUCKET, guild_id, user_id, 3):
+            ...  # not on cooldown, and now it is
+    """
+
+    def __init__(self):
+        # bucket -> {(guild_id, user_id): monotonic deadline}
+        self.buckets: Dict[str, Dict[CooldownKey, float]] = defaultdict(dict)
+
+        # whole second -> [(bucket, key)] whose deadline falls in that second
+        self._wheel: Dict[int, List[Tuple[str, CooldownKey]]] = defaultdict(list)
+        self._next_slot = int(time.monotonic())
+
+        # Monitoring counters
+        self.expired = 0
+
+    def _sweep(self, now: float):
+        """Drop entries whose deadline has passed, visiting only elapsed slots."""
+        current_slot = int(now)
+        if current_slot < self._next_slot:
+            return
+
+        # After a long idle period, jump straight to the occupied slots
+        if current_slot - self._next_slot > len(self._wheel):
+            elapsed_slots = sorted(slot for slot in self._wheel if slot < current_slot)
+        else:
+            elapsed_slots = range(self._next_slot, current_slot)
+
+        for slot in elapsed_slots:
+            entries = self._wheel.pop(slot, None)
+            if not entries:
+                continue
+            for bucket, key in entries:
+                deadlines = self.buckets[bucket]
+                deadline = deadlines.get(key)
+                # Re-armed cooldowns have a later deadline in another slot
+                if deadline is not None and deadline <= now:
+                    del deadlines[key]
+                    self.expired += 1
+
+        self._next_slot = current_slot
+
+    def remaining(self, bucket: str, guild_id: int, user_id: int) -> float:
+        """Seconds left on a member's cooldown (0.0 if not on cooldown)."""
+        now = time.monotonic()
+        self._sweep(now)
+        deadline = self.buckets[bucket].get((guild_id, user_id))
+        if deadline is None or deadline <= now:
+            return 0.0
+        return deadline - now
+
+    def on_cooldown(self, bucket: str, guild_id: int, user_id: int) -> bool:
+        """Whether a member is currently on cooldown in a bucket."""
+        return self.remaining(bucket, guild_id, user_id) > 0.0
+
+    def trigger(self, bucket: str, guild_id: int, user_id: int, seconds: float):
+        """Start (or restart) a member's cooldown."""
+        now = time.monotonic()
+        self._sweep(now)
+        key = (guild_id, user_id)
+        deadline = now + seconds
+        self.buckets[bucket][key] = deadline
+        self._wheel[int(deadline)].append((bucket, key))
+
+    def try_acquire(self, bucket: str, guild_id: int, user_id: int, seconds: float) -> bool:
+        """
+        Start a cooldown unless one is already running.
+
+        Returns:
+            True if the member was free (cooldown now started), False if on cooldown
+        """
+        if self.on_cooldown(bucket, guild_id, user_id):
+            return False
+        self.trigger(bucket, guild_id, user_id, seconds)
+        return True
+
+    def reset(self, bucket: str, guild_id: int, user_id: int):
+        """Clear a member's cooldown (its wheel entry is skipped when swept)."""
+        self.buckets[bucket].pop((guild_id, user_id), None)
+
+    def get_stats(self) -> dict:
+        """Get cooldown statistics for monitoring."""
+        return {
+            "active": {bucket: len(deadlines) for bucket, deadlines in self.buckets.items()},
+            "wheel_slots": len(self._wheel),
+            "expired": self.expired,
+        }
+
+
+# Singleton instance
+_cooldown_service = None
+
+
+def get_cooldown_service() -> CooldownService:
+    """Get the singleton CooldownService instance."""
+    global _cooldown_service
+    if _cooldown_service is None:
+        _cooldown_service = CooldownService()
+    return _cooldown_service
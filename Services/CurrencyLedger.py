@@ -0,0 +1,488 @@
+"""
+Currency Ledger
+
+Single entry point for wallet currency changes: one call applies every leg
+of a transfer (any number of members plus the guild vault) atomically, or
+none of them.
+
+- Session layer (Redis available): one Lua script checks the idempotency
+  key, checks funds, and updates every member session and the guild vault
+  cache in a single round trip. The regular session flush persists the
+  deltas (currency_to_flush / vault_currency_to_flush) to MySQL. Members
+  without a session get one loaded from the database, then the script is
+  retried once.
+- Write-ahead buffer (Redis unavailable): transfers are appended to an
+  in-memory buffer and applied to MySQL in grouped transactions every
+  LEDGER_FLUSH_INTERVAL seconds (default 1), or as soon as LEDGER_FLUSH_BATCH
+  entries (default 500) are waiting.
+- Idempotency keys (e.g. f"give:{interaction.id}") make retried commands
+  and re-run tasks apply once; keys are remembered for LEDGER_IDEMPOTENCY_TTL
+  seconds (default 1 day).
+
+Balances that are changed directly in MySQL (bank deposits, withdrawals)
+should call settle() first so no session holds a stale copy.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# KEYS: idempotency key, vault key, session keys...
+# ARGV: idempotency ttl, session ttl, vault ttl, require funds, vault delta,
+#       use idempotency key, timestamp, one delta per session key
+_TRANSFER_SCRIPT = """
+if ARGV[6] == '1' then
+    local seen = redis.call('GET', KEYS[1])
+    if seen then
+        return {'duplicate', seen}
+    end
+end
+
+local sessions = {}
+local missing = {}
+for i = 3, #KEYS do
+    local data = redis.call('GET', KEYS[i])
+    if data then
+        sessions[i] = cjson.decode(data)
+    else
+        table.insert(missing, i - 2)
+    end
+end
+if #missing > 0 then
+    return {'missing', cjson.encode(missing)}
+end
+
+if ARGV[4] == '1' then
+    for i = 3, #KEYS do
+        local delta = tonumber(ARGV[i + 5])
+        local balance = sessions[i].currency or 0
+        if delta < 0 and balance + delta < 0 then
+            return {'insufficient', tostring(i - 2), tostring(balance)}
+        end
+    end
+end
+
+local balances = {}
+for i = 3, #KEYS do
+    local session = sessions[i]
+    local delta = tonumber(ARGV[i + 5])
+    session.currency = (session.currency or 0) + delta
+    session.currency_to_flush = (session.currency_to_flush or 0) + delta
+    session.last_active = ARGV[7]
+    session.dirty = true
+    redis.call('SET', KEYS[i], cjson.encode(session), 'EX', ARGV[2])
+    table.insert(balances, session.currency)
+end
+
+local vault_delta = tonumber(ARGV[5])
+if vault_delta ~= 0 then
+    local data = redis.call('GET', KEYS[2])
+    local vault = {vault_currency_to_flush = 0}
+    if data then
+        vault = cjson.decode(data)
+    end
+    vault.vault_currency_to_flush = (vault.vault_currency_to_flush or 0) + vault_delta
+    vault.last_updated = ARGV[7]
+    vault.dirty = true
+    redis.call('SET', KEYS[2], cjson.encode(vault), 'EX', ARGV[3])
+end
+
+local result = cjson.encode(balances)
+if ARGV[6] == '1' then
+    redis.call('SET', KEYS[1], result, 'EX', ARGV[1])
+end
+return {'ok', result}
+"""
+
+
+@dataclass
+class LedgerEntry:
+    """One buffered transfer waiting to be written to MySQL."""
+
+    guild_id: int
+    deltas: Dict[int, int]
+    vault_delta: int = 0
+    idempotency_key: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class TransferResult:
+    """Outcome of a ledger transfer."""
+
+    success: bool
+    balances: Dict[int, int] = field(default_factory=dict)
+    duplicate: bool = False
+    error: Optional[str] = None
+    insufficient_user_id: Optional[int] = None
+
+
+class CurrencyLedger:
+    """
+    Atomic, idempotent wallet currency transfers.
+
+    Usage:
+        ledger = get_currency_ledger()
+        result = await ledger.transfer(
+            guild_id, {giver_id: -100, target_id: 100}, idempotency_key=f"give:{interaction.id}"
+        )
+        if not result.success and result.error == "insufficient_funds":
+            ...
+    """
+
+    def __init__(self):
+        self.idempotency_ttl = int(os.getenv('LEDGER_IDEMPOTENCY_TTL', '86400'))
+        self.flush_interval = float(os.getenv('LEDGER_FLUSH_INTERVAL', '1'))
+        self.flush_batch = int(os.getenv('LEDGER_FLUSH_BATCH', '500'))
+        self.vault_ttl = 86400
+
+        # Write-ahead buffer, used when Redis is unavailable
+        self.buffer: List[LedgerEntry] = []
+        self.pending: Dict[Tuple[int, int], int] = {}
+        self.local_keys = TTLCache(maxsize=100000, ttl=self.idempotency_ttl)
+        self.buffer_lock = asyncio.Lock()
+        self.flush_lock = asyncio.Lock()
+        self.flush_task = None
+        self._script = None
+
+        # Monitoring counters
+        self.transfers = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.buffered = 0
+        self.flushed_entries = 0
+        self.flush_failures = 0
+
+    def _idempotency_key(self, key: str) -> str:
+        """Generate Redis key for a transfer's idempotency record."""
+        return f"ledger:idem:{key}"
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    async def start(self):
+        """Start the periodic write-ahead buffer flush."""
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                if self.buffer:
+                    await self.flush()
+        except asyncio.CancelledError:
+            logger.info("Currency ledger flush task stopped")
+
+    async def transfer(
+        self,
+        guild_id: int,
+        deltas: Dict[int, int],
+        vault_delta: int = 0,
+        idempotency_key: Optional[str] = None,
+        require_funds: bool = True
+    ) -> TransferResult:
+        """
+        Apply a set of currency changes in one guild atomically.
+
+        Args:
+            guild_id: Discord guild ID
+            deltas: user_id -> currency delta (negative for debits)
+            vault_delta: Change to the guild vault
+            idempotency_key: Transfers with a key already seen are not applied again
+            require_funds: Reject the transfer if any debit would leave a member below zero
+
+        Returns:
+            TransferResult with each member's new balance. error is
+            "insufficient_funds" (with insufficient_user_id) or "unknown_user"
+            when nothing was applied.
+        """
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if not deltas and not vault_delta:
+            return TransferResult(success=True)
+
+        redis = self._redis()
+        if redis is not None:
+            try:
+                result = await self._transfer_in_sessions(
+                    redis, guild_id, deltas, vault_delta, idempotency_key, require_funds
+                )
+            except Exception as e:
+                logger.error(f"Ledger session transfer failed in guild {guild_id}, buffering instead: {e}")
+                result = None
+            if result is not None:
+                return self._count(result)
+
+        return self._count(await self._transfer_in_buffer(guild_id, deltas, vault_delta, idempotency_key, require_funds))
+
+    def _count(self, result: TransferResult) -> TransferResult:
+        if result.duplicate:
+            self.duplicates += 1
+        elif result.success:
+            self.transfers += 1
+        else:
+            self.rejected += 1
+        return result
+
+    async def _run_script(self, redis, guild_id, user_ids, deltas, vault_delta, idempotency_key, require_funds):
+        if self._script is None:
+            self._script = redis.register_script(_TRANSFER_SCRIPT)
+
+        manager = get_session_manager()
+        keys = [
+            self._idempotency_key(idempotency_key or ""),
+            manager._guild_vault_key(guild_id),
+            *[manager._session_key(guild_id, user_id) for user_id in user_ids],
+        ]
+        args = [
+            self.idempotency_ttl,
+            manager.session_ttl,
+            self.vault_ttl,
+            1 if require_funds else 0,
+            vault_delta,
+            1 if idempotency_key else 0,
+            datetime.now(timezone.utc).isoformat(),
+            *[deltas[user_id] for user_id in user_ids],
+        ]
+        return await self._script(keys=keys, args=args, client=redis)
+
+    async def _transfer_in_sessions(self, redis, guild_id, deltas, vault_delta, idempotency_key, require_funds):
+        """Apply the transfer to the member sessions; None if the session layer can't take it."""
+        user_ids = list(deltas)
+
+        for attempt in range(2):
+            status, *payload = await self._run_script(
+                redis, guild_id, user_ids, deltas, vault_delta, idempotency_key, require_funds
+            )
+
+            if status in ('ok', 'duplicate'):
+                balances = json.loads(payload[0]) or []
+                return TransferResult(
+                    success=True,
+                    balances=dict(zip(user_ids, balances)),
+                    duplicate=status == 'duplicate'
+                )
+
+            if status == 'insufficient':
+                user_id = user_ids[int(payload[0]) - 1]
+                return TransferResult(
+                    success=False,
+                    balances={user_id: int(float(payload[1]))},
+                    error="insufficient_funds",
+                    insufficient_user_id=user_id
+                )
+
+            # Some members have no session yet: load them and try once more
+            missing = [user_ids[index - 1] for index in json.loads(payload[0])]
+            if attempt or not await self._load_sessions(guild_id, missing):
+                return TransferResult(success=False, error="unknown_user")
+
+        return None
+
+    async def _load_sessions(self, guild_id: int, user_ids: List[int]) -> bool:
+        from Dao.GuildUserDao import GuildUserDao
+        from Dao.UserDao import UserDao
+
+        manager = get_session_manager()
+        guild_user_dao = GuildUserDao()
+        user_dao = UserDao()
+        try:
+            for user_id in user_ids:
+                session = await manager.get_or_create_session(guild_id, user_id, guild_user_dao, user_dao)
+                if session is None:
+                    logger.warning(f"Ledger could not load a session for user {user_id} in guild {guild_id}")
+                    return False
+            return True
+        finally:
+            guild_user_dao.close()
+            user_dao.close()
+
+    async def _transfer_in_buffer(self, guild_id, deltas, vault_delta, idempotency_key, require_funds):
+        """Check funds against MySQL plus buffered deltas, then append to the write-ahead buffer."""
+        from Dao.GuildUserDao import GuildUserDao
+
+        async with self.buffer_lock:
+            if idempotency_key and idempotency_key in self.local_keys:
+                return TransferResult(success=True, balances=self.local_keys[idempotency_key], duplicate=True)
+
+            guild_user_dao = GuildUserDao()
+            try:
+                balances = {}
+                for user_id, delta in deltas.items():
+                    guild_user = await asyncio.to_thread(guild_user_dao.get_guild_user, user_id, guild_id)
+                    if guild_user is None:
+                        return TransferResult(success=False, error="unknown_user")
+                    balance = guild_user.currency + self.pending.get((guild_id, user_id), 0)
+                    if require_funds and delta < 0 and balance + delta < 0:
+                        return TransferResult(
+                            success=False,
+                            balances={user_id: balance},
+                            error="insufficient_funds",
+                            insufficient_user_id=user_id
+                        )
+                    balances[user_id] = balance + delta
+            finally:
+                guild_user_dao.close()
+
+            self.buffer.append(LedgerEntry(guild_id, deltas, vault_delta, idempotency_key))
+            for user_id, delta in deltas.items():
+                self.pending[(guild_id, user_id)] = self.pending.get((guild_id, user_id), 0) + delta
+            if idempotency_key:
+                self.local_keys[idempotency_key] = balances
+            self.buffered += 1
+            should_flush = len(self.buffer) >= self.flush_batch
+
+        if should_flush:
+            await self.flush()
+        return TransferResult(success=True, balances=balances)
+
+    async def flush(self) -> int:
+        """
+        Write buffered transfers to MySQL in one grouped transaction.
+
+        Returns:
+            Number of transfers written (0 if the write failed; they stay buffered)
+        """
+        from Dao.GuildUserDao import GuildUserDao
+
+        async with self.flush_lock:
+            async with self.buffer_lock:
+                entries, self.buffer = self.buffer, []
+            if not entries:
+                return 0
+
+            member_deltas: Dict[Tuple[int, int], int] = {}
+            vault_deltas: Dict[int, int] = {}
+            for entry in entries:
+                for user_id, delta in entry.deltas.items():
+                    member_deltas[(entry.guild_id, user_id)] = member_deltas.get((entry.guild_id, user_id), 0) + delta
+                if entry.vault_delta:
+                    vault_deltas[entry.guild_id] = vault_deltas.get(entry.guild_id, 0) + entry.vault_delta
+
+            guild_user_dao = GuildUserDao()
+            try:
+                written = await asyncio.to_thread(guild_user_dao.apply_currency_deltas, member_deltas, vault_deltas)
+            finally:
+                guild_user_dao.close()
+
+            async with self.buffer_lock:
+                if not written:
+                    # Keep them, ahead of anything buffered meanwhile
+                    self.buffer[:0] = entries
+                    self.flush_failures += 1
+                    logger.error(f"Ledger flush of {len(entries)} transfers failed, will retry")
+                    return 0
+
+                for key, delta in member_deltas.items():
+                    remaining = self.pending.get(key, 0) - delta
+                    if remaining:
+                        self.pending[key] = remaining
+                    else:
+                        self.pending.pop(key, None)
+
+            self.flushed_entries += len(entries)
+            logger.debug(f"Ledger flushed {len(entries)} transfers ({len(member_deltas)} members, {len(vault_deltas)} vaults)")
+            return len(entries)
+
+    async def settle(self, guild_id: int, user_id: int) -> bool:
+        """
+        Make MySQL the only copy of a member's balance before changing it directly.
+
+        Writes out any buffered transfers, then flushes the member's session
+        and drops it (the next activity reloads it from the database).
+
+        Returns:
+            True if the database row is current; on False the caller must not
+            read or write the balance directly
+        """
+        if self.buffer and not await self.flush():
+            return False
+
+        return await get_session_manager().flush_and_drop_session(guild_id, user_id)
+
+    async def write_through(self, guild_id: int, deltas: Dict[int, int], vault_delta: int = 0) -> bool:
+        """
+        Apply a transfer straight to MySQL in one transaction.
+
+        For members who shouldn't get a session (e.g. they just left the
+        guild); call settle() for each of them first.
+        """
+        from Dao.GuildUserDao import GuildUserDao
+
+        guild_user_dao = GuildUserDao()
+        try:
+            written = await asyncio.to_thread(
+                guild_user_dao.apply_currency_deltas,
+                {(guild_id, user_id): delta for user_id, delta in deltas.items()},
+                {guild_id: vault_delta} if vault_delta else None
+            )
+        finally:
+            guild_user_dao.close()
+
+        self._count(TransferResult(success=written))
+        return written
+
+    def get_stats(self) -> dict:
+        """Get ledger statistics for monitoring."""
+        return {
+            "transfers": self.transfers,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "buffered": self.buffered,
+            "buffer_size": len(self.buffer),
+            "flushed_entries": self.flushed_entries,
+            "flush_failures": self.flush_failures,
+        }
+
+    async def cleanup(self):
+        """Stop the flush task and write out anything still buffered."""
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+        if self.buffer:
+            await self.flush()
+        if self.buffer:
+            logger.error(f"⚠️ {len(self.buffer)} ledger transfers could not be written on shutdown")
+
+
+# Singleton instance
+_currency_ledger = None
+
+
+def get_currency_ledger() -> CurrencyLedger:
+    """Get the singleton CurrencyLedger instance."""
+    global _currency_ledger
+    if _currency_ledger is None:
+        _currency_ledger = CurrencyLedger()
+    return _currency_ledger
+
+
+async def initialize_currency_ledger():
+    """Start the currency ledger's buffer flush."""
+    await get_currency_ledger().start()
+
+
+async def cleanup_currency_ledger():
+    """Flush and stop the currency ledger."""
+    global _currency_ledger
+    if _currency_ledger:
+        await _currency_ledger.cleanup()
+        _currency_ledger = None
@@ -97,6 +97,28 @@ class DailyCheckCache:
                 "estimated_checks_prevented": len(self.checked_today) * 99  # Rough estimate
             }
 
+    async def invalidate_guilds(self, guild_ids) -> int:
+        """
+        Forget which users were checked in the given guilds.
+
+        Called after the midnight reset so everyone's daily status is
+        re-read on their next message.
+
+        Args:
+            guild_ids: Iterable of Discord guild IDs
+
+        Returns:
+            Number of entries removed
+        """
+        guild_ids = set(guild_ids)
+        async with self.lock:
+            old_size = len(self.checked_today)
+            self.checked_today = {key for key in self.checked_today if key[0] not in guild_ids}
+            self.current_date = datetime.now(timezone.utc).date()
+            removed = old_size - len(self.checked_today)
+        logger.info(f"🌅 Daily check cache invalidated for {len(guild_ids)} guild(s). Cleared {removed} entries.")
+        return removed
+
     async def force_reset(self):
         """
         Force reset the cache (for testing or manual intervention).
@@ -0,0 +1,187 @@
+"""
+Cache-first Discord Entity Resolution
+
+Resolves users, members and messages without spending REST calls (and
+global rate limit) on objects the bot already has.
+
+Lookup order:
+1. Gateway cache: bot.get_user, guild.get_member (dict lookups; messages
+   skip this step, bot.cached_messages can only be scanned linearly)
+2. Bounded TTL cache of objects this resolver fetched or was handed before
+   (RESOLVER_CACHE_TTL seconds, default 300); misses that came back as
+   NotFound/Forbidden are remembered for RESOLVER_NEGATIVE_TTL seconds
+   (default 60) so deleted messages aren't refetched every loop
+3. REST fetch in its own task; concurrent requests for the same ID share
+   it, and a caller being cancelled doesn't cancel it for the others
+
+Callers that only need to edit or delete a message can use
+partial_message(), which never fetches. After editing a resolved message,
+pass the returned message to remember_message() so the cache keeps the
+edited version.
+"""
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Optional
+
+import discord
+from cachetools import TTLCache
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+_MISSING = object()
+
+
+class EntityResolver:
+    """
+    Gateway cache -> TTL cache -> coalesced REST resolution.
+
+    Usage:
+        resolver = get_entity_resolver()
+        user = await resolver.get_user(bot, user_id)
+        member = await resolver.get_member(guild, user_id)
+        message = await resolver.get_message(bot, channel, message_id)
+    """
+
+    KINDS = ("user", "member", "message")
+
+    def __init__(self):
+        cache_ttl = int(os.getenv('RESOLVER_CACHE_TTL', '300'))
+        negative_ttl = int(os.getenv('RESOLVER_NEGATIVE_TTL', '60'))
+
+        self.cache = TTLCache(maxsize=20000, ttl=cache_ttl)
+        self.missing = TTLCache(maxsize=20000, ttl=negative_ttl)
+        self.inflight: Dict[tuple, asyncio.Task] = {}
+
+        # Monitoring counters, per kind
+        self.stats = {
+            kind: {"gateway_hits": 0, "cache_hits": 0, "fetches": 0, "coalesced": 0, "not_found": 0}
+            for kind in self.KINDS
+        }
+
+    async def _resolve(self, key: tuple, fetch: Callable[[], Awaitable]):
+        """Serve key from the TTL caches, or fetch it once however many callers are waiting."""
+        kind = key[0]
+        stats = self.stats[kind]
+
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            stats["cache_hits"] += 1
+            return cached
+        if key in self.missing:
+            stats["cache_hits"] += 1
+            return None
+
+        task = self.inflight.get(key)
+        if task is None:
+            stats["fetches"] += 1
+            task = self.inflight[key] = asyncio.create_task(self._fetch(key, fetch))
+            # Mark the outcome retrieved so an error nobody awaited isn't logged as unhandled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        else:
+            stats["coalesced"] += 1
+
+        # Every caller (the first one too) waits through a shield, so cancelling
+        # one of them leaves the fetch running for the rest
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: tuple, fetch: Callable[[], Awaitable]):
+        """Fetch task behind _resolve: caches the result (or the miss) for key."""
+        try:
+            try:
+                result = await fetch()
+            except (discord.NotFound, discord.Forbidden):
+                self.stats[key[0]]["not_found"] += 1
+                self.missing[key] = True
+                return None
+            self.cache[key] = result
+            return result
+        finally:
+            self.inflight.pop(key, None)
+
+    async def get_user(self, bot, user_id: int) -> Optional[discord.User]:
+        """
+        Resolve a user.
+
+        Returns:
+            User, or None if the user doesn't exist
+        """
+        user = bot.get_user(user_id)
+        if user is not None:
+            self.stats["user"]["gateway_hits"] += 1
+            return user
+        return await self._resolve(("user", user_id), lambda: bot.fetch_user(user_id))
+
+    async def get_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """
+        Resolve a guild member.
+
+        Returns:
+            Member, or None if the user isn't in the guild
+        """
+        member = guild.get_member(user_id)
+        if member is not None:
+            self.stats["member"]["gateway_hits"] += 1
+            return member
+        return await self.fetch_member(guild, user_id)
+
+    async def fetch_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """
+        Resolve a member as REST returns it (no presence data), skipping the
+        gateway cache but still served from the TTL cache and coalesced.
+        """
+        return await self._resolve(("member", guild.id, user_id), lambda: guild.fetch_member(user_id))
+
+    async def get_message(self, bot, channel, message_id: int) -> Optional[discord.Message]:
+        """
+        Resolve a message in a channel.
+
+        Messages the bot sent or edited should be handed to remember_message()
+        so they're served from the TTL cache.
+
+        Returns:
+            Message, or None if it was deleted or can't be read
+        """
+        return await self._resolve(("message", message_id), lambda: channel.fetch_message(message_id))
+
+    def partial_message(self, channel, message_id: int) -> discord.PartialMessage:
+        """Get a message handle for edit/delete/pin without fetching it."""
+        return channel.get_partial_message(message_id)
+
+    def remember_message(self, message: discord.Message):
+        """Cache a message (e.g. the one returned by message.edit)."""
+        key = ("message", message.id)
+        self.missing.pop(key, None)
+        self.cache[key] = message
+
+    def forget_message(self, message_id: int):
+        """Drop a message from the cache (e.g. after deleting it)."""
+        self.cache.pop(("message", message_id), None)
+
+    def get_stats(self) -> dict:
+        """Get resolver statistics (per-kind counters and hit rate) for monitoring."""
+        stats = {}
+        for kind, counters in self.stats.items():
+            hits = counters["gateway_hits"] + counters["cache_hits"] + counters["coalesced"]
+            lookups = hits + counters["fetches"]
+            stats[kind] = {
+                **counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+            }
+        stats["cached"] = len(self.cache)
+        stats["cached_missing"] = len(self.missing)
+        return stats
+
+
+# Singleton instance
+_entity_resolver = None
+
+
+def get_entity_resolver() -> EntityResolver:
+    """Get the singleton EntityResolver instance."""
+    global _entity_resolver
+    if _entity_resolver is None:
+        _entity_resolver = EntityResolver()
+    return _entity_resolver
@@ -0,0 +1,224 @@
+"""
+Global Stats Counters
+
+Keeps running bot-wide totals (messages, reactions, currency, XP) and a
+rolling active-user estimate so /admin-stats doesn't scan the Users table.
+
+- Totals live in a Redis hash and are bumped with the deltas each session
+  flush writes to MySQL (SessionManager._flush_session_to_db), once the
+  first reconcile has filled the hash
+- Active users are counted with one HyperLogLog per UTC hour; the rolling
+  window is the PFCOUNT union of the last GLOBAL_STATS_ACTIVE_HOURS buckets
+- reconcile() overwrites the totals from a single SUM scan of Users, which
+  also picks up currency changes made outside sessions (transfers, admin
+  gives, bank); the reconcile task runs it every
+  GLOBAL_STATS_RECONCILE_INTERVAL seconds (default 1 hour)
+- Falls back to in-process counters and per-hour sets if Redis is unavailable
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Set
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+COUNTER_FIELDS = ("messages", "reactions", "currency", "exp")
+COUNTERS_KEY = "global_stats:counters"
+
+# Bump the totals only once a reconcile has filled the hash, so flushes
+# before it don't leave delta-only totals that read as real ones.
+# KEYS: counters hash. ARGV: field, delta pairs. Returns 1 if applied.
+_RECORD_FLUSH_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+class GlobalStatsService:
+    """
+    Running global totals and a rolling active-user count.
+
+    Usage:
+        stats = get_global_stats_service()
+        await stats.record_flush(user_id, messages=3, exp=45)
+        totals = await stats.get_totals()  # None until the first reconcile
+    """
+
+    def __init__(self):
+        self.active_window_hours = int(os.getenv('GLOBAL_STATS_ACTIVE_HOURS', '24'))
+        self.reconcile_interval = int(os.getenv('GLOBAL_STATS_RECONCILE_INTERVAL', '3600'))
+
+        # Used when Redis is unavailable
+        self.local_counters: Dict[str, int] = {}
+        self.local_active: Dict[int, Set[int]] = {}
+
+        # Monitoring counters
+        self.flushes_recorded = 0
+        self.reconciliations = 0
+        self.last_reconciled: Optional[float] = None
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    def _current_hour(self) -> int:
+        return int(time.time() // 3600)
+
+    def _active_key(self, hour: int) -> str:
+        """Generate Redis key for an hour's active-user HyperLogLog."""
+        return f"global_stats:active:{hour}"
+
+    def _window_hours(self):
+        current = self._current_hour()
+        return range(current - self.active_window_hours + 1, current + 1)
+
+    async def record_flush(
+        self,
+        user_id: int,
+        messages: int = 0,
+        reactions: int = 0,
+        currency: int = 0,
+        exp: int = 0
+    ):
+        """
+        Apply the deltas from one flushed session and mark the user active.
+
+        Args:
+            user_id: Discord user ID
+            messages: Messages written to the DB by this flush
+            reactions: Reactions written to the DB by this flush
+            currency: Net currency change written to the DB by this flush
+            exp: Global XP change written to the DB by this flush
+        """
+        deltas = {"messages": messages, "reactions": reactions, "currency": currency, "exp": exp}
+        hour = self._current_hour()
+        self.flushes_recorded += 1
+
+        redis = self._redis()
+        if redis is None:
+            # Only count on top of a reconciled baseline, like the Redis hash
+            if self.local_counters:
+                for field, value in deltas.items():
+                    self.local_counters[field] = self.local_counters.get(field, 0) + value
+            self.local_active.setdefault(hour, set()).add(user_id)
+            self._prune_local_active()
+            return
+
+        try:
+            changed = [arg for field, value in deltas.items() if value for arg in (field, value)]
+            if changed:
+                await redis.eval(_RECORD_FLUSH_SCRIPT, 1, COUNTERS_KEY, *changed)
+
+            active_key = self._active_key(hour)
+            pipe = redis.pipeline(transaction=False)
+            pipe.pfadd(active_key, user_id)
+            pipe.expire(active_key, (self.active_window_hours + 1) * 3600)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not record global stats for user {user_id}: {e}")
+
+    def _prune_local_active(self):
+        oldest = self._current_hour() - self.active_window_hours
+        for hour in [h for h in self.local_active if h <= oldest]:
+            del self.local_active[hour]
+
+    async def get_totals(self) -> Optional[dict]:
+        """
+        Get the running totals.
+
+        Returns:
+            dict with messages, reactions, currency, exp and active_users,
+            or None if the counters haven't been reconciled yet
+        """
+        redis = self._redis()
+        if redis is None:
+            if not self.local_counters:
+                return None
+            self._prune_local_active()
+            hll_active = len(set().union(*self.local_active.values())) if self.local_active else 0
+            counters = dict(self.local_counters)
+        else:
+            try:
+                pipe = redis.pipeline(transaction=False)
+                pipe.hgetall(COUNTERS_KEY)
+                pipe.pfcount(*[self._active_key(hour) for hour in self._window_hours()])
+                raw_counters, hll_active = await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Could not read global stats: {e}")
+                return None
+            if not raw_counters:
+                return None
+            counters = {field: int(value) for field, value in raw_counters.items()}
+
+        totals = {field: counters.get(field, 0) for field in COUNTER_FIELDS}
+        # The HyperLogLog only knows users flushed since it started filling;
+        # the reconciled DB count covers the rest of the window
+        totals["active_users"] = max(hll_active, counters.get("active_users", 0))
+        return totals
+
+    async def reconcile(self) -> bool:
+        """
+        Overwrite the running totals from MySQL.
+
+        Deltas recorded between the SUM scan and the overwrite can be lost;
+        the drift is bounded by one reconcile interval.
+
+        Returns:
+            True if the totals were refreshed
+        """
+        from Dao.UserDao import UserDao
+
+        user_dao = UserDao()
+        try:
+            totals = await asyncio.to_thread(user_dao.get_global_totals, self.active_window_hours)
+        finally:
+            user_dao.close()
+
+        if totals is None:
+            return False
+
+        redis = self._redis()
+        if redis is None:
+            self.local_counters = dict(totals)
+        else:
+            try:
+                await redis.hset(COUNTERS_KEY, mapping=totals)
+            except Exception as e:
+                logger.warning(f"Could not store reconciled global stats: {e}")
+                return False
+
+        self.reconciliations += 1
+        self.last_reconciled = time.time()
+        logger.info(f"📊 Reconciled global stats: {totals}")
+        return True
+
+    def get_stats(self) -> dict:
+        """Get global stats service statistics for monitoring."""
+        return {
+            "flushes_recorded": self.flushes_recorded,
+            "reconciliations": self.reconciliations,
+            "last_reconciled": self.last_reconciled,
+            "local_active_hours": len(self.local_active),
+        }
+
+
+# Singleton instance
+_global_stats_service = None
+
+
+def get_global_stats_service() -> GlobalStatsService:
+    """Get the singleton GlobalStatsService instance."""
+    global _global_stats_service
+    if _global_stats_service is None:
+        _global_stats_service = GlobalStatsService()
+    return _global_stats_service
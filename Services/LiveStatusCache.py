@@ -0,0 +1,211 @@
+"""
+Streamer Live Status Cache
+
+Shares Twitch/Kick lookups between every guild (and every bot process)
+tracking the same streamer, so API calls scale with unique streamers rather
+than announcements.
+
+- get_live_streams() dedupes the requested logins, serves the ones checked
+  in the last LIVE_STATUS_TTL seconds (default 25, under the 30s status
+  update interval) from memory or Redis, and fetches the rest in one
+  batch call; offline results are cached too, but only from a fetch that
+  succeeded (fetches raise LiveStatusUnavailable when the API failed)
+- Platform user IDs never change for a login, so resolved IDs are kept for
+  good: in memory and in the Redis hash {platform}:user_ids
+- Works without Redis (per-process caching only)
+
+    cache = get_live_status_cache()
+    live = await cache.get_live_streams(
+        "twitch", usernames, lambda logins: twitch_service.get_live_streams_batch(session, logins)
+    )
+"""
+
+import json
+import os
+from typing import Awaitable, Callable, Dict, Iterable, List
+
+from cachetools import TTLCache
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Stored for logins that were checked and found offline
+_OFFLINE = "offline"
+
+
+class LiveStatusUnavailable(Exception):
+    """Raised by a batch fetch when the platform API could not be queried."""
+
+
+def unique_logins(usernames: Iterable[str]) -> List[str]:
+    """Lowercase and dedupe logins, keeping their first-seen order."""
+    return list(dict.fromkeys(username.lower() for username in usernames if username))
+
+
+class LiveStatusCache:
+    """
+    Short-lived live status and permanent user IDs per platform login.
+
+    Usage:
+        cache = get_live_status_cache()
+        live = await cache.get_live_streams("kick", usernames, fetch)
+        ids = await cache.get_user_ids("kick", usernames)
+    """
+
+    def __init__(self):
+        self.status_ttl = int(os.getenv('LIVE_STATUS_TTL', '25'))
+        self.statuses = TTLCache(maxsize=50000, ttl=self.status_ttl)  # (platform, login) -> data or _OFFLINE
+        self.user_ids: Dict[str, Dict[str, str]] = {}  # platform -> login -> user ID
+
+        # Monitoring counters
+        self.requested = 0
+        self.cache_hits = 0
+        self.fetched = 0
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    def _status_key(self, platform: str, login: str) -> str:
+        """Generate Redis key for a login's last live status."""
+        return f"live_status:{platform}:{login}"
+
+    def _user_ids_key(self, platform: str) -> str:
+        """Generate Redis key for a platform's login -> user ID hash."""
+        return f"{platform}:user_ids"
+
+    async def get_live_streams(
+        self,
+        platform: str,
+        usernames: Iterable[str],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, dict]]]
+    ) -> Dict[str, dict]:
+        """
+        Get live status for each unique login, fetching only stale ones.
+
+        Args:
+            platform: "twitch" or "kick"
+            usernames: Logins, duplicates and any case allowed
+            fetch: Batch lookup for a list of lowercase logins, returning
+                {login: stream data} for the live ones (the services'
+                get_live_streams_batch)
+
+        Returns:
+            {lowercase login: stream data} for logins that are live
+
+        Raises:
+            LiveStatusUnavailable: fetch failed; nothing was cached, so the
+                next call asks the API again
+        """
+        logins = unique_logins(usernames)
+        self.requested += len(logins)
+
+        statuses = {}
+        missing = []
+        for login in logins:
+            cached = self.statuses.get((platform, login))
+            if cached is None:
+                missing.append(login)
+            else:
+                statuses[login] = cached
+
+        redis = self._redis()
+        if missing and redis is not None:
+            try:
+                values = await redis.mget([self._status_key(platform, login) for login in missing])
+                still_missing = []
+                for login, value in zip(missing, values):
+                    if value is None:
+                        still_missing.append(login)
+                    else:
+                        status = value if value == _OFFLINE else json.loads(value)
+                        statuses[login] = status
+                        self.statuses[(platform, login)] = status
+                missing = still_missing
+            except Exception as e:
+                logger.warning(f"Could not read cached {platform} live status from Redis: {e}")
+
+        self.cache_hits += len(logins) - len(missing)
+
+        if missing:
+            live = await fetch(missing)
+            self.fetched += len(missing)
+
+            pipe = redis.pipeline(transaction=False) if redis is not None else None
+            for login in missing:
+                status = live.get(login) or _OFFLINE
+                statuses[login] = status
+                self.statuses[(platform, login)] = status
+                if pipe is not None:
+                    value = status if status == _OFFLINE else json.dumps(status)
+                    pipe.set(self._status_key(platform, login), value, ex=self.status_ttl)
+            if pipe is not None:
+                try:
+                    await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Could not cache {platform} live status in Redis: {e}")
+
+        return {login: status for login, status in statuses.items() if status != _OFFLINE}
+
+    async def get_user_ids(self, platform: str, usernames: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the user IDs already resolved for these logins.
+
+        Returns:
+            {lowercase login: user ID} for the logins with a known ID
+        """
+        known = self.user_ids.setdefault(platform, {})
+        logins = unique_logins(usernames)
+        missing = [login for login in logins if login not in known]
+
+        redis = self._redis()
+        if missing and redis is not None:
+            try:
+                values = await redis.hmget(self._user_ids_key(platform), missing)
+                for login, user_id in zip(missing, values):
+                    if user_id is not None:
+                        known[login] = user_id
+            except Exception as e:
+                logger.warning(f"Could not read {platform} user IDs from Redis: {e}")
+
+        return {login: known[login] for login in logins if login in known}
+
+    async def remember_user_ids(self, platform: str, user_ids: Dict[str, str]):
+        """Store newly resolved {login: user ID} pairs for good."""
+        if not user_ids:
+            return
+
+        user_ids = {login.lower(): str(user_id) for login, user_id in user_ids.items()}
+        self.user_ids.setdefault(platform, {}).update(user_ids)
+
+        redis = self._redis()
+        if redis is not None:
+            try:
+                await redis.hset(self._user_ids_key(platform), mapping=user_ids)
+            except Exception as e:
+                logger.warning(f"Could not store {platform} user IDs in Redis: {e}")
+
+    def get_stats(self) -> dict:
+        """Get cache statistics for monitoring."""
+        return {
+            "requested": self.requested,
+            "cache_hits": self.cache_hits,
+            "fetched": self.fetched,
+            "cached_statuses": len(self.statuses),
+            "known_user_ids": {platform: len(ids) for platform, ids in self.user_ids.items()},
+        }
+
+
+# Singleton instance
+_live_status_cache = None
+
+
+def get_live_status_cache() -> LiveStatusCache:
+    """Get the singleton LiveStatusCache instance."""
+    global _live_status_cache
+    if _live_status_cache is None:
+        _live_status_cache = LiveStatusCache()
+    return _live_status_cache
@@ -0,0 +1,388 @@
+"""
+Lottery Participation Store
+
+Keeps lottery entries in one Redis set per event so entering and drawing
+don't touch the LotteryParticipants table on the hot path.
+
+- enter():  SADD into the event's entrant set; duplicates are rejected by
+            the set itself, new entrants are also queued in a pending set
+- count():  SCARD of the entrant set
+- draw():   SRANDMEMBER candidates from the entrant set
+- flush():  SPOPs the pending set and writes it to LotteryParticipants with
+            one multi-row INSERT, every LOTTERY_FLUSH_INTERVAL seconds
+            (default 30); failed batches go back into the pending set
+- Entrant sets are hydrated from LotteryParticipants on first use, so
+  lotteries started before a restart (or before this store) keep their
+  entrants
+- The current event per guild is cached for LOTTERY_EVENT_CACHE_TTL seconds
+  (default 30), so reactions on ordinary messages don't query LotteryEvents
+- Vault totals shown to entrants are the guild's stored vault (cached for
+  the same TTL) plus the pending vault delta from the session cache
+- Falls back to direct LotteryParticipants reads and writes if Redis is
+  unavailable
+"""
+
+import asyncio
+import os
+import random
+from typing import List, Optional
+
+from cachetools import TTLCache
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Add an entrant and queue them for the DB in one step.
+# KEYS: entrant set, pending set. ARGV: user ID, key TTL. Returns 1 if new.
+_ENTER_SCRIPT = """
+local added = redis.call('SADD', KEYS[1], ARGV[1])
+if added == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return added
+"""
+
+
+class LotteryService:
+    """
+    Lottery entrant sets with bulk persistence.
+
+    Usage:
+        lottery = get_lottery_service()
+        event = await lottery.get_current_event(guild_id)
+        if await lottery.enter(event.id, user_id):
+            entrants = await lottery.count(event.id)
+    """
+
+    def __init__(self):
+        self.flush_interval = float(os.getenv('LOTTERY_FLUSH_INTERVAL', '30'))
+        self.event_cache_ttl = int(os.getenv('LOTTERY_EVENT_CACHE_TTL', '30'))
+        self.key_ttl = 7 * 86400  # Entrant sets outlive any lottery duration
+
+        self.event_cache = TTLCache(maxsize=10000, ttl=self.event_cache_ttl)
+        self.vault_cache = TTLCache(maxsize=10000, ttl=self.event_cache_ttl)
+        self.active_events = set()  # Events with entrants that may still need flushing
+        self.flush_lock = asyncio.Lock()
+        self.flush_task = None
+
+        # Monitoring counters
+        self.entries = 0
+        self.duplicate_entries = 0
+        self.flushed_entries = 0
+        self.flush_failures = 0
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    def _entrants_key(self, event_id: int) -> str:
+        """Generate Redis key for an event's entrant set."""
+        return f"lottery:{event_id}:entrants"
+
+    def _pending_key(self, event_id: int) -> str:
+        """Generate Redis key for an event's entrants not yet written to the DB."""
+        return f"lottery:{event_id}:pending"
+
+    def _hydrated_key(self, event_id: int) -> str:
+        """Generate Redis key marking an entrant set as loaded from the DB."""
+        return f"lottery:{event_id}:hydrated"
+
+    async def start(self):
+        """Start the periodic entrant flush."""
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                if self.active_events:
+                    await self.flush()
+        except asyncio.CancelledError:
+            logger.info("Lottery entrant flush task stopped")
+
+    async def get_current_event(self, guild_id: int):
+        """
+        Get the guild's running lottery event (cached).
+
+        Returns:
+            LotteryEvent, or None if the guild has no running lottery
+        """
+        if guild_id in self.event_cache:
+            return self.event_cache[guild_id]
+
+        from Dao.LotteryEventDao import LotteryEventDao
+
+        le_dao = LotteryEventDao()
+        try:
+            event = await asyncio.to_thread(le_dao.get_current_event, guild_id)
+        finally:
+            le_dao.close()
+
+        self.event_cache[guild_id] = event
+        return event
+
+    def invalidate_event(self, guild_id: int):
+        """Drop the cached current event after a lottery starts or ends."""
+        self.event_cache.pop(guild_id, None)
+        self.vault_cache.pop(guild_id, None)
+
+    async def _hydrate(self, redis, event_id: int):
+        """Load an event's existing DB entrants into its set, once."""
+        if await redis.exists(self._hydrated_key(event_id)):
+            return
+
+        from Dao.LotteryParticipantDao import LotteryParticipantDao
+
+        lp_dao = LotteryParticipantDao()
+        try:
+            participant_ids = await asyncio.to_thread(lp_dao.get_participant_ids, event_id)
+        finally:
+            lp_dao.close()
+
+        pipe = redis.pipeline(transaction=True)
+        if participant_ids:
+            pipe.sadd(self._entrants_key(event_id), *participant_ids)
+        pipe.set(self._hydrated_key(event_id), 1, ex=self.key_ttl)
+        await pipe.execute()
+
+    async def enter(self, event_id: int, user_id: int) -> bool:
+        """
+        Enter a user into a lottery.
+
+        Returns:
+            True if the user was entered, False if they had already entered
+            (or the entry could not be stored)
+        """
+        redis = self._redis()
+        if redis is None:
+            return await self._enter_in_db(event_id, user_id)
+
+        try:
+            await self._hydrate(redis, event_id)
+
+            added = await redis.eval(
+                _ENTER_SCRIPT, 2, self._entrants_key(event_id), self._pending_key(event_id),
+                user_id, self.key_ttl
+            )
+            if added:
+                self.active_events.add(event_id)
+        except Exception as e:
+            logger.error(f"Lottery entry via Redis failed for event {event_id}, writing to DB: {e}")
+            return await self._enter_in_db(event_id, user_id)
+
+        if added:
+            self.entries += 1
+        else:
+            self.duplicate_entries += 1
+        return bool(added)
+
+    async def _enter_in_db(self, event_id: int, user_id: int) -> bool:
+        from Dao.LotteryParticipantDao import LotteryParticipantDao
+
+        lp_dao = LotteryParticipantDao()
+        try:
+            inserted = await asyncio.to_thread(lp_dao.try_add_participant, event_id, user_id)
+        finally:
+            lp_dao.close()
+
+        if inserted:
+            self.entries += 1
+        else:
+            self.duplicate_entries += 1
+        return inserted
+
+    async def count(self, event_id: int) -> int:
+        """Get the number of entrants in a lottery."""
+        redis = self._redis()
+        if redis is not None:
+            try:
+                await self._hydrate(redis, event_id)
+                return await redis.scard(self._entrants_key(event_id))
+            except Exception as e:
+                logger.warning(f"Could not count lottery entrants for event {event_id} in Redis: {e}")
+
+        return len(await self._participant_ids_from_db(event_id))
+
+    async def draw(self, event_id: int, candidates: int = 10) -> List[int]:
+        """
+        Draw random entrants without replacement.
+
+        Callers take the first candidate that is still eligible (e.g. still
+        in the guild), so one departed winner doesn't stall the draw.
+
+        Returns:
+            Up to `candidates` distinct participant IDs, empty if nobody entered
+        """
+        redis = self._redis()
+        if redis is not None:
+            try:
+                await self._hydrate(redis, event_id)
+                members = await redis.srandmember(self._entrants_key(event_id), candidates)
+                return [int(member) for member in members]
+            except Exception as e:
+                logger.warning(f"Could not draw lottery entrants for event {event_id} from Redis: {e}")
+
+        participant_ids = await self._participant_ids_from_db(event_id)
+        return random.sample(participant_ids, min(candidates, len(participant_ids)))
+
+    async def _participant_ids_from_db(self, event_id: int) -> List[int]:
+        from Dao.LotteryParticipantDao import LotteryParticipantDao
+
+        lp_dao = LotteryParticipantDao()
+        try:
+            return await asyncio.to_thread(lp_dao.get_participant_ids, event_id)
+        finally:
+            lp_dao.close()
+
+    async def flush(self, event_ids: Optional[List[int]] = None) -> int:
+        """
+        Write pending entrants to LotteryParticipants in bulk.
+
+        Args:
+            event_ids: Events to flush (default: every event entered through this process)
+
+        Returns:
+            Number of entrants written
+        """
+        redis = self._redis()
+        if redis is None:
+            return 0
+
+        from Dao.LotteryParticipantDao import LotteryParticipantDao
+
+        written = 0
+        async with self.flush_lock:
+            lp_dao = LotteryParticipantDao()
+            try:
+                for event_id in list(event_ids if event_ids is not None else self.active_events):
+                    pending_key = self._pending_key(event_id)
+                    try:
+                        pending = await redis.scard(pending_key)
+                        members = await redis.spop(pending_key, pending) if pending else []
+                    except Exception as e:
+                        logger.warning(f"Could not read pending lottery entrants for event {event_id}: {e}")
+                        continue
+
+                    if not members:
+                        self.active_events.discard(event_id)
+                        continue
+
+                    participant_ids = [int(member) for member in members]
+                    if await asyncio.to_thread(lp_dao.add_participants, event_id, participant_ids):
+                        written += len(participant_ids)
+                    else:
+                        # Put them back for the next flush
+                        self.flush_failures += 1
+                        await redis.sadd(pending_key, *participant_ids)
+            finally:
+                lp_dao.close()
+
+        self.flushed_entries += written
+        if written:
+            logger.debug(f"Flushed {written} lottery entrants to the database")
+        return written
+
+    async def finish(self, event_id: int) -> bool:
+        """
+        Write out an ended lottery's remaining entrants and drop its Redis keys.
+
+        Returns:
+            True if every entrant was persisted (keys are kept otherwise)
+        """
+        redis = self._redis()
+        if redis is None:
+            return True
+
+        try:
+            await self.flush([event_id])
+            if await redis.scard(self._pending_key(event_id)):
+                logger.error(f"Lottery event {event_id} still has unflushed entrants, keeping its entrant set")
+                return False
+            await redis.delete(
+                self._entrants_key(event_id),
+                self._pending_key(event_id),
+                self._hydrated_key(event_id)
+            )
+        except Exception as e:
+            logger.error(f"Error finishing lottery event {event_id}: {e}")
+            return False
+
+        self.active_events.discard(event_id)
+        return True
+
+    async def get_vault_total(self, guild_id: int, use_cache: bool = True) -> int:
+        """
+        Get the guild vault as entrants see it: stored vault plus pending delta.
+
+        With use_cache, the stored part can be up to LOTTERY_EVENT_CACHE_TTL
+        seconds old (and so briefly off around a session flush); pass
+        use_cache=False when the figure is paid out.
+        """
+        base = self.vault_cache.get(guild_id) if use_cache else None
+        if base is None:
+            from Dao.GuildDao import GuildDao
+
+            guild_dao = GuildDao()
+            try:
+                base = await asyncio.to_thread(guild_dao.get_vault_currency, guild_id)
+            finally:
+                guild_dao.close()
+            self.vault_cache[guild_id] = base
+
+        delta = await get_session_manager().get_vault_currency_delta(guild_id)
+        return base + (delta or 0)
+
+    def get_stats(self) -> dict:
+        """Get lottery service statistics for monitoring."""
+        return {
+            "entries": self.entries,
+            "duplicate_entries": self.duplicate_entries,
+            "flushed_entries": self.flushed_entries,
+            "flush_failures": self.flush_failures,
+            "active_events": len(self.active_events),
+            "cached_events": len(self.event_cache),
+        }
+
+    async def cleanup(self):
+        """Stop the flush task and write out any pending entrants."""
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+        if self.active_events:
+            await self.flush()
+
+
+# Singleton instance
+_lottery_service = None
+
+
+def get_lottery_service() -> LotteryService:
+    """Get the singleton LotteryService instance."""
+    global _lottery_service
+    if _lottery_service is None:
+        _lottery_service = LotteryService()
+    return _lottery_service
+
+
+async def initialize_lottery_service():
+    """Start the lottery service's entrant flush."""
+    await get_lottery_service().start()
+
+
+async def cleanup_lottery_service():
+    """Flush and stop the lottery service."""
+    global _lottery_service
+    if _lottery_service:
+        await _lottery_service.cleanup()
+        _lottery_service = None
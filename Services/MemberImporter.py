@@ -0,0 +1,300 @@
+"""
+Streaming Guild Member Import
+
+Imports every member of a newly joined guild into Users and GuildUsers
+without materialising the whole guild in memory or in one transaction.
+
+- Members are processed in id order in fixed-size chunks (default 2000)
+- Rows are built as plain tuples, no User/GuildUser objects
+- Each chunk is one multi-row INSERT ... ON DUPLICATE KEY UPDATE per table,
+  run off the event loop; the loop gets control back between chunks
+- After every committed chunk the last imported member id is checkpointed
+  in Redis, so an interrupted import (restart, crash, DB outage) resumes
+  where it stopped instead of starting over
+- Only a couple of imports run at once so a burst of joins can't starve
+  the connection pool
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+from Dao.GuildUserDao import GuildUserDao
+from Dao.UserDao import UserDao
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Starting currency for members imported on guild join
+STARTING_CURRENCY = 1000
+
+
+class MemberImporter:
+    """
+    Chunked, resumable member importer.
+
+    Usage:
+        importer.start_import(guild)          # on guild join, returns the task
+        await importer.resume_pending(bot)    # on ready, picks up interrupted imports
+        importer.cancel_import(guild_id)      # on guild remove
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None, max_concurrent_imports: int = 2):
+        """
+        Args:
+            chunk_size: Members per batch (env MEMBER_IMPORT_CHUNK_SIZE, default 2000)
+            max_concurrent_imports: Guild imports allowed to write at the same time
+        """
+        self.chunk_size = chunk_size or int(os.getenv('MEMBER_IMPORT_CHUNK_SIZE', '2000'))
+        self.checkpoint_ttl = 7 * 86400
+
+        self.user_dao = UserDao()
+        self.guild_user_dao = GuildUserDao()
+
+        self.active_imports: Dict[int, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_imports)
+
+        # Monitoring counters
+        self.imports_completed = 0
+        self.members_imported = 0
+
+    def _checkpoint_key(self, guild_id: int) -> str:
+        """Generate Redis key for a guild's import checkpoint."""
+        return f"member_import:{guild_id}"
+
+    def _redis(self):
+        """Redis client for checkpoints, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    async def _load_checkpoint(self, guild_id: int) -> int:
+        """Get the last imported member id for a guild (0 if none)."""
+        redis = self._redis()
+        if redis is None:
+            return 0
+        try:
+            value = await redis.get(self._checkpoint_key(guild_id))
+            return int(value) if value else 0
+        except Exception as e:
+            logger.warning(f"Could not read member import checkpoint for guild {guild_id}: {e}")
+            return 0
+
+    async def _save_checkpoint(self, guild_id: int, last_member_id: int):
+        """Record the last member id committed for a guild."""
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.setex(self._checkpoint_key(guild_id), self.checkpoint_ttl, last_member_id)
+        except Exception as e:
+            logger.warning(f"Could not save member import checkpoint for guild {guild_id}: {e}")
+
+    async def _clear_checkpoint(self, guild_id: int):
+        """Remove a guild's checkpoint once its import is finished or abandoned."""
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._checkpoint_key(guild_id))
+        except Exception as e:
+            logger.warning(f"Could not clear member import checkpoint for guild {guild_id}: {e}")
+
+    def _build_rows(self, members: List[discord.Member], guild_id: int, formatted_now: str) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Build Users and GuildUsers row tuples for a chunk of members.
+
+        Column order matches UserDao.USER_ROW_COLUMNS and
+        GuildUserDao.GUILD_USER_ROW_COLUMNS.
+        """
+        user_rows = []
+        guild_user_rows = []
+
+        for member in members:
+            try:
+                account_created = member.created_at.strftime("%Y-%m-%d %H:%M:%S") if member.created_at else formatted_now
+            except Exception:
+                account_created = formatted_now
+            try:
+                joined_at = member.joined_at.strftime("%Y-%m-%d %H:%M:%S") if member.joined_at else formatted_now
+            except Exception:
+                joined_at = formatted_now
+
+            user_rows.append((
+                member.id,
+                member.name,
+                member.global_name if hasattr(member, 'global_name') else member.name,
+                str(member.avatar.url) if member.avatar else None,
+                False,                          # is_bot
+                0, 0, 0, 0, 0,                  # global_exp, global_level, total_currency, bank_balance, daily_transfer_amount
+                None, None,                     # last_transfer_reset, last_interest_payout_date
+                0, 0,                           # total_messages, total_reactions
+                account_created,
+                formatted_now,                  # first_seen
+                formatted_now,                  # last_seen
+                None, None                      # privacy_settings, global_settings
+            ))
+            guild_user_rows.append((
+                member.id,
+                guild_id,
+                member.name,
+                member.display_name,
+                0, 0, 0,                        # level, streak, highest_streak
+                0, 0, 0,                        # exp, exp_gained, exp_lost
+                STARTING_CURRENCY,
+                0, 0, 0,                        # slots bonus state
+                0, 0,                           # messages_sent, reactions_sent
+                joined_at,
+                formatted_now,                  # last_active
+                0, None,                        # daily, last_daily
+                True                            # is_active
+            ))
+
+        return user_rows, guild_user_rows
+
+    def _write_chunk(self, user_rows: List[tuple], guild_user_rows: List[tuple]) -> bool:
+        """Upsert one chunk into both tables (blocking, run in a thread)."""
+        # Users first: GuildUsers rows reference them
+        if not self.user_dao.bulk_upsert_user_rows(user_rows):
+            return False
+        return self.guild_user_dao.bulk_upsert_guild_user_rows(guild_user_rows)
+
+    async def import_guild(self, guild: discord.Guild) -> int:
+        """
+        Import all non-bot members of a guild, resuming from any checkpoint.
+
+        Returns:
+            Number of members written by this run
+        """
+        async with self._semaphore:
+            resume_after = await self._load_checkpoint(guild.id)
+
+            members = sorted(
+                (m for m in guild.members if not m.bot and m.id > resume_after),
+                key=lambda m: m.id
+            )
+            total = len(members)
+            if resume_after:
+                logger.info(f"Resuming member import for {guild.name} after member {resume_after}: {total} members remaining")
+            else:
+                logger.info(f"Starting member import for {guild.name}: {total} members")
+
+            started = time.perf_counter()
+            imported = 0
+
+            for start in range(0, total, self.chunk_size):
+                chunk = members[start:start + self.chunk_size]
+                formatted_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                user_rows, guild_user_rows = self._build_rows(chunk, guild.id, formatted_now)
+
+                if not await asyncio.to_thread(self._write_chunk, user_rows, guild_user_rows):
+                    logger.error(
+                        f"Member import for {guild.name} stopped after {imported}/{total} members; "
+                        f"it will resume from the last checkpoint"
+                    )
+                    return imported
+
+                imported += len(chunk)
+                await self._save_checkpoint(guild.id, chunk[-1].id)
+
+                elapsed = time.perf_counter() - started
+                logger.debug(
+                    f"Member import for {guild.name}: {imported}/{total} "
+                    f"({imported / elapsed:,.0f} members/s)"
+                )
+
+                # Let other events run between chunks
+                await asyncio.sleep(0)
+
+            await self._clear_checkpoint(guild.id)
+
+            elapsed = time.perf_counter() - started
+            rate = imported / elapsed if elapsed > 0 else 0
+            logger.info(
+                f"Member import complete for {guild.name}: {imported} members in {elapsed:.2f}s "
+                f"({rate:,.0f} members/s, {self.chunk_size} per chunk)"
+            )
+
+            self.imports_completed += 1
+            self.members_imported += imported
+            return imported
+
+    async def _run_import(self, guild: discord.Guild):
+        """Task wrapper that logs failures and clears the active entry."""
+        try:
+            await self.import_guild(guild)
+        except asyncio.CancelledError:
+            logger.info(f"Member import for {guild.name} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error importing members for {guild.name}: {e}", exc_info=True)
+        finally:
+            self.active_imports.pop(guild.id, None)
+
+    def start_import(self, guild: discord.Guild) -> asyncio.Task:
+        """Start importing a guild's members in the background (no-op if already running)."""
+        task = self.active_imports.get(guild.id)
+        if task is None or task.done():
+            task = self.active_imports[guild.id] = asyncio.create_task(self._run_import(guild))
+        return task
+
+    async def cancel_import(self, guild_id: int):
+        """Stop a running import and drop its checkpoint (e.g. the bot left the guild)."""
+        task = self.active_imports.pop(guild_id, None)
+        if task and not task.done():
+            task.cancel()
+        await self._clear_checkpoint(guild_id)
+
+    async def resume_pending(self, bot: discord.Client) -> int:
+        """
+        Restart imports that were interrupted before they finished.
+
+        Returns:
+            Number of imports resumed
+        """
+        redis = self._redis()
+        if redis is None:
+            return 0
+
+        resumed = 0
+        try:
+            async for key in redis.scan_iter(match="member_import:*", count=100):
+                guild_id = int(key.split(":", 1)[1])
+                guild = bot.get_guild(guild_id)
+                if guild is None:
+                    await self._clear_checkpoint(guild_id)
+                    continue
+                if guild_id not in self.active_imports:
+                    self.start_import(guild)
+                    resumed += 1
+        except Exception as e:
+            logger.error(f"Error scanning for interrupted member imports: {e}")
+
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted member imports")
+        return resumed
+
+    def get_stats(self) -> dict:
+        """Get import statistics for monitoring."""
+        return {
+            "active_imports": len(self.active_imports),
+            "imports_completed": self.imports_completed,
+            "members_imported": self.members_imported,
+            "chunk_size": self.chunk_size,
+        }
+
+
+# Singleton instance
+_member_importer = None
+
+
+def get_member_importer() -> MemberImporter:
+    """Get the singleton MemberImporter instance."""
+    global _member_importer
+    if _member_importer is None:
+        _member_importer = MemberImporter()
+    return _member_importer
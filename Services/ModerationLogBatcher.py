@@ -0,0 +1,145 @@
+"""
+Batched Moderation Log Delivery
+
+Moderation events (deletes, edits, joins, bans...) are buffered per log
+channel and sent as multi-embed messages instead of one message per event.
+
+- Each channel gets a short flush window; everything queued in that window
+  goes out together, up to 10 embeds (and 6000 characters) per message
+- Bulk deletes and raids become a handful of sends instead of hundreds,
+  keeping the bot well under the per-channel rate limits
+- Queues are bounded; if a channel falls far behind, the oldest events are
+  dropped and a summary embed reports how many were skipped
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, Dict, List
+
+import discord
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+class ModerationLogBatcher:
+    """
+    Buffers embeds per log channel and flushes them in batches.
+
+    Usage:
+        batcher.enqueue(channel, embed)   # returns immediately
+        await batcher.flush_all()         # on cog unload
+    """
+
+    def __init__(self, flush_interval: float = 2.0, max_queue_size: int = 500):
+        """
+        Args:
+            flush_interval: Seconds to collect events before sending
+            max_queue_size: Maximum embeds buffered per channel before dropping the oldest
+        """
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+
+        self.queues: Dict[int, Deque[discord.Embed]] = {}
+        self.channels: Dict[int, discord.abc.Messageable] = {}
+        self.flush_tasks: Dict[int, asyncio.Task] = {}
+        self.dropped: Dict[int, int] = {}
+
+        # Monitoring counters
+        self.events_queued = 0
+        self.messages_sent = 0
+
+    def enqueue(self, channel: discord.abc.Messageable, embed: discord.Embed):
+        """Queue an embed for a log channel and schedule a flush if needed."""
+        queue = self.queues.get(channel.id)
+        if queue is None:
+            queue = self.queues[channel.id] = deque()
+
+        if len(queue) >= self.max_queue_size:
+            queue.popleft()
+            self.dropped[channel.id] = self.dropped.get(channel.id, 0) + 1
+
+        queue.append(embed)
+        self.channels[channel.id] = channel
+        self.events_queued += 1
+
+        task = self.flush_tasks.get(channel.id)
+        if task is None or task.done():
+            self.flush_tasks[channel.id] = asyncio.create_task(self._flush_after_window(channel.id))
+
+    async def _flush_after_window(self, channel_id: int):
+        """Wait out the flush window, then send everything queued for the channel."""
+        try:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush_channel(channel_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error flushing moderation log for channel {channel_id}: {e}", exc_info=True)
+
+    def _take_batch(self, queue: Deque[discord.Embed]) -> List[discord.Embed]:
+        """Pop up to one message worth of embeds from the front of a queue."""
+        batch = []
+        chars = 0
+        while queue and len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            size = len(queue[0])
+            if batch and chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            batch.append(queue.popleft())
+            chars += size
+        return batch
+
+    async def _flush_channel(self, channel_id: int):
+        """Send all queued embeds for one channel, 10 per message."""
+        queue = self.queues.get(channel_id)
+        channel = self.channels.get(channel_id)
+        if not queue or channel is None:
+            return
+
+        dropped = self.dropped.pop(channel_id, 0)
+        if dropped:
+            queue.appendleft(discord.Embed(
+                title="Moderation Log Backlog",
+                description=f"{dropped:,} older events were skipped because this channel fell behind.",
+                color=discord.Color.dark_grey()
+            ))
+
+        while queue:
+            batch = self._take_batch(queue)
+            try:
+                await channel.send(embeds=batch)
+                self.messages_sent += 1
+            except discord.Forbidden:
+                logger.warning(f"Missing permissions to post moderation logs in channel {channel_id}, dropping {len(batch) + len(queue)} events")
+                queue.clear()
+            except discord.HTTPException as e:
+                logger.error(f"Failed to send moderation log batch to channel {channel_id}: {e}")
+
+        self.queues.pop(channel_id, None)
+        self.channels.pop(channel_id, None)
+
+    async def flush_all(self):
+        """Cancel pending windows and send everything queued immediately."""
+        for task in list(self.flush_tasks.values()):
+            task.cancel()
+        self.flush_tasks.clear()
+
+        for channel_id in list(self.queues.keys()):
+            try:
+                await self._flush_channel(channel_id)
+            except Exception as e:
+                logger.error(f"Error flushing moderation log for channel {channel_id}: {e}")
+
+    def get_stats(self) -> dict:
+        """Get batching statistics for monitoring."""
+        return {
+            "events_queued": self.events_queued,
+            "messages_sent": self.messages_sent,
+            "pending_channels": len(self.queues),
+            "pending_events": sum(len(queue) for queue in self.queues.values()),
+        }
@@ -0,0 +1,323 @@
+"""
+Reminder Scheduler
+
+Delivers /remind reminders on time without polling the database every
+few seconds.
+
+- Reminders due within the next hour are loaded into a min-heap keyed by
+  due time; the scheduler sleeps until the earliest one or the end of the
+  loaded window, so the database is only read once per horizon
+- /remind and /cancelreminder hand their changes to the scheduler: directly
+  when it runs in this process, otherwise over the reminder_scheduler Redis
+  channel to the process leading the reminder task (Services/TaskLeader.py).
+  A new reminder that is now the earliest wakes the scheduler early
+- Due reminders are sent concurrently (bounded by a semaphore), users are
+  resolved from the bot's cache before falling back to REST, and the whole
+  batch is marked completed with one UPDATE
+"""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Set, Tuple
+
+import discord
+
+from Dao.ReminderDao import ReminderDao
+from Entities.Reminder import Reminder
+from Services.EntityResolver import get_entity_resolver
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Carries "schedule:{id}" and "cancel:{id}" to the process running the scheduler
+REMINDER_CHANNEL = "reminder_scheduler"
+
+
+def _due_timestamp(reminder: Reminder) -> float:
+    """Epoch seconds a reminder is due (naive datetimes from MySQL are UTC)."""
+    remind_at = reminder.remind_at
+    if isinstance(remind_at, str):
+        remind_at = datetime.fromisoformat(remind_at)
+    if remind_at.tzinfo is None:
+        remind_at = remind_at.replace(tzinfo=timezone.utc)
+    return remind_at.timestamp()
+
+
+class ReminderScheduler:
+    """
+    In-memory heap of upcoming reminders.
+
+    Usage:
+        await scheduler.run(bot)                          # from the reminder task
+        await scheduler.reminder_created(reminder)        # after saving a new reminder
+        await scheduler.reminder_cancelled(reminder_id)   # after deleting a reminder
+    """
+
+    def __init__(self, horizon_seconds: int = 3600, max_concurrent_sends: int = 10):
+        """
+        Args:
+            horizon_seconds: How far ahead reminders are loaded into memory
+                (and how often the database is read)
+            max_concurrent_sends: DMs sent at the same time when a batch is due
+        """
+        self.horizon_seconds = horizon_seconds
+        self.running = False
+
+        self.heap: List[Tuple[float, int, Reminder]] = []
+        self.scheduled_ids: Set[int] = set()
+        self.cancelled_ids: Set[int] = set()
+
+        self.bot = None
+        self.reminder_dao: Optional[ReminderDao] = None
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(max_concurrent_sends)
+
+        # Monitoring counters
+        self.reminders_sent = 0
+        self.reminders_failed = 0
+
+    def schedule(self, reminder: Reminder):
+        """Add a saved reminder to the heap if it falls inside the loaded window."""
+        if reminder.id is None or reminder.id in self.scheduled_ids:
+            return
+
+        due = _due_timestamp(reminder)
+        if due > time.time() + self.horizon_seconds:
+            return  # Loaded by a later refresh
+
+        heapq.heappush(self.heap, (due, reminder.id, reminder))
+        self.scheduled_ids.add(reminder.id)
+        self.cancelled_ids.discard(reminder.id)
+
+        # Wake the loop if this is now the earliest reminder
+        if self.heap[0][1] == reminder.id:
+            self._wakeup.set()
+
+    def cancel(self, reminder_id: int):
+        """Drop a reminder from the heap (lazily skipped when it comes due)."""
+        if reminder_id in self.scheduled_ids:
+            self.scheduled_ids.discard(reminder_id)
+            self.cancelled_ids.add(reminder_id)
+
+    async def reminder_created(self, reminder: Reminder):
+        """Hand a newly saved reminder to the scheduler, wherever it runs."""
+        if self.running:
+            self.schedule(reminder)
+        else:
+            await self._publish(f"schedule:{reminder.id}")
+
+    async def reminder_cancelled(self, reminder_id: int):
+        """Tell the scheduler, wherever it runs, that a reminder was deleted."""
+        if self.running:
+            self.cancel(reminder_id)
+        else:
+            await self._publish(f"cancel:{reminder_id}")
+
+    async def _publish(self, event: str):
+        manager = get_session_manager()
+        if not manager.redis_available:
+            return  # Picked up when the scheduler's window reaches it
+        try:
+            await manager.redis.publish(REMINDER_CHANNEL, event)
+        except Exception as e:
+            logger.warning(f"Could not publish reminder event {event}: {e}")
+
+    async def _handle_event(self, event: str):
+        """Apply a schedule/cancel event published by another process."""
+        action, _, reminder_id = event.partition(":")
+        reminder_id = int(reminder_id)
+        if action == "cancel":
+            self.cancel(reminder_id)
+        elif action == "schedule":
+            reminder = await asyncio.to_thread(self.reminder_dao.get_reminder_by_id, reminder_id)
+            if reminder is not None and not reminder.completed:
+                self.schedule(reminder)
+
+    async def _listen(self, pubsub):
+        """Apply reminder events from other processes until cancelled."""
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message and message['type'] == 'message':
+                    await self._handle_event(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error handling reminder event: {e}")
+                await asyncio.sleep(1)  # Back off on error
+
+    async def _load_window(self):
+        """Load every incomplete reminder due within the horizon."""
+        until = datetime.fromtimestamp(time.time() + self.horizon_seconds, tz=timezone.utc)
+        reminders = await asyncio.to_thread(self.reminder_dao.get_reminders_due_before, until)
+        for reminder in reminders:
+            self.schedule(reminder)
+
+    def _pop_due(self, now: float) -> List[Reminder]:
+        """Pop every reminder due at or before now."""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, reminder_id, reminder = heapq.heappop(self.heap)
+            if reminder_id in self.cancelled_ids:
+                self.cancelled_ids.discard(reminder_id)
+                continue
+            self.scheduled_ids.discard(reminder_id)
+            due.append(reminder)
+        return due
+
+    async def _resolve_user(self, user_id: int) -> Optional[discord.User]:
+        """Get a user from the gateway or resolver cache, falling back to a REST fetch."""
+        return await get_entity_resolver().get_user(self.bot, user_id)
+
+    def _build_embed(self, reminder: Reminder) -> discord.Embed:
+        """Build the reminder DM embed."""
+        embed = discord.Embed(
+            title="⏰ Reminder!",
+            description=f"# {reminder.message}",
+            color=discord.Color.blue(),
+            timestamp=reminder.created_at
+        )
+
+        # Add context about when it was set
+        embed.add_field(
+            name="Set",
+            value=f"<t:{int(reminder.created_at.timestamp())}:R>",
+            inline=True
+        )
+
+        # Try to get guild and channel names for context
+        try:
+            guild = self.bot.get_guild(reminder.guild_id)
+            if guild:
+                channel = guild.get_channel(reminder.channel_id)
+                context = f"in #{channel.name}" if channel else f"in {guild.name}"
+                embed.add_field(name="From", value=context, inline=True)
+
+                # Add jump link if message URL exists
+                if reminder.message_url:
+                    embed.add_field(
+                        name="Original Message",
+                        value=f"[Jump to message]({reminder.message_url})",
+                        inline=False
+                    )
+        except Exception as e:
+            logger.debug(f"Could not get guild/channel context: {e}")
+
+        embed.set_footer(text="Reminder System")
+        return embed
+
+    async def _deliver(self, reminder: Reminder):
+        """Send one reminder DM."""
+        async with self._semaphore:
+            try:
+                user = await self._resolve_user(reminder.user_id)
+                if not user:
+                    logger.warning(f"Could not find user {reminder.user_id} for reminder {reminder.id}")
+                    self.reminders_failed += 1
+                    return
+
+                await user.send(embed=self._build_embed(reminder))
+                self.reminders_sent += 1
+                logger.info(f"✅ Successfully sent reminder {reminder.id} to user {reminder.user_id} ({user.name})")
+            except discord.Forbidden:
+                self.reminders_failed += 1
+                logger.warning(f"❌ Could not DM user {reminder.user_id} - DMs may be disabled")
+            except Exception as e:
+                self.reminders_failed += 1
+                logger.error(f"❌ Error processing reminder {reminder.id}: {e}", exc_info=True)
+
+    async def _dispatch(self, reminders: List[Reminder]):
+        """Send a batch of due reminders and mark them all completed."""
+        await asyncio.gather(*(self._deliver(reminder) for reminder in reminders))
+
+        # Completed even if the DM failed, so undeliverable reminders don't retry forever
+        reminder_ids = [reminder.id for reminder in reminders]
+        if not await asyncio.to_thread(self.reminder_dao.mark_completed_bulk, reminder_ids):
+            logger.error(f"Failed to mark reminders {reminder_ids} as completed")
+
+        logger.info(f"=== REMINDER TASK: Processed {len(reminders)} reminder(s) ===")
+
+    async def _subscribe(self):
+        """Start listening for reminder events, or None without Redis."""
+        manager = get_session_manager()
+        if not manager.redis_available:
+            return None, None
+        try:
+            pubsub = manager.redis.pubsub()
+            await pubsub.subscribe(REMINDER_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Could not subscribe to reminder events, only this process's reminders wake the scheduler: {e}")
+            return None, None
+        return pubsub, asyncio.create_task(self._listen(pubsub))
+
+    async def run(self, bot):
+        """Scheduler loop: sleep until the next reminder or window end, then dispatch."""
+        self.bot = bot
+        self.reminder_dao = ReminderDao()
+        # A previous run (before losing leadership) may have missed cancellations
+        self.heap.clear()
+        self.scheduled_ids.clear()
+        self.cancelled_ids.clear()
+        self.running = True
+        pubsub, listener = await self._subscribe()
+        next_refresh = 0.0
+
+        try:
+            while not bot.is_closed():
+                try:
+                    now = time.time()
+                    if now >= next_refresh:
+                        await self._load_window()
+                        next_refresh = now + self.horizon_seconds
+
+                    due = self._pop_due(time.time())
+                    if due:
+                        await self._dispatch(due)
+
+                    next_due = self.heap[0][0] if self.heap else float('inf')
+                    delay = min(next_due, next_refresh) - time.time()
+                    if delay > 0:
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                        except asyncio.TimeoutError:
+                            pass
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ CRITICAL ERROR in reminder scheduler: {e}", exc_info=True)
+                    await asyncio.sleep(5)
+        finally:
+            self.running = False
+            if listener is not None:
+                listener.cancel()
+                try:
+                    await pubsub.aclose()
+                except Exception as e:
+                    logger.debug(f"Error closing reminder event subscription: {e}")
+            self.reminder_dao.close()
+
+    def get_stats(self) -> dict:
+        """Get scheduler statistics for monitoring."""
+        return {
+            "scheduled": len(self.scheduled_ids),
+            "next_due_in": round(self.heap[0][0] - time.time(), 1) if self.heap else None,
+            "reminders_sent": self.reminders_sent,
+            "reminders_failed": self.reminders_failed,
+        }
+
+
+# Singleton instance
+_reminder_scheduler = None
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    """Get the singleton ReminderScheduler instance."""
+    global _reminder_scheduler
+    if _reminder_scheduler is None:
+        _reminder_scheduler = ReminderScheduler()
+    return _reminder_scheduler
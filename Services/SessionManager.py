@@ -26,11 +26,78 @@ from datetime import datetime, timezone
 from typing import Optional, Tuple, Dict, List
 import redis.asyncio as aioredis
 import os
+import time
 import uuid
+from contextlib import asynccontextmanager
 from logger import AppLogger
+from Services.CooldownService import XP_BUCKET, get_cooldown_service
+from utils.level_curve import LevelCurve, get_default_level_curve
 
 logger = AppLogger(__name__).get_logger()
 
+# Deletes each session key whose JSON payload isn't marked dirty and that has
+# no queued games; returns how many were deleted
+_DROP_CLEAN_SESSIONS_SCRIPT = """
+local dropped = 0
+for _, key in ipairs(KEYS) do
+    local data = redis.call('GET', key)
+    local games_key = string.gsub(key, '^session:', 'session_games:', 1)
+    if data and not cjson.decode(data).dirty and redis.call('LLEN', games_key) == 0 then
+        redis.call('DEL', key)
+        dropped = dropped + 1
+    end
+end
+return dropped
+"""
+
+# Subtracts what a flush wrote from a session instead of overwriting it, so
+# changes made while the flush ran (e.g. ledger transfers) stay pending.
+# KEYS: session key, session games key. ARGV: currency, messages, reactions
+# and game count flushed, guild_exp and global_exp as written
+_MARK_FLUSHED_SCRIPT = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return 0
+end
+local session = cjson.decode(data)
+session.currency_to_flush = (session.currency_to_flush or 0) - tonumber(ARGV[1])
+session.messages_to_flush = (session.messages_to_flush or 0) - tonumber(ARGV[2])
+session.reactions_to_flush = (session.reactions_to_flush or 0) - tonumber(ARGV[3])
+-- Games queued before they moved to their own list were flushed with the rest
+session.pending_games = nil
+
+redis.call('LTRIM', KEYS[2], tonumber(ARGV[4]), -1)
+local remaining = redis.call('LLEN', KEYS[2])
+
+session.dirty = session.currency_to_flush ~= 0 or session.messages_to_flush ~= 0
+    or session.reactions_to_flush ~= 0 or remaining > 0
+    or session.guild_exp ~= tonumber(ARGV[5]) or session.global_exp ~= tonumber(ARGV[6])
+redis.call('SET', KEYS[1], cjson.encode(session), 'KEEPTTL')
+return 1
+"""
+
+# Same for a guild vault cache. ARGV: vault currency flushed
+_MARK_VAULT_FLUSHED_SCRIPT = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return 0
+end
+local vault = cjson.decode(data)
+vault.vault_currency_to_flush = (vault.vault_currency_to_flush or 0) - tonumber(ARGV[1])
+vault.dirty = vault.vault_currency_to_flush ~= 0
+redis.call('SET', KEYS[1], cjson.encode(vault), 'KEEPTTL')
+return 1
+"""
+
+# Deletes a flush lock only if it is still held by the flush that took it.
+# KEYS: lock key. ARGV: lock token
+_RELEASE_FLUSH_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 
 class SessionManager:
     """
@@ -56,6 +123,11 @@ class SessionManager:
         self.flush_interval = 300  # Flush dirty sessions every 5 minutes
         self.flush_task = None
 
+        # Every bot process flushes the same Redis keys; a key is only
+        # flushed by whichever process holds its flush lock
+        self.flush_lock_ttl = 60
+        self.flush_conflicts = 0
+
         # Fallback in-memory sessions (if Redis unavailable)
         self.fallback_sessions: Dict[Tuple[int, int], dict] = {}
         self.lock = asyncio.Lock()
@@ -117,6 +189,16 @@ class SessionManager:
         """Generate Redis key for user session."""
         return f"session:{guild_id}:{user_id}"
 
+    def _session_games_key(self, guild_id: int, user_id: int) -> str:
+        """
+        Generate Redis key for a session's queued game logs.
+
+        Games live in a list of JSON strings beside the session rather than
+        inside it: the Lua scripts that update sessions decode numbers as
+        doubles, which would round the snowflake IDs in each game record.
+        """
+        return f"session_games:{guild_id}:{user_id}"
+
     def _guild_vault_key(self, guild_id: int) -> str:
         """Generate Redis key for guild vault cache."""
         return f"guild_vault:{guild_id}"
@@ -152,12 +234,12 @@ class SessionManager:
                 await self.redis.expire(session_key, self.session_ttl)
                 return session
 
-            # No session exists - load from database
-            guild_user = guild_user_dao.get_guild_user(user_id, guild_id)
+            # No session exists - load from database (off the event loop)
+            guild_user = await asyncio.to_thread(guild_user_dao.get_guild_user, user_id, guild_id)
             if not guild_user:
                 return None
 
-            global_user = user_dao.get_user(user_id)
+            global_user = await asyncio.to_thread(user_dao.get_user, user_id)
             if not global_user:
                 return None
 
@@ -177,8 +259,7 @@ class SessionManager:
                 "currency": guild_user.currency,           # Current guild currency
                 "currency_to_flush": 0,                    # Net currency change to flush
 
-                # Game buffering
-                "pending_games": [],                       # List of game dicts to flush
+                # Game logs are queued in the session games list (_session_games_key)
 
                 # Session metadata
                 "last_active": datetime.now(timezone.utc).isoformat(),
@@ -214,8 +295,9 @@ class SessionManager:
         user_id: int,
         xp_amount: int,
         cooldown_seconds: int,
-        premium_multiplier: float = 1.0
-    ) -> Tuple[bool, int, int, Optional[dict]]:
+        premium_multiplier: float = 1.0,
+        level_curve: Optional[LevelCurve] = None
+    ) -> Tuple[int, int, int, Optional[dict]]:
         """
         Grant XP to user's active session (in-memory operation).
 
@@ -225,17 +307,24 @@ class SessionManager:
             xp_amount: Base XP to grant (before multipliers)
             cooldown_seconds: Cooldown period in seconds
             premium_multiplier: Premium XP multiplier (default 1.0)
+            level_curve: The guild's level curve (default curve if None)
 
         Returns:
             Tuple of:
-            - level_up: Whether user leveled up
+            - levels_gained: Number of levels gained (0 if none)
             - new_level: User's new level
             - xp_gained: Actual XP granted (after multipliers)
             - session: Updated session dict (or None if Redis unavailable)
         """
         if not self.redis_available:
             # Fallback mode: return None to trigger immediate DB operations
-            return False, 0, 0, None
+            return 0, 0, 0, None
+
+        # Local cooldown check first: no Redis round trip while on cooldown
+        # (track_message_activity has already refreshed last_active)
+        cooldowns = get_cooldown_service()
+        if cooldowns.on_cooldown(XP_BUCKET, guild_id, user_id):
+            return 0, 0, 0, None
 
         try:
             session_key = self._session_key(guild_id, user_id)
@@ -244,22 +333,22 @@ class SessionManager:
             session_data = await self.redis.get(session_key)
             if not session_data:
                 # Session doesn't exist - caller should create it first
-                return False, 0, 0, None
+                return 0, 0, 0, None
 
             session = json.loads(session_data)
 
-            # Check cooldown
-            if session.get("last_xp_gain"):
-                last_xp_time = datetime.fromisoformat(session["last_xp_gain"])
-                now = datetime.now(timezone.utc)
-                time_since_last = (now - last_xp_time).total_seconds()
+            # Check cooldown recorded in the session (covers grants made by other processes)
+            last_xp_gain = session.get("last_xp_gain")
+            if last_xp_gain:
+                if isinstance(last_xp_gain, str):
+                    # Sessions written before last_xp_gain became an epoch timestamp
+                    last_xp_gain = datetime.fromisoformat(last_xp_gain).timestamp()
+                remaining = cooldown_seconds - (time.time() - last_xp_gain)
 
-                if time_since_last < cooldown_seconds:
+                if remaining > 0:
                     # Still on cooldown - no XP granted
-                    # Update last_active but don't mark dirty
-                    session["last_active"] = now.isoformat()
-                    await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
-                    return False, session["guild_level"], 0, session
+                    cooldowns.trigger(XP_BUCKET, guild_id, user_id, remaining)
+                    return 0, session["guild_level"], 0, session
 
             # Apply XP multiplier (already includes streak bonus from caller)
             xp_gained = math.ceil(xp_amount * premium_multiplier)
@@ -273,12 +362,12 @@ class SessionManager:
             session["global_exp"] += xp_gained
 
             # Calculate new levels
-            session["guild_level"] = self._calculate_level_from_exp(session["guild_exp"])
-            session["global_level"] = self._calculate_level_from_exp(session["global_exp"])
+            session["guild_level"] = (level_curve or get_default_level_curve()).level_for_exp(session["guild_exp"])
+            session["global_level"] = get_default_level_curve().level_for_exp(session["global_exp"])
 
             # Update metadata
             now = datetime.now(timezone.utc)
-            session["last_xp_gain"] = now.isoformat()
+            session["last_xp_gain"] = now.timestamp()
             session["last_active"] = now.isoformat()
             session["messages_this_session"] += 1
             session["dirty"] = True  # Mark for flush
@@ -286,19 +375,15 @@ class SessionManager:
             # Save back to Redis
             await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
 
-            level_up = session["guild_level"] > old_level
+            cooldowns.trigger(XP_BUCKET, guild_id, user_id, cooldown_seconds)
 
-            return level_up, session["guild_level"], xp_gained, session
+            levels_gained = max(session["guild_level"] - old_level, 0)
+
+            return levels_gained, session["guild_level"], xp_gained, session
 
         except Exception as e:
             logger.error(f"Error granting XP to session: {e}", exc_info=True)
-            return False, 0, 0, None
-
-    def _calculate_level_from_exp(self, exp: int) -> int:
-        """Calculate level from experience points."""
-        if exp < 0:
-            return 0
-        return math.floor(math.sqrt(exp / 100))
+            return 0, 0, 0, None
 
     async def update_session_activity(self, guild_id: int, user_id: int):
         """
@@ -357,24 +442,27 @@ class SessionManager:
             from Dao.GuildUserDao import GuildUserDao
             from Dao.UserDao import UserDao
 
-            guild_user_dao = GuildUserDao()
-            user_dao = UserDao()
-            try:
-                # Update guild stats
-                guild_user_dao.increment_activity_counts(
-                    user_id, guild_id, messages=0, reactions=1
-                )
-                # Update global stats (NEW - fixes fallback mode gap)
-                user_dao.increment_user_stats(
-                    user_id=user_id,
-                    global_exp_gain=0,
-                    currency_gain=0,
-                    messages_gain=0,
-                    reactions_gain=1
-                )
-            finally:
-                guild_user_dao.close()
-                user_dao.close()
+            def write_reaction():
+                guild_user_dao = GuildUserDao()
+                user_dao = UserDao()
+                try:
+                    # Update guild stats
+                    guild_user_dao.increment_activity_counts(
+                        user_id, guild_id, messages=0, reactions=1
+                    )
+                    # Update global stats (NEW - fixes fallback mode gap)
+                    user_dao.increment_user_stats(
+                        user_id=user_id,
+                        global_exp_gain=0,
+                        currency_gain=0,
+                        messages_gain=0,
+                        reactions_gain=1
+                    )
+                finally:
+                    guild_user_dao.close()
+                    user_dao.close()
+
+            await asyncio.to_thread(write_reaction)
             return
 
         try:
@@ -426,51 +514,6 @@ class SessionManager:
             logger.error(f"Error getting currency from session: {e}")
             return None
 
-    async def update_currency(self, guild_id: int, user_id: int, amount: int) -> bool:
-        """
-        Update user's currency in their active session (in-memory operation).
-
-        Args:
-            guild_id: Discord guild ID
-            user_id: Discord user ID
-            amount: Currency delta (positive for gain, negative for loss)
-
-        Returns:
-            True if successful, False otherwise
-        """
-        if not self.redis_available:
-            # Fallback mode: return False to trigger immediate DB write
-            return False
-
-        try:
-            session_key = self._session_key(guild_id, user_id)
-            session_data = await self.redis.get(session_key)
-
-            if not session_data:
-                # Session doesn't exist - caller should create it first
-                return False
-
-            session = json.loads(session_data)
-
-            # Update currency
-            session["currency"] = session.get("currency", 0) + amount
-            session["currency_to_flush"] = session.get("currency_to_flush", 0) + amount
-
-            # Update metadata
-            session["last_active"] = datetime.now(timezone.utc).isoformat()
-            session["dirty"] = True
-
-            # Save back to Redis
-            await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
-
-            logger.debug(f"Updated currency for user {user_id} in session: delta={amount}, new_balance={session['currency']}")
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Error updating currency in session: {e}")
-            return False
-
     async def queue_game(
         self,
         guild_id: int,
@@ -506,14 +549,12 @@ class SessionManager:
 
         try:
             session_key = self._session_key(guild_id, user_id)
-            session_data = await self.redis.get(session_key)
 
-            if not session_data:
+            # Extend TTL on activity; fails if the session doesn't exist
+            if not await self.redis.expire(session_key, self.session_ttl):
                 # Session doesn't exist - caller should create it first
                 return False
 
-            session = json.loads(session_data)
-
             # Create game record
             game_record = {
                 "user_id": user_id,
@@ -527,19 +568,15 @@ class SessionManager:
                 "timestamp": timestamp or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
             }
 
-            # Add to pending games
-            if "pending_games" not in session:
-                session["pending_games"] = []
-            session["pending_games"].append(game_record)
-
-            # Update metadata
-            session["last_active"] = datetime.now(timezone.utc).isoformat()
-            session["dirty"] = True
-
-            # Save back to Redis
-            await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
+            # Append to the session's games list; the session itself isn't
+            # rewritten, so a concurrent ledger transfer can't be overwritten
+            games_key = self._session_games_key(guild_id, user_id)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(games_key, json.dumps(game_record))
+                pipe.expire(games_key, self.session_ttl)
+                pending, _ = await pipe.execute()
 
-            logger.debug(f"Queued {game_type} game for user {user_id}: {result} ({len(session['pending_games'])} games pending)")
+            logger.debug(f"Queued {game_type} game for user {user_id}: {result} ({pending} games pending)")
 
             return True
 
@@ -547,56 +584,6 @@ class SessionManager:
             logger.error(f"Error queuing game in session: {e}")
             return False
 
-    async def add_vault_currency(self, guild_id: int, amount: int) -> bool:
-        """
-        Add currency to guild vault cache (in-memory operation).
-
-        This is called when game losses add currency to the guild vault.
-        Updates are batched and flushed periodically to avoid DB writes on every game.
-
-        Args:
-            guild_id: Discord guild ID
-            amount: Currency amount to add (should be positive)
-
-        Returns:
-            True if successful, False otherwise (triggers immediate DB write)
-        """
-        if not self.redis_available:
-            # Fallback mode: return False to trigger immediate DB write
-            return False
-
-        try:
-            vault_key = self._guild_vault_key(guild_id)
-
-            # Get existing vault cache or create new one
-            vault_data = await self.redis.get(vault_key)
-
-            if vault_data:
-                vault_cache = json.loads(vault_data)
-            else:
-                # Initialize new vault cache
-                vault_cache = {
-                    "vault_currency_to_flush": 0,
-                    "last_updated": datetime.now(timezone.utc).isoformat(),
-                    "dirty": False
-                }
-
-            # Add to pending vault currency
-            vault_cache["vault_currency_to_flush"] = vault_cache.get("vault_currency_to_flush", 0) + amount
-            vault_cache["last_updated"] = datetime.now(timezone.utc).isoformat()
-            vault_cache["dirty"] = True
-
-            # Save back to Redis with TTL (longer for guild data - 24 hours)
-            await self.redis.setex(vault_key, 86400, json.dumps(vault_cache))
-
-            logger.debug(f"Added {amount} to guild {guild_id} vault cache (pending: {vault_cache['vault_currency_to_flush']})")
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Error adding vault currency to cache: {e}")
-            return False
-
     async def get_vault_currency_delta(self, guild_id: int) -> Optional[int]:
         """
         Get the pending vault currency delta for a guild.
@@ -646,38 +633,8 @@ class SessionManager:
                 )
 
                 for key in keys:
-                    session_data = await self.redis.get(key)
-                    if not session_data:
-                        continue
-
-                    session = json.loads(session_data)
-
-                    # Only flush if dirty
-                    if session.get("dirty", False):
-                        # Extract guild_id and user_id from key
-                        parts = key.split(":")
-                        if len(parts) != 3:
-                            continue
-
-                        guild_id = int(parts[1])
-                        user_id = int(parts[2])
-
-                        # Flush to database
-                        success = await self._flush_session_to_db(
-                            guild_id, user_id, session
-                        )
-
-                        if success:
-                            # Mark as clean and reset deltas
-                            session["dirty"] = False
-                            session["messages_to_flush"] = 0
-                            session["reactions_to_flush"] = 0
-                            session["currency_to_flush"] = 0
-                            session["pending_games"] = []
-                            ttl = await self.redis.ttl(key)
-                            if ttl > 0:
-                                await self.redis.setex(key, ttl, json.dumps(session))
-                            flushed_count += 1
+                    if await self._flush_session_key(key, only_dirty=True):
+                        flushed_count += 1
 
                 if cursor == 0:
                     break
@@ -694,32 +651,8 @@ class SessionManager:
                 )
 
                 for key in keys:
-                    vault_data = await self.redis.get(key)
-                    if not vault_data:
-                        continue
-
-                    vault_cache = json.loads(vault_data)
-
-                    # Only flush if dirty
-                    if vault_cache.get("dirty", False):
-                        # Extract guild_id from key
-                        parts = key.split(":")
-                        if len(parts) != 2:
-                            continue
-
-                        guild_id = int(parts[1])
-
-                        # Flush to database
-                        success = await self._flush_vault_to_db(guild_id, vault_cache)
-
-                        if success:
-                            # Mark as clean and reset delta
-                            vault_cache["dirty"] = False
-                            vault_cache["vault_currency_to_flush"] = 0
-                            ttl = await self.redis.ttl(key)
-                            if ttl > 0:
-                                await self.redis.setex(key, ttl, json.dumps(vault_cache))
-                            vault_flushed_count += 1
+                    if await self._flush_vault_key(key, only_dirty=True):
+                        vault_flushed_count += 1
 
                 if cursor == 0:
                     break
@@ -730,20 +663,155 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Error flushing dirty sessions: {e}", exc_info=True)
 
+    @asynccontextmanager
+    async def _flush_lock(self, key: str):
+        """
+        Hold a key's flush lock for the duration of one flush.
+
+        Yields True if this process got the lock, False if another process
+        is flushing the key right now (the caller skips it).
+        """
+        lock_key = f"flush_lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(lock_key, token, nx=True, ex=self.flush_lock_ttl)
+        if not acquired:
+            self.flush_conflicts += 1
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                await self.redis.eval(_RELEASE_FLUSH_LOCK_SCRIPT, 1, lock_key, token)
+
+    async def _flush_session_key(self, key: str, only_dirty: bool) -> bool:
+        """
+        Flush one session under its flush lock.
+
+        The session is read after the lock is taken, so deltas another
+        process has just written and subtracted are never written twice.
+
+        Returns:
+            True if the session was written to the database
+        """
+        parts = key.split(":")
+        if len(parts) != 3:
+            return False
+
+        guild_id = int(parts[1])
+        user_id = int(parts[2])
+
+        games_key = self._session_games_key(guild_id, user_id)
+
+        if only_dirty:
+            # Don't take a lock for clean sessions
+            session_data = await self.redis.get(key)
+            if not session_data:
+                return False
+            if not json.loads(session_data).get("dirty", False) and not await self.redis.llen(games_key):
+                return False
+
+        async with self._flush_lock(key) as locked:
+            if not locked:
+                return False
+
+            session_data = await self.redis.get(key)
+            if not session_data:
+                return False
+
+            session = json.loads(session_data)
+            queued_games = await self.redis.lrange(games_key, 0, -1)
+            if only_dirty and not session.get("dirty", False) and not queued_games:
+                return False
+
+            games = (session.get("pending_games") or []) + [json.loads(game) for game in queued_games]
+            if not await self._flush_session_to_db(guild_id, user_id, session, games):
+                return False
+
+            # Sessions outlive the process; don't let anyone write these deltas again
+            await self._mark_flushed(key, session, len(queued_games))
+            return True
+
+    async def _flush_vault_key(self, key: str, only_dirty: bool) -> bool:
+        """
+        Flush one guild vault cache under its flush lock.
+
+        Returns:
+            True if the vault was written to the database
+        """
+        parts = key.split(":")
+        if len(parts) != 2:
+            return False
+
+        guild_id = int(parts[1])
+
+        async with self._flush_lock(key) as locked:
+            if not locked:
+                return False
+
+            vault_data = await self.redis.get(key)
+            if not vault_data:
+                return False
+
+            vault_cache = json.loads(vault_data)
+            if only_dirty and not vault_cache.get("dirty", False):
+                return False
+
+            if not await self._flush_vault_to_db(guild_id, vault_cache):
+                return False
+
+            # Subtract the flushed amount; the ledger may have added more meanwhile
+            await self.redis.eval(
+                _MARK_VAULT_FLUSHED_SCRIPT, 1, key,
+                vault_cache.get("vault_currency_to_flush", 0)
+            )
+            return True
+
     async def _flush_session_to_db(
         self,
         guild_id: int,
         user_id: int,
-        session: dict
+        session: dict,
+        games: Optional[List[dict]] = None
     ) -> bool:
         """
         Flush a single session to the database.
 
         Flushes XP, currency, messages, reactions, and game logs atomically.
+        games are the session's queued game records.
 
         Returns:
             True if successful, False otherwise
         """
+        from Services.GlobalStatsService import get_global_stats_service
+
+        # The DAO calls run in a worker thread so the flush never blocks the event loop
+        exp_delta = await asyncio.to_thread(self._write_session_to_db, guild_id, user_id, session, games)
+        if exp_delta is None:
+            return False
+
+        # Keep the /admin-stats running totals in step with what was written
+        await get_global_stats_service().record_flush(
+            user_id,
+            messages=session.get("messages_to_flush", 0),
+            reactions=session.get("reactions_to_flush", 0),
+            currency=session.get("currency_to_flush", 0),
+            exp=exp_delta
+        )
+
+        return True
+
+    def _write_session_to_db(
+        self,
+        guild_id: int,
+        user_id: int,
+        session: dict,
+        games: Optional[List[dict]] = None
+    ) -> Optional[int]:
+        """
+        Blocking part of _flush_session_to_db: write the session with the DAOs.
+
+        Returns:
+            The global XP delta written, or None if the write failed
+        """
         from Dao.GuildUserDao import GuildUserDao
         from Dao.UserDao import UserDao
         from Dao.GamesDao import GamesDao
@@ -799,24 +867,25 @@ class SessionManager:
                 )
 
             # Flush pending games
-            pending_games = session.get("pending_games", [])
-            if pending_games:
-                games_flushed = games_dao.batch_add_games(pending_games)
+            if games:
+                games_flushed = games_dao.batch_add_games(games)
                 logger.debug(f"Flushed {games_flushed} game records for user {user_id}")
 
             # Update global user
+            exp_delta = 0
             global_user = user_dao.get_user(user_id)
             if global_user:
+                exp_delta = session["global_exp"] - (global_user.global_exp or 0)
                 global_user.global_exp = session["global_exp"]
                 global_user.global_level = session["global_level"]
                 global_user.last_seen = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 user_dao.update_user(global_user)
 
-            return True
+            return exp_delta
 
         except Exception as e:
             logger.error(f"Error flushing session to DB for user {user_id} in guild {guild_id}: {e}")
-            return False
+            return None
         finally:
             if guild_user_dao:
                 guild_user_dao.close()
@@ -825,6 +894,25 @@ class SessionManager:
             if games_dao:
                 games_dao.close()
 
+    async def _mark_flushed(self, session_key: str, session: dict, games_flushed: int = 0):
+        """
+        Take the deltas a flush just wrote out of the stored session.
+
+        The session is updated in place in Redis, so anything added since
+        it was read for the flush stays pending (and the session dirty).
+        The first games_flushed entries are dropped from the games list.
+        """
+        _, guild_id, user_id = session_key.split(":")
+        await self.redis.eval(
+            _MARK_FLUSHED_SCRIPT, 2, session_key, self._session_games_key(guild_id, user_id),
+            session.get("currency_to_flush", 0),
+            session.get("messages_to_flush", 0),
+            session.get("reactions_to_flush", 0),
+            games_flushed,
+            session["guild_exp"],
+            session["global_exp"]
+        )
+
     async def _flush_vault_to_db(self, guild_id: int, vault_cache: dict) -> bool:
         """
         Flush guild vault cache to the database.
@@ -846,9 +934,9 @@ class SessionManager:
             # Get the pending vault currency delta
             vault_currency_to_flush = vault_cache.get("vault_currency_to_flush", 0)
 
-            if vault_currency_to_flush > 0:
-                # Add to guild vault atomically
-                success = guild_dao.add_vault_currency(guild_id, vault_currency_to_flush)
+            if vault_currency_to_flush != 0:
+                # Apply to guild vault atomically (negative after ledger payouts from the vault)
+                success = await asyncio.to_thread(guild_dao.add_vault_currency, guild_id, vault_currency_to_flush)
 
                 if success:
                     logger.debug(f"Flushed {vault_currency_to_flush} to vault for guild {guild_id}")
@@ -876,27 +964,40 @@ class SessionManager:
             return
 
         try:
-            session_key = self._session_key(guild_id, user_id)
-            session_data = await self.redis.get(session_key)
-
-            if session_data:
-                session = json.loads(session_data)
-                if session.get("dirty", False):
-                    await self._flush_session_to_db(guild_id, user_id, session)
-
-                    # Mark as clean and reset deltas
-                    session["dirty"] = False
-                    session["messages_to_flush"] = 0
-                    session["reactions_to_flush"] = 0
-                    session["currency_to_flush"] = 0
-                    session["pending_games"] = []
-                    ttl = await self.redis.ttl(session_key)
-                    if ttl > 0:
-                        await self.redis.setex(session_key, ttl, json.dumps(session))
+            await self._flush_session_key(self._session_key(guild_id, user_id), only_dirty=True)
 
         except Exception as e:
             logger.error(f"Error flushing session for user {user_id}: {e}")
 
+    async def flush_and_drop_session(self, guild_id: int, user_id: int, attempts: int = 3) -> bool:
+        """
+        Flush a session and drop it once nothing in it is left unwritten.
+
+        The session is only deleted while it is clean (_DROP_CLEAN_SESSIONS_SCRIPT),
+        so a failed flush, a flush lock held elsewhere or a transfer landing
+        after the flush keeps it, and the flush is retried.
+
+        Returns:
+            True if the member has no cached session any more
+        """
+        if not self.redis_available:
+            return True
+
+        key = self._session_key(guild_id, user_id)
+        try:
+            for attempt in range(attempts):
+                if attempt:
+                    await asyncio.sleep(0.1 * attempt)
+                await self._flush_session_key(key, only_dirty=True)
+                if await self.redis.eval(_DROP_CLEAN_SESSIONS_SCRIPT, 1, key) or not await self.redis.exists(key):
+                    return True
+        except Exception as e:
+            logger.error(f"Error flushing and dropping session for user {user_id} in guild {guild_id}: {e}")
+            return False
+
+        logger.warning(f"Session for user {user_id} in guild {guild_id} still has unflushed changes, keeping it")
+        return False
+
     async def flush_all_sessions(self):
         """
         Flush all sessions to database (called on shutdown).
@@ -920,26 +1021,8 @@ class SessionManager:
                 )
 
                 for key in keys:
-                    session_data = await self.redis.get(key)
-                    if not session_data:
-                        continue
-
-                    session = json.loads(session_data)
-
-                    # Extract guild_id and user_id
-                    parts = key.split(":")
-                    if len(parts) != 3:
-                        continue
-
-                    guild_id = int(parts[1])
-                    user_id = int(parts[2])
-
                     # Flush to database (even if not dirty)
-                    success = await self._flush_session_to_db(
-                        guild_id, user_id, session
-                    )
-
-                    if success:
+                    if await self._flush_session_key(key, only_dirty=False):
                         flushed_count += 1
 
                 if cursor == 0:
@@ -957,32 +1040,64 @@ class SessionManager:
                 )
 
                 for key in keys:
-                    vault_data = await self.redis.get(key)
-                    if not vault_data:
-                        continue
+                    # Flush to database (even if not dirty)
+                    if await self._flush_vault_key(key, only_dirty=False):
+                        vault_flushed_count += 1
 
-                    vault_cache = json.loads(vault_data)
+                if cursor == 0:
+                    break
 
-                    # Extract guild_id
-                    parts = key.split(":")
-                    if len(parts) != 2:
-                        continue
+            logger.info(f"✅ Flushed {flushed_count} user sessions and {vault_flushed_count} guild vaults on shutdown")
 
-                    guild_id = int(parts[1])
+        except Exception as e:
+            logger.error(f"Error flushing all sessions: {e}", exc_info=True)
 
-                    # Flush to database (even if not dirty)
-                    success = await self._flush_vault_to_db(guild_id, vault_cache)
+    async def invalidate_guild_sessions(self, guild_ids) -> int:
+        """
+        Drop cached sessions for a set of guilds after a bulk DB change.
 
-                    if success:
-                        vault_flushed_count += 1
+        Dirty sessions are flushed first; clean sessions are then deleted
+        in batches by a Lua script that re-checks the dirty flag, so a
+        session modified in between keeps its pending changes.
+
+        Args:
+            guild_ids: Iterable of Discord guild IDs
+
+        Returns:
+            Number of sessions dropped
+        """
+        if not self.redis_available:
+            return 0
+
+        guild_prefixes = tuple(f"session:{guild_id}:" for guild_id in set(guild_ids))
+        if not guild_prefixes:
+            return 0
+
+        try:
+            await self.flush_dirty_sessions()
+
+            dropped = 0
+            cursor = 0
+            while True:
+                cursor, keys = await self.redis.scan(
+                    cursor,
+                    match="session:*",
+                    count=500
+                )
+
+                matching = [key for key in keys if key.startswith(guild_prefixes)]
+                if matching:
+                    dropped += await self.redis.eval(_DROP_CLEAN_SESSIONS_SCRIPT, len(matching), *matching)
 
                 if cursor == 0:
                     break
 
-            logger.info(f"✅ Flushed {flushed_count} user sessions and {vault_flushed_count} guild vaults on shutdown")
+            logger.info(f"🧹 Dropped {dropped} cached sessions across {len(guild_prefixes)} guild(s)")
+            return dropped
 
         except Exception as e:
-            logger.error(f"Error flushing all sessions: {e}", exc_info=True)
+            logger.error(f"Error invalidating guild sessions: {e}", exc_info=True)
+            return 0
 
     async def get_stats(self) -> dict:
         """Get session statistics for monitoring."""
@@ -1047,7 +1162,8 @@ class SessionManager:
                 'dirty_sessions': dirty_sessions,
                 'cached_vaults': total_vaults,
                 'dirty_vaults': dirty_vaults,
-                'flush_interval': self.flush_interval
+                'flush_interval': self.flush_interval,
+                'flush_conflicts': self.flush_conflicts
             }
 
         except Exception as e:
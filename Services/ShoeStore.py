@@ -0,0 +1,288 @@
+"""
+Shared Blackjack Shoe Store
+
+Keeps each guild's persistent blackjack shoe in Redis so shoes survive
+restarts and every bot process deals from the same shoe for a guild.
+
+- Shoe state is a packed byte string of card codes (one byte per card, see
+  utils.blackjack_cards) plus a deal position, stored in a Redis hash
+- Deals run as a Lua script, so concurrent games across processes never
+  receive the same card
+- Reshuffles are compare-and-set on a generation counter, so two processes
+  hitting the cut card at once only shuffle once
+- Keys expire after a period of inactivity, evicting idle guilds
+- Falls back to the in-process BlackjackShoe if Redis is unavailable
+
+Game logic is synchronous, so this service uses a synchronous Redis client
+(one short round trip per deal). Like the DAOs' pooled MySQL calls, it must
+stay off the event loop: Blackjack_View runs every dealing game action via
+asyncio.to_thread.
+"""
+
+import os
+import random
+from typing import List, Optional
+
+import redis
+
+from logger import AppLogger
+from utils.blackjack_cards import CARD_STRINGS, new_shoe_codes
+
+logger = AppLogger(__name__).get_logger()
+
+
+# KEYS[1] = shoe key, ARGV[1] = card count, ARGV[2] = idle TTL
+# Returns {cards} on success or {-1, generation} when the shoe must be (re)shuffled
+DEAL_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'cards', 'pos', 'reshuffle_at', 'gen')
+local cards = state[1]
+if not cards then
+    return {-1, 0}
+end
+local count = tonumber(ARGV[1])
+local pos = tonumber(state[2])
+if pos >= tonumber(state[3]) or pos + count > string.len(cards) then
+    return {-1, tonumber(state[4]) or 0}
+end
+redis.call('HINCRBY', KEYS[1], 'pos', count)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return {string.sub(cards, pos + 1, pos + count)}
+"""
+
+# KEYS[1] = shoe key, ARGV = expected generation, cards, reshuffle point, num decks, idle TTL
+# Returns 1 if this caller installed the new shoe, 0 if another process already did
+RESHUFFLE_SCRIPT = """
+local gen = tonumber(redis.call('HGET', KEYS[1], 'gen')) or 0
+if gen ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'cards', ARGV[2], 'pos', 0, 'reshuffle_at', ARGV[3], 'num_decks', ARGV[4], 'gen', gen + 1)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+return 1
+"""
+
+
+class ShoeStore:
+    """
+    Redis-backed storage for per-guild blackjack shoes.
+
+    Each guild's shoe lives in a hash at blackjack_shoe:{guild_id}:
+    - cards: packed card codes in deal order
+    - pos: number of cards dealt so far
+    - reshuffle_at: cut card position (num_decks * 52 * penetration)
+    - num_decks: decks in the shoe
+    - gen: shuffle generation, bumped on every reshuffle
+    """
+
+    def __init__(self):
+        self.redis: Optional[redis.Redis] = None
+        self.redis_available = False
+
+        # Idle guilds are evicted after this many seconds without a deal
+        self.idle_ttl = int(os.getenv('BLACKJACK_SHOE_IDLE_TTL', '86400'))
+
+        self._deal = None
+        self._reshuffle = None
+
+    def initialize(self):
+        """
+        Connect to Redis and register the deal/reshuffle scripts.
+
+        If Redis is unavailable, guild shoes stay in process memory.
+        """
+        try:
+            redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
+            redis_password = os.getenv('REDIS_PASSWORD', None)
+
+            # Binary-safe client: shoe state is packed bytes
+            self.redis = redis.Redis.from_url(
+                redis_url,
+                password=redis_password,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=2,
+                socket_keepalive=True,
+                health_check_interval=30
+            )
+            self.redis.ping()
+
+            self._deal = self.redis.register_script(DEAL_SCRIPT)
+            self._reshuffle = self.redis.register_script(RESHUFFLE_SCRIPT)
+            self.redis_available = True
+
+            logger.info("✅ ShoeStore connected to Redis, blackjack shoes are shared across processes")
+        except Exception as e:
+            logger.warning(f"⚠️ ShoeStore could not connect to Redis: {e}")
+            logger.warning("⚠️ Blackjack shoes will be kept in process memory")
+            self.redis_available = False
+
+    def _shoe_key(self, guild_id: int) -> str:
+        """Generate Redis key for a guild's shoe."""
+        return f"blackjack_shoe:{guild_id}"
+
+    def _install_shoe(self, guild_id: int, expected_gen: int, num_decks: int, penetration: float) -> bool:
+        """Shuffle a fresh shoe and install it if nobody else reshuffled first."""
+        cards = new_shoe_codes(num_decks)
+        random.shuffle(cards)
+        reshuffle_at = int(len(cards) * penetration)
+
+        installed = self._reshuffle(
+            keys=[self._shoe_key(guild_id)],
+            args=[expected_gen, bytes(cards), reshuffle_at, num_decks, self.idle_ttl]
+        )
+        if installed:
+            logger.debug(f"Reshuffled blackjack shoe for guild {guild_id} (generation {expected_gen + 1})")
+        return bool(installed)
+
+    def deal_codes(self, guild_id: int, count: int = 1, num_decks: int = 6, penetration: float = 0.75) -> Optional[List[int]]:
+        """
+        Atomically deal card codes from a guild's shared shoe.
+
+        Creates or reshuffles the shoe as needed. num_decks and penetration are
+        only used when a new shoe is shuffled.
+
+        Returns:
+            List of card codes, or None if Redis is unavailable or errored
+            (caller should fall back to a local shoe)
+        """
+        if not self.redis_available:
+            return None
+
+        key = self._shoe_key(guild_id)
+        try:
+            # Earlier attempts may only discover that a (re)shuffle is needed
+            for _ in range(3):
+                result = self._deal(keys=[key], args=[count, self.idle_ttl])
+                if result[0] != -1:
+                    return list(result[0])
+                self._install_shoe(guild_id, int(result[1]), num_decks, penetration)
+
+            logger.warning(f"Could not deal from shared shoe for guild {guild_id} after reshuffling")
+            return None
+        except Exception as e:
+            logger.error(f"Error dealing from shared shoe for guild {guild_id}: {e}")
+            return None
+
+    def reshuffle(self, guild_id: int) -> bool:
+        """Force reshuffle a guild's shoe. Returns True if the shoe existed."""
+        if not self.redis_available:
+            return False
+
+        try:
+            state = self.redis.hmget(self._shoe_key(guild_id), 'gen', 'num_decks', 'reshuffle_at')
+            if state[0] is None:
+                return False
+            num_decks = int(state[1])
+            penetration = int(state[2]) / (num_decks * 52)
+            return self._install_shoe(guild_id, int(state[0]), num_decks, penetration)
+        except Exception as e:
+            logger.error(f"Error reshuffling shared shoe for guild {guild_id}: {e}")
+            return False
+
+    def get_shoe_stats(self, guild_id: int) -> Optional[dict]:
+        """Get statistics about a guild's shared shoe, or None if it doesn't exist."""
+        if not self.redis_available:
+            return None
+
+        try:
+            state = self.redis.hmget(self._shoe_key(guild_id), 'pos', 'reshuffle_at', 'num_decks', 'gen')
+            if state[0] is None:
+                return None
+
+            cards_dealt = int(state[0])
+            num_decks = int(state[2])
+            total_cards = num_decks * 52
+            return {
+                "num_decks": num_decks,
+                "total_cards": total_cards,
+                "remaining_cards": total_cards - cards_dealt,
+                "cards_dealt": cards_dealt,
+                "penetration": cards_dealt / total_cards,
+                "penetration_point": int(state[1]),
+                "generation": int(state[3])
+            }
+        except Exception as e:
+            logger.error(f"Error reading shared shoe stats for guild {guild_id}: {e}")
+            return None
+
+    def clear(self, guild_id: int) -> bool:
+        """Remove a guild's shoe. Returns True if it existed."""
+        if not self.redis_available:
+            return False
+
+        try:
+            return bool(self.redis.delete(self._shoe_key(guild_id)))
+        except Exception as e:
+            logger.error(f"Error clearing shared shoe for guild {guild_id}: {e}")
+            return False
+
+    def cleanup(self):
+        """Close the Redis connection."""
+        if self.redis:
+            try:
+                self.redis.close()
+            except Exception as e:
+                logger.error(f"Error closing ShoeStore Redis connection: {e}")
+        self.redis_available = False
+
+
+class SharedShoe:
+    """
+    BlackjackShoe-compatible handle for a guild's shoe in the ShoeStore.
+
+    Holds no cards itself. If a deal from Redis fails, the guild's in-process
+    shoe is used for that deal so games never stall.
+    """
+
+    def __init__(self, store: ShoeStore, guild_id: int, num_decks: int = 6, penetration: float = 0.75):
+        self.store = store
+        self.guild_id = guild_id
+        self.num_decks = num_decks
+        self.penetration = penetration
+
+    def _local_shoe(self):
+        from Entities.BlackjackShoe import BlackjackShoe
+        return BlackjackShoe.get_local_guild_shoe(self.guild_id, self.num_decks, self.penetration)
+
+    def deal_codes(self, count: int) -> List[int]:
+        """Deal count card codes in one atomic operation."""
+        codes = self.store.deal_codes(self.guild_id, count, self.num_decks, self.penetration)
+        if codes is None:
+            return self._local_shoe().deal_codes(count)
+        return codes
+
+    def deal_code(self) -> int:
+        """Deal a single card code."""
+        return self.deal_codes(1)[0]
+
+    def deal_card(self) -> str:
+        """Deal a single card as a display string."""
+        return CARD_STRINGS[self.deal_code()]
+
+    def __repr__(self):
+        return f"SharedShoe(guild_id={self.guild_id}, num_decks={self.num_decks})"
+
+
+# Singleton instance
+_shoe_store = None
+
+
+def get_shoe_store() -> ShoeStore:
+    """Get the singleton ShoeStore instance."""
+    global _shoe_store
+    if _shoe_store is None:
+        _shoe_store = ShoeStore()
+    return _shoe_store
+
+
+async def initialize_shoe_store():
+    """Initialize the shoe store. Call this from bot startup."""
+    get_shoe_store().initialize()
+
+
+async def cleanup_shoe_store():
+    """Cleanup the shoe store. Call this from bot shutdown."""
+    global _shoe_store
+    if _shoe_store:
+        _shoe_store.cleanup()
+        _shoe_store = None
@@ -0,0 +1,230 @@
+"""
+Streaming Presence Index
+
+Tracks which members are streaming, keyed by (guild_id, member_id), from
+gateway presence events instead of scanning every member's activities.
+
+- Cogs/On_Presence_Update.py feeds on_presence_update into update_member()
+  and reseeds a guild from its member cache when it becomes available
+  (startup, or after an outage where presence updates were missed)
+- Each member's current streaming activity (platform, URL, title) is stored;
+  members who aren't streaming aren't stored at all
+- A member starting or stopping a stream emits a StreamingEvent to every
+  subscriber; changing title or game while live only updates the entry
+- Subscribers are plain callables; coroutine functions are scheduled as tasks,
+  held in subscriber_tasks until they finish so they can't be garbage collected
+
+    index = get_streaming_presence_index()
+    index.subscribe(lambda event: changed.add((event.guild_id, event.member_id)))
+    if index.is_streaming(guild.id, member.id):
+        ...
+"""
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+import discord
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+STARTED = "started"
+STOPPED = "stopped"
+
+
+@dataclass(frozen=True)
+class StreamingActivity:
+    """The parts of a discord.Streaming activity worth keeping."""
+
+    platform: Optional[str]
+    url: Optional[str]
+    title: Optional[str]
+    details: Optional[str]
+    game: Optional[str]
+
+    @classmethod
+    def from_member(cls, member) -> Optional["StreamingActivity"]:
+        """Get a member's first streaming activity, or None if they aren't streaming."""
+        for activity in member.activities:
+            if isinstance(activity, discord.Streaming):
+                return cls(
+                    platform=activity.platform,
+                    url=activity.url,
+                    title=activity.name,
+                    details=activity.details,
+                    game=getattr(activity, 'game', None),
+                )
+        return None
+
+
+@dataclass(frozen=True)
+class StreamingEvent:
+    """A member started or stopped streaming."""
+
+    kind: str  # STARTED or STOPPED
+    guild_id: int
+    member_id: int
+    activity: StreamingActivity  # The new stream, or the one that just ended
+
+
+class StreamingPresenceIndex:
+    """
+    Members currently streaming, per guild.
+
+    Usage:
+        index = get_streaming_presence_index()
+        index.update_member(after)          # from on_presence_update
+        index.seed_guild(guild)             # when a guild becomes available
+        activity = index.get(guild_id, member_id)
+    """
+
+    def __init__(self):
+        self.streaming: Dict[int, Dict[int, StreamingActivity]] = {}
+        self.seeded_guilds: Set[int] = set()
+        self.subscribers: List[Callable[[StreamingEvent], object]] = []
+        self.subscriber_tasks: Set[asyncio.Task] = set()
+
+        # Monitoring counters
+        self.presence_updates = 0
+        self.started_events = 0
+        self.stopped_events = 0
+
+    def subscribe(self, callback: Callable[[StreamingEvent], object]):
+        """Call callback(event) for every started/stopped event."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[StreamingEvent], object]):
+        """Stop delivering events to callback."""
+        try:
+            self.subscribers.remove(callback)
+        except ValueError:
+            pass
+
+    def _emit(self, event: StreamingEvent):
+        if event.kind == STARTED:
+            self.started_events += 1
+        else:
+            self.stopped_events += 1
+
+        for callback in list(self.subscribers):
+            try:
+                result = callback(event)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self.subscriber_tasks.add(task)
+                    task.add_done_callback(self._subscriber_task_done)
+            except Exception as e:
+                logger.error(f"Streaming event subscriber failed for member {event.member_id}: {e}")
+
+    def _subscriber_task_done(self, task: asyncio.Task):
+        """Drop a finished subscriber task and log its failure, if any."""
+        self.subscriber_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Streaming event subscriber failed: {task.exception()}")
+
+    def _set(self, guild_id: int, member_id: int, activity: Optional[StreamingActivity]) -> Optional[StreamingEvent]:
+        """Store a member's activity; returns the event it caused, if any."""
+        guild_streams = self.streaming.get(guild_id)
+        previous = guild_streams.get(member_id) if guild_streams else None
+
+        if activity is None:
+            if previous is None:
+                return None
+            del guild_streams[member_id]
+            event = StreamingEvent(STOPPED, guild_id, member_id, previous)
+        else:
+            self.streaming.setdefault(guild_id, {})[member_id] = activity
+            if previous is not None:
+                return None  # Still live; title or game changed at most
+            event = StreamingEvent(STARTED, guild_id, member_id, activity)
+
+        self._emit(event)
+        return event
+
+    def update_member(self, member) -> Optional[StreamingEvent]:
+        """
+        Record a member's current presence.
+
+        Returns:
+            The started/stopped event this update caused, or None
+        """
+        self.presence_updates += 1
+        return self._set(member.guild.id, member.id, StreamingActivity.from_member(member))
+
+    def seed_guild(self, guild) -> int:
+        """
+        Rebuild a guild's entries from its member cache.
+
+        Emits events for every difference from what the index held.
+
+        Returns:
+            Number of events emitted
+        """
+        current = {}
+        for member in guild.members:
+            activity = StreamingActivity.from_member(member)
+            if activity is not None:
+                current[member.id] = activity
+
+        events = 0
+        for member_id in list(self.streaming.get(guild.id, {})):
+            if member_id not in current and self._set(guild.id, member_id, None):
+                events += 1
+        for member_id, activity in current.items():
+            if self._set(guild.id, member_id, activity):
+                events += 1
+
+        self.seeded_guilds.add(guild.id)
+        return events
+
+    def forget_member(self, guild_id: int, member_id: int):
+        """Drop a member who left the guild (no event)."""
+        guild_streams = self.streaming.get(guild_id)
+        if guild_streams:
+            guild_streams.pop(member_id, None)
+
+    def forget_guild(self, guild_id: int):
+        """Drop a guild the bot left (no events)."""
+        self.streaming.pop(guild_id, None)
+        self.seeded_guilds.discard(guild_id)
+
+    def is_seeded(self, guild_id: int) -> bool:
+        return guild_id in self.seeded_guilds
+
+    def get(self, guild_id: int, member_id: int) -> Optional[StreamingActivity]:
+        """Get a member's current stream, or None if they aren't streaming."""
+        guild_streams = self.streaming.get(guild_id)
+        return guild_streams.get(member_id) if guild_streams else None
+
+    def is_streaming(self, guild_id: int, member_id: int) -> bool:
+        return self.get(guild_id, member_id) is not None
+
+    def streaming_members(self, guild_id: int) -> Dict[int, StreamingActivity]:
+        """Get every streaming member of a guild (member ID -> activity)."""
+        return dict(self.streaming.get(guild_id, {}))
+
+    def get_stats(self) -> dict:
+        """Get index statistics for monitoring."""
+        return {
+            "streaming_members": sum(len(streams) for streams in self.streaming.values()),
+            "seeded_guilds": len(self.seeded_guilds),
+            "presence_updates": self.presence_updates,
+            "started_events": self.started_events,
+            "stopped_events": self.stopped_events,
+            "subscribers": len(self.subscribers),
+        }
+
+
+# Singleton instance
+_streaming_presence_index = None
+
+
+def get_streaming_presence_index() -> StreamingPresenceIndex:
+    """Get the singleton StreamingPresenceIndex instance."""
+    global _streaming_presence_index
+    if _streaming_presence_index is None:
+        _streaming_presence_index = StreamingPresenceIndex()
+    return _streaming_presence_index
@@ -0,0 +1,224 @@
+"""
+Background Task Leadership
+
+When the bot runs as several processes (see launcher.py), tasks that work
+on global state (reminders, global stats, YouTube polling, portals) must run
+in exactly one of them. Each such task is elected separately:
+
+- Leadership is the Redis key task_leader:{task} set with NX and a lease of
+  TASK_LEADER_LEASE seconds (default 30), holding this process's token
+- The leader renews the lease every third of that; if the key is gone or
+  owned by another process, the task is cancelled here. If Redis can't be
+  reached, the task keeps running until the lease would have run out
+- Other processes retry every third of a lease, so a crashed leader's tasks
+  move to another process within one lease
+- On shutdown the leader deletes its keys so a follower takes over at once
+- A single-process deployment runs the tasks directly; without Redis,
+  process 0 runs them
+
+Guild-scoped tasks don't use this: they run in every process and only
+handle guilds on that process's shards (utils.sharding.owns_guild).
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict
+
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Extends a lease only if this process still holds it.
+# KEYS: leader key. ARGV: token, lease in ms. Returns 1 if renewed
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Deletes a leader key only if this process holds it. KEYS: leader key. ARGV: token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TaskLeader:
+    """
+    Per-task leader election across bot processes.
+
+    Usage:
+        leader = get_task_leader()
+        await leader.run("check_reminders_task", lambda: module.start_task(bot))
+    """
+
+    def __init__(self):
+        self.process_index = int(os.getenv('BOT_PROCESS_INDEX', '0'))
+        self.process_count = int(os.getenv('BOT_PROCESS_COUNT', '1'))
+        self.lease_ms = int(float(os.getenv('TASK_LEADER_LEASE', '30')) * 1000)
+        self.renew_interval = self.lease_ms / 3000
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self.runners: Dict[str, asyncio.Task] = {}  # Task name -> election loop
+        self.leading = set()  # Task names this process currently runs
+
+        # Monitoring counters
+        self.elections_won = 0
+        self.leases_lost = 0
+
+    @property
+    def coordinated(self) -> bool:
+        """Whether other processes may run the same tasks."""
+        return self.process_count > 1
+
+    def _redis(self):
+        """Redis client, or None if Redis is unavailable."""
+        manager = get_session_manager()
+        return manager.redis if manager.redis_available else None
+
+    def _leader_key(self, name: str) -> str:
+        """Generate Redis key holding a task's leader token."""
+        return f"task_leader:{name}"
+
+    async def try_acquire(self, name: str) -> bool:
+        """Take leadership of a task if nobody holds it."""
+        redis = self._redis()
+        if redis is None:
+            return self.process_index == 0
+
+        try:
+            return bool(await redis.set(self._leader_key(name), self.token, nx=True, px=self.lease_ms))
+        except Exception as e:
+            logger.warning(f"Could not run leader election for {name}: {e}")
+            return False
+
+    async def renew(self, name: str) -> bool:
+        """
+        Extend this process's lease on a task.
+
+        Returns:
+            False if another process holds the task now
+
+        Raises:
+            Exception: if Redis could not be reached
+        """
+        redis = self._redis()
+        if redis is None:
+            return self.process_index == 0
+        return bool(await redis.eval(_RENEW_SCRIPT, 1, self._leader_key(name), self.token, self.lease_ms))
+
+    async def release(self, name: str):
+        """Give up a task so another process can take it."""
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.eval(_RELEASE_SCRIPT, 1, self._leader_key(name), self.token)
+        except Exception as e:
+            logger.warning(f"Could not release leadership of {name}: {e}")
+
+    async def run(self, name: str, start: Callable[[], Awaitable]):
+        """
+        Run start() whenever this process leads the task named name.
+
+        Returns when the task itself returns. Loses and re-contests
+        leadership as needed until then.
+        """
+        if not self.coordinated:
+            return await start()
+
+        self.runners[name] = asyncio.current_task()
+        try:
+            while True:
+                if not await self.try_acquire(name):
+                    await asyncio.sleep(self.renew_interval)
+                    continue
+
+                finished, result = await self._lead(name, start)
+                if finished:
+                    return result
+        finally:
+            self.runners.pop(name, None)
+
+    async def _lead(self, name: str, start: Callable[[], Awaitable]) -> tuple:
+        """Run the task while renewing its lease. Returns (finished, result)."""
+        logger.info(f"Process {self.process_index} now runs {name}")
+        self.elections_won += 1
+        self.leading.add(name)
+
+        task = asyncio.create_task(start(), name=f"leader_{name}")
+        renewed_at = time.monotonic()
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.renew_interval)
+                if done:
+                    return True, task.result()
+
+                try:
+                    if not await self.renew(name):
+                        logger.warning(f"Process {self.process_index} lost leadership of {name}")
+                        break
+                    renewed_at = time.monotonic()
+                except Exception as e:
+                    if time.monotonic() - renewed_at >= self.lease_ms / 1000:
+                        logger.warning(f"Could not renew leadership of {name} within its lease, stopping it: {e}")
+                        break
+                    logger.debug(f"Lease renewal for {name} failed, retrying: {e}")
+
+            self.leases_lost += 1
+            return False, None
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.leading.discard(name)
+            await self.release(name)
+
+    def get_stats(self) -> dict:
+        """Get leadership statistics for monitoring."""
+        return {
+            "process_index": self.process_index,
+            "process_count": self.process_count,
+            "leading": sorted(self.leading),
+            "contending": sorted(self.runners),
+            "elections_won": self.elections_won,
+            "leases_lost": self.leases_lost,
+        }
+
+    async def cleanup(self):
+        """Stop every elected task and hand its lease back."""
+        runners = list(self.runners.values())
+        for runner in runners:
+            runner.cancel()
+        if runners:
+            await asyncio.gather(*runners, return_exceptions=True)
+
+
+# Singleton instance
+_task_leader = None
+
+
+def get_task_leader() -> TaskLeader:
+    """Get the singleton TaskLeader instance."""
+    global _task_leader
+    if _task_leader is None:
+        _task_leader = TaskLeader()
+    return _task_leader
+
+
+async def cleanup_task_leader():
+    """Stop elected tasks and release their leases."""
+    global _task_leader
+    if _task_leader:
+        await _task_leader.cleanup()
+        _task_leader = None
@@ -26,6 +26,7 @@ from typing import Optional, Tuple, Dict
 import redis.asyncio as aioredis
 import os
 from logger import AppLogger
+from utils.level_curve import LevelCurve, get_default_level_curve
 
 logger = AppLogger(__name__).get_logger()
 
@@ -198,8 +199,9 @@ class XPSessionManager:
         user_id: int,
         xp_amount: int,
         cooldown_seconds: int,
-        premium_multiplier: float = 1.0
-    ) -> Tuple[bool, int, int, Optional[dict]]:
+        premium_multiplier: float = 1.0,
+        level_curve: Optional[LevelCurve] = None
+    ) -> Tuple[int, int, int, Optional[dict]]:
         """
         Grant XP to user's active session (in-memory operation).
 
@@ -209,17 +211,18 @@ class XPSessionManager:
             xp_amount: Base XP to grant (before multipliers)
             cooldown_seconds: Cooldown period in seconds
             premium_multiplier: Premium XP multiplier (default 1.0)
+            level_curve: The guild's level curve (default curve if None)
 
         Returns:
             Tuple of:
-            - level_up: Whether user leveled up
+            - levels_gained: Number of levels gained (0 if none)
             - new_level: User's new level
             - xp_gained: Actual XP granted (after multipliers)
             - session: Updated session dict (or None if Redis unavailable)
         """
         if not self.redis_available:
             # Fallback mode: return None to trigger immediate DB operations
-            return False, 0, 0, None
+            return 0, 0, 0, None
 
         try:
             session_key = self._session_key(guild_id, user_id)
@@ -228,7 +231,7 @@ class XPSessionManager:
             session_data = await self.redis.get(session_key)
             if not session_data:
                 # Session doesn't exist - caller should create it first
-                return False, 0, 0, None
+                return 0, 0, 0, None
 
             session = json.loads(session_data)
 
@@ -243,7 +246,7 @@ class XPSessionManager:
                     # Update last_active but don't mark dirty
                     session["last_active"] = now.isoformat()
                     await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
-                    return False, session["guild_level"], 0, session
+                    return 0, session["guild_level"], 0, session
 
             # Apply XP multiplier (already includes streak bonus from caller)
             xp_gained = math.ceil(xp_amount * premium_multiplier)
@@ -257,8 +260,8 @@ class XPSessionManager:
             session["global_exp"] += xp_gained
 
             # Calculate new levels
-            session["guild_level"] = self._calculate_level_from_exp(session["guild_exp"])
-            session["global_level"] = self._calculate_level_from_exp(session["global_exp"])
+            session["guild_level"] = (level_curve or get_default_level_curve()).level_for_exp(session["guild_exp"])
+            session["global_level"] = get_default_level_curve().level_for_exp(session["global_exp"])
 
             # Update metadata
             now = datetime.now(timezone.utc)
@@ -270,19 +273,13 @@ class XPSessionManager:
             # Save back to Redis
             await self.redis.setex(session_key, self.session_ttl, json.dumps(session))
 
-            level_up = session["guild_level"] > old_level
+            levels_gained = max(session["guild_level"] - old_level, 0)
 
-            return level_up, session["guild_level"], xp_gained, session
+            return levels_gained, session["guild_level"], xp_gained, session
 
         except Exception as e:
             logger.error(f"Error granting XP to session: {e}", exc_info=True)
-            return False, 0, 0, None
-
-    def _calculate_level_from_exp(self, exp: int) -> int:
-        """Calculate level from experience points."""
-        if exp < 0:
-            return 0
-        return math.floor(math.sqrt(exp / 100))
+            return 0, 0, 0, None
 
     async def update_session_activity(self, guild_id: int, user_id: int):
         """
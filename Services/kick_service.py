@@ -15,10 +15,15 @@ from dotenv import load_dotenv
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
+from Services.LiveStatusCache import LiveStatusUnavailable, get_live_status_cache, unique_logins
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Most slugs / broadcaster_user_ids the public API accepts per request
+KICK_BATCH_SIZE = 50
+
 
 class KickService:
     """Kick.com API integration for live stream tracking"""
@@ -159,6 +164,37 @@ class KickService:
             return data['data'][0]  # Return first matching channel
         return None
 
+    async def get_channel_ids_batch(
+        self,
+        session: aiohttp.ClientSession,
+        usernames: List[str]
+    ) -> Dict[str, str]:
+        """
+        Resolve channel slugs to broadcaster user IDs, 50 per API call.
+
+        Returns:
+            Dict mapping slug (lowercase) to user ID for channels that exist
+
+        Raises:
+            LiveStatusUnavailable: a channels request failed
+        """
+        user_ids = {}
+        for start in range(0, len(usernames), KICK_BATCH_SIZE):
+            chunk = usernames[start:start + KICK_BATCH_SIZE]
+            data = await self._make_api_request(session, "channels", params={"slug": chunk}, require_auth=True)
+            if 'data' not in data:
+                # _make_api_request already logged the error and returned {}
+                raise LiveStatusUnavailable(f"Kick channels request failed for {len(chunk)} slugs")
+
+            for channel_info in data.get('data') or []:
+                slug = channel_info.get('slug')
+                user_id = (channel_info.get('broadcaster_user_id')
+                           or channel_info.get('user_id') or channel_info.get('id'))
+                if slug and user_id:
+                    user_ids[slug.lower()] = str(user_id)
+
+        return user_ids
+
     async def get_user_info(
         self,
         session: aiohttp.ClientSession,
@@ -192,8 +228,12 @@ class KickService:
             usernames: List of Kick usernames (slugs)
 
         Returns:
-            Dict mapping username to stream data for live streams only.
+            Dict mapping username (lowercase) to stream data for live streams only.
+
+        Raises:
+            LiveStatusUnavailable: a channels or livestreams request failed
         """
+        usernames = unique_logins(usernames)
         if not usernames:
             return {}
 
@@ -202,28 +242,31 @@ class KickService:
         # Try batch endpoint first (if available)
         try:
             # Kick's livestreams endpoint with multiple broadcaster_user_id params
-            # First, we need to get user IDs for the usernames
-            user_ids = []
-            username_to_id = {}
-
-            for username in usernames:
-                channel_info = await self.get_channel_info(session, username)
-                if channel_info:
-                    user_id = channel_info.get('user_id') or channel_info.get('id')
-                    if user_id:
-                        user_ids.append(str(user_id))
-                        username_to_id[str(user_id)] = username
-
-            if user_ids:
-                # Try batch livestreams endpoint (requires OAuth authentication)
-                params = {'broadcaster_user_id': user_ids}
+            # First, we need user IDs for the usernames; they never change, so
+            # each one is only resolved once
+            cache = get_live_status_cache()
+            username_to_id = await cache.get_user_ids("kick", usernames)
+            unresolved = [username for username in usernames if username not in username_to_id]
+            if unresolved:
+                resolved = await self.get_channel_ids_batch(session, unresolved)
+                await cache.remember_user_ids("kick", resolved)
+                username_to_id.update(resolved)
+
+            id_to_username = {user_id: username for username, user_id in username_to_id.items()}
+            user_ids = list(id_to_username)
+
+            # Batch livestreams endpoint (requires OAuth authentication)
+            for start in range(0, len(user_ids), KICK_BATCH_SIZE):
+                params = {'broadcaster_user_id': user_ids[start:start + KICK_BATCH_SIZE]}
                 data = await self._make_api_request(session, "livestreams", params, require_auth=True)
+                if 'data' not in data:
+                    raise LiveStatusUnavailable(f"Kick livestreams request failed for {len(params['broadcaster_user_id'])} channels")
 
-                for stream_info in data.get('data', []):
+                for stream_info in data.get('data') or []:
                     broadcaster_id = str(stream_info.get('broadcaster_user_id'))
-                    username = username_to_id.get(broadcaster_id)
+                    username = id_to_username.get(broadcaster_id)
                     if username:
-                        live_streams[username.lower()] = {
+                        live_streams[username] = {
                             "data": [stream_info],
                             "is_live": True,
                             "title": stream_info.get('title'),
@@ -233,6 +276,9 @@ class KickService:
                             "thumbnail_url": stream_info.get('thumbnail', {}).get('url')
                         }
 
+        except LiveStatusUnavailable:
+            # The individual checks hit the same API; don't report everyone offline
+            raise
         except Exception as e:
             self.logger.warning(f"Batch livestream check failed, falling back to individual checks: {e}")
 
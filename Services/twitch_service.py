@@ -6,11 +6,16 @@ from dotenv import load_dotenv
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from Services.LiveStatusCache import LiveStatusUnavailable, get_live_status_cache, unique_logins
+
 load_dotenv()
 
 # Set up logging for the service
 logger = logging.getLogger(__name__)
 
+# Most user_login values Helix accepts per /streams request
+HELIX_BATCH_SIZE = 100
+
 
 class TwitchService:
     def __init__(self):
@@ -90,7 +95,10 @@ class TwitchService:
             usernames: List[str]
     ) -> Dict[str, Dict[str, Any]]:
         """
-        NEW CORE METHOD: Checks status for up to 100 streamers in a single API call.
+        NEW CORE METHOD: Checks status for many streamers, 100 per API call.
+
+        Usernames are lowercased and deduplicated first, so a streamer tracked
+        by several guilds is only asked about once.
 
         Args:
             session: aiohttp session
@@ -99,23 +107,36 @@ class TwitchService:
         Returns:
             Dict mapping user_login (lowercase) to its stream data dictionary.
             Only streams that are LIVE are included in the result.
+
+        Raises:
+            LiveStatusUnavailable: a /streams request failed, so offline
+                can't be told apart from unknown
         """
-        if not usernames:
+        logins = unique_logins(usernames)
+        if not logins:
             return {}
 
-        # Helix API /streams endpoint supports up to 100 user_login parameters
-        params = [("user_login", u.lower()) for u in usernames]
-        data = await self._make_api_request(session, "streams", params)
-
         live_streams = {}
-        # The API response contains a list of currently live streams.
-        # We map them to their user_login (which is guaranteed to be lowercase).
-        for stream_info in data.get('data', []):
-            user_login = stream_info['user_login']
-            live_streams[user_login] = {"data": [stream_info]}
-            # We wrap it in {"data": [...]} to match the existing format of get_stream_info
-            # for easier compatibility in the posting logic.
-
+        user_ids = {}
+        # Helix API /streams endpoint supports up to 100 user_login parameters
+        for start in range(0, len(logins), HELIX_BATCH_SIZE):
+            params = [("user_login", login) for login in logins[start:start + HELIX_BATCH_SIZE]]
+            data = await self._make_api_request(session, "streams", params)
+            if 'data' not in data:
+                # _make_api_request already logged the error and returned {}
+                raise LiveStatusUnavailable(f"Twitch streams request failed for {len(params)} logins")
+
+            # The API response contains a list of currently live streams.
+            # We map them to their user_login (which is guaranteed to be lowercase).
+            for stream_info in data.get('data', []):
+                user_login = stream_info['user_login']
+                live_streams[user_login] = {"data": [stream_info]}
+                # We wrap it in {"data": [...]} to match the existing format of get_stream_info
+                # for easier compatibility in the posting logic.
+                if stream_info.get('user_id'):
+                    user_ids[user_login] = stream_info['user_id']
+
+        await get_live_status_cache().remember_user_ids("twitch", user_ids)
         return live_streams
 
     # --- DEPRECATED/Replaced Methods ---
@@ -154,6 +175,20 @@ class TwitchService:
         # Twitch Helix API uses 'login' (lowercase) for user lookup
         return data["data"][0] if data.get("data") else None
 
+    async def get_user_id(self, session: aiohttp.ClientSession, username: str) -> Optional[str]:
+        """Get a user's ID, looking it up only the first time (IDs never change)."""
+        cache = get_live_status_cache()
+        known = await cache.get_user_ids("twitch", [username])
+        if known:
+            return known[username.lower()]
+
+        user_data = await self.get_user_info(session, username)
+        if not user_data:
+            return None
+
+        await cache.remember_user_ids("twitch", {username: user_data['id']})
+        return user_data['id']
+
     async def get_recent_vods(
             self,
             session: aiohttp.ClientSession,
@@ -162,12 +197,10 @@ class TwitchService:
     ) -> List[Dict[str, Any]]:
         """Get recent VODs for a user (used by VOD checker)."""
         # First get user ID
-        user_data = await self.get_user_info(session, username)
-        if not user_data:
+        user_id = await self.get_user_id(session, username)
+        if not user_id:
             return []
 
-        user_id = user_data['id']
-
         # Get VODs
         data = await self._make_api_request(session, "videos", [
             ("user_id", user_id),
@@ -376,7 +376,41 @@ class YouTubeService:
             logger.warning(f"No video details found for video ID: {video_id}")
             return None
 
-        video = data['items'][0]
+        return self._parse_video_details(data['items'][0])
+
+    async def get_video_details_batch(
+            self,
+            session: aiohttp.ClientSession,
+            video_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches details for many videos, 50 IDs per 'videos' request.
+        Quota cost: 1 unit per 50 videos.
+
+        Returns: {video_id: details} (missing, deleted or private videos are omitted)
+        """
+        results = {}
+        unique_ids = list(dict.fromkeys(video_ids))
+
+        for start in range(0, len(unique_ids), 50):
+            chunk = unique_ids[start:start + 50]
+            data = await self._make_api_request(
+                session,
+                'videos',
+                {
+                    'part': 'snippet,liveStreamingDetails,statistics',
+                    'id': ','.join(chunk)
+                },
+                quota_cost=1
+            )
+
+            for video in data.get('items', []):
+                results[video['id']] = self._parse_video_details(video)
+
+        return results
+
+    def _parse_video_details(self, video: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a 'videos' API item into the details dict used by the announcement tasks."""
         snippet = video.get('snippet', {})
         live_details = video.get('liveStreamingDetails', {})
         stats = video.get('statistics', {})
@@ -1,9 +1,10 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
-import json
 from Dao.GuildUserDao import GuildUserDao
-from Dao.GuildDao import GuildDao
+from Services.ConfigCache import get_config_cache
+from Services.DailyCheckCache import get_daily_check_cache
+from Services.SessionManager import get_session_manager
 
 logger = logging.getLogger(__name__)
 
@@ -35,104 +36,43 @@ async def daily_reward_task(bot):
 
 
 async def _reset_daily_rewards_all_guilds(bot):
-    """Reset daily rewards for all guilds the bot is in."""
+    """
+    Reset daily rewards for all guilds the bot is in.
+
+    The reset is two set-based UPDATEs per chunk of guilds, run in a worker
+    thread, followed by a bulk invalidation of cached sessions and daily
+    checks for the affected guilds.
+    """
+    guild_ids = await _get_leveling_guild_ids(bot)
+    if not guild_ids:
+        logger.info('No guilds with leveling enabled, skipping daily reset')
+        return
+
     guild_user_dao = GuildUserDao()
     try:
-        # Process all guilds the bot is connected to
-        for guild in bot.guilds:
-            try:
-                logger.info(f'Processing daily reset for guild: {guild.name} (ID: {guild.id})')
-                await _reset_daily_rewards_for_guild(guild_user_dao, guild)
-
-            except Exception as e:
-                logger.error(f'Error processing guild {guild.name} (ID: {guild.id}): {e}')
+        daily_resets, streak_resets = await asyncio.to_thread(guild_user_dao.reset_daily_for_guilds, guild_ids)
     finally:
         guild_user_dao.close()
 
+    logger.info(f'Daily reset for {len(guild_ids)} guilds: cleared {daily_resets} daily claims, reset {streak_resets} streaks')
 
-async def _reset_daily_rewards_for_guild(guild_user_dao: GuildUserDao, guild):
-    """Reset daily rewards for a specific guild."""
-    # Check if leveling is enabled for this guild
-    leveling_config = _get_leveling_config(guild.id)
-
-    if not leveling_config.get("enabled", True):
-        logger.info(f'Guild {guild.name}: Leveling disabled, skipping daily reset')
-        return
-
-    # Reset daily status for all users in this guild
-    guild_user_dao.reset_daily(guild.id)
-
-    today = datetime.utcnow().date()
-    processed_count = 0
-    streak_resets = 0
-
-    for member in guild.members:
-        # Skip bots
-        if member.bot:
-            continue
-
-        try:
-            current_user = guild_user_dao.get_guild_user(member.id, guild.id)
-
-            if current_user is None:
-                # Skip users not in database
-                continue
+    # Cached sessions hold the old streak and the daily cache remembers yesterday's checks
+    await get_session_manager().invalidate_guild_sessions(guild_ids)
+    await get_daily_check_cache().invalidate_guilds(guild_ids)
 
-            processed_count += 1
 
-            if current_user.last_daily is not None:
-                # Handle datetime object properly
-                if isinstance(current_user.last_daily, datetime):
-                    last_daily_date = current_user.last_daily.date()
-                else:
-                    # If it's a string, parse it
-                    last_daily_date = datetime.strptime(
-                        str(current_user.last_daily), "%Y-%m-%d %H:%M:%S"
-                    ).date()
+async def _get_leveling_guild_ids(bot) -> list:
+    """Get the IDs of connected guilds that have leveling enabled."""
+    configs = await get_config_cache().get_leveling_configs([guild.id for guild in bot.guilds])
+    guild_ids = []
 
-                # Reset streak if user missed more than one day
-                if last_daily_date < today - timedelta(days=1):
-                    if current_user.streak > 0:
-                        guild_user_dao.reset_streak(current_user.user_id, guild.id)
-                        streak_resets += 1
-                        logger.info(f'Guild {guild.name}: {current_user.name} streak reset')
+    for guild in bot.guilds:
+        if configs[guild.id].get("enabled", True):
+            guild_ids.append(guild.id)
+        else:
+            logger.info(f'Guild {guild.name}: Leveling disabled, skipping daily reset')
 
-        except Exception as e:
-            logger.error(f'Error processing user {member.name} in guild {guild.name}: {e}')
-
-    logger.info(f'Guild {guild.name}: Processed {processed_count} users, reset {streak_resets} streaks')
-
-
-def _get_leveling_config(guild_id):
-    """Get leveling configuration from guild settings"""
-    default_config = {
-        "enabled": True
-    }
-
-    guild_dao = GuildDao()
-    try:
-        guild = guild_dao.get_guild(guild_id)
-
-        if not guild or not guild.settings:
-            return default_config
-
-        # Parse settings JSON
-        settings = json.loads(guild.settings) if isinstance(guild.settings, str) else guild.settings
-
-        # Get leveling settings or return default
-        leveling_settings = settings.get("leveling", {})
-
-        # Merge with defaults
-        config = default_config.copy()
-        config.update(leveling_settings)
-
-        return config
-
-    except Exception as e:
-        logger.error(f"Error getting leveling config for guild {guild_id}: {e}")
-        return default_config
-    finally:
-        guild_dao.close()
+    return guild_ids
 
 
 # import asyncio
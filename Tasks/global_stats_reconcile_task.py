@@ -0,0 +1,27 @@
+import asyncio
+import logging
+from Services.GlobalStatsService import get_global_stats_service
+
+logger = logging.getLogger(__name__)
+
+
+async def start_task(bot):
+    """Entry point function that the task manager expects."""
+    await global_stats_reconcile_task(bot)
+
+
+async def global_stats_reconcile_task(bot):
+    """Reconcile the /admin-stats running totals against MySQL on startup and then periodically."""
+    await bot.wait_until_ready()
+    stats = get_global_stats_service()
+
+    while not bot.is_closed():
+        logger.info('Running global_stats_reconcile_task')
+
+        try:
+            if not await stats.reconcile():
+                logger.warning('Global stats reconciliation did not complete')
+        except Exception as e:
+            logger.error(f'Global stats reconcile task error: {e}')
+
+        await asyncio.sleep(stats.reconcile_interval)
@@ -11,6 +11,9 @@ import logging
 import aiohttp
 from Services.kick_service import KickService
 from Dao.KickAnnouncementDao import KickAnnouncementDao
+from Services.AnnouncementRenderStore import get_announcement_render_store
+from Services.LiveStatusCache import get_live_status_cache, unique_logins
+from utils.sharding import owns_guild
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +51,8 @@ async def _check_kick_status_updates(bot):
     try:
         # Fetch Kick streams needing status update (last_status_check_at > 20 min ago)
         kick_due = dao.get_announcements_needing_status_update()
+        # Guilds on other shards are updated by the process running them
+        kick_due = [a for a in kick_due if owns_guild(bot, a['guild_id'])]
 
         if not kick_due:
             logger.debug("No Kick streams needing status update")
@@ -55,14 +60,18 @@ async def _check_kick_status_updates(bot):
 
         logger.debug(f"Checking status updates for {len(kick_due)} Kick streams")
 
-        kick_usernames = [a['streamer_username'] for a in kick_due]
+        # A streamer announced in several guilds is checked once and fanned out
+        kick_usernames = unique_logins(a['streamer_username'] for a in kick_due)
         status_update_data = {}
 
         # Simple session - Kick's official public API handles auth via OAuth token
         async with aiohttp.ClientSession() as session:
             if kick_usernames:
                 try:
-                    kick_live_data = await kick_service.get_live_streams_batch(session, kick_usernames)
+                    kick_live_data = await get_live_status_cache().get_live_streams(
+                        "kick", kick_usernames,
+                        lambda usernames: kick_service.get_live_streams_batch(session, usernames)
+                    )
                     for username, data in kick_live_data.items():
                         status_update_data[username] = data
                 except Exception as e:
@@ -71,7 +80,7 @@ async def _check_kick_status_updates(bot):
         # Update announcements
         update_tasks = []
         for announcement in kick_due:
-            username = announcement['streamer_username']
+            username = announcement['streamer_username'].lower()
 
             if username in status_update_data:
                 data = status_update_data[username]
@@ -102,54 +111,12 @@ async def _check_kick_status_updates(bot):
 
 
 async def _update_kick_announcement(bot, announcement: dict, new_viewer_count: int, new_title: str, dao: KickAnnouncementDao):
-    """Update Discord message with new viewer count and title."""
+    """Update Discord message with new viewer count and title (skipped if nothing visibly changed)."""
     try:
-        guild = bot.get_guild(announcement['guild_id'])
-        if not guild:
-            logger.debug(f"Guild {announcement['guild_id']} not found")
-            return
-
-        channel = guild.get_channel(announcement['channel_id'])
-        if not channel:
-            logger.debug(f"Channel {announcement['channel_id']} not found")
-            return
-
-        try:
-            message = await channel.fetch_message(announcement['message_id'])
-        except discord.NotFound:
-            logger.warning(f"Message {announcement['message_id']} not found (may have been deleted)")
-            return
-        except discord.Forbidden:
-            logger.warning(f"No permission to fetch message {announcement['message_id']}")
-            return
-
-        if not message.embeds:
-            logger.debug(f"Message {announcement['message_id']} has no embeds")
-            return
-
-        embed = message.embeds[0]
-
-        # Update the description (stream title) if provided
-        if new_title:
-            stream_link = f"https://kick.com/{announcement['streamer_username']}"
-            embed.description = f"### [{new_title}]({stream_link})"
-
-        # Update the Viewers field
-        updated = False
-        for i, field in enumerate(embed.fields):
-            if field.name == "Viewers":
-                embed.set_field_at(i, name="Viewers", value=f"{new_viewer_count:,}", inline=False)
-                updated = True
-                break
-
-        if updated or new_title:
-            await message.edit(embed=embed)
-            log_parts = []
-            if updated:
-                log_parts.append(f"viewer count to {new_viewer_count:,}")
-            if new_title:
-                log_parts.append(f"title to '{new_title}'")
-            logger.debug(f"Updated {' and '.join(log_parts)} for stream {announcement['streamer_username']}")
+        stream_link = f"https://kick.com/{announcement['streamer_username']}"
+        await get_announcement_render_store().update_stream_announcement(
+            bot, "kick", announcement, new_viewer_count, new_title, stream_link
+        )
 
         # Update DAO
         dao.update_last_status_check(announcement['id'], new_viewer_count)
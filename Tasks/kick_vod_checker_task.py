@@ -12,6 +12,7 @@ import logging
 from Services.kick_service import KickService
 from Dao.KickAnnouncementDao import KickAnnouncementDao
 from Dao.GuildDao import GuildDao
+from utils.sharding import owns_guild
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +93,10 @@ async def _check_single_kick_vod(bot, ann, kick_service, session, guild_dao, dao
         channel_id = ann.get('channel_id') if isinstance(ann, dict) else ann.channel_id
         message_id = ann.get('message_id') if isinstance(ann, dict) else ann.message_id
 
+        # Guilds on other shards are checked by the process running them
+        if not owns_guild(bot, guild_id):
+            return
+
         # Check if guild has VOD detection enabled
         settings = guild_dao.get_guild_settings(guild_id)
         if not settings:
@@ -1,13 +1,14 @@
 import asyncio
-import random
 from datetime import datetime, timedelta, timezone
 import logging
 import discord
 
-from Dao.GuildDao import GuildDao
 from Dao.GuildUserDao import GuildUserDao
 from Dao.LotteryEventDao import LotteryEventDao
-from Dao.LotteryParticipantDao import LotteryParticipantDao
+from Services.CurrencyLedger import get_currency_ledger
+from Services.EntityResolver import get_entity_resolver
+from Services.LotteryService import get_lottery_service
+from utils.sharding import owns_guild
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,10 @@ async def _process_all_guild_lotteries(bot):
             return
 
         for lottery_event in current_lotteries:
+            # Guilds on other shards are handled by the process running them
+            if not owns_guild(bot, lottery_event.guild_id):
+                continue
+
             try:
                 guild = bot.get_guild(lottery_event.guild_id)
                 if not guild:
@@ -77,29 +82,26 @@ async def _end_lottery(lottery_event, guild, channel):
     """End a lottery event and select a winner."""
     logger.info(f'Guild {guild.name}: Ending lottery event {lottery_event.id}')
 
-    # Get all required DAOs
     le_dao = LotteryEventDao()
-    guild_dao = GuildDao()  # Use GuildDao instead of VaultDao
     guild_user_dao = GuildUserDao()  # Need this for winner's currency
-    lp_dao = LotteryParticipantDao()
+    lottery = get_lottery_service()
     try:
-        # Get lottery credits from guild vault
-        lottery_credits = guild_dao.get_vault_currency(guild.id)
-
-        # Get participants using lottery_event.id (not message_id)
-        participants = lp_dao.get_participants(lottery_event.id)
+        # Draw from the event's entrant set; the first candidate still in the guild wins
+        candidates = await lottery.draw(lottery_event.id)
 
-        if not participants:
+        if not candidates:
             logger.warning(f'Guild {guild.name}: No participants in lottery {lottery_event.id}')
             await _cleanup_empty_lottery(lottery_event, guild, channel, le_dao)
+            await lottery.finish(lottery_event.id)
+            lottery.invalidate_event(guild.id)
             return
 
-        # Select winner
-        winner = random.choice(participants)
-        discord_winner = guild.get_member(winner.participant_id)
+        discord_winner = next(
+            (member for member in map(guild.get_member, candidates) if member is not None), None
+        )
 
         if not discord_winner:
-            logger.warning(f'Guild {guild.name}: Winner {winner.participant_id} not found in guild')
+            logger.warning(f'Guild {guild.name}: None of the drawn winners {candidates} are still in the guild')
             # Could implement fallback logic here
             return
 
@@ -110,6 +112,9 @@ async def _end_lottery(lottery_event, guild, channel):
             logger.error(f'Guild {guild.name}: Failed to get guild user for winner {discord_winner.name}')
             return
 
+        # The pot is the stored vault plus game losses not yet flushed to it
+        lottery_credits = await lottery.get_vault_total(guild.id, use_cache=False)
+
         # Send winner announcement
         lottery_role = discord.utils.get(guild.roles, name="LotteryParticipant")
         role_mention = lottery_role.mention if lottery_role else "@LotteryParticipant"
@@ -121,8 +126,11 @@ async def _end_lottery(lottery_event, guild, channel):
         )
 
         # Update database records
-        await _update_lottery_records(lottery_event, winner_guild_user, lottery_credits, le_dao, guild_user_dao,
-                                      guild_dao, guild)
+        await _update_lottery_records(lottery_event, winner_guild_user, lottery_credits, le_dao, guild)
+
+        # Persist the remaining entrants and drop the entrant set
+        await lottery.finish(lottery_event.id)
+        lottery.invalidate_event(guild.id)
 
         # Cleanup
         await _cleanup_lottery(lottery_event, guild, channel)
@@ -133,13 +141,10 @@ async def _end_lottery(lottery_event, guild, channel):
         logger.error(f'Guild {guild.name}: Error ending lottery {lottery_event.id}: {e}')
     finally:
         le_dao.close()
-        guild_dao.close()
         guild_user_dao.close()
-        lp_dao.close()
 
 
-async def _update_lottery_records(lottery_event, winner_guild_user, lottery_credits, le_dao, guild_user_dao, guild_dao,
-                                  guild):
+async def _update_lottery_records(lottery_event, winner_guild_user, lottery_credits, le_dao, guild):
     """Update all database records for the lottery end."""
     try:
         # Update lottery event
@@ -148,14 +153,20 @@ async def _update_lottery_records(lottery_event, winner_guild_user, lottery_cred
         lottery_event.credits = lottery_credits
         le_dao.update_event(lottery_event)
 
-        # Update winner's guild currency with global sync
-        guild_user_dao.update_currency_with_global_sync(winner_guild_user.user_id, guild.id, lottery_credits)
-
-        # Reset guild vault currency to 0
-        guild_dao.update_vault_currency(guild.id, 0)
+        # Move the pot from the vault to the winner in one ledger transfer; keyed on
+        # the lottery so a re-run can't pay twice. Vault additions made after the pot
+        # was read stay in the vault for the next lottery.
+        result = await get_currency_ledger().transfer(
+            guild.id,
+            {winner_guild_user.user_id: lottery_credits},
+            vault_delta=-lottery_credits,
+            idempotency_key=f"lottery:{lottery_event.id}"
+        )
+        if not result.success:
+            raise RuntimeError(f"lottery payout failed ({result.error})")
 
         logger.info(
-            f'Guild {guild.name}: Updated lottery records - winner got {lottery_credits} credits, vault reset to 0')
+            f'Guild {guild.name}: Updated lottery records - winner got {lottery_credits} credits from the vault')
 
     except Exception as e:
         logger.error(f'Guild {guild.name}: Error updating lottery records: {e}')
@@ -174,7 +185,8 @@ async def _send_lottery_reminder(lottery_event, guild, channel, remaining_time):
             # (you might want to store this in database or cache to avoid spam)
 
             try:
-                message = await channel.fetch_message(lottery_event.message_id)
+                # Only the link is needed, so don't fetch the message
+                message = get_entity_resolver().partial_message(channel, lottery_event.message_id)
                 await channel.send(
                     f"## <a:pepesith:1165101386921418792> The lottery ends in {minutes_remaining} minutes! "
                     f"Enter here -> {message.jump_url}"
@@ -193,7 +205,7 @@ async def _cleanup_lottery(lottery_event, guild, channel):
     try:
         # Remove and delete lottery message
         try:
-            message = await channel.fetch_message(lottery_event.message_id)
+            message = get_entity_resolver().partial_message(channel, lottery_event.message_id)
             await message.unpin()
             await message.delete()
         except discord.NotFound:
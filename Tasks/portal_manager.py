@@ -5,7 +5,9 @@ import asyncio
 from datetime import datetime
 
 from Dao.CrossServerPortalDao import CrossServerPortalDao
+from Services.EntityResolver import get_entity_resolver
 from logger import AppLogger
+from utils.sharding import owns_guild
 
 
 logger = AppLogger(__name__).get_logger()
@@ -26,16 +28,23 @@ async def check_expired_portals(bot):
                 portal_dao.close_portal(portal.id)
 
                 # Update portal messages to show closed status
-                for channel_id, message_id in [
-                    (portal.channel_id_1, portal.message_id_1),
-                    (portal.channel_id_2, portal.message_id_2)
+                for guild_id, channel_id, message_id in [
+                    (portal.guild_id_1, portal.channel_id_1, portal.message_id_1),
+                    (portal.guild_id_2, portal.channel_id_2, portal.message_id_2)
                 ]:
                     try:
-                        channel = bot.get_channel(channel_id)
+                        if owns_guild(bot, guild_id):
+                            channel = bot.get_channel(channel_id)
+                        else:
+                            # Guild is on another process's shards; edit over REST
+                            channel = bot.get_partial_messageable(channel_id, guild_id=guild_id)
                         if not channel or not message_id:
                             continue
 
-                        message = await channel.fetch_message(message_id)
+                        message = await get_entity_resolver().get_message(bot, channel, message_id)
+                        if message is None:
+                            logger.warning(f"Portal message {message_id} not found in channel {channel_id}")
+                            continue
                         embed = message.embeds[0]
 
                         # Update embed to show portal is closed
@@ -48,6 +57,7 @@ async def check_expired_portals(bot):
                         )
 
                         await message.edit(embed=embed)
+                        get_entity_resolver().forget_message(message_id)
 
                         # Optionally post a closing message
                         await channel.send(
@@ -77,6 +87,11 @@ async def before_check_expired_portals():
 
 
 async def start_task(bot):
-    """Start the portal manager background task"""
-    check_expired_portals.start(bot)
+    """Run the portal manager background task until it is stopped"""
+    loop_task = check_expired_portals.start(bot)
     logger.info("Portal manager task started")
+    try:
+        await loop_task
+    finally:
+        # Stopped here when another process takes over the task
+        check_expired_portals.cancel()
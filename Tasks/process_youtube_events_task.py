@@ -3,184 +3,202 @@ import aiohttp
 import discord
 import pytz
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable
 
 from database import get_db_session
 from Dao.YoutubeDao import YoutubeDao
-from Dao.GuildDao import GuildDao
 from Dao.StreamingAnnouncementDao import StreamingAnnouncementDao
+from Services.ConfigCache import get_config_cache
 from Services.youtube_service import YouTubeService
+from utils.route_limiter import RouteLimiter
+from utils.sharding import owns_guild
 import logging
 logger = logging.getLogger(__name__)
 
+# Webhook events drained per batch
+EVENT_BATCH_SIZE = 200
+
+# Announcement sends in flight at once (at most one per Discord channel)
+MAX_CONCURRENT_POSTS = 10
+
+
 async def start_task(bot):
     """
     Background task to process YouTube webhook events.
-    It fetches unprocessed events, gets video details, and creates/updates
+    It fetches unprocessed events in batches, gets video details, and creates/updates
     StreamingAnnouncements for live streams.
     """
     # Create an aiohttp session for API calls
     async with aiohttp.ClientSession() as session:
         youtube_service = YouTubeService()
+        limiter = RouteLimiter(max_concurrent=MAX_CONCURRENT_POSTS)
 
         while True:
             try:
                 await asyncio.sleep(10) # Process every 10 seconds
 
-                async with get_db_session() as db_session:
-                    youtube_dao = YoutubeDao(db_session)
-
-                    events = await youtube_dao.get_unprocessed_webhook_events()
-                    if not events:
-                        # logger.debug("No unprocessed YouTube webhook events found.")
-                        continue
-
-                    logger.info(f"Processing {len(events)} unprocessed YouTube webhook events.")
-
-                    for event_id, _, channel_id, video_id, event_type, payload in events:
-                        try:
-                            # Fetch full video details using the YouTube Data API
-                            video_details = await youtube_service.get_video_details(session, video_id)
-
-                            if not video_details:
-                                logger.warning(f"Could not retrieve video details for video ID {video_id} (channel {channel_id}). Marking as processed.")
-                                await youtube_dao.mark_webhook_event_as_processed(event_id)
-                                continue
-
-                            if video_details['is_live']:
-                                logger.info(f"YouTube channel {channel_id} (video {video_id}) is LIVE: {video_details['title']}")
-                                # Post to all subscribed guilds
-                                await _post_youtube_live_announcements(bot, channel_id, video_id, video_details)
-                            elif event_type == 'video_published':
-                                logger.info(f"YouTube channel {channel_id} published a new video: {video_details['title']} ({video_id})")
-                                # Post to all subscribed guilds
-                                await _post_youtube_video_announcements(bot, channel_id, video_id, video_details)
-                            elif video_details['is_upcoming']:
-                                logger.info(f"YouTube channel {channel_id} (video {video_id}) is UPCOMING. Not creating announcement yet.")
-                                # We might want to store upcoming events differently or ignore them for now
-                                # Depending on requirements, we could create a 'scheduled' announcement
-                                pass # For now, just mark as processed if we don't announce upcoming
-                            else:
-                                logger.info(f"YouTube channel {channel_id} (video {video_id}) is a regular upload or ended live stream. Not announcing.")
-                                # For ended live streams, the VOD checker will handle the update.
-                                pass
-
-                            # Mark event as processed regardless of whether an announcement was made
-                            await youtube_dao.mark_webhook_event_as_processed(event_id)
-
-                        except Exception as e:
-                            logger.error(f"Error processing YouTube event {event_id} (video {video_id}, channel {channel_id}): {e}", exc_info=True)
-                            # Do not mark as processed if an error occurred, so it can be retried
+                # Keep draining while batches come back full
+                while await _process_event_batch(bot, session, youtube_service, limiter):
+                    pass
 
             except Exception as e:
                 logger.error(f"Unhandled error in YouTube event processing task: {e}", exc_info=True)
 
 
-async def _get_subscribed_guilds_for_channel(bot, channel_id: str) -> List[tuple]:
+async def _process_event_batch(bot, session, youtube_service: YouTubeService, limiter: RouteLimiter) -> bool:
     """
-    Get all guilds subscribed to a YouTube channel with their settings.
-    Returns list of (guild, channel, streamer_config, settings) tuples.
+    Process one batch of unprocessed webhook events.
 
-    Optimized: Only queries guilds subscribed to this specific channel (like Twitch implementation).
-    """
-    subscribed_guilds = []
+    - Video details for the whole batch come from batched 'videos' calls (50 IDs each)
+    - Subscribed guilds for every announced channel come from one query,
+      with guild settings read through the settings cache
+    - Announcements are posted concurrently under the route limiter
+    - All events are marked processed with one UPDATE; if anything before that
+      raises, the batch stays unprocessed and is retried
 
-    # Get only subscriptions for this specific channel (efficient SQL query)
+    Returns:
+        True if the batch was full (more events may be waiting)
+    """
     async with get_db_session() as db_session:
         youtube_dao = YoutubeDao(db_session)
-        channel_subscriptions = await youtube_dao.get_guilds_subscribed_to_channel(channel_id)
-
-    if not channel_subscriptions:
-        logger.debug(f"No guilds subscribed to YouTube channel {channel_id}")
-        return []
-
-    logger.debug(f"Found {len(channel_subscriptions)} guild(s) subscribed to YouTube channel {channel_id}")
 
-    # For each subscribed guild, get the guild object and settings
-    guild_dao = GuildDao()
-    try:
-        for guild_id, channel_name in channel_subscriptions:
-            guild = bot.get_guild(guild_id)
-            if not guild:
-                logger.debug(f"Guild {guild_id} not found (bot not in guild)")
-                continue
-
-            # Get guild settings
-            settings = guild_dao.get_guild_settings(guild_id)
-            if not settings:
-                logger.debug(f"No settings found for guild {guild_id}")
-                continue
-
-            streaming_settings = settings.get('youtube', {})
-            if not streaming_settings.get('enabled'):
-                logger.debug(f"Streaming disabled for guild {guild.name}")
-                continue
-
-            # Get announcement channel
-            announcement_channel_id = streaming_settings.get('announcement_channel_id')
-            if not announcement_channel_id:
-                logger.debug(f"No announcement channel configured for guild {guild.name}")
-                continue
+        events = await youtube_dao.get_unprocessed_webhook_events(limit=EVENT_BATCH_SIZE)
+        if not events:
+            # logger.debug("No unprocessed YouTube webhook events found.")
+            return False
+
+        logger.info(f"Processing {len(events)} unprocessed YouTube webhook events.")
+
+        # Fetch full video details using the YouTube Data API
+        video_details = await youtube_service.get_video_details_batch(session, [event[3] for event in events])
+
+        # video_id -> (channel_id, details); duplicate events for a video announce once
+        live_videos = {}
+        published_videos = {}
+
+        for event_id, _, channel_id, video_id, event_type, payload in events:
+            details = video_details.get(video_id)
+
+            if not details:
+                logger.warning(f"Could not retrieve video details for video ID {video_id} (channel {channel_id}). Marking as processed.")
+            elif details['is_live']:
+                logger.info(f"YouTube channel {channel_id} (video {video_id}) is LIVE: {details['title']}")
+                live_videos.setdefault(video_id, (channel_id, details))
+            elif event_type == 'video_published':
+                logger.info(f"YouTube channel {channel_id} published a new video: {details['title']} ({video_id})")
+                published_videos.setdefault(video_id, (channel_id, details))
+            elif details['is_upcoming']:
+                # Upcoming streams are not announced until they go live
+                logger.info(f"YouTube channel {channel_id} (video {video_id}) is UPCOMING. Not creating announcement yet.")
+            else:
+                # For ended live streams, the VOD checker will handle the update.
+                logger.info(f"YouTube channel {channel_id} (video {video_id}) is a regular upload or ended live stream. Not announcing.")
 
-            channel = guild.get_channel(int(announcement_channel_id))
-            if not channel:
-                logger.warning(f"Announcement channel {announcement_channel_id} not found in guild {guild.name}")
-                continue
+        announced_channels = {channel_id for channel_id, _ in live_videos.values()}
+        announced_channels.update(channel_id for channel_id, _ in published_videos.values())
+        subscribed_guilds = await _get_subscribed_guilds_for_channels(bot, youtube_dao, announced_channels)
 
-            # Find the streamer config for this YouTube channel
-            streamer_config = None
-            for streamer in streaming_settings.get('tracked_streamers', []):
-                if streamer.get('platform') == 'youtube':
-                    # Match by username (which should be the channel_id or handle)
-                    # For now, we'll just pass the first YouTube streamer config
-                    # In the future, might need to match by channel_id specifically
-                    streamer_config = streamer
-                    break
+        posts = []
+        for post_function, videos in (
+            (_post_youtube_live_announcement_to_guild, live_videos),
+            (_post_youtube_video_announcement_to_guild, published_videos),
+        ):
+            for channel_id, details in videos.values():
+                targets = subscribed_guilds.get(channel_id)
+                if not targets:
+                    logger.info(f"No guilds subscribed to YouTube channel {channel_id}")
+                    continue
+                for guild, discord_channel, streamer_config, settings in targets:
+                    posts.append(_post_limited(
+                        limiter, discord_channel.id, post_function,
+                        guild, discord_channel, streamer_config, settings, details
+                    ))
 
-            if not streamer_config:
-                # Create a default config if none exists
-                streamer_config = {'platform': 'youtube', 'username': channel_name or channel_id}
+        if posts:
+            await asyncio.gather(*posts, return_exceptions=True)
 
-            subscribed_guilds.append((guild, channel, streamer_config, streaming_settings))
+        # Mark events as processed regardless of whether an announcement was made
+        await youtube_dao.mark_webhook_events_as_processed([event[0] for event in events])
 
-    finally:
-        guild_dao.close()
+        return len(events) == EVENT_BATCH_SIZE
 
-    return subscribed_guilds
 
+async def _post_limited(limiter: RouteLimiter, route_key: int, post_function, *args):
+    """Run an announcement post while holding its channel's route slot."""
+    async with limiter.route(route_key):
+        await post_function(*args)
 
-async def _post_youtube_live_announcements(bot, channel_id: str, video_id: str, video_details: Dict[str, Any]):
-    """Post YouTube live stream announcement to all subscribed guilds."""
-    subscribed_guilds = await _get_subscribed_guilds_for_channel(bot, channel_id)
 
-    if not subscribed_guilds:
-        logger.info(f"No guilds subscribed to YouTube channel {channel_id}")
-        return
+async def _get_subscribed_guilds_for_channels(bot, youtube_dao: YoutubeDao, channel_ids: Iterable[str]) -> Dict[str, List[tuple]]:
+    """
+    Get all guilds subscribed to a set of YouTube channels with their settings.
+    Returns {channel_id: [(guild, channel, streamer_config, settings), ...]}.
 
-    for guild, discord_channel, streamer_config, settings in subscribed_guilds:
-        try:
-            await _post_youtube_live_announcement_to_guild(
-                guild, discord_channel, streamer_config, settings, video_details
-            )
-        except Exception as e:
-            logger.error(f"Error posting YouTube live announcement to guild {guild.name}: {e}", exc_info=True)
+    One query covers every channel; guild settings come from the config cache.
+    """
+    channel_ids = list(channel_ids)
+    if not channel_ids:
+        return {}
 
+    channel_subscriptions = await youtube_dao.get_guilds_subscribed_to_channels(channel_ids)
+    if not channel_subscriptions:
+        logger.debug(f"No guilds subscribed to YouTube channels {channel_ids}")
+        return {}
 
-async def _post_youtube_video_announcements(bot, channel_id: str, video_id: str, video_details: Dict[str, Any]):
-    """Post YouTube video published announcement to all subscribed guilds."""
-    subscribed_guilds = await _get_subscribed_guilds_for_channel(bot, channel_id)
+    config_cache = get_config_cache()
+    subscribed_guilds = {}
 
-    if not subscribed_guilds:
-        logger.info(f"No guilds subscribed to YouTube channel {channel_id}")
-        return
+    # For each subscribed guild, get the guild object and settings
+    for channel_id, guild_id, channel_name in channel_subscriptions:
+        guild = bot.get_guild(guild_id)
+        if not guild and owns_guild(bot, guild_id):
+            logger.debug(f"Guild {guild_id} not found (bot not in guild)")
+            continue
+
+        # Get guild settings
+        settings = await config_cache.get_guild_settings(guild_id)
+        if not settings:
+            logger.debug(f"No settings found for guild {guild_id}")
+            continue
+
+        streaming_settings = settings.get('youtube', {})
+        if not streaming_settings.get('enabled'):
+            logger.debug(f"Streaming disabled for guild {guild_id}")
+            continue
+
+        # Get announcement channel
+        announcement_channel_id = streaming_settings.get('announcement_channel_id')
+        if not announcement_channel_id:
+            logger.debug(f"No announcement channel configured for guild {guild_id}")
+            continue
+
+        if guild:
+            channel = guild.get_channel(int(announcement_channel_id))
+        else:
+            # Guild is on another process's shards; post over REST
+            guild = discord.Object(id=guild_id)
+            channel = bot.get_partial_messageable(int(announcement_channel_id), guild_id=guild_id)
+        if not channel:
+            logger.warning(f"Announcement channel {announcement_channel_id} not found in guild {guild_id}")
+            continue
+
+        # Find the streamer config for this YouTube channel
+        streamer_config = None
+        for streamer in streaming_settings.get('tracked_streamers', []):
+            if streamer.get('platform') == 'youtube':
+                # Match by username (which should be the channel_id or handle)
+                # For now, we'll just pass the first YouTube streamer config
+                # In the future, might need to match by channel_id specifically
+                streamer_config = streamer
+                break
+
+        if not streamer_config:
+            # Create a default config if none exists
+            streamer_config = {'platform': 'youtube', 'username': channel_name or channel_id}
+
+        subscribed_guilds.setdefault(channel_id, []).append((guild, channel, streamer_config, streaming_settings))
 
-    for guild, discord_channel, streamer_config, settings in subscribed_guilds:
-        try:
-            await _post_youtube_video_announcement_to_guild(
-                guild, discord_channel, streamer_config, settings, video_details
-            )
-        except Exception as e:
-            logger.error(f"Error posting YouTube video announcement to guild {guild.name}: {e}", exc_info=True)
+    return subscribed_guilds
 
 
 async def _post_youtube_live_announcement_to_guild(
@@ -243,7 +261,8 @@ async def _post_youtube_live_announcement_to_guild(
             else:
                 stream_started_dt = started_at or datetime.utcnow()
 
-            dao.create_announcement(
+            await asyncio.to_thread(
+                dao.create_announcement,
                 platform='youtube',
                 guild_id=guild.id,
                 channel_id=channel.id,
@@ -257,12 +276,12 @@ async def _post_youtube_live_announcement_to_guild(
                 initial_viewer_count=viewer_count
             )
 
-            logger.info(f'Guild {guild.name}: Posted YouTube live announcement for {channel_title} (message {message.id})')
+            logger.info(f'Guild {guild.id}: Posted YouTube live announcement for {channel_title} (message {message.id})')
         finally:
             dao.close()
 
     except Exception as e:
-        logger.error(f'Guild {guild.name}: Error posting YouTube live announcement: {e}', exc_info=True)
+        logger.error(f'Guild {guild.id}: Error posting YouTube live announcement: {e}', exc_info=True)
 
 
 async def _post_youtube_video_announcement_to_guild(
@@ -309,10 +328,10 @@ async def _post_youtube_video_announcement_to_guild(
         # Send message
         await channel.send(content=content, embed=embed)
 
-        logger.info(f'Guild {guild.name}: Posted YouTube video announcement for {channel_title}')
+        logger.info(f'Guild {guild.id}: Posted YouTube video announcement for {channel_title}')
 
     except Exception as e:
-        logger.error(f'Guild {guild.name}: Error posting YouTube video announcement: {e}', exc_info=True)
+        logger.error(f'Guild {guild.id}: Error posting YouTube video announcement: {e}', exc_info=True)
 
 
 def _build_announcement_content_youtube(streamer_config, channel_title, video_title, viewer_count):
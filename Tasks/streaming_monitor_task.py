@@ -1,9 +1,18 @@
 import asyncio
+import os
+import time
 import discord
 import logging
 
+from Services.StreamingPresenceIndex import get_streaming_presence_index
+
 logger = logging.getLogger(__name__)
 
+# Full pass over every guild's streamers, catching role changes made by hand
+# (e.g. someone given the Streamer role mid-stream); between passes only
+# members who started or stopped streaming are looked at
+RECONCILE_INTERVAL = int(os.getenv('STREAMING_RECONCILE_INTERVAL', '1800'))
+
 
 async def start_task(bot):
     """Entry point function that the task manager expects."""
@@ -11,32 +20,41 @@ async def start_task(bot):
 
 
 async def streaming_monitor_task(bot):
-    """Monitor streaming members and manage Live Now role every minute."""
+    """Manage the Live Now role from streaming presence changes every minute."""
     await bot.wait_until_ready()
 
+    index = get_streaming_presence_index()
+    changed = set()  # (guild_id, member_id) that started or stopped streaming since the last pass
 
-    while not bot.is_closed():
-        logger.debug(f'Running streaming_monitor_task')
+    def on_streaming_event(event):
+        changed.add((event.guild_id, event.member_id))
 
-        try:
-            await _check_all_guilds_streaming_status(bot)
-        except Exception as e:
-            logger.error(f'Streaming monitor task error: {e}')
+    index.subscribe(on_streaming_event)
+    last_reconcile = None
 
-        await asyncio.sleep(60)
+    try:
+        while not bot.is_closed():
+            logger.debug(f'Running streaming_monitor_task')
 
+            try:
+                if last_reconcile is None or time.monotonic() - last_reconcile >= RECONCILE_INTERVAL:
+                    changed.clear()
+                    await _check_all_guilds_streaming_status(bot, index)
+                    last_reconcile = time.monotonic()
+                elif changed:
+                    pending = list(changed)
+                    changed.clear()
+                    await _apply_streaming_changes(bot, index, pending)
+            except Exception as e:
+                logger.error(f'Streaming monitor task error: {e}')
 
-async def _check_all_guilds_streaming_status(bot):
-    """Check streaming status for all guilds."""
-    for guild in bot.guilds:
-        try:
-            await _check_guild_streaming_status(guild)
-        except Exception as e:
-            logger.error(f'Error checking streaming status for guild {guild.name}: {e}')
+            await asyncio.sleep(60)
+    finally:
+        index.unsubscribe(on_streaming_event)
 
 
-async def _check_guild_streaming_status(guild):
-    """Check streaming status for a specific guild."""
+def _get_live_roles(guild, warn=True):
+    """Get the guild's (Live Now, Streamer) roles, or None if either is missing."""
     # Get roles for this guild - check for both "Live Now" and "Streamers"
     live_now_role = discord.utils.get(guild.roles, name="Live Now")
 
@@ -46,81 +64,101 @@ async def _check_guild_streaming_status(guild):
         streamer_role = discord.utils.get(guild.roles, name="Streamers")
 
     if not live_now_role:
-        logger.warning(f'Guild {guild.name}: "Live Now" role not found')
-        return
+        if warn:
+            logger.warning(f'Guild {guild.name}: "Live Now" role not found')
+        return None
 
     if not streamer_role:
-        logger.warning(f'Guild {guild.name}: "Streamer" or "Streamers" role not found')
+        if warn:
+            logger.warning(f'Guild {guild.name}: "Streamer" or "Streamers" role not found')
+        return None
+
+    return live_now_role, streamer_role
+
+
+async def _apply_streaming_changes(bot, index, pending):
+    """Update the Live Now role for members who started or stopped streaming."""
+    by_guild = {}
+    for guild_id, member_id in pending:
+        by_guild.setdefault(guild_id, []).append(member_id)
+
+    for guild_id, member_ids in by_guild.items():
+        guild = bot.get_guild(guild_id)
+        if not guild:
+            continue
+
+        # Missing roles are reported by the full pass
+        roles = _get_live_roles(guild, warn=False)
+        if not roles:
+            continue
+        live_now_role, streamer_role = roles
+
+        for member_id in member_ids:
+            member = guild.get_member(member_id)
+            if member and streamer_role in member.roles:
+                await _sync_live_now_role(guild, member, live_now_role, index)
+
+
+async def _check_all_guilds_streaming_status(bot, index):
+    """Check streaming status for all guilds."""
+    for guild in bot.guilds:
+        try:
+            await _check_guild_streaming_status(guild, index)
+        except Exception as e:
+            logger.error(f'Error checking streaming status for guild {guild.name}: {e}')
+
+
+async def _check_guild_streaming_status(guild, index):
+    """Check streaming status for a specific guild."""
+    roles = _get_live_roles(guild)
+    if not roles:
         return
+    live_now_role, streamer_role = roles
+
+    if not index.is_seeded(guild.id):
+        index.seed_guild(guild)
 
     members_processed = 0
     roles_added = 0
     roles_removed = 0
 
     # Check all members with the Streamer/Streamers role
-    # Use cached members which include presence data from gateway events
-    streamer_members = [
-        member for member in guild.members
-        if streamer_role in member.roles
-    ]
-
-    for member in streamer_members:
+    for member in streamer_role.members:
         members_processed += 1
 
-        try:
-            # Use cached member data which includes presence updates from gateway
-            # (Presence Intent provides real-time status and activity data)
-
-            # Check if member is currently streaming
-            is_streaming = _is_member_streaming(member)
-
-            if is_streaming:
-                if live_now_role not in member.roles:
-                    await member.add_roles(live_now_role, reason="Started streaming")
-                    roles_added += 1
-                    logger.info(f'Guild {guild.name}: Added "Live Now" role to {member.display_name} (ID: {member.id})')
-            else:
-                if live_now_role in member.roles:
-                    await member.remove_roles(live_now_role, reason="Stopped streaming")
-                    roles_removed += 1
-                    logger.info(f'Guild {guild.name}: Removed "Live Now" role from {member.display_name} (ID: {member.id})')
-
-        except discord.HTTPException as e:
-            logger.error(f'Guild {guild.name}: Failed to update member {member.id} ({member.display_name}): {e}')
-        except Exception as e:
-            logger.error(f'Guild {guild.name}: Unexpected error processing member {member.id} ({member.display_name}): {e}')
+        change = await _sync_live_now_role(guild, member, live_now_role, index)
+        if change == "added":
+            roles_added += 1
+        elif change == "removed":
+            roles_removed += 1
 
     if members_processed > 0:
         logger.debug(f'Guild {guild.name}: Processed {members_processed} streamers, '
                      f'added {roles_added} roles, removed {roles_removed} roles')
 
 
-def _is_member_streaming(member):
-    """Check if a member is currently streaming on any platform."""
-    streaming_activities = [
-        activity for activity in member.activities
-        if isinstance(activity, discord.Streaming)
-    ]
-    return len(streaming_activities) > 0
-
-
-# Optional: More detailed streaming info
-async def _get_streaming_details(member):
-    """Get detailed streaming information for a member."""
-    streaming_activities = [
-        activity for activity in member.activities
-        if isinstance(activity, discord.Streaming)
-    ]
-
-    if not streaming_activities:
-        return None
-
-    # Return details about the first streaming activity
-    activity = streaming_activities[0]
-    return {
-        'platform': activity.platform,
-        'name': activity.name,
-        'details': activity.details,
-        'url': activity.url,
-        'game': activity.game if hasattr(activity, 'game') else None
-    }
\ No newline at end of file
+async def _sync_live_now_role(guild, member, live_now_role, index):
+    """
+    Give or take a streamer's Live Now role to match the presence index.
+
+    Returns:
+        "added", "removed", or None if nothing changed
+    """
+    try:
+        if index.is_streaming(guild.id, member.id):
+            if live_now_role not in member.roles:
+                await member.add_roles(live_now_role, reason="Started streaming")
+                logger.info(f'Guild {guild.name}: Added "Live Now" role to {member.display_name} (ID: {member.id})')
+                return "added"
+        else:
+            if live_now_role in member.roles:
+                await member.remove_roles(live_now_role, reason="Stopped streaming")
+                logger.info(f'Guild {guild.name}: Removed "Live Now" role from {member.display_name} (ID: {member.id})')
+                return "removed"
+
+    except discord.HTTPException as e:
+        logger.error(f'Guild {guild.name}: Failed to update member {member.id} ({member.display_name}): {e}')
+    except Exception as e:
+        logger.error(f'Guild {guild.name}: Unexpected error processing member {member.id} ({member.display_name}): {e}')
+
+    return None
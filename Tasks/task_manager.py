@@ -2,17 +2,31 @@ import asyncio
 import logging
 import importlib
 from . import __all__ as task_modules
+from Services.TaskLeader import get_task_leader
 
 logger = logging.getLogger(__name__)
 
+# Tasks that work on state shared by every guild. When the bot runs as
+# several processes these run in exactly one of them (Services/TaskLeader.py);
+# every other task runs in each process and handles that process's guilds.
+GLOBAL_TASKS = {
+    "check_reminders_task",
+    "portal_manager",
+    "global_stats_reconcile_task",
+    "process_youtube_events_task",
+    "youtube_rss_poll_task",
+}
+
 # Track registered tasks to prevent duplicates
 _registered_tasks = set()
 
 
-def register_tasks(bot):
+def register_tasks(bot, profiler=None):
     """
     Registers all task coroutines found in the Tasks package.
     Each task module must define a function: `start_task(bot)`.
+    Modules in GLOBAL_TASKS only start while this process leads them.
+    Module import times are recorded on profiler (a StartupProfiler), if given.
     """
     global _registered_tasks
 
@@ -33,12 +47,21 @@ def register_tasks(bot):
         try:
             # Import the module directly
             logger.debug(f"Attempting to import: Tasks.{module_name}")
-            module = importlib.import_module(f"Tasks.{module_name}")
+            if profiler:
+                with profiler.measure("task import", module_name):
+                    module = importlib.import_module(f"Tasks.{module_name}")
+            else:
+                module = importlib.import_module(f"Tasks.{module_name}")
             logger.info(f"✅ Successfully imported module: {module_name}")
 
             if hasattr(module, "start_task"):
                 logger.info(f"✅ Module {module_name} has start_task function, creating task...")
-                task = bot.loop.create_task(module.start_task(bot))
+                if module_name in GLOBAL_TASKS:
+                    task = bot.loop.create_task(
+                        get_task_leader().run(module_name, lambda module=module: module.start_task(bot))
+                    )
+                else:
+                    task = bot.loop.create_task(module.start_task(bot))
                 task.set_name(f"task_{module_name}")  # Name the task for easier debugging
                 _registered_tasks.add(module_name)
                 logger.info(f"✅ Task registered: {module_name} (Task ID: {id(task)}, Task Name: {task.get_name()})")
@@ -12,6 +12,7 @@ import logging
 from Services.youtube_service import YouTubeService
 from Dao.StreamingAnnouncementDao import StreamingAnnouncementDao
 from Dao.GuildDao import GuildDao
+from utils.sharding import owns_guild
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,10 @@ async def _check_single_youtube_vod(bot, ann, youtube_service, session, guild_da
     try:
         attempt_count = ann.vod_check_attempts
 
+        # Guilds on other shards are checked by the process running them
+        if not owns_guild(bot, ann.guild_id):
+            return
+
         # Check if guild has VOD detection enabled
         settings = guild_dao.get_guild_settings(ann.guild_id)
         if not settings:
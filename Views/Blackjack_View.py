@@ -1,11 +1,12 @@
 #! /usr/bin/python3.10
+import asyncio
 import discord
 import logging
 import uuid
 from Dao.GuildUserDao import GuildUserDao
 from Dao.GamesDao import GamesDao
-from Dao.GuildDao import GuildDao
 from Entities.BlackjackGame import BlackjackGame
+from Services.CurrencyLedger import get_currency_ledger
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,8 @@ class Blackjack_View(discord.ui.View):
             guild_id=guild_id if use_persistent_shoe else None,
             use_persistent_shoe=use_persistent_shoe
         )
-        self.game.deal_initial_hands()
+        # Serializes game actions, which run in a worker thread (see _run_game)
+        self.game_lock = asyncio.Lock()
 
         # Message reference
         self.message: discord.Message = None
@@ -39,9 +41,6 @@ class Blackjack_View(discord.ui.View):
         self.insurance_phase = False
         self.main_game_started = False
 
-        # Check for immediate dealer blackjack (after insurance)
-        self.check_initial_state()
-
     def check_initial_state(self):
         """Check if insurance is needed or game ends immediately"""
         player_blackjack = self.game.is_blackjack(self.game.player_hand)
@@ -55,8 +54,24 @@ class Blackjack_View(discord.ui.View):
             self.game.game_over = True
             self.main_game_started = True
 
+    async def _run_game(self, action, *args):
+        """
+        Run a game action that may deal cards.
+
+        Persistent shoes deal through the ShoeStore's synchronous Redis
+        client, so actions run in a worker thread instead of blocking the
+        event loop.
+        """
+        async with self.game_lock:
+            return await asyncio.to_thread(action, *args)
+
     async def send(self, interaction: discord.Interaction):
-        """Send the initial game message"""
+        """Deal the initial hands and send the game message"""
+        await self._run_game(self.game.deal_initial_hands)
+
+        # Check for immediate dealer blackjack (after insurance)
+        self.check_initial_state()
+
         embed = self.create_game_embed()
 
         # Insurance phase
@@ -179,30 +194,11 @@ class Blackjack_View(discord.ui.View):
             return
 
         # Deduct insurance bet
-        guild_user_dao = GuildUserDao()
-        player_user = guild_user_dao.get_guild_user(self.player.id, self.guild_id)
         insurance_cost = self.bet // 2
-
-        if not player_user or player_user.currency < insurance_cost:
-            await interaction.response.send_message("You don't have enough credits for insurance!", ephemeral=True)
+        if not await self._take_stake(interaction, insurance_cost, "insurance",
+                                      "You don't have enough credits for insurance!"):
             return
 
-        # Try to update currency in session
-        if self.session_manager:
-            session_updated = await self.session_manager.update_currency(
-                guild_id=self.guild_id,
-                user_id=self.player.id,
-                amount=-insurance_cost
-            )
-            if not session_updated:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -insurance_cost)
-        else:
-            # No session manager - immediate DB write
-            guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -insurance_cost)
-
-        player_user.currency -= insurance_cost  # Update local object
-
         self.game.take_insurance(self.bet)
         self.insurance_phase = False
         self.main_game_started = True
@@ -250,11 +246,11 @@ class Blackjack_View(discord.ui.View):
         await interaction.response.defer()
 
         # Player takes a card
-        card, value, busted = self.game.player_hit_current()
+        card, value, busted = await self._run_game(self.game.player_hit_current)
 
         if self.game.game_over:
             # Both hands done or player busted
-            self.game.dealer_play()
+            await self._run_game(self.game.dealer_play)
             await self.end_game()
         else:
             # Update the game view
@@ -276,7 +272,7 @@ class Blackjack_View(discord.ui.View):
 
         if self.game.game_over:
             # All hands done, dealer plays
-            self.game.dealer_play()
+            await self._run_game(self.game.dealer_play)
             await self.end_game()
         else:
             # Move to split hand
@@ -291,38 +287,18 @@ class Blackjack_View(discord.ui.View):
             return
 
         # Deduct additional bet first
-        guild_user_dao = GuildUserDao()
-        player_user = guild_user_dao.get_guild_user(self.player.id, self.guild_id)
-
-        if not player_user or player_user.currency < self.bet:
-            await interaction.response.send_message("You don't have enough credits to double down!", ephemeral=True)
+        if not await self._take_stake(interaction, self.bet, "double", "You don't have enough credits to double down!"):
             return
 
-        # Try to update currency in session
-        if self.session_manager:
-            session_updated = await self.session_manager.update_currency(
-                guild_id=self.guild_id,
-                user_id=self.player.id,
-                amount=-self.bet
-            )
-            if not session_updated:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -self.bet)
-        else:
-            # No session manager - immediate DB write
-            guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -self.bet)
-
-        player_user.currency -= self.bet  # Update local object
-
         self.main_game_started = True
         await interaction.response.defer()
 
         # Double down: deal one card and stand
-        card, value, busted = self.game.player_double_down_current()
+        card, value, busted = await self._run_game(self.game.player_double_down_current)
 
         if self.game.game_over:
             # All hands done
-            self.game.dealer_play()
+            await self._run_game(self.game.dealer_play)
             await self.end_game()
         else:
             # Move to split hand
@@ -337,34 +313,14 @@ class Blackjack_View(discord.ui.View):
             return
 
         # Deduct additional bet for split hand
-        guild_user_dao = GuildUserDao()
-        player_user = guild_user_dao.get_guild_user(self.player.id, self.guild_id)
-
-        if not player_user or player_user.currency < self.bet:
-            await interaction.response.send_message("You don't have enough credits to split!", ephemeral=True)
+        if not await self._take_stake(interaction, self.bet, "split", "You don't have enough credits to split!"):
             return
 
-        # Try to update currency in session
-        if self.session_manager:
-            session_updated = await self.session_manager.update_currency(
-                guild_id=self.guild_id,
-                user_id=self.player.id,
-                amount=-self.bet
-            )
-            if not session_updated:
-                # Fallback to immediate DB write
-                guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -self.bet)
-        else:
-            # No session manager - immediate DB write
-            guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, -self.bet)
-
-        player_user.currency -= self.bet  # Update local object
-
         self.main_game_started = True
         await interaction.response.defer()
 
         # Perform split
-        success = self.game.player_split()
+        success = await self._run_game(self.game.player_split)
 
         if not success:
             await interaction.followup.send("Failed to split!", ephemeral=True)
@@ -388,6 +344,22 @@ class Blackjack_View(discord.ui.View):
         self.game.player_surrender()
         await self.end_game()
 
+    async def _take_stake(self, interaction: discord.Interaction, amount: int, kind: str, insufficient_message: str) -> bool:
+        """Debit an extra stake (insurance, double, split) through the ledger; False if it wasn't taken."""
+        transfer = await get_currency_ledger().transfer(
+            self.guild_id,
+            {self.player.id: -amount},
+            idempotency_key=f"blackjack:{kind}:{interaction.id}"
+        )
+        if transfer.success:
+            return True
+
+        if transfer.error == "insufficient_funds":
+            await interaction.response.send_message(insufficient_message, ephemeral=True)
+        else:
+            await interaction.response.send_message("An error occurred while updating your balance.", ephemeral=True)
+        return False
+
     def create_game_embed(self) -> discord.Embed:
         """Create embed showing current game state"""
         player_value = self.game.get_hand_value(self.game.player_hand)
@@ -507,31 +479,16 @@ class Blackjack_View(discord.ui.View):
         # Calculate total payout
         total_won, total_lost, details = self.game.calculate_total_payout(self.bet)
 
-        # Update player currency
-        guild_user_dao = GuildUserDao()
-        player_user = guild_user_dao.get_guild_user(self.player.id, self.guild_id)
-
-        if player_user:
-            # Try to update currency in session
-            if self.session_manager:
-                session_updated = await self.session_manager.update_currency(
-                    guild_id=self.guild_id,
-                    user_id=self.player.id,
-                    amount=total_won
-                )
-                if not session_updated:
-                    # Fallback to immediate DB write
-                    guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, total_won)
-            else:
-                # No session manager - immediate DB write
-                guild_user_dao.update_currency_with_global_sync(self.player.id, self.guild_id, total_won)
-
-            player_user.currency += total_won  # Update local object
-
-            # Add to vault (10% of losses)
-            if total_lost > 0:
-                guild_dao = GuildDao()
-                guild_dao.add_vault_currency(self.guild_id, int(total_lost * 0.1))
+        # Pay out winnings and add 10% of losses to the vault in one ledger transfer
+        transfer = await get_currency_ledger().transfer(
+            self.guild_id,
+            {self.player.id: total_won},
+            vault_delta=int(total_lost * 0.1) if total_lost > 0 else 0,
+            idempotency_key=f"blackjack:{self.game_id}",
+            require_funds=False
+        )
+        if not transfer.success:
+            logger.error(f"Blackjack game {self.game_id} payout of {total_won} failed: {transfer.error}")
 
         # Record game in database
         games_dao = GamesDao()
@@ -673,7 +630,7 @@ class Blackjack_View(discord.ui.View):
             while not self.game.game_over:
                 self.game.player_stand_current()
 
-            self.game.dealer_play()
+            await self._run_game(self.game.dealer_play)
             await self.end_game()
 
             # Add timeout message
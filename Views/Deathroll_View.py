@@ -5,6 +5,7 @@ import uuid
 from datetime import datetime
 from Dao.GuildUserDao import GuildUserDao
 from Dao.GamesDao import GamesDao
+from Services.CurrencyLedger import get_currency_ledger
 
 
 class Deathroll_View(discord.ui.View):
@@ -245,7 +246,14 @@ class Deathroll_View(discord.ui.View):
             child.disabled = True
 
         # Handle currency transfer
-        await self.winner_payout(winner, loser)
+        if not await self.winner_payout(winner, loser):
+            await self.message.edit(
+                content=f"The Deathroll match is void: {loser.display_name}'s bet of {self.bet:,.0f} credits "
+                        f"couldn't be collected, so no credits changed hands.",
+                embed=None, view=self)
+            if self.message_start:
+                await self.message_start.delete()
+            return
 
         # Update embed
         embed = self.create_end_game_embed(winner, loser)
@@ -262,37 +270,28 @@ class Deathroll_View(discord.ui.View):
             f"Deathroll game {self.game_id} completed in guild {self.guild_id}. Winner: {winner.display_name}, Loser: {loser.display_name}")
 
     async def winner_payout(self, winner, loser):
-        """Handle winner payout"""
+        """
+        Handle winner payout.
+
+        Returns:
+            True if the bet was transferred, False if nothing changed hands
+        """
         guild_user_dao = GuildUserDao()
 
         winner_user = guild_user_dao.get_guild_user(winner.id, self.guild_id)
         loser_user = guild_user_dao.get_guild_user(loser.id, self.guild_id)
 
         if winner_user and loser_user:
-            # Try to update currency in sessions for both players
-            if self.session_manager:
-                # Winner gets the bet
-                winner_updated = await self.session_manager.update_currency(
-                    guild_id=self.guild_id,
-                    user_id=winner.id,
-                    amount=self.bet
-                )
-                # Loser loses the bet
-                loser_updated = await self.session_manager.update_currency(
-                    guild_id=self.guild_id,
-                    user_id=loser.id,
-                    amount=-self.bet
-                )
-
-                # Fallback to immediate DB writes if session updates failed
-                if not winner_updated:
-                    guild_user_dao.update_currency_with_global_sync(winner.id, self.guild_id, self.bet)
-                if not loser_updated:
-                    guild_user_dao.update_currency_with_global_sync(loser.id, self.guild_id, -self.bet)
-            else:
-                # No session manager - immediate DB writes
-                guild_user_dao.update_currency_with_global_sync(winner.id, self.guild_id, self.bet)
-                guild_user_dao.update_currency_with_global_sync(loser.id, self.guild_id, -self.bet)
+            # Settle both sides in one atomic ledger transfer; the loser may have
+            # spent the bet since the game started, in which case nothing is paid
+            transfer = await get_currency_ledger().transfer(
+                self.guild_id,
+                {winner.id: self.bet, loser.id: -self.bet},
+                idempotency_key=f"deathroll:{self.game_id}"
+            )
+            if not transfer.success:
+                logging.warning(f"Deathroll game {self.game_id} payout failed: {transfer.error}")
+                return False
 
             winner_user.currency += self.bet  # Update local objects
             loser_user.currency -= self.bet
@@ -412,4 +411,9 @@ class Deathroll_View(discord.ui.View):
                         "final_roll": self.current_roll,
                         "game_instance_id": game_instance_id
                     }
-                )
\ No newline at end of file
+                )
+
+            return True
+
+        logging.error(f"Deathroll game {self.game_id}: missing guild user, no payout")
+        return False
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 from Dao.GamesDao import GamesDao
 from Dao.GuildUserDao import GuildUserDao
+from Services.CurrencyLedger import get_currency_ledger
 import uuid
 
 
@@ -404,11 +405,15 @@ class View_Rock_Paper_Scissors(discord.ui.View):
         self.round_number += 1
 
     async def winner_payout(self):
-        """Handle winner payout"""
+        """
+        Handle winner payout.
+
+        Returns:
+            True if the bet was transferred, False if nothing changed hands
+        """
         if self.bet <= 0:
-            return
+            return False
 
-        guild_user_dao = GuildUserDao()
         games_dao = GamesDao()
 
         winner_id = None
@@ -432,27 +437,19 @@ class View_Rock_Paper_Scissors(discord.ui.View):
             game_instance_id = str(uuid.uuid4())
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # Try to queue games and update currency in sessions
+            # Settle both sides in one atomic ledger transfer; the loser may have
+            # spent the bet since the game started, in which case nothing is paid
+            transfer = await get_currency_ledger().transfer(
+                self.guild_id,
+                {winner_id: self.bet, loser_id: -self.bet},
+                idempotency_key=f"rockpaperscissors:{self.game_id}"
+            )
+            if not transfer.success:
+                logging.warning(f"RPS game {self.game_id} payout failed: {transfer.error}")
+                return False
+
+            # Try to queue games in sessions
             if self.session_manager:
-                # Update currency for winner
-                winner_updated = await self.session_manager.update_currency(
-                    guild_id=self.guild_id,
-                    user_id=winner_id,
-                    amount=self.bet
-                )
-                # Update currency for loser
-                loser_updated = await self.session_manager.update_currency(
-                    guild_id=self.guild_id,
-                    user_id=loser_id,
-                    amount=-self.bet
-                )
-
-                # Fallback to immediate DB writes if session updates failed
-                if not winner_updated:
-                    guild_user_dao.update_currency_with_global_sync(winner_id, self.guild_id, self.bet)
-                if not loser_updated:
-                    guild_user_dao.update_currency_with_global_sync(loser_id, self.guild_id, -self.bet)
-
                 # Queue game for winner
                 winner_queued = await self.session_manager.queue_game(
                     guild_id=self.guild_id,
@@ -538,9 +535,6 @@ class View_Rock_Paper_Scissors(discord.ui.View):
                         )
             else:
                 # No session manager - immediate DB writes
-                guild_user_dao.update_currency_with_global_sync(winner_id, self.guild_id, self.bet)
-                guild_user_dao.update_currency_with_global_sync(loser_id, self.guild_id, -self.bet)
-
                 # Record game for winner
                 games_dao.add_game(
                     user_id=winner_id,
@@ -581,14 +575,22 @@ class View_Rock_Paper_Scissors(discord.ui.View):
                     }
                 )
 
+            return True
+
+        return False
+
     async def complete_game(self):
         """Complete the game"""
         if not self.match_complete:
             return 
             
         if self.bet > 0:
-            await self.announce_winner()
-            await self.winner_payout()
+            if await self.winner_payout():
+                await self.announce_winner()
+            else:
+                await self.message.channel.send(
+                    f"The 🪨📄✂️ match is void: {self.match_loser.display_name}'s bet of {self.bet} Credits "
+                    f"couldn't be collected, so no credits changed hands.")
 
         # Disable all buttons
         for child in self.children:
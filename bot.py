@@ -1,30 +1,58 @@
 #! /usr/bin/python3.10
+# Imported first so the startup profile's clock starts before the heavy imports
+from utils.startup_profiler import StartupProfiler
+
+import os
 import sys
 import discord
 from discord.ext import commands
 
+from Services.CommandSync import get_command_sync
 from Services.ConfigCache import initialize_config_cache, cleanup_config_cache
+from Services.CurrencyLedger import initialize_currency_ledger, cleanup_currency_ledger
+from Services.LotteryService import initialize_lottery_service, cleanup_lottery_service
 from Services.PerformanceMonitor import initialize_performance_monitor, cleanup_performance_monitor
 from Services.SessionManager import initialize_session_manager, cleanup_session_manager
+from Services.ShoeStore import initialize_shoe_store, cleanup_shoe_store
+from Services.TaskLeader import cleanup_task_leader
 from logger import AppLogger
 from Tasks.task_manager import register_tasks
-from Cogs import __all__ as enabled_cogs
+from Cogs import __all__ as enabled_cogs, DEFERRED_COGS
 from database import Database
+from utils.sharding import shard_config_from_env
 
 
 logger = AppLogger(__name__).get_logger()
 
 
-class Bot(commands.Bot):
-    def __init__(self) -> None:
+class Bot(commands.AutoShardedBot):
+    def __init__(self, shard_ids=None, shard_count=None) -> None:
+        """
+        Args:
+            shard_ids: Shards this process connects (default: SHARD_IDS, or all)
+            shard_count: Total shards across all processes (default: SHARD_COUNT,
+                or Discord's recommended count)
+        """
+        if shard_ids is None and shard_count is None:
+            shard_ids, shard_count = shard_config_from_env()
+
         intents = discord.Intents.default()
         intents.message_content = True
         intents.members = True
         intents.presences = True
         intents.moderation = True  # Required for on_audit_log_entry events (ban, unban, kick, role changes)
-        super().__init__(command_prefix=commands.when_mentioned_or('!'), intents=intents, help_command=None)
+        super().__init__(
+            command_prefix=commands.when_mentioned_or('!'), intents=intents, help_command=None,
+            shard_ids=shard_ids, shard_count=shard_count
+        )
         self.posted = False
 
+        self.startup_profiler = StartupProfiler()
+        # Load DEFERRED_COGS and start background tasks after READY, so the
+        # gateway connects without waiting on their imports
+        self.defer_heavy_cogs = os.getenv('DEFER_HEAVY_COGS', '1') != '0'
+        self._post_ready_done = False
+
     async def on_command_error(self, ctx, error):
         """Handle command errors globally"""
         # Suppress CommandNotFound errors (these happen when someone mentions the bot with non-commands)
@@ -36,6 +64,8 @@ class Bot(commands.Bot):
         logger.error(f"Command error in {ctx.guild.name if ctx.guild else 'DM'}: {error}")
 
     async def setup_hook(self):
+        self.startup_profiler.mark("setup_hook started")
+
         try:
             await initialize_config_cache()
             logger.info("✅ Config cache initialized")
@@ -50,33 +80,102 @@ class Bot(commands.Bot):
             logger.error(f"❌ Failed to initialize session manager: {e}")
             logger.warning("⚠️  Sessions disabled, using immediate DB writes (higher DB load)")
 
+        try:
+            await initialize_currency_ledger()
+            logger.info("✅ Currency ledger initialized")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize currency ledger: {e}")
+
+        try:
+            await initialize_lottery_service()
+            logger.info("✅ Lottery service initialized")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize lottery service: {e}")
+
+        try:
+            await initialize_shoe_store()
+            logger.info("✅ Blackjack shoe store initialized")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize blackjack shoe store: {e}")
+
         try:
             await initialize_performance_monitor()
             logger.info("✅ Performance monitor initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize performance monitor: {e}")
 
-        register_tasks(self)
-        for cog_name in enabled_cogs:
+        self.startup_profiler.mark("services initialized")
+
+        if self.defer_heavy_cogs:
+            await self._load_cogs([cog for cog in enabled_cogs if cog not in DEFERRED_COGS])
+        else:
+            register_tasks(self, profiler=self.startup_profiler)
+            await self._load_cogs(enabled_cogs)
+        self.startup_profiler.mark("cogs loaded")
+
+    async def _load_cogs(self, cog_names):
+        for cog_name in cog_names:
             ext = f"Cogs.{cog_name}"
+            if ext in self.extensions:
+                continue
             try:
-                if ext not in self.extensions:
+                # Import plus setup(); for import cost alone run `python -X importtime bot.py`
+                with self.startup_profiler.measure("cog load", cog_name):
                     await self.load_extension(ext)
-                    logger.info(f'{ext} loaded')
+                logger.info(f'{ext} loaded')
             except Exception as e:
                 logger.error(f'Failed to load {ext}: {e}')
 
+    async def _finish_startup(self):
+        """Load what was deferred past READY, sync slash commands, then log the startup profile."""
+        if self.defer_heavy_cogs:
+            register_tasks(self, profiler=self.startup_profiler)
+            await self._load_cogs([cog for cog in enabled_cogs if cog in DEFERRED_COGS])
+            self.startup_profiler.mark("deferred cogs loaded")
+
+        # After deferred cogs load, so their commands are included. Skipped
+        # when the tree is unchanged since the last sync (Services/CommandSync.py)
+        try:
+            with self.startup_profiler.measure("command sync", "tree"):
+                await get_command_sync().sync_all(self)
+        except Exception as e:
+            logger.error(f"Slash command sync failed: {e}")
+        self.startup_profiler.mark("commands synced")
+
+        logger.info(self.startup_profiler.report())
+
     async def close(self):
         """Close the bot and clean up database connections"""
         logger.info("🛑 Bot shutting down, closing database connection pools...")
 
-        # Cleanup session manager FIRST (most critical data)
+        # Stop elected background tasks so another process can take them over
+        try:
+            await cleanup_task_leader()
+            logger.info("✅ Task leadership released")
+        except Exception as e:
+            logger.error(f"Error during task leader cleanup: {e}")
+
+        # Write out lottery entrants not yet persisted (needs the session manager's Redis client)
+        try:
+            await cleanup_lottery_service()
+            logger.info("✅ Lottery service cleaned up")
+        except Exception as e:
+            logger.error(f"Error during lottery service cleanup: {e}")
+
+        # Cleanup session manager next (most critical data)
         try:
             await cleanup_session_manager()
             logger.info("✅ Session manager cleaned up")
         except Exception as e:
             logger.error(f"Error during session manager cleanup: {e}")
 
+        # Write out currency transfers buffered while Redis was unavailable
+        try:
+            await cleanup_currency_ledger()
+            logger.info("✅ Currency ledger cleaned up")
+        except Exception as e:
+            logger.error(f"Error during currency ledger cleanup: {e}")
+
         # Cleanup performance monitor (generates final report)
         try:
             await cleanup_performance_monitor()
@@ -84,6 +183,11 @@ class Bot(commands.Bot):
         except Exception as e:
             logger.error(f"Error during performance monitor cleanup: {e}")
 
+        try:
+            await cleanup_shoe_store()
+        except Exception as e:
+            logger.error(f"Error during shoe store cleanup: {e}")
+
         # Cleanup cache
         try:
             await cleanup_config_cache()
@@ -98,10 +202,18 @@ class Bot(commands.Bot):
             logger.error(f"Error closing database pools: {e}")
         await super().close()
 
+    async def on_connect(self):
+        self.startup_profiler.mark("gateway connected")
+
     async def on_ready(self):
         logger.info(f'Logged on as {self.user}!')
-        synced = await self.tree.sync()
-        logger.info(f"slash cmd's synced: {str(len(synced))}")
+        self.startup_profiler.mark("ready")
+
+        # on_ready fires again after reconnects; commands only need syncing once
+        if not self._post_ready_done:
+            self._post_ready_done = True
+            await self._finish_startup()
+
         logger.info(f"discord.py version: {discord.__version__}")
         logger.info(f"python version: {str(sys.version)}")
 
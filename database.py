@@ -1,10 +1,17 @@
 import os
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
 import mysql.connector
-from mysql.connector import pooling
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the connection wait-time histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
 # Global database instance (singleton)
 _global_database = None
 
@@ -37,14 +44,318 @@ def get_database(db_host=None, db_user=None, db_password=None, db_name=None, poo
     return _global_database
 
 
+class _PoolEntry:
+    """A raw MySQL connection plus the bookkeeping the pool needs."""
+
+    __slots__ = ('connection', 'created_at', 'returned_at')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+
+
+class PooledConnection:
+    """
+    Checked-out connection handed to DAOs.
+
+    Delegates everything to the MySQL connection; close() returns it to the
+    pool instead of closing it. Connections marked broken are discarded.
+    """
+
+    __slots__ = ('_pool', '_entry', '_released', 'broken')
+
+    def __init__(self, pool: 'ConnectionPool', entry: _PoolEntry):
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+        self.broken = False
+
+    def __getattr__(self, name):
+        return getattr(self._entry.connection, name)
+
+    def close(self):
+        """Return the connection to the pool (only the first call counts)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._entry, broken=self.broken)
+
+    def __del__(self):
+        # Safety net for code paths that forget to close
+        try:
+            if not self._released:
+                self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Bounded MySQL connection pool with validation, adaptive sizing and metrics.
+
+    - Grows lazily from min_size up to max_size and retires connections that
+      sit idle for idle_timeout seconds (down to min_size); idle connections
+      are reused most-recently-returned first so the extras actually idle out
+    - Validation: connections older than recycle_seconds are reconnected and
+      connections idle longer than preping_idle_seconds are pinged before
+      being handed out; hot connections skip the round trip
+    - Waiting for a free connection blocks on a condition variable and wakes
+      as soon as one is returned, instead of sleep-and-retry; callers on the
+      event loop thread only wait briefly (see Database._wait_budget)
+    - Tracks checked-out/idle counts, a wait-time histogram, exhaustion
+      events (had to wait / timed out) and connection age
+    """
+
+    def __init__(self, pool_name: str, connect_args: dict, max_size: int = 10, min_size: int = 2,
+                 recycle_seconds: int = 3600, preping_idle_seconds: int = 30, idle_timeout: int = 300):
+        self.pool_name = pool_name
+        self.connect_args = connect_args
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.recycle_seconds = recycle_seconds
+        self.preping_idle_seconds = preping_idle_seconds
+        self.idle_timeout = idle_timeout
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._total = 0
+        self._created_at = {}  # id(entry) -> created_at, for age stats of all open connections
+
+        # Metrics
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.acquired = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.total_wait_ms = 0.0
+        self.created = 0
+        self.retired = 0
+        self.recycled = 0
+        self.prepings = 0
+        self.preping_failures = 0
+        self.discarded = 0
+        self._last_exhaustion_log = 0.0
+
+        # Open min_size connections now so a bad configuration fails at startup
+        for _ in range(self.min_size):
+            entry = self._open()
+            with self._cond:
+                self._total += 1
+                self._idle.append(entry)
+
+    def _open(self) -> _PoolEntry:
+        entry = _PoolEntry(mysql.connector.connect(**self.connect_args))
+        with self._cond:
+            self.created += 1
+            self._created_at[id(entry)] = entry.created_at
+        return entry
+
+    def _close_entry(self, entry: _PoolEntry):
+        with self._cond:
+            self._created_at.pop(id(entry), None)
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: float) -> Optional[PooledConnection]:
+        """
+        Check out a connection, waiting up to timeout seconds for one to be returned.
+
+        Returns:
+            PooledConnection, or None if the pool stayed exhausted for the whole timeout
+
+        Raises:
+            mysql.connector.Error if a new connection can't be opened or validated
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        entry = None
+        must_open = False
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._total < self.max_size:
+                    self._total += 1
+                    must_open = True
+                    break
+
+                if not waited:
+                    waited = True
+                    self.waited += 1
+                    self._log_exhaustion()
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    return None
+                self._cond.wait(remaining)
+
+        try:
+            if must_open:
+                entry = self._open()
+            else:
+                self._validate(entry)
+        except Exception:
+            if entry is not None:
+                self._close_entry(entry)
+            with self._cond:
+                self._total -= 1
+                if not must_open:
+                    self.discarded += 1
+                self._cond.notify()
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self.acquired += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.total_wait_ms += wait_ms
+            self.wait_histogram[self._bucket(wait_ms)] += 1
+
+        return PooledConnection(self, entry)
+
+    def _validate(self, entry: _PoolEntry):
+        """Recycle old connections and ping ones that have been idle a while."""
+        now = time.monotonic()
+        if self.recycle_seconds and now - entry.created_at > self.recycle_seconds:
+            entry.connection.reconnect(attempts=1, delay=0)
+            entry.created_at = now
+            with self._cond:
+                self._created_at[id(entry)] = now
+                self.recycled += 1
+        elif now - entry.returned_at > self.preping_idle_seconds:
+            with self._cond:
+                self.prepings += 1
+            try:
+                entry.connection.ping(reconnect=True, attempts=1, delay=0)
+            except Exception:
+                with self._cond:
+                    self.preping_failures += 1
+                raise
+
+    def release(self, entry: _PoolEntry, broken: bool = False):
+        """Return a checked-out connection (discarding it if broken) and retire long-idle extras."""
+        now = time.monotonic()
+        retire = []
+
+        with self._cond:
+            self.checked_out -= 1
+            if broken:
+                self._total -= 1
+                self.discarded += 1
+                retire.append(entry)
+            else:
+                entry.returned_at = now
+                self._idle.append(entry)
+
+            # Oldest-returned connections sit at the left end
+            while (self._idle and self._total > self.min_size
+                   and now - self._idle[0].returned_at > self.idle_timeout):
+                retire.append(self._idle.popleft())
+                self._total -= 1
+                self.retired += 1
+
+            self._cond.notify()
+
+        for retired_entry in retire:
+            self._close_entry(retired_entry)
+
+    @staticmethod
+    def _bucket(wait_ms: float) -> int:
+        for index, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                return index
+        return len(WAIT_BUCKETS_MS)
+
+    def _log_exhaustion(self):
+        """Warn (at most every 10 seconds) that callers are waiting for connections."""
+        now = time.monotonic()
+        if now - self._last_exhaustion_log >= 10:
+            self._last_exhaustion_log = now
+            logger.warning(
+                f"Connection pool '{self.pool_name}' exhausted: {self.checked_out}/{self.max_size} checked out, "
+                f"{self.waited} waits and {self.timeouts} timeouts so far"
+            )
+
+    def stats(self) -> dict:
+        """Snapshot of pool health for monitoring."""
+        now = time.monotonic()
+        with self._cond:
+            ages = [now - created_at for created_at in self._created_at.values()]
+            histogram = {
+                (f"<={bound}ms" if index < len(WAIT_BUCKETS_MS) else f">{WAIT_BUCKETS_MS[-1]}ms"): count
+                for index, (bound, count) in enumerate(zip(WAIT_BUCKETS_MS + (None,), self.wait_histogram))
+            }
+            return {
+                "pool_name": self.pool_name,
+                "host": self.connect_args.get("host"),
+                "max_size": self.max_size,
+                "min_size": self.min_size,
+                "open": self._total,
+                "checked_out": self.checked_out,
+                "idle": len(self._idle),
+                "peak_checked_out": self.peak_checked_out,
+                "acquired": self.acquired,
+                "exhaustion_waits": self.waited,
+                "exhaustion_timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.acquired, 3) if self.acquired else 0.0,
+                "wait_histogram": histogram,
+                "oldest_connection_age_s": round(max(ages), 1) if ages else 0.0,
+                "avg_connection_age_s": round(sum(ages) / len(ages), 1) if ages else 0.0,
+                "created": self.created,
+                "retired": self.retired,
+                "recycled": self.recycled,
+                "prepings": self.prepings,
+                "preping_failures": self.preping_failures,
+                "discarded": self.discarded,
+                "status": "active",
+            }
+
+    def close(self) -> int:
+        """Close every idle connection; checked-out ones are closed when returned."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self.min_size = 0
+            self.idle_timeout = 0
+        for entry in idle:
+            self._close_entry(entry)
+        return len(idle)
+
+
 class Database:
     """
     Database connection manager with connection pooling support.
-    Uses MySQL connection pooling to reuse connections across the application.
+    Uses bounded, instrumented connection pools (see ConnectionPool) shared across the application.
+
+    Pool tuning (environment):
+        DB_POOL_MIN_SIZE          connections opened up front (default 2)
+        DB_POOL_TIMEOUT           seconds a worker thread waits for a connection (default 10)
+        DB_POOL_LOOP_WAIT         seconds the event loop thread waits for a connection (default 0.05)
+        DB_POOL_RECYCLE           reconnect connections older than this many seconds (default 3600)
+        DB_POOL_PREPING_IDLE      ping connections idle longer than this many seconds (default 30)
+        DB_POOL_IDLE_TIMEOUT      retire extra connections idle this long (default 300)
+
+    Optional read pool, for read-only analytics/leaderboard queries:
+        db_read_host              replica host (read pool points at the primary if unset)
+        db_read_user / db_read_password   replica credentials (default to the primary's)
+        DB_READ_POOL_SIZE         read pool size; a read pool is created if this or db_read_host is set
+        DB_REPLICA_MAX_LAG        reads fall back to the primary when the replica is further behind (default 30)
+        DB_REPLICA_CHECK_INTERVAL seconds between replica lag checks, made by a background thread (default 5)
     """
 
     # Class-level connection pools (one per database configuration)
     _pools = {}
+    _pools_lock = threading.Lock()
 
     def __init__(self, db_host=None, db_user=None, db_password=None, db_name=None, use_test_db=False, pool_name=None, pool_size=32):
         """
@@ -57,7 +368,7 @@ class Database:
             db_name: Database name
             use_test_db: Use test database credentials
             pool_name: Name for the connection pool (auto-generated if None)
-            pool_size: Number of connections in the pool (default: 32, max 32)
+            pool_size: Maximum number of connections in the pool (default: 32)
         """
         if use_test_db:
             self.db_host = db_host or os.getenv('test_db_host')
@@ -75,6 +386,10 @@ class Database:
         self.pool_name = pool_name
         self.use_test_db = use_test_db
 
+        # Seconds a worker thread / the event loop thread will wait for a free connection
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+        self.loop_wait_timeout = float(os.getenv('DB_POOL_LOOP_WAIT', '0.05'))
+
         # Create or get the connection pool with proper credentials
         self._ensure_pool_exists(
             pool_name=pool_name,
@@ -85,6 +400,34 @@ class Database:
             pool_size=pool_size
         )
 
+        # Optional separate read pool (replica host or a dedicated slice of the primary)
+        self.read_pool_name = None
+        read_host = os.getenv('db_read_host')
+        read_pool_size = os.getenv('DB_READ_POOL_SIZE')
+
+        # Replica lag tracking (only when the read pool points at another host)
+        self.read_is_replica = bool(read_host) and read_host != self.db_host
+        self.replica_max_lag = float(os.getenv('DB_REPLICA_MAX_LAG', '30'))
+        self.replica_check_interval = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5'))
+        self._replica_lock = threading.Lock()
+        self._replica_lag: Optional[float] = None
+        self._replica_monitor: Optional[threading.Thread] = None
+        self.replica_reads = 0
+        self.replica_fallbacks = 0
+
+        if not use_test_db and (read_host or read_pool_size):
+            self.read_pool_name = f"{pool_name}_read"
+            self._ensure_pool_exists(
+                pool_name=self.read_pool_name,
+                host=read_host or self.db_host,
+                user=os.getenv('db_read_user') or self.db_user,
+                password=os.getenv('db_read_password') or self.db_password,
+                database=self.db_name,
+                pool_size=int(read_pool_size or pool_size)
+            )
+            if self.read_is_replica:
+                self._start_replica_monitor()
+
         # Don't auto-acquire connection - let each DAO get its own
         # This prevents race conditions from shared global connection
         self.mydb = None
@@ -101,71 +444,208 @@ class Database:
             user: Database user
             password: Database password
             database: Database name
-            pool_size: Number of connections in the pool
+            pool_size: Maximum number of connections in the pool
         """
-        if pool_name not in cls._pools:
+        with cls._pools_lock:
+            if pool_name in cls._pools:
+                return
             try:
-                pool = pooling.MySQLConnectionPool(
-                    pool_name=pool_name,
-                    pool_size=pool_size,
-                    pool_reset_session=False,
-                    host=host,
-                    user=user,
-                    password=password,
-                    database=database,
-                    autocommit=True,
-                    connection_timeout=30,
-                    raise_on_warnings=False,
-                    use_unicode=True,
-                    charset='utf8mb4',
-                    collation='utf8mb4_unicode_ci'
+                pool = ConnectionPool(
+                    pool_name,
+                    connect_args=dict(
+                        host=host,
+                        user=user,
+                        password=password,
+                        database=database,
+                        autocommit=True,
+                        connection_timeout=30,
+                        raise_on_warnings=False,
+                        use_unicode=True,
+                        charset='utf8mb4',
+                        collation='utf8mb4_unicode_ci'
+                    ),
+                    max_size=pool_size,
+                    min_size=int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                    recycle_seconds=int(os.getenv('DB_POOL_RECYCLE', '3600')),
+                    preping_idle_seconds=int(os.getenv('DB_POOL_PREPING_IDLE', '30')),
+                    idle_timeout=int(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
                 )
                 cls._pools[pool_name] = pool
-                logger.info(f"Created connection pool '{pool_name}' with {pool_size} connections")
+                logger.info(f"Created connection pool '{pool_name}' ({host}) with up to {pool_size} connections")
             except Exception as e:
                 logger.error(f"Failed to create connection pool '{pool_name}': {e}")
                 raise
 
-    def _get_pooled_connection(self, retries=3, retry_delay=0.05):
+    def _wait_budget(self) -> float:
+        """
+        How long this caller may wait for a free connection.
+
+        On the event loop thread any wait blocks every coroutine, so it is
+        capped at DB_POOL_LOOP_WAIT - enough to ride out a short burst of
+        contention without stalling the bot; worker threads
+        (asyncio.to_thread) can wait the full pool timeout.
         """
-        Get a connection from the pool with retry logic.
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self.pool_timeout
+        return self.loop_wait_timeout
+
+    def _get_pooled_connection(self, read_only=False, max_lag_seconds=None):
+        """
+        Get a connection from the pool, waiting for one to be returned if it is exhausted.
+
+        How long it waits depends on the calling thread, see _wait_budget.
 
         Args:
-            retries: Number of times to retry if pool is exhausted (default: 3)
-            retry_delay: Delay in seconds between retries (default: 0.05)
+            read_only: Use the read pool if one is configured and the replica is healthy
+            max_lag_seconds: Replica lag tolerated for this read (defaults to DB_REPLICA_MAX_LAG)
 
         Returns:
-            A MySQL connection from the pool, or None if failed
+            A pooled MySQL connection (close() returns it to the pool), or None if failed
         """
-        import time
+        timeout = self._wait_budget()
 
-        for attempt in range(retries):
-            try:
-                pool = self._pools.get(self.pool_name)
-                if not pool:
-                    logger.error(f"Connection pool '{self.pool_name}' not found")
-                    if attempt < retries - 1:
-                        time.sleep(retry_delay)
-                    continue
-
-                connection = pool.get_connection()
-                if connection:
-                    # Connection obtained from pool, return it even if not immediately connected
-                    # The pool handles reconnection internally
+        if read_only and self.read_pool_name:
+            if self._replica_usable(max_lag_seconds):
+                try:
+                    connection = self._acquire(self.read_pool_name, timeout)
+                    if connection is not None:
+                        self.replica_reads += 1
                     return connection
-                else:
-                    if attempt < retries - 1:
-                        time.sleep(retry_delay)
-                    continue
+                except Exception as e:
+                    logger.warning(f"Read pool '{self.read_pool_name}' unavailable, reading from primary: {e}")
+                    self._mark_replica_down()
+            self.replica_fallbacks += 1
+
+        try:
+            return self._acquire(self.pool_name, timeout)
+        except Exception as e:
+            logger.error(f"Failed to get connection from pool '{self.pool_name}': {e}")
+            return None
+
+    def _acquire(self, pool_name, timeout):
+        """Check out a connection from a named pool (None if it stayed exhausted; raises on connection errors)."""
+        pool = self._pools.get(pool_name)
+        if not pool:
+            logger.error(f"Connection pool '{pool_name}' not found")
+            return None
+
+        connection = pool.acquire(timeout)
+        if connection is None:
+            if timeout < self.pool_timeout:
+                logger.error(f"Connection pool '{pool_name}' exhausted on the event loop thread (waited {timeout * 1000:.0f} ms); run this query via asyncio.to_thread")
+            else:
+                logger.error(f"Connection pool '{pool_name}' exhausted: no connection freed within {timeout * 1000:.0f} ms")
+        return connection
+
+    def _replica_usable(self, max_lag_seconds=None) -> bool:
+        """Whether reads may go to the read pool (replica reachable and lag within bounds)."""
+        if not self.read_is_replica:
+            return True
+        lag = self.get_replica_lag()
+        if lag is None:
+            return False
+        limit = self.replica_max_lag if max_lag_seconds is None else max_lag_seconds
+        return lag <= limit
+
+    def _mark_replica_down(self):
+        """Treat the replica as unavailable until the next lag check."""
+        with self._replica_lock:
+            self._replica_lag = None
+
+    def get_replica_lag(self) -> Optional[float]:
+        """
+        Seconds the read replica is behind the primary, or None if unknown/unreachable.
 
+        Returns the last reading of the background lag check (see
+        refresh_replica_lag), so it never queries the replica itself.
+        """
+        if not self.read_pool_name:
+            return None
+        if not self.read_is_replica:
+            return 0.0
+        with self._replica_lock:
+            return self._replica_lag
+
+    def _start_replica_monitor(self):
+        """Start the daemon thread that refreshes the replica lag every DB_REPLICA_CHECK_INTERVAL seconds."""
+        self._replica_monitor = threading.Thread(
+            target=self._replica_monitor_loop,
+            name=f"{self.read_pool_name}_lag",
+            daemon=True
+        )
+        self._replica_monitor.start()
+
+    def _replica_monitor_loop(self):
+        """Refresh the replica lag until the read pool is closed."""
+        while self.read_pool_name in self._pools:
+            try:
+                self.refresh_replica_lag()
             except Exception as e:
-                # Only log as error on last attempt to reduce spam
-                if attempt == retries - 1:
-                    logger.error(f"Failed to get connection from pool after {retries} attempts: {e}")
-                elif attempt < retries - 1:
-                    time.sleep(retry_delay)
+                logger.debug(f"Replica lag monitor error: {e}")
+            time.sleep(self.replica_check_interval)
 
-        return None
+    def refresh_replica_lag(self) -> Optional[float]:
+        """
+        Measure the replica lag and store it for get_replica_lag.
+
+        Uses SHOW REPLICA STATUS (SHOW SLAVE STATUS on older servers); a
+        server that isn't replicating (e.g. a standalone test instance)
+        reports 0. Blocks on the replica, so only call it off the event loop.
+        """
+        with self._replica_lock:
+            previous = self._replica_lag
+
+        # An exhausted read pool keeps the previous reading; only errors mark the replica down
+        lag = previous
+        connection = None
+        try:
+            connection = self._acquire(self.read_pool_name, self.pool_timeout)
+            if connection is not None:
+                lag = self._query_replica_lag(connection)
+        except Exception as e:
+            logger.debug(f"Replica lag check failed: {e}")
+            lag = None
+            self.mark_broken(connection)
+        finally:
+            if connection is not None:
+                connection.close()
+
+        with self._replica_lock:
+            self._replica_lag = lag
+
+        if (lag is None) != (previous is None):
+            if lag is None:
+                logger.warning(f"Read replica '{self.read_pool_name}' unavailable or not replicating, reads go to the primary")
+            else:
+                logger.info(f"Read replica '{self.read_pool_name}' healthy again (lag {lag:.0f}s)")
+        return lag
+
+    @staticmethod
+    def _query_replica_lag(connection) -> Optional[float]:
+        """Read the replication delay from a replica connection."""
+        cursor = connection.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except mysql.connector.Error:
+                cursor.execute("SHOW SLAVE STATUS")
+            row = cursor.fetchone()
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+        if row is None:
+            return 0.0
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return float(lag) if lag is not None else None
+
+    @staticmethod
+    def mark_broken(connection):
+        """Discard a connection when it's closed instead of returning it to the pool (e.g. after a lost-connection error)."""
+        if isinstance(connection, PooledConnection):
+            connection.broken = True
 
     def close_connection(self):
         """Close the current connection and return it to the pool."""
@@ -200,41 +680,38 @@ class Database:
             pool_name: Name of the pool to check
 
         Returns:
-            dict: Pool statistics including pool size and current connections
+            dict: Pool statistics (see ConnectionPool.stats)
         """
         try:
             pool = cls._pools.get(pool_name)
             if not pool:
                 return {"error": f"Pool '{pool_name}' not found"}
-
-            # Try to get pool size from the pool object
-            pool_size = pool.pool_size if hasattr(pool, 'pool_size') else "unknown"
-
-            return {
-                "pool_name": pool_name,
-                "pool_size": pool_size,
-                "status": "active"
-            }
+            return pool.stats()
         except Exception as e:
             return {"error": str(e)}
 
+    def get_replica_stats(self) -> dict:
+        """Get read routing statistics for monitoring."""
+        return {
+            "read_pool": self.read_pool_name,
+            "is_replica": self.read_is_replica,
+            "lag_seconds": self._replica_lag if self.read_is_replica else 0.0,
+            "max_lag_seconds": self.replica_max_lag,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.replica_fallbacks,
+        }
+
     @classmethod
     def close_all_pools(cls):
         """Close all connection pools (useful for graceful shutdown)."""
-        for pool_name, pool in cls._pools.items():
-            try:
-                # Close all connections in the pool
-                while True:
-                    try:
-                        conn = pool.get_connection()
-                        if conn.is_connected():
-                            conn.close()
-                    except:
-                        break
-                logger.info(f"Closed connection pool '{pool_name}'")
-            except Exception as e:
-                logger.warning(f"Error closing pool '{pool_name}': {e}")
-        cls._pools.clear()
+        with cls._pools_lock:
+            for pool_name, pool in cls._pools.items():
+                try:
+                    closed = pool.close()
+                    logger.info(f"Closed connection pool '{pool_name}' ({closed} idle connections)")
+                except Exception as e:
+                    logger.warning(f"Error closing pool '{pool_name}': {e}")
+            cls._pools.clear()
 
 
 # --- SQLAlchemy Async Setup for new features ---
@@ -0,0 +1,112 @@
+#! /usr/bin/python3.10
+"""
+Multi-process launcher.
+
+Runs the bot as several processes, each connecting a contiguous range of
+shards, so gateway traffic is spread across CPU cores. Global background
+tasks are elected to one process through Redis (Services/TaskLeader.py);
+guild tasks run in every process for that process's guilds.
+
+Usage:
+    python launcher.py --processes 4 --shards 16
+
+--shards defaults to SHARD_COUNT, then to one shard per process. A process
+that exits unexpectedly is restarted after --restart-delay seconds. SIGINT
+or SIGTERM shuts every process down cleanly (sessions are flushed on exit).
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import time
+
+from dotenv import load_dotenv
+
+from utils.sharding import shard_ranges
+
+
+def _run_process(process_index: int, process_count: int, shard_ids: list, shard_count: int):
+    """Child process entry point: run one Bot on its shard range."""
+    # Services read their process identity from the environment
+    os.environ['BOT_PROCESS_INDEX'] = str(process_index)
+    os.environ['BOT_PROCESS_COUNT'] = str(process_count)
+    os.environ['SHARD_COUNT'] = str(shard_count)
+    os.environ['SHARD_IDS'] = ','.join(str(shard_id) for shard_id in shard_ids)
+
+    load_dotenv()
+
+    from bot import Bot
+
+    Bot(shard_ids=shard_ids, shard_count=shard_count).run(os.getenv('TOKEN'))
+
+
+def _start(context, process_index: int, process_count: int, shard_ids: list, shard_count: int):
+    process = context.Process(
+        target=_run_process,
+        args=(process_index, process_count, shard_ids, shard_count),
+        name=f"bot-{process_index}",
+    )
+    process.start()
+    print(f"Started process {process_index} (pid {process.pid}) with shards {shard_ids[0]}-{shard_ids[-1]}")
+    return process
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=int(os.getenv('BOT_PROCESS_COUNT', '2')))
+    parser.add_argument("--shards", type=int, default=int(os.getenv('SHARD_COUNT', '0')) or None)
+    parser.add_argument("--restart-delay", type=float, default=5.0)
+    args = parser.parse_args()
+
+    shard_count = args.shards or args.processes
+    ranges = shard_ranges(shard_count, args.processes)
+
+    # Fresh interpreters, so no process inherits another's event loop or connections
+    context = multiprocessing.get_context("spawn")
+    processes = {
+        index: _start(context, index, args.processes, shard_ids, shard_count)
+        for index, shard_ids in enumerate(ranges)
+    }
+
+    stopping = False
+    forward_signal = False
+
+    def handle_sigterm(signum, frame):
+        nonlocal stopping, forward_signal
+        stopping = True
+        forward_signal = True
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    try:
+        while not stopping:
+            time.sleep(1)
+            for index, process in list(processes.items()):
+                if process.is_alive() or stopping:
+                    continue
+                print(f"Process {index} exited with code {process.exitcode}, restarting in {args.restart_delay}s")
+                time.sleep(args.restart_delay)
+                processes[index] = _start(context, index, args.processes, ranges[index], shard_count)
+    except KeyboardInterrupt:
+        # Ctrl+C already reached every process in the terminal's process group
+        pass
+
+    if forward_signal:
+        # discord.py shuts down cleanly on SIGINT
+        for process in processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+
+    for index, process in processes.items():
+        process.join(timeout=60)
+        if process.is_alive():
+            print(f"Process {index} did not stop in time, terminating")
+            process.terminate()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,7 @@ class UpdateLevelingSettingsRequest(BaseModel):
     announcement_channel_id: Optional[str] = None
     exp_multiplier: Optional[float] = Field(None, ge=0.1, le=5.0)
     max_level: Optional[int] = Field(None, ge=1, le=1000000)
+    custom_level_curve: Optional[bool] = None
     exp_formula: Optional[ExpFormula] = None
     base_exp: Optional[int] = Field(None, ge=50, le=1000)
     exp_growth_factor: Optional[float] = Field(None, ge=1.0, le=3.0)
@@ -44,9 +44,10 @@ class LevelingSettings(BaseModel):
     level_up_message_with_streak: str = "🎉 {mention} GUILD LEVEL UP! You have reached level {level}! Gained {credits} Credits! {base_credits} + {streak_bonus} from {streak}x Streak!"
 
     exp_multiplier: float = Field(default=1.0, ge=0.1, le=5.0)
-    max_level: int = Field(default=100, ge=1, le=1000000)
+    max_level: Optional[int] = Field(default=None, ge=1, le=1000000)  # None = no cap
 
-    # XP formula settings
+    # XP formula settings (max_level and these only apply with custom_level_curve)
+    custom_level_curve: bool = False
     exp_formula: ExpFormula = ExpFormula.QUADRATIC
     base_exp: int = Field(default=100, ge=50, le=1000)
     exp_growth_factor: float = Field(default=1.2, ge=1.0, le=3.0)
@@ -72,6 +73,7 @@ class LevelingSettings(BaseModel):
                 "announcement_channel_id": "123456789012345678",
                 "exp_multiplier": 1.0,
                 "max_level": 100,
+                "custom_level_curve": True,
                 "exp_formula": "quadratic",
                 "base_exp": 100,
                 "exp_growth_factor": 1.2
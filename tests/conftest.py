@@ -0,0 +1,17 @@
+import fakeredis.aioredis
+import pytest
+
+from Services.SessionManager import get_session_manager
+
+
+@pytest.fixture
+def fake_redis():
+    """Point the shared SessionManager Redis client at a fresh fakeredis for one test."""
+    manager = get_session_manager()
+    saved = manager.redis, manager.redis_available
+    manager.redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    manager.redis_available = True
+    try:
+        yield manager.redis
+    finally:
+        manager.redis, manager.redis_available = saved
@@ -0,0 +1,80 @@
+import asyncio
+
+import discord
+
+from Services.AnnouncementRenderStore import AnnouncementRenderStore
+
+
+class FakePartialMessage:
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def edit(self, embed):
+        self.channel.edits.append(embed.to_dict())
+
+
+class FakeChannel:
+    def __init__(self, message):
+        self.message = message
+        self.fetches = 0
+        self.edits = []
+
+    async def fetch_message(self, message_id):
+        self.fetches += 1
+        return self.message
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self)
+
+
+class FakeGuild:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+
+class FakeBot:
+    def __init__(self, guild):
+        self.guild = guild
+
+    def get_guild(self, guild_id):
+        return self.guild
+
+
+class FakeMessage:
+    def __init__(self, embed):
+        self.embeds = [embed]
+
+
+def test_viewer_threshold():
+    store = AnnouncementRenderStore()
+    store.viewer_threshold = 0.05
+
+    assert store.viewer_change_is_significant(None, 10)
+    assert not store.viewer_change_is_significant(1000, 1040)
+    assert store.viewer_change_is_significant(1000, 1050)
+    assert store.viewer_change_is_significant(3, 4)
+
+
+def test_updates_fetch_once_and_skip_small_changes():
+    embed = discord.Embed(description="### [Old](https://www.twitch.tv/someone)")
+    embed.add_field(name="Viewers", value="1,000", inline=False)
+    channel = FakeChannel(FakeMessage(embed))
+    bot = FakeBot(FakeGuild(channel))
+    announcement = {'id': 1, 'guild_id': 2, 'channel_id': 3, 'message_id': 4, 'streamer_username': 'someone'}
+    link = "https://www.twitch.tv/someone"
+
+    async def scenario():
+        store = AnnouncementRenderStore()
+        assert await store.update_stream_announcement(bot, "twitch", announcement, 2000, "Old", link)
+        assert not await store.update_stream_announcement(bot, "twitch", announcement, 2010, "Old", link)
+        assert await store.update_stream_announcement(bot, "twitch", announcement, 2010, "New", link)
+
+    asyncio.run(scenario())
+
+    assert channel.fetches == 1
+    assert len(channel.edits) == 2
+    assert channel.edits[-1]['fields'][0]['value'] == "2,000"
+    assert channel.edits[-1]['description'] == "### [New](https://www.twitch.tv/someone)"
@@ -0,0 +1,32 @@
+from utils.blackjack_cards import CARD_STRINGS, decode_card, encode_card, evaluate_hand
+from utils.blackjack_simulator import simulate, verify_against_game
+from utils.blackjack_strategy import get_basic_strategy_action
+
+
+def test_card_encoding_round_trip():
+    for code, card in enumerate(CARD_STRINGS):
+        assert encode_card(card) == code
+        assert decode_card(code) == card
+
+
+def test_evaluate_hand():
+    assert evaluate_hand(["A♠", "K♥"]) == (21, True)
+    assert evaluate_hand(["A♠", "A♥", "9♦"]) == (21, True)
+    assert evaluate_hand(["A♠", "6♥", "10♦"]) == (17, False)
+    assert evaluate_hand(["K♠", "Q♥", "5♦"]) == (25, False)
+
+
+def test_basic_strategy_lookup():
+    assert get_basic_strategy_action(["8♠", "8♥"], "10♦")["action"] == "Split"
+    assert get_basic_strategy_action(["10♠", "6♥"], "10♦")["action"] == "Surrender"
+    assert get_basic_strategy_action(["10♠", "6♥"], "10♦", can_surrender=False)["action"] == "Hit"
+    assert get_basic_strategy_action(["A♠", "7♥"], "4♦") == {"action": "Double", "reason": "Double soft 18 vs 3-6"}
+
+
+def test_simulator_matches_live_game():
+    assert verify_against_game(2000, seed=1) == []
+
+
+def test_simulator_house_edge_is_sane():
+    stats = simulate(200_000, seed=1)
+    assert -0.02 < stats["house_edge"] < 0.02
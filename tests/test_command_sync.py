@@ -0,0 +1,96 @@
+import asyncio
+
+import discord
+from discord import app_commands
+
+from Services.CommandSync import CommandSync
+from Services.SessionManager import get_session_manager
+
+
+class FakeBot:
+    application_id = 1234
+
+    def __init__(self):
+        self.client = discord.Client(intents=discord.Intents.none())
+        self.tree = app_commands.CommandTree(self.client)
+        self.uploads = []
+
+        async def sync(guild=None):
+            self.uploads.append(guild)
+            return self.tree.get_commands(guild=guild)
+
+        self.tree.sync = sync
+
+    def add_command(self, name: str, description: str):
+        async def callback(interaction: discord.Interaction):
+            pass
+
+        self.tree.add_command(app_commands.Command(name=name, description=description, callback=callback))
+
+
+def _run(scenario, tmp_path):
+    """Run scenario(sync) with the state file under tmp_path."""
+    async def run():
+        sync = CommandSync()
+        sync.state_file = str(tmp_path / "command_sync.json")
+        sync.force = False
+        sync.dev_guild_ids = []
+        return await scenario(sync)
+
+    return asyncio.run(run())
+
+
+def test_hash_ignores_registration_order():
+    first, second = FakeBot(), FakeBot()
+    first.add_command("ping", "Pong")
+    first.add_command("rank", "Show rank")
+    second.add_command("rank", "Show rank")
+    second.add_command("ping", "Pong")
+
+    sync = CommandSync()
+    assert sync.tree_hash(first.tree) == sync.tree_hash(second.tree)
+
+    second.add_command("help", "Help")
+    assert sync.tree_hash(first.tree) != sync.tree_hash(second.tree)
+
+
+def test_sync_uploads_only_when_tree_changes(fake_redis, tmp_path):
+    async def scenario(sync):
+        bot = FakeBot()
+        bot.add_command("ping", "Pong")
+        results = [await sync.sync(bot), await sync.sync(bot)]
+
+        bot.add_command("help", "Help")
+        results.append(await sync.sync(bot))
+        return [result["synced"] for result in results], len(bot.uploads)
+
+    synced, uploads = _run(scenario, tmp_path)
+
+    assert synced == [True, False, True]
+    assert uploads == 2
+
+
+def test_state_file_is_used_without_redis(fake_redis, tmp_path):
+    async def scenario(sync):
+        bot = FakeBot()
+        bot.add_command("ping", "Pong")
+        await sync.sync(bot)
+
+        get_session_manager().redis_available = False
+        return (await sync.sync(bot))["synced"]
+
+    assert _run(scenario, tmp_path) is False
+
+
+def test_dev_guilds_sync_instead_of_global(fake_redis, tmp_path):
+    async def scenario(sync):
+        sync.dev_guild_ids = [42]
+        bot = FakeBot()
+        bot.add_command("ping", "Pong")
+        results = await sync.sync_all(bot)
+        return results, bot.uploads
+
+    results, uploads = _run(scenario, tmp_path)
+
+    assert [result["scope"] for result in results] == ["42"]
+    assert [guild.id for guild in uploads] == [42]
@@ -0,0 +1,56 @@
+import asyncio
+
+import Dao.GuildDao
+from Services.ConfigCache import GuildConfigCache
+
+
+class FakeGuildDao:
+    queries = []
+
+    def get_guild_settings_bulk(self, guild_ids):
+        self.queries.append(list(guild_ids))
+        return {1: {"leveling": {"enabled": False}}, 2: None}
+
+    def close(self):
+        pass
+
+
+def test_leveling_configs_load_misses_in_one_query(monkeypatch):
+    monkeypatch.setattr(Dao.GuildDao, "GuildDao", FakeGuildDao)
+    cache = GuildConfigCache()
+    cache.cache[3] = {"enabled": True, "cached": True}
+
+    configs = asyncio.run(cache.get_leveling_configs([1, 2, 3, 4]))
+    again = asyncio.run(cache.get_leveling_configs([1, 2]))
+
+    assert FakeGuildDao.queries == [[1, 2, 4]]
+    assert [configs[guild_id]["enabled"] for guild_id in (1, 2, 3, 4)] == [False, True, True, True]
+    assert configs[3]["cached"]
+    assert again == {1: configs[1], 2: configs[2]}
+
+
+class FlakyGuildDao:
+    responses = [None, {1: {"roles": {"enabled": False}}}]
+
+    def get_guild_settings_bulk(self, guild_ids):
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def test_failed_settings_load_is_retried_not_cached(monkeypatch):
+    monkeypatch.setattr(Dao.GuildDao, "GuildDao", FlakyGuildDao)
+    cache = GuildConfigCache()
+
+    async def scenario():
+        first = await cache.get_role_plan(1)
+        assert 1 not in cache.settings_cache and 1 not in cache.role_plan_cache
+        second = await cache.get_guild_settings(1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is None
+    assert second == {"roles": {"enabled": False}}
+    assert cache.settings_cache[1] == second
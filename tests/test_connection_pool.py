@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import database
+from database import ConnectionPool, Database
+
+
+class FakeConnection:
+    def __init__(self, **kwargs):
+        self.pings = 0
+        self.closed = False
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self.pings += 1
+
+    def reconnect(self, attempts=1, delay=0):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(monkeypatch, **kwargs):
+    monkeypatch.setattr(database.mysql.connector, "connect", FakeConnection)
+    return ConnectionPool("test", connect_args={"host": "localhost"}, **kwargs)
+
+
+def test_pool_grows_lazily_and_times_out_when_exhausted(monkeypatch):
+    pool = make_pool(monkeypatch, max_size=2, min_size=1)
+    assert pool.stats()["open"] == 1
+
+    first = pool.acquire(0)
+    second = pool.acquire(0)
+    assert pool.stats()["open"] == 2
+    assert pool.acquire(0.01) is None
+
+    stats = pool.stats()
+    assert stats["checked_out"] == 2
+    assert stats["exhaustion_waits"] == 1
+    assert stats["exhaustion_timeouts"] == 1
+
+    first.close()
+    first.close()  # Only the first close returns the connection
+    second.close()
+    assert pool.stats()["idle"] == 2
+
+
+def test_waiter_wakes_when_connection_is_returned(monkeypatch):
+    pool = make_pool(monkeypatch, max_size=1, min_size=1)
+    held = pool.acquire(0)
+
+    threading.Timer(0.05, held.close).start()
+    started = time.monotonic()
+    connection = pool.acquire(5)
+    elapsed = time.monotonic() - started
+
+    assert connection is not None
+    assert elapsed < 1
+    assert sum(pool.stats()["wait_histogram"].values()) == 2
+
+
+def test_broken_connections_are_discarded_and_idle_ones_pinged(monkeypatch):
+    pool = make_pool(monkeypatch, max_size=2, min_size=0, preping_idle_seconds=0)
+
+    connection = pool.acquire(0)
+    Database.mark_broken(connection)
+    connection.close()
+    assert pool.stats()["open"] == 0
+    assert pool.stats()["discarded"] == 1
+
+    connection = pool.acquire(0)
+    connection.close()
+    time.sleep(0.01)
+    connection = pool.acquire(0)
+    assert connection.pings == 1
+
+
+def test_event_loop_callers_only_wait_briefly_for_a_connection():
+    db = Database.__new__(Database)
+    db.pool_timeout = 10.0
+    db.loop_wait_timeout = 0.05
+
+    async def on_loop():
+        return db._wait_budget()
+
+    assert db._wait_budget() == 10.0
+    assert asyncio.run(on_loop()) == 0.05
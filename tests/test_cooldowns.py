@@ -0,0 +1,47 @@
+from Services import CooldownService as cooldown_module
+from Services.CooldownService import XP_BUCKET, CooldownService
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cooldown_expires_and_is_swept(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cooldown_module.time, "monotonic", clock)
+    service = CooldownService()
+
+    assert service.try_acquire(XP_BUCKET, 1, 2, 3)
+    assert not service.try_acquire(XP_BUCKET, 1, 2, 3)
+    assert service.remaining(XP_BUCKET, 1, 2) == 3
+
+    clock.now += 5
+    assert not service.on_cooldown(XP_BUCKET, 1, 2)
+    assert service.buckets[XP_BUCKET] == {}
+    assert service.expired == 1
+
+
+def test_rearmed_cooldown_survives_sweep_of_old_slot(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cooldown_module.time, "monotonic", clock)
+    service = CooldownService()
+
+    service.trigger(XP_BUCKET, 1, 2, 1)
+    clock.now += 0.5
+    service.trigger(XP_BUCKET, 1, 2, 10)
+
+    clock.now += 2
+    assert service.on_cooldown(XP_BUCKET, 1, 2)
+
+
+def test_buckets_are_independent(monkeypatch):
+    monkeypatch.setattr(cooldown_module.time, "monotonic", FakeClock())
+    service = CooldownService()
+
+    service.trigger(XP_BUCKET, 1, 2, 3)
+    assert not service.on_cooldown("ai_mention", 1, 2)
+    assert not service.on_cooldown(XP_BUCKET, 2, 1)
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+from Services.CurrencyLedger import CurrencyLedger
+from Services.SessionManager import get_session_manager
+
+GUILD_ID = 1
+
+
+def _session(currency):
+    return {
+        "currency": currency,
+        "currency_to_flush": 0,
+        "messages_to_flush": 0,
+        "reactions_to_flush": 0,
+        "guild_exp": 0,
+        "global_exp": 0,
+        "dirty": False,
+    }
+
+
+def _run_with_sessions(redis, balances, scenario):
+    """Run scenario(ledger, redis) with seeded member sessions."""
+    manager = get_session_manager()
+
+    async def run():
+        for user_id, currency in balances.items():
+            await redis.set(manager._session_key(GUILD_ID, user_id), json.dumps(_session(currency)))
+        return await scenario(CurrencyLedger(), redis)
+
+    return asyncio.run(run())
+
+
+async def _load(redis, user_id):
+    return json.loads(await redis.get(get_session_manager()._session_key(GUILD_ID, user_id)))
+
+
+def test_transfer_updates_every_leg(fake_redis):
+    async def scenario(ledger, redis):
+        result = await ledger.transfer(GUILD_ID, {10: -100, 20: 90}, vault_delta=10)
+        vault = json.loads(await redis.get(get_session_manager()._guild_vault_key(GUILD_ID)))
+        return result, await _load(redis, 10), await _load(redis, 20), vault
+
+    result, giver, receiver, vault = _run_with_sessions(fake_redis, {10: 500, 20: 0}, scenario)
+
+    assert result.success
+    assert result.balances == {10: 400, 20: 90}
+    assert (giver["currency"], giver["currency_to_flush"], giver["dirty"]) == (400, -100, True)
+    assert (receiver["currency"], receiver["currency_to_flush"]) == (90, 90)
+    assert vault["vault_currency_to_flush"] == 10
+
+
+def test_insufficient_funds_applies_nothing(fake_redis):
+    async def scenario(ledger, redis):
+        result = await ledger.transfer(GUILD_ID, {10: -100, 20: 100})
+        return result, await _load(redis, 10), await _load(redis, 20)
+
+    result, giver, receiver = _run_with_sessions(fake_redis, {10: 50, 20: 0}, scenario)
+
+    assert not result.success
+    assert result.error == "insufficient_funds"
+    assert result.insufficient_user_id == 10
+    assert giver["currency"] == 50
+    assert receiver["currency"] == 0
+
+
+def test_idempotency_key_applies_once(fake_redis):
+    async def scenario(ledger, redis):
+        first = await ledger.transfer(GUILD_ID, {10: -100, 20: 100}, idempotency_key="give:1")
+        second = await ledger.transfer(GUILD_ID, {10: -100, 20: 100}, idempotency_key="give:1")
+        return first, second, await _load(redis, 10)
+
+    first, second, giver = _run_with_sessions(fake_redis, {10: 500, 20: 0}, scenario)
+
+    assert first.success and not first.duplicate
+    assert second.success and second.duplicate
+    assert second.balances == first.balances
+    assert giver["currency"] == 400
+
+
+def test_mark_flushed_keeps_concurrent_deltas(fake_redis):
+    async def scenario(ledger, redis):
+        await ledger.transfer(GUILD_ID, {10: 50})
+        flushed = await _load(redis, 10)
+        # A transfer lands while the flush is writing to MySQL
+        await ledger.transfer(GUILD_ID, {10: 25})
+        manager = get_session_manager()
+        await manager._mark_flushed(manager._session_key(GUILD_ID, 10), flushed)
+        return await _load(redis, 10)
+
+    session = _run_with_sessions(fake_redis, {10: 0}, scenario)
+
+    assert session["currency"] == 75
+    assert session["currency_to_flush"] == 25
+    assert session["dirty"]
+
+
+def test_queued_game_ids_survive_transfer_and_flush(fake_redis):
+    user_id = 123456789012345678
+    guild_id = 987654321098765432
+
+    async def scenario(ledger, redis):
+        manager = get_session_manager()
+        key = manager._session_key(guild_id, user_id)
+        await redis.set(key, json.dumps(_session(500)))
+        await manager.queue_game(guild_id, user_id, "coinflip", 100, 0, 100, "loss")
+        await ledger.transfer(guild_id, {user_id: -100})
+        queued = [json.loads(game) for game in await redis.lrange(manager._session_games_key(guild_id, user_id), 0, -1)]
+
+        await manager.queue_game(guild_id, user_id, "coinflip", 100, 200, 0, "win")
+        await manager._mark_flushed(key, json.loads(await redis.get(key)), games_flushed=1)
+        remaining = await redis.lrange(manager._session_games_key(guild_id, user_id), 0, -1)
+        return queued, remaining, json.loads(await redis.get(key))
+
+    queued, remaining, session = _run_with_sessions(fake_redis, {}, scenario)
+
+    assert (queued[0]["user_id"], queued[0]["guild_id"]) == (user_id, guild_id)
+    assert [json.loads(game)["result"] for game in remaining] == ["win"]
+    assert session["dirty"]
+
+
+def test_get_stats_counts_dirty_sessions_without_flushing(fake_redis):
+    async def scenario(ledger, redis):
+        await ledger.transfer(GUILD_ID, {10: 50})
+        return await get_session_manager().get_stats(), await _load(redis, 10)
+
+    stats, session = _run_with_sessions(fake_redis, {10: 0, 20: 0}, scenario)
+
+    assert (stats["active_sessions"], stats["dirty_sessions"]) == (2, 1)
+    assert session["currency_to_flush"] == 50
+
+
+def test_settle_keeps_the_session_when_the_flush_fails(fake_redis, monkeypatch):
+    manager = get_session_manager()
+
+    async def failing_write(guild_id, user_id, session, games=None):
+        return False
+
+    monkeypatch.setattr(manager, "_flush_session_to_db", failing_write)
+
+    async def scenario(ledger, redis):
+        await ledger.transfer(GUILD_ID, {10: 50})
+        settled_dirty = await ledger.settle(GUILD_ID, 10)
+        settled_clean = await ledger.settle(GUILD_ID, 20)
+        return settled_dirty, settled_clean, await _load(redis, 10), await redis.exists(manager._session_key(GUILD_ID, 20))
+
+    settled_dirty, settled_clean, session, clean_exists = _run_with_sessions(fake_redis, {10: 0, 20: 0}, scenario)
+
+    assert not settled_dirty
+    assert session["currency_to_flush"] == 50
+    assert settled_clean and not clean_exists
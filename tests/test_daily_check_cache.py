@@ -0,0 +1,16 @@
+import asyncio
+
+from Services.DailyCheckCache import DailyCheckCache
+
+
+def test_invalidate_guilds_only_forgets_those_guilds():
+    async def scenario():
+        cache = DailyCheckCache()
+        assert await cache.should_check_daily(1, 10)
+        assert await cache.should_check_daily(2, 20)
+
+        assert await cache.invalidate_guilds([1]) == 1
+        assert await cache.should_check_daily(1, 10)
+        assert not await cache.should_check_daily(2, 20)
+
+    asyncio.run(scenario())
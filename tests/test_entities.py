@@ -0,0 +1,33 @@
+from Entities.BaseEntity import BaseEntity
+from Entities.GuildUser import GuildUser
+from utils.entity_hydration_benchmark import COLUMNS, make_rows
+
+
+def test_from_row_matches_constructor():
+    row = make_rows(1)[0]
+    hydrated = GuildUser.from_row(COLUMNS, row)
+    constructed = GuildUser(**dict(zip(COLUMNS, row)))
+
+    assert hydrated.to_dict() == constructed.to_dict()
+    assert not hasattr(hydrated, '__dict__')
+
+
+def test_from_row_ignores_unknown_columns_on_slotted_entities():
+    columns = ('user_id', 'guild_id', 'exp', 'user_rank')
+    guild_user = GuildUser.from_row(columns, (1, 2, 300, 7))
+
+    assert (guild_user.user_id, guild_user.guild_id, guild_user.exp) == (1, 2, 300)
+    assert GuildUser.row_hydrator(columns) is GuildUser.row_hydrator(list(columns))
+
+
+def test_from_row_converts_is_active_to_bool():
+    guild_user = GuildUser.from_row(('user_id', 'guild_id', 'is_active'), (1, 2, 0))
+
+    assert guild_user.is_active is False
+
+
+def test_from_row_on_dict_backed_entity():
+    entity_class = type('Plain', (BaseEntity,), {})
+    entity = entity_class.from_row(('id', 'total'), (5, 10))
+
+    assert entity.to_dict() == {'id': 5, 'total': 10}
@@ -0,0 +1,83 @@
+import asyncio
+
+import discord
+
+from Services.EntityResolver import EntityResolver
+
+
+class FakeResponse:
+    status = 404
+    reason = "Not Found"
+
+
+class FakeBot:
+    def __init__(self, cached_users=None, missing=()):
+        self.cached_users = cached_users or {}
+        self.missing = set(missing)
+        self.cached_messages = []
+        self.fetches = 0
+
+    def get_user(self, user_id):
+        return self.cached_users.get(user_id)
+
+    async def fetch_user(self, user_id):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        if user_id in self.missing:
+            raise discord.NotFound(FakeResponse(), "Unknown User")
+        return f"user-{user_id}"
+
+
+def test_concurrent_lookups_share_one_fetch():
+    resolver = EntityResolver()
+    bot = FakeBot()
+
+    async def run():
+        return await asyncio.gather(*(resolver.get_user(bot, 1) for _ in range(5)))
+
+    users = asyncio.run(run())
+    again = asyncio.run(resolver.get_user(bot, 1))
+
+    assert users == ["user-1"] * 5
+    assert again == "user-1"
+    assert bot.fetches == 1
+    assert resolver.stats["user"]["coalesced"] == 4
+    assert resolver.stats["user"]["cache_hits"] == 1
+
+
+def test_gateway_cache_is_tried_first():
+    resolver = EntityResolver()
+    bot = FakeBot(cached_users={1: "cached-user"})
+
+    assert asyncio.run(resolver.get_user(bot, 1)) == "cached-user"
+    assert bot.fetches == 0
+    assert resolver.get_stats()["user"]["hit_rate"] == 1.0
+
+
+def test_not_found_is_remembered():
+    resolver = EntityResolver()
+    bot = FakeBot(missing={2})
+
+    assert asyncio.run(resolver.get_user(bot, 2)) is None
+    assert asyncio.run(resolver.get_user(bot, 2)) is None
+    assert bot.fetches == 1
+    assert resolver.stats["user"]["not_found"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_fetch():
+    resolver = EntityResolver()
+    bot = FakeBot()
+
+    async def run():
+        first = asyncio.create_task(resolver.get_user(bot, 3))
+        second = asyncio.create_task(resolver.get_user(bot, 3))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(run())
+
+    assert isinstance(first, asyncio.CancelledError)
+    assert second == "user-3"
+    assert bot.fetches == 1
+    assert resolver.cache[("user", 3)] == "user-3"
@@ -0,0 +1,53 @@
+import asyncio
+
+from Services.GlobalStatsService import COUNTERS_KEY, GlobalStatsService
+
+
+def test_totals_unavailable_until_reconciled():
+    stats = GlobalStatsService()
+
+    asyncio.run(stats.record_flush(1, messages=5))
+
+    assert asyncio.run(stats.get_totals()) is None
+
+
+def test_flush_deltas_apply_on_top_of_baseline():
+    stats = GlobalStatsService()
+    stats.local_counters = {"messages": 100, "reactions": 10, "currency": 500, "exp": 1000, "active_users": 1}
+
+    asyncio.run(stats.record_flush(1, messages=3, currency=-50, exp=20))
+    asyncio.run(stats.record_flush(2, reactions=2))
+    asyncio.run(stats.record_flush(1, messages=1))
+    totals = asyncio.run(stats.get_totals())
+
+    assert totals == {"messages": 104, "reactions": 12, "currency": 450, "exp": 1020, "active_users": 2}
+
+
+def test_active_users_window_drops_old_hours():
+    stats = GlobalStatsService()
+    stats.active_window_hours = 2
+    stats.local_counters = {"active_users": 0}
+    current = stats._current_hour()
+    stats.local_active = {current - 5: {1, 2, 3}, current - 1: {4}}
+
+    asyncio.run(stats.record_flush(5))
+    totals = asyncio.run(stats.get_totals())
+
+    assert totals["active_users"] == 2
+    assert current - 5 not in stats.local_active
+
+
+def test_redis_totals_ignore_flushes_before_reconcile(fake_redis):
+    stats = GlobalStatsService()
+
+    async def scenario():
+        await stats.record_flush(1, messages=5)
+        before = await stats.get_totals()
+        await fake_redis.hset(COUNTERS_KEY, mapping={"messages": 100, "active_users": 1})
+        await stats.record_flush(1, messages=3)
+        return before, await stats.get_totals()
+
+    before, after = asyncio.run(scenario())
+
+    assert before is None
+    assert after["messages"] == 103
@@ -0,0 +1,15 @@
+import logging
+
+from Dao.GuildDao import GuildDao
+
+
+def _dao(result):
+    dao = GuildDao.__new__(GuildDao)
+    dao.logger = logging.getLogger(__name__)
+    dao.execute_query = lambda sql, params=None, commit=False: result
+    return dao
+
+
+def test_add_vault_currency_reports_failed_update():
+    assert _dao(False).add_vault_currency(1, 500) is False
+    assert _dao(True).add_vault_currency(1, 500) is True
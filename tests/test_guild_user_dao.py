@@ -0,0 +1,19 @@
+import logging
+
+from Dao.GuildUserDao import GuildUserDao
+from Entities.GuildUser import GuildUser
+
+
+def test_daily_claim_leaves_currency_to_the_ledger():
+    calls = []
+    dao = GuildUserDao.__new__(GuildUserDao)
+    dao.logger = logging.getLogger(__name__)
+    dao.execute_query = lambda sql, params=None, commit=False: calls.append((sql, params)) or True
+
+    guild_user = GuildUser(user_id=7, guild_id=1, name="alice", currency=50, streak=3, highest_streak=4,
+                           daily=1, last_daily="2026-10-18 09:00:00")
+    assert dao.update_daily_claim(guild_user) is True
+
+    sql, params = calls[0]
+    assert "currency" not in sql and "exp" not in sql
+    assert params == (1, "2026-10-18 09:00:00", 3, 4, 7, 1)
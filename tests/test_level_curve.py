@@ -0,0 +1,56 @@
+import math
+
+from utils.level_curve import get_default_level_curve, level_curve_for_config
+
+
+def test_default_curve_matches_sqrt_formula():
+    curve = get_default_level_curve()
+
+    for exp in [0, 1, 99, 100, 399, 400, 12345, 10_000_000]:
+        assert curve.level_for_exp(exp) == math.floor(math.sqrt(exp / 100))
+    assert curve.exp_for_level(3) == 900
+    assert curve.exp_to_next_level(450) == 450
+
+
+def test_linear_and_exponential_curves():
+    linear = level_curve_for_config({"custom_level_curve": True, "exp_formula": "linear", "base_exp": 50})
+    exponential = level_curve_for_config({
+        "custom_level_curve": True, "exp_formula": "exponential", "base_exp": 100, "exp_growth_factor": 2.0
+    })
+
+    assert linear.level_for_exp(149) == 2
+    assert [exponential.exp_for_level(level) for level in range(4)] == [0, 100, 300, 700]
+    assert exponential.level_for_exp(699) == 2
+
+
+def test_multi_level_jump():
+    curve = get_default_level_curve()
+
+    assert curve.level_for_exp(2500) - curve.level_for_exp(150) == 4
+
+
+def test_max_level_caps_lookups():
+    curve = level_curve_for_config({"custom_level_curve": True, "max_level": 10})
+
+    assert curve.level_for_exp(10 ** 9) == 10
+    assert curve.exp_to_next_level(10 ** 9) == 0
+    assert curve.exp_for_level(11) == curve.exp_for_level(10)
+
+
+def test_curves_are_shared_by_parameters():
+    assert level_curve_for_config({"custom_level_curve": True, "exp_formula": "quadratic"}) is get_default_level_curve()
+    assert level_curve_for_config({"custom_level_curve": True, "exp_formula": "bogus"}) is get_default_level_curve()
+
+
+def test_curve_settings_need_opt_in():
+    stored = {"exp_formula": "linear", "base_exp": 50, "max_level": 100}
+
+    assert level_curve_for_config(stored) is get_default_level_curve()
+    assert level_curve_for_config({**stored, "custom_level_curve": True}).max_level == 100
+
+
+def test_unset_max_level_is_uncapped():
+    curve = level_curve_for_config({"custom_level_curve": True, "max_level": None})
+
+    assert curve is get_default_level_curve()
+    assert curve.level_for_exp(10 ** 7) == 316
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+import Services.LiveStatusCache as live_status_cache_module
+from Services.LiveStatusCache import LiveStatusCache, LiveStatusUnavailable
+from Services.kick_service import KickService
+from Services.twitch_service import TwitchService
+
+
+def test_duplicate_streamers_fetched_once_and_shared(fake_redis):
+    fetched = []
+
+    async def fetch(logins):
+        fetched.append(list(logins))
+        return {"alice": {"data": [{"viewer_count": 5}]}}
+
+    async def scenario():
+        first = await LiveStatusCache().get_live_streams("twitch", ["Alice", "bob", "alice", "BOB"], fetch)
+        # A second process shares the statuses through Redis, offline ones included
+        second = await LiveStatusCache().get_live_streams("twitch", ["alice", "bob"], fetch)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert fetched == [["alice", "bob"]]
+    assert first == second == {"alice": {"data": [{"viewer_count": 5}]}}
+
+
+def test_twitch_batches_unique_logins_by_100(monkeypatch):
+    monkeypatch.setattr(live_status_cache_module, "_live_status_cache", LiveStatusCache())
+    service = TwitchService()
+    calls = []
+
+    async def fake_request(session, endpoint, params):
+        calls.append(params)
+        return {"data": [{"user_login": params[0][1], "user_id": "1"}]}
+
+    monkeypatch.setattr(service, "_make_api_request", fake_request)
+    usernames = [f"Streamer{i}" for i in range(150)] * 3
+
+    live = asyncio.run(service.get_live_streams_batch(None, usernames))
+
+    assert [len(params) for params in calls] == [100, 50]
+    assert set(live) == {"streamer0", "streamer100"}
+
+
+def test_kick_resolves_user_ids_once(fake_redis, monkeypatch):
+    monkeypatch.setattr(live_status_cache_module, "_live_status_cache", LiveStatusCache())
+    service = KickService()
+    calls = []
+
+    async def fake_request(session, endpoint, params=None, method='GET', require_auth=False):
+        calls.append(endpoint)
+        if endpoint == "channels":
+            return {"data": [{"slug": slug, "broadcaster_user_id": i} for i, slug in enumerate(params["slug"], start=1)]}
+        return {"data": [{"broadcaster_user_id": 1, "title": "Live"}]}
+
+    monkeypatch.setattr(service, "_make_api_request", fake_request)
+
+    async def scenario():
+        await service.get_live_streams_batch(None, ["Ana", "ben", "ana"])
+        return await service.get_live_streams_batch(None, ["ana", "ben"])
+
+    live = asyncio.run(scenario())
+
+    assert calls == ["channels", "livestreams", "livestreams"]
+    assert live["ana"]["title"] == "Live"
+
+
+def test_failed_fetch_caches_nothing(fake_redis, monkeypatch):
+    monkeypatch.setattr(live_status_cache_module, "_live_status_cache", LiveStatusCache())
+    service = TwitchService()
+    responses = [{}, {"data": [{"user_login": "alice", "user_id": "1"}]}]
+
+    async def fake_request(session, endpoint, params):
+        return responses.pop(0)
+
+    monkeypatch.setattr(service, "_make_api_request", fake_request)
+
+    async def scenario():
+        cache = LiveStatusCache()
+        fetch = lambda logins: service.get_live_streams_batch(None, logins)
+        with pytest.raises(LiveStatusUnavailable):
+            await cache.get_live_streams("twitch", ["alice", "bob"], fetch)
+        return await cache.get_live_streams("twitch", ["alice", "bob"], fetch)
+
+    assert set(asyncio.run(scenario())) == {"alice"}
@@ -0,0 +1,39 @@
+import asyncio
+
+from Services.LotteryService import LotteryService
+
+EVENT_ID = 7
+
+
+def _run(redis, scenario):
+    """Run scenario(lottery, redis) with the event already hydrated."""
+    async def run():
+        lottery = LotteryService()
+        await redis.set(lottery._hydrated_key(EVENT_ID), 1)
+        return await scenario(lottery, redis)
+
+    return asyncio.run(run())
+
+
+def test_enter_rejects_repeat_entries(fake_redis):
+    async def scenario(lottery, redis):
+        results = [await lottery.enter(EVENT_ID, user_id) for user_id in (1, 2, 1)]
+        return results, await lottery.count(EVENT_ID), await redis.smembers(lottery._pending_key(EVENT_ID))
+
+    results, count, pending = _run(fake_redis, scenario)
+
+    assert results == [True, True, False]
+    assert count == 2
+    assert pending == {"1", "2"}
+
+
+def test_draw_returns_distinct_entrants(fake_redis):
+    async def scenario(lottery, redis):
+        for user_id in range(1, 6):
+            await lottery.enter(EVENT_ID, user_id)
+        return await lottery.draw(EVENT_ID, candidates=3)
+
+    drawn = _run(fake_redis, scenario)
+
+    assert len(set(drawn)) == 3
+    assert set(drawn) <= {1, 2, 3, 4, 5}
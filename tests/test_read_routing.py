@@ -0,0 +1,96 @@
+import logging
+
+from Dao.BaseDao import BaseDao, read_intent
+from database import Database
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows=None):
+        self.rows = [(1,)] if rows is None else rows
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.rows)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.calls = []
+
+    def _get_pooled_connection(self, read_only=False, max_lag_seconds=None):
+        self.calls.append((read_only, max_lag_seconds))
+        return FakeConnection()
+
+
+class StatsDao(BaseDao):
+    def __init__(self):
+        self.db = FakeDatabase()
+        self.logger = logging.getLogger(__name__)
+
+    @read_intent(max_lag_seconds=5)
+    def get_report(self):
+        return self.execute_query("SELECT 1")
+
+    @read_intent()
+    def write_inside_read_intent(self):
+        return self.execute_query("UPDATE t SET a = 1", commit=True)
+
+
+def test_reads_route_by_intent():
+    dao = StatsDao()
+
+    dao.execute_query("SELECT 1")
+    dao.get_report()
+    dao.execute_read("SELECT 1", replica=True)
+    dao.write_inside_read_intent()
+    dao.execute_query("SELECT 1")
+
+    assert dao.db.calls == [(False, None), (True, 5), (True, None), (False, None), (False, None)]
+
+
+def test_replica_lag_parsing():
+    assert Database._query_replica_lag(FakeConnection(rows=[])) == 0.0
+    assert Database._query_replica_lag(FakeConnection(rows=[{'Seconds_Behind_Source': 12}])) == 12.0
+    assert Database._query_replica_lag(FakeConnection(rows=[{'Seconds_Behind_Master': None}])) is None
+
+
+def test_replica_routing_reads_the_cached_lag():
+    import threading
+
+    db = Database.__new__(Database)
+    db.read_pool_name = "test_read"
+    db.read_is_replica = True
+    db.replica_max_lag = 30.0
+    db.pool_timeout = 1.0
+    db._replica_lock = threading.Lock()
+    db._replica_lag = None
+    db._acquire = lambda pool_name, timeout: FakeConnection(rows=[{'Seconds_Behind_Source': 12}])
+
+    assert not db._replica_usable()
+
+    assert db.refresh_replica_lag() == 12.0
+    db._acquire = None  # routing must not query the replica itself
+    assert db._replica_usable()
+    assert not db._replica_usable(max_lag_seconds=5)
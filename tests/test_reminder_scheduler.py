@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from Entities.Reminder import Reminder
+from Services.ReminderScheduler import REMINDER_CHANNEL, ReminderScheduler
+
+
+def make_reminder(reminder_id, seconds_from_now):
+    return Reminder(
+        id=reminder_id,
+        user_id=1,
+        guild_id=2,
+        channel_id=3,
+        message="test",
+        remind_at=datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now),
+    )
+
+
+def test_due_reminders_pop_in_order_and_skip_cancelled():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(make_reminder(1, -5))
+    scheduler.schedule(make_reminder(2, -10))
+    scheduler.schedule(make_reminder(3, -1))
+    scheduler.schedule(make_reminder(4, 600))
+    scheduler.cancel(3)
+
+    due = scheduler._pop_due(datetime.now(timezone.utc).timestamp())
+
+    assert [reminder.id for reminder in due] == [2, 1]
+    assert scheduler.scheduled_ids == {4}
+    assert scheduler.cancelled_ids == set()
+
+
+def test_schedule_dedupes_and_ignores_reminders_past_horizon():
+    scheduler = ReminderScheduler(horizon_seconds=60)
+    scheduler.schedule(make_reminder(1, 30))
+    scheduler.schedule(make_reminder(1, 30))
+    scheduler.schedule(make_reminder(2, 3600))
+
+    assert len(scheduler.heap) == 1
+    assert scheduler._wakeup.is_set()
+
+
+def test_other_processes_publish_changes_to_the_running_scheduler(fake_redis):
+    async def scenario():
+        pubsub = fake_redis.pubsub()
+        await pubsub.subscribe(REMINDER_CHANNEL)
+        await ReminderScheduler().reminder_created(make_reminder(7, 30))
+        await ReminderScheduler().reminder_cancelled(7)
+        events = []
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                events.append(message["data"])
+            if len(events) == 2:
+                break
+        await pubsub.aclose()
+        return events
+
+    events = asyncio.run(scenario())
+
+    running = ReminderScheduler()
+    running.schedule(make_reminder(7, 30))
+    asyncio.run(running._handle_event(events[1]))
+
+    assert events == ["schedule:7", "cancel:7"]
+    assert running.scheduled_ids == set()
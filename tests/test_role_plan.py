@@ -0,0 +1,40 @@
+from utils.role_plan import compile_role_plan
+
+
+def test_cumulative_plan_grants_every_threshold_below_level():
+    plan = compile_role_plan({
+        "enabled": True,
+        "role_mappings": {"10": {"role_ids": ["2"]}, "5": [1], "20": [3]},
+    })
+
+    assert plan.roles_for_level(4) == (frozenset(), frozenset())
+    assert plan.roles_for_level(10) == (frozenset({1, 2}), frozenset())
+    assert plan.roles_for_level(99) == (frozenset({1, 2, 3}), frozenset())
+
+
+def test_progressive_plan_withholds_roles_above_level():
+    plan = compile_role_plan({
+        "enabled": True,
+        "mode": "progressive",
+        "role_mappings": {"5": [1], "10": [2], "20": [3]},
+    })
+
+    assert plan.roles_for_level(12) == (frozenset({1, 2}), frozenset({3}))
+
+
+def test_disabled_or_empty_config_has_no_plan():
+    assert compile_role_plan({"enabled": False, "role_mappings": {"5": [1]}}) is None
+    assert compile_role_plan({"enabled": True, "role_mappings": {}}) is None
+    assert compile_role_plan(None) is None
+
+
+def test_version_follows_the_mappings_not_the_compile():
+    config = {"enabled": True, "role_mappings": {"5": [1], "10": ["2"]}}
+    reordered = {"enabled": True, "role_mappings": {"10": {"role_ids": [2]}, "5": ["1"]}}
+
+    version = compile_role_plan(config).version
+
+    assert compile_role_plan(config).version == version
+    assert compile_role_plan(reordered).version == version
+    assert compile_role_plan({**config, "mode": "progressive"}).version != version
+    assert compile_role_plan({**config, "role_mappings": {"5": [1], "10": [3]}}).version != version
@@ -0,0 +1,25 @@
+import asyncio
+
+from utils.route_limiter import RouteLimiter
+
+
+def test_one_request_per_route_and_bounded_overall():
+    limiter = RouteLimiter(max_concurrent=2)
+    in_flight = {}
+    peaks = {"total": 0}
+
+    async def send(route):
+        async with limiter.route(route):
+            in_flight[route] = in_flight.get(route, 0) + 1
+            assert in_flight[route] == 1
+            peaks["total"] = max(peaks["total"], sum(in_flight.values()))
+            await asyncio.sleep(0.01)
+            in_flight[route] -= 1
+
+    async def scenario():
+        await asyncio.gather(*(send(route) for route in [1, 1, 2, 2, 3, 3]))
+
+    asyncio.run(scenario())
+
+    assert peaks["total"] == 2
+    assert len(limiter) == 0
@@ -0,0 +1,38 @@
+import logging
+
+from Dao.BaseDao import BaseDao
+from tests.test_read_routing import FakeDatabase
+from utils.startup_profiler import StartupProfiler
+
+
+class TableDao(BaseDao):
+    def __init__(self):
+        self.db = FakeDatabase()
+        self.logger = logging.getLogger(__name__)
+
+
+def test_report_orders_steps_and_totals_phases():
+    profiler = StartupProfiler()
+    profiler.timings = [
+        ("cog load", "Rank", 0.5),
+        ("cog load", "Ping", 0.01),
+        ("task import", "Rank", 0.2),
+    ]
+    profiler.mark("ready")
+    profiler.mark("ready")
+
+    assert profiler.phase_totals() == {"cog load": 0.51, "task import": 0.2}
+    assert [name for _, name, _ in profiler.slowest(2)] == ["Rank", "Rank"]
+    assert list(profiler.milestones) == ["ready"]
+    assert "cog load: Rank" in profiler.report()
+
+
+def test_create_table_runs_once_per_process():
+    sql = "CREATE TABLE IF NOT EXISTS StartupProfilerTest (id INT)"
+    first, second = TableDao(), TableDao()
+
+    assert first.create_table_if_not_exists(sql)
+    assert second.create_table_if_not_exists(sql)
+
+    assert len(first.db.calls) == 1
+    assert second.db.calls == []
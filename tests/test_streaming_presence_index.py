@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from Services.StreamingPresenceIndex import STARTED, STOPPED, StreamingPresenceIndex
+
+GUILD = SimpleNamespace(id=1)
+
+
+def _member(member_id: int, *activities):
+    return SimpleNamespace(id=member_id, guild=GUILD, activities=list(activities))
+
+
+def _stream(title: str = "Speedrun"):
+    return discord.Streaming(name="Twitch", url="https://twitch.tv/someone", details=title)
+
+
+def test_start_and_stop_emit_one_event_each():
+    index = StreamingPresenceIndex()
+    events = []
+    index.subscribe(events.append)
+
+    index.update_member(_member(10, discord.Game("Chess")))
+    index.update_member(_member(10, _stream()))
+    index.update_member(_member(10, _stream("New title")))  # Still live
+    live = index.get(1, 10)
+    index.update_member(_member(10))
+
+    assert [event.kind for event in events] == [STARTED, STOPPED]
+    assert live.url == "https://twitch.tv/someone"
+    assert live.title == "New title"
+    assert not index.is_streaming(1, 10)
+
+
+def test_seed_guild_emits_only_differences():
+    index = StreamingPresenceIndex()
+    index.update_member(_member(10, _stream()))
+    index.update_member(_member(11, _stream()))
+    events = []
+    index.subscribe(events.append)
+
+    guild = SimpleNamespace(id=1, members=[_member(10, _stream()), _member(11), _member(12, _stream())])
+    emitted = index.seed_guild(guild)
+
+    assert emitted == 2
+    assert sorted((event.kind, event.member_id) for event in events) == [(STARTED, 12), (STOPPED, 11)]
+    assert set(index.streaming_members(1)) == {10, 12}
+    assert index.is_seeded(1)
+
+
+def test_failing_subscriber_does_not_block_others():
+    index = StreamingPresenceIndex()
+    seen = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    index.subscribe(broken)
+    index.subscribe(seen.append)
+    index.update_member(_member(10, _stream()))
+
+    assert [event.member_id for event in seen] == [10]
+
+
+def test_coroutine_subscribers_are_held_until_done():
+    index = StreamingPresenceIndex()
+    seen = []
+
+    async def notify(event):
+        await asyncio.sleep(0)
+        seen.append(event.member_id)
+
+    async def run():
+        index.subscribe(notify)
+        index.update_member(_member(10, _stream()))
+        pending = len(index.subscriber_tasks)
+        await asyncio.gather(*index.subscriber_tasks)
+        await asyncio.sleep(0)
+        return pending
+
+    assert asyncio.run(run()) == 1
+    assert seen == [10]
+    assert not index.subscriber_tasks
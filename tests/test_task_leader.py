@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from Services.SessionManager import get_session_manager
+from Services.TaskLeader import TaskLeader
+
+
+def _leader(process_index: int) -> TaskLeader:
+    leader = TaskLeader()
+    leader.process_index = process_index
+    leader.process_count = 2
+    leader.lease_ms = 300
+    leader.renew_interval = 0.1
+    return leader
+
+
+def _counting_task(running: list, name: str):
+    async def task():
+        running.append(name)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            running.remove(name)
+    return task
+
+
+def test_one_process_runs_a_global_task_and_hands_it_over(fake_redis):
+    async def scenario(redis):
+        running = []
+        first, second = _leader(0), _leader(1)
+        runners = [
+            asyncio.create_task(first.run("reminders", _counting_task(running, "first"))),
+            asyncio.create_task(second.run("reminders", _counting_task(running, "second"))),
+        ]
+        await asyncio.sleep(0.5)
+        before = list(running)
+
+        await first.cleanup()
+        await asyncio.sleep(0.3)
+        after = list(running)
+
+        await second.cleanup()
+        await asyncio.gather(*runners, return_exceptions=True)
+        return before, after, await redis.exists("task_leader:reminders")
+
+    before, after, key_left = asyncio.run(scenario(fake_redis))
+
+    assert len(before) == 1
+    assert after == ["second"]
+    assert not key_left
+
+
+def test_leader_stops_task_when_lease_is_taken(fake_redis):
+    async def scenario(redis):
+        running = []
+        leader = _leader(0)
+        runner = asyncio.create_task(leader.run("stats", _counting_task(running, "leader")))
+        await asyncio.sleep(0.2)
+        started = list(running)
+
+        # Another process holds the lease now (e.g. after a long pause here)
+        await redis.set("task_leader:stats", "someone-else", px=10000)
+        await asyncio.sleep(0.3)
+        stopped = list(running)
+
+        await leader.cleanup()
+        await asyncio.gather(runner, return_exceptions=True)
+        return started, stopped, leader.leases_lost
+
+    started, stopped, leases_lost = asyncio.run(scenario(fake_redis))
+
+    assert started == ["leader"]
+    assert stopped == []
+    assert leases_lost == 1
+
+
+def test_session_flush_skips_key_locked_by_another_process(fake_redis):
+    async def scenario(redis):
+        manager = get_session_manager()
+        key = manager._session_key(1, 2)
+        await redis.set(key, json.dumps({"dirty": True, "guild_exp": 0, "global_exp": 0}))
+        await redis.set(f"flush_lock:{key}", "other-process", ex=60)
+        return await manager._flush_session_key(key, only_dirty=True), await redis.get(f"flush_lock:{key}")
+
+    flushed, lock_owner = asyncio.run(scenario(fake_redis))
+
+    assert flushed is False
+    assert lock_owner == "other-process"
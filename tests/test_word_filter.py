@@ -0,0 +1,38 @@
+from utils.word_filter import WordFilter, build_pattern, compile_guild_word_filter, get_default_word_filter
+
+
+def test_trie_pattern_merges_common_prefixes():
+    assert build_pattern(["ab", "abc", "abd", "x"]) == "(?:ab[cd]?|x)"
+
+
+def test_substring_matching_is_case_insensitive():
+    word_filter = WordFilter(["Darn", "heck"])
+
+    assert word_filter.find("well DARNIT") == "darn"
+    assert word_filter.find("what the heck") == "heck"
+    assert word_filter.find("all good here") is None
+
+
+def test_word_boundary_and_leetspeak_options():
+    bounded = WordFilter(["ass"], word_boundary=True)
+    assert bounded.find("first class") is None
+    assert bounded.find("you ass!") == "ass"
+
+    leet = WordFilter(["hello"], leetspeak=True)
+    assert leet.find("H3LL0 there") == "hello"
+
+
+def test_leetspeak_keeps_trailing_punctuation_with_word_boundary():
+    word_filter = WordFilter(["bad", "shit"], word_boundary=True, leetspeak=True)
+
+    assert word_filter.find("that was bad!") == "bad"
+    assert word_filter.find("$h!t happens") == "shit"
+    assert word_filter.find("badly") is None
+
+
+def test_guild_filter_settings():
+    assert compile_guild_word_filter({"enabled": False, "words": ["gosh"]}) is get_default_word_filter()
+
+    guild_filter = compile_guild_word_filter({"words": ["gosh"], "word_boundary": True})
+    assert guild_filter.find("oh gosh") == "gosh"
+    assert guild_filter.find("goshawk") is None
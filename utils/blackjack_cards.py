@@ -0,0 +1,95 @@
+#! /usr/bin/python3.10
+"""
+Compact card encoding for blackjack.
+
+Cards are encoded as a single integer code in the range 0-51:
+    code = rank_index * 4 + suit_index
+
+Everything a hand evaluator needs (blackjack points, display string, rank)
+is precomputed into lookup tables so hot paths never parse card strings.
+Live games keep their human-readable string cards and use CARD_POINTS for
+evaluation; the persistent shoe and the batch simulator work on codes.
+"""
+
+from typing import Iterable, List, Tuple
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['♠', '♥', '♦', '♣']
+
+DECK_SIZE = len(RANKS) * len(SUITS)
+ACE_RANK_INDEX = RANKS.index('A')
+
+# code -> display string (e.g. 0 -> "2♠", 51 -> "A♣")
+CARD_STRINGS: Tuple[str, ...] = tuple(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+
+# display string -> code
+CARD_CODES = {card: code for code, card in enumerate(CARD_STRINGS)}
+
+# Points per rank index with Aces counted as 1 (hard value)
+RANK_POINTS: Tuple[int, ...] = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1)
+
+# code -> hard points
+CODE_POINTS: Tuple[int, ...] = tuple(RANK_POINTS[code // 4] for code in range(DECK_SIZE))
+
+# display string -> hard points (used by live games that hold string cards)
+CARD_POINTS = {card: CODE_POINTS[code] for card, code in CARD_CODES.items()}
+
+
+def encode_card(card: str) -> int:
+    """Convert a display string like "K♥" into its integer code."""
+    return CARD_CODES[card]
+
+
+def decode_card(code: int) -> str:
+    """Convert an integer card code back into its display string."""
+    return CARD_STRINGS[code]
+
+
+def new_shoe_codes(num_decks: int) -> bytearray:
+    """Return an unshuffled shoe of card codes, one byte per card."""
+    return bytearray(range(DECK_SIZE)) * num_decks
+
+
+def blackjack_value(hard_total: int, has_ace: bool) -> Tuple[int, bool]:
+    """
+    Resolve a hard total into the best blackjack value.
+
+    Returns (value, is_soft) where is_soft means one Ace is counted as 11.
+    """
+    if has_ace and hard_total <= 11:
+        return hard_total + 10, True
+    return hard_total, False
+
+
+def evaluate_hand(hand: Iterable[str]) -> Tuple[int, bool]:
+    """
+    Evaluate a hand of string cards using the CARD_POINTS lookup table.
+
+    Returns (value, is_soft) with the same semantics as
+    BlackjackGame.calculate_hand_value.
+    """
+    hard_total = 0
+    has_ace = False
+    for card in hand:
+        points = CARD_POINTS[card]
+        hard_total += points
+        if points == 1:
+            has_ace = True
+    return blackjack_value(hard_total, has_ace)
+
+
+def evaluate_codes(codes: Iterable[int]) -> Tuple[int, bool]:
+    """Evaluate a hand of integer card codes. Returns (value, is_soft)."""
+    hard_total = 0
+    has_ace = False
+    for code in codes:
+        points = CODE_POINTS[code]
+        hard_total += points
+        if points == 1:
+            has_ace = True
+    return blackjack_value(hard_total, has_ace)
+
+
+def decode_hand(codes: Iterable[int]) -> List[str]:
+    """Convert a sequence of card codes into display strings."""
+    return [CARD_STRINGS[code] for code in codes]
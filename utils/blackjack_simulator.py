@@ -0,0 +1,432 @@
+#! /usr/bin/python3.10
+"""
+Batch Blackjack Simulator
+
+Plays large numbers of hands with basic strategy against the house rules used
+by Views/Blackjack_View (dealer peeks for blackjack, dealer stands on all 17s,
+one split, double on any two cards, late surrender, no insurance) and prices
+every outcome with BlackjackGame's own payout code. Used to measure the house
+edge for payout tuning and to catch regressions in game or payout logic.
+
+Hands are simulated in numpy batches: every hand in a batch advances one
+decision per step using the precomputed strategy tables, so a million hands
+take a few seconds instead of minutes.
+
+Usage:
+    python -m utils.blackjack_simulator --hands 1000000 --bet 100 --decks 6
+"""
+
+import argparse
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from Entities.BlackjackGame import BlackjackGame
+from utils.blackjack_cards import CODE_POINTS, DECK_SIZE, decode_hand
+from utils.blackjack_strategy import (
+    ACTIONS, DOUBLE, HIT, MAX_CARD_VALUE, MAX_TOTAL, PAIR_TABLE, SPLIT, STAND, STRATEGY_TABLE, SURRENDER,
+    get_basic_strategy_action
+)
+
+# Cards reserved per hand; hands needing more reuse the last card (vanishingly rare)
+WINDOW = 16
+
+# Hand results, mirroring BlackjackGame.determine_winner_for_hand
+RESULTS = ("player_blackjack", "player_win", "push", "dealer_win")
+BLACKJACK, WIN, PUSH, LOSS = range(4)
+
+DEFAULT_RULES = {
+    "allow_split": True,
+    "allow_surrender": True,
+    "allow_double_after_split": True,
+}
+
+_CODE_POINTS = np.array(CODE_POINTS, dtype=np.int16)
+
+# STRATEGY_ACTIONS[total, soft, dealer, can_double, can_surrender] -> action code
+_STRATEGY_ACTIONS = np.array(
+    [[[[[cell[0] for cell in surrender] for surrender in double] for double in dealer] for dealer in soft]
+     for soft in STRATEGY_TABLE],
+    dtype=np.int8
+)
+
+# PAIR_ACTIONS[pair_value, dealer] -> SPLIT, or -1 to fall through to the regular table
+_PAIR_ACTIONS = np.array(
+    [[cell[0] if cell is not None else -1 for cell in row] for row in PAIR_TABLE],
+    dtype=np.int8
+)
+
+
+def _hand_value(hard, has_ace):
+    """Vectorized blackjack_value: returns (value, is_soft) arrays."""
+    soft = has_ace & (hard <= 11)
+    return hard + soft * 10, soft
+
+
+def _card_value(points):
+    """Blackjack points (Ace = 1) to strategy card value (Ace = 11)."""
+    return np.where(points == 1, 11, points)
+
+
+def _payout_tables(bet: int) -> tuple:
+    """
+    Price every outcome with BlackjackGame's payout code.
+
+    Returns (returns, surrender_return) where returns[doubled][result] is the
+    amount credited back to the player for a hand staked at bet * (1 + doubled).
+    """
+    returns = np.array(
+        [[BlackjackGame._calculate_hand_payout(bet * (1 + doubled), winner)[0] for winner in RESULTS]
+         for doubled in (0, 1)],
+        dtype=np.int64
+    )
+
+    surrendered = BlackjackGame(num_decks=1)
+    surrendered.surrendered = True
+    surrender_return, _, _ = surrendered.calculate_total_payout(bet)
+
+    return returns, surrender_return
+
+
+def deal_windows(rng: np.random.Generator, num_hands: int, num_decks: int, penetration: float) -> np.ndarray:
+    """
+    Deal card codes for a batch of hands from freshly shuffled shoes.
+
+    Each shoe is shuffled, cut at the penetration point, and split into
+    consecutive WINDOW-sized runs of cards, one run per hand.
+
+    Returns:
+        uint8 array of shape (num_hands, WINDOW)
+    """
+    usable = int(num_decks * DECK_SIZE * penetration)
+    windows_per_shoe = max(1, usable // WINDOW)
+    num_shoes = math.ceil(num_hands / windows_per_shoe)
+
+    shoes = np.tile(np.arange(DECK_SIZE, dtype=np.uint8), (num_shoes, num_decks))
+    shoes = rng.permuted(shoes, axis=1)
+    if shoes.shape[1] < windows_per_shoe * WINDOW:
+        # Tiny shoes: allow windows to run past the cut card
+        shoes = np.concatenate([shoes] * math.ceil(windows_per_shoe * WINDOW / shoes.shape[1]), axis=1)
+    return shoes[:, :windows_per_shoe * WINDOW].reshape(-1, WINDOW)[:num_hands]
+
+
+def play_batch(cards: np.ndarray, bet: int, rules: Optional[dict] = None) -> dict:
+    """
+    Play one hand per row of card codes and settle them.
+
+    Args:
+        cards: uint8 card codes of shape (n, WINDOW), dealt in order
+        bet: Initial bet per hand
+        rules: Table rules (see DEFAULT_RULES)
+
+    Returns:
+        Dict of per-hand numpy arrays: net, staked, blackjack, doubled, split,
+        surrendered, results (n, 2; -1 for unused split slot), overflow
+    """
+    rules = {**DEFAULT_RULES, **(rules or {})}
+    n = cards.shape[0]
+    rows_all = np.arange(n)
+    points = _CODE_POINTS[cards]
+
+    # Player hands: two slots (main hand, split hand)
+    hard = np.zeros((n, 2), dtype=np.int16)
+    has_ace = np.zeros((n, 2), dtype=bool)
+    num_cards = np.zeros((n, 2), dtype=np.int8)
+    doubled = np.zeros((n, 2), dtype=bool)
+    busted = np.zeros((n, 2), dtype=bool)
+    is_split = np.zeros(n, dtype=bool)
+    surrendered = np.zeros(n, dtype=bool)
+    current = np.zeros(n, dtype=np.int8)
+    pointer = np.full(n, 4, dtype=np.int16)
+
+    def draw(rows):
+        idx = np.minimum(pointer[rows], WINDOW - 1)
+        pointer[rows] += 1
+        return points[rows, idx]
+
+    # Initial deal: player, dealer, player, dealer. Dealer shows the second card.
+    hard[:, 0] = points[:, 0] + points[:, 2]
+    has_ace[:, 0] = (points[:, 0] == 1) | (points[:, 2] == 1)
+    num_cards[:, 0] = 2
+    dealer_hard = points[:, 1] + points[:, 3]
+    dealer_ace = (points[:, 1] == 1) | (points[:, 3] == 1)
+    dealer_up = _card_value(points[:, 3])
+
+    player_blackjack = _hand_value(hard[:, 0], has_ace[:, 0])[0] == 21
+    dealer_blackjack = _hand_value(dealer_hard, dealer_ace)[0] == 21
+
+    # Dealer peeks: any natural ends the round before the player acts
+    active = ~(player_blackjack | dealer_blackjack)
+
+    while active.any():
+        rows = rows_all[active]
+        slot = current[rows]
+        value, soft = _hand_value(hard[rows, slot], has_ace[rows, slot])
+        two_cards = num_cards[rows, slot] == 2
+        first_action = two_cards & ~is_split[rows]
+
+        can_double = two_cards & (first_action | rules["allow_double_after_split"])
+        can_surrender = first_action & rules["allow_surrender"]
+        can_split = first_action & rules["allow_split"] & (points[rows, 0] == points[rows, 2])
+        pair_value = np.where(can_split, _card_value(points[rows, 0]), 0)
+
+        action = _STRATEGY_ACTIONS[value, soft.astype(np.int8), dealer_up[rows],
+                                   can_double.astype(np.int8), can_surrender.astype(np.int8)]
+        pair_action = _PAIR_ACTIONS[pair_value, dealer_up[rows]]
+        action = np.where(pair_action >= 0, pair_action, action)
+
+        finished = action == STAND
+
+        # Hit / Double: take one card
+        takes_card = (action == HIT) | (action == DOUBLE)
+        if takes_card.any():
+            hit_rows, hit_slot = rows[takes_card], slot[takes_card]
+            card = draw(hit_rows)
+            hard[hit_rows, hit_slot] += card
+            has_ace[hit_rows, hit_slot] |= card == 1
+            num_cards[hit_rows, hit_slot] += 1
+            doubled[hit_rows, hit_slot] |= action[takes_card] == DOUBLE
+            new_value = _hand_value(hard[hit_rows, hit_slot], has_ace[hit_rows, hit_slot])[0]
+            busted[hit_rows, hit_slot] = new_value > 21
+            finished[takes_card] = (new_value > 21) | (action[takes_card] == DOUBLE)
+
+        # Split: second card moves to the split hand, then each hand gets one card
+        splits = action == SPLIT
+        if splits.any():
+            split_rows = rows[splits]
+            is_split[split_rows] = True
+            first, second = points[split_rows, 0], points[split_rows, 2]
+            main_card = draw(split_rows)
+            split_card = draw(split_rows)
+            hard[split_rows, 0] = first + main_card
+            has_ace[split_rows, 0] = (first == 1) | (main_card == 1)
+            hard[split_rows, 1] = second + split_card
+            has_ace[split_rows, 1] = (second == 1) | (split_card == 1)
+            num_cards[split_rows, 1] = 2
+
+        surrenders = action == SURRENDER
+        surrendered[rows[surrenders]] = True
+        finished |= surrenders
+
+        # A finished main hand hands over to the split hand; otherwise the round is over
+        done_rows = rows[finished]
+        moves_to_split = is_split[done_rows] & (current[done_rows] == 0)
+        current[done_rows[moves_to_split]] = 1
+        active[done_rows[~moves_to_split]] = False
+
+    # Dealer plays out against any hand still standing
+    live_hand = ~busted[:, 0] | (is_split & ~busted[:, 1])
+    dealer_plays = ~(player_blackjack | dealer_blackjack | surrendered) & live_hand
+    while True:
+        dealer_value = _hand_value(dealer_hard, dealer_ace)[0]
+        hitting = dealer_plays & (dealer_value < 17)
+        if not hitting.any():
+            break
+        hit_rows = rows_all[hitting]
+        card = draw(hit_rows)
+        dealer_hard[hit_rows] += card
+        dealer_ace[hit_rows] |= card == 1
+    dealer_busted = dealer_value > 21
+
+    # Settle each hand slot
+    results = np.full((n, 2), -1, dtype=np.int8)
+    for slot in (0, 1):
+        value = _hand_value(hard[:, slot], has_ace[:, slot])[0]
+        result = np.where(value > dealer_value, WIN, np.where(value < dealer_value, LOSS, PUSH))
+        result = np.where(dealer_busted, WIN, result)
+        if slot == 0:
+            result = np.where(player_blackjack & ~dealer_blackjack, BLACKJACK, result)
+            result = np.where(dealer_blackjack & ~player_blackjack, LOSS, result)
+            result = np.where(player_blackjack & dealer_blackjack, PUSH, result)
+        result = np.where(value > 21, LOSS, result)
+        in_play = np.ones(n, dtype=bool) if slot == 0 else is_split
+        results[in_play, slot] = result[in_play]
+
+    returns, surrender_return = _payout_tables(bet)
+    staked = np.where(doubled[:, 0], 2 * bet, bet) + np.where(is_split, np.where(doubled[:, 1], 2 * bet, bet), 0)
+    returned = returns[doubled[:, 0].astype(np.int8), results[:, 0]]
+    returned += np.where(is_split, returns[doubled[:, 1].astype(np.int8), np.maximum(results[:, 1], 0)], 0)
+    returned = np.where(surrendered, surrender_return, returned)
+
+    return {
+        "net": returned - staked,
+        "staked": staked,
+        "blackjack": player_blackjack,
+        "doubled": doubled.any(axis=1),
+        "split": is_split,
+        "surrendered": surrendered,
+        "results": results,
+        "overflow": pointer > WINDOW,
+    }
+
+
+def simulate(num_hands: int = 1_000_000, bet: int = 100, num_decks: int = 6, penetration: float = 0.75,
+             rules: Optional[dict] = None, batch_size: int = 250_000, seed: Optional[int] = None) -> dict:
+    """
+    Simulate num_hands rounds of basic-strategy play and report the house edge.
+
+    Args:
+        num_hands: Number of rounds to play
+        bet: Initial bet per round (use the live bet sizes, payouts round down)
+        num_decks: Decks per shoe
+        penetration: Fraction of the shoe dealt before reshuffling
+        rules: Table rules (see DEFAULT_RULES)
+        batch_size: Rounds simulated per numpy batch
+        seed: RNG seed for reproducible runs
+
+    Returns:
+        Dict with house edge (per initial bet), totals and outcome frequencies
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    totals = {"net": 0, "staked": 0, "blackjack": 0, "doubled": 0, "split": 0, "surrendered": 0}
+    result_counts = np.zeros(len(RESULTS), dtype=np.int64)
+    net_sq = 0.0
+
+    remaining = num_hands
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        cards = deal_windows(rng, size, num_decks, penetration)
+        batch = play_batch(cards, bet, rules)
+
+        totals["net"] += int(batch["net"].sum())
+        totals["staked"] += int(batch["staked"].sum())
+        for key in ("blackjack", "doubled", "split", "surrendered"):
+            totals[key] += int(batch[key].sum())
+        net_sq += float(np.square(batch["net"], dtype=np.float64).sum())
+        results = batch["results"][~batch["surrendered"]]
+        result_counts += np.bincount(results[results >= 0], minlength=len(RESULTS))
+
+        remaining -= size
+
+    elapsed = time.perf_counter() - start
+    mean = totals["net"] / num_hands
+    std_error = math.sqrt(max(net_sq / num_hands - mean * mean, 0.0) / num_hands)
+
+    return {
+        "hands": num_hands,
+        "bet": bet,
+        "num_decks": num_decks,
+        "house_edge": -mean / bet,
+        "house_edge_std_error": std_error / bet,
+        "player_net": totals["net"],
+        "total_staked": totals["staked"],
+        "blackjack_rate": totals["blackjack"] / num_hands,
+        "double_rate": totals["doubled"] / num_hands,
+        "split_rate": totals["split"] / num_hands,
+        "surrender_rate": totals["surrendered"] / num_hands,
+        "hand_results": {name: int(count) for name, count in zip(RESULTS, result_counts)},
+        "elapsed_seconds": elapsed,
+        "hands_per_second": num_hands / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def replay_with_game(codes, bet: int, rules: Optional[dict] = None) -> int:
+    """
+    Play one hand through the live BlackjackGame with a fixed card order.
+
+    Decisions come from get_basic_strategy_action and settlement from
+    calculate_total_payout, exactly as a player following the hints would
+    experience it. Returns the player's net result.
+    """
+    rules = {**DEFAULT_RULES, **(rules or {})}
+    game = BlackjackGame(num_decks=1)
+    game.deck = bytearray(reversed(bytes(codes)))  # deal_card pops from the end
+    game.deal_initial_hands()
+
+    if game.is_blackjack(game.player_hand) or game.is_blackjack(game.dealer_hand):
+        game.game_over = True
+
+    while not game.game_over:
+        hand = game.get_current_hand()
+        first_action = len(hand) == 2 and not game.is_split
+        strategy = get_basic_strategy_action(
+            hand,
+            game.dealer_hand[1],
+            can_double=len(hand) == 2 and (first_action or rules["allow_double_after_split"]),
+            can_split=first_action and rules["allow_split"] and game.can_split(),
+            can_surrender=first_action and rules["allow_surrender"] and game.can_surrender()
+        )
+        action = strategy["action"]
+        if action == ACTIONS[SPLIT]:
+            game.player_split()
+        elif action == ACTIONS[SURRENDER]:
+            game.player_surrender()
+        elif action == ACTIONS[DOUBLE]:
+            game.player_double_down_current()
+        elif action == ACTIONS[HIT]:
+            game.player_hit_current()
+        else:
+            game.player_stand_current()
+
+    natural = len(game.player_hand) == 2 and len(game.dealer_hand) == 2 and not game.is_split and (
+        game.is_blackjack(game.player_hand) or game.is_blackjack(game.dealer_hand))
+    if not game.surrendered and not natural:
+        main_busted = game.get_hand_value(game.player_hand) > 21
+        split_busted = game.is_split and game.get_hand_value(game.split_hand) > 21
+        if not main_busted or (game.is_split and not split_busted):
+            game.dealer_play()
+
+    total_won, _, _ = game.calculate_total_payout(bet)
+    staked = bet * (2 if game.doubled_down else 1)
+    if game.is_split:
+        staked += bet * (2 if game.split_hand_doubled else 1)
+    return total_won - staked
+
+
+def verify_against_game(num_hands: int = 10_000, bet: int = 100, num_decks: int = 6,
+                        rules: Optional[dict] = None, seed: Optional[int] = None) -> list:
+    """
+    Cross-check the vectorized engine against the live BlackjackGame.
+
+    Returns a list of mismatches as (cards, vectorized_net, game_net); an empty
+    list means the batch simulator and the game agree hand for hand.
+    """
+    rng = np.random.default_rng(seed)
+    cards = deal_windows(rng, num_hands, num_decks, 0.75)
+    batch = play_batch(cards, bet, rules)
+
+    mismatches = []
+    for row in np.flatnonzero(~batch["overflow"]):
+        expected = replay_with_game(cards[row], bet, rules)
+        if expected != int(batch["net"][row]):
+            mismatches.append((decode_hand(cards[row]), int(batch["net"][row]), expected))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate basic-strategy blackjack against the bot's house rules")
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--bet", type=int, default=100)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-split", action="store_true")
+    parser.add_argument("--no-surrender", action="store_true")
+    parser.add_argument("--verify", type=int, default=0, help="Replay N hands through BlackjackGame and compare")
+    args = parser.parse_args()
+
+    rules = {"allow_split": not args.no_split, "allow_surrender": not args.no_surrender}
+
+    if args.verify:
+        mismatches = verify_against_game(args.verify, args.bet, args.decks, rules, args.seed)
+        print(f"Verified {args.verify:,} hands against BlackjackGame: {len(mismatches)} mismatches")
+        for cards, vectorized, game in mismatches[:10]:
+            print(f"  {' '.join(cards)} -> simulator {vectorized:+}, game {game:+}")
+
+    stats = simulate(args.hands, args.bet, args.decks, args.penetration, rules, seed=args.seed)
+    print(f"Hands:          {stats['hands']:,} ({stats['hands_per_second']:,.0f} hands/s)")
+    print(f"House edge:     {stats['house_edge']:.4%} ± {stats['house_edge_std_error']:.4%}")
+    print(f"Player net:     {stats['player_net']:+,} on {stats['total_staked']:,} staked")
+    print(f"Blackjacks:     {stats['blackjack_rate']:.3%}")
+    print(f"Doubles:        {stats['double_rate']:.3%}")
+    print(f"Splits:         {stats['split_rate']:.3%}")
+    print(f"Surrenders:     {stats['surrender_rate']:.3%}")
+    print(f"Hand results:   {stats['hand_results']}")
+
+
+if __name__ == "__main__":
+    main()
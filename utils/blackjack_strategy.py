@@ -3,33 +3,36 @@
 Basic Strategy for Blackjack
 Provides mathematically optimal play recommendations based on player hand and dealer upcard.
 Based on standard basic strategy for dealer stands on 17 (S17).
+
+The strategy is precomputed once at import into lookup tables indexed by
+(player total, soft, dealer upcard, can double, can surrender) plus a small
+pair table indexed by (pair value, dealer upcard), so a recommendation is a
+couple of tuple lookups instead of a walk through the rule chain.
 """
 
+from typing import Optional, Tuple
+
+from utils.blackjack_cards import CARD_POINTS, evaluate_hand
+
+# Action codes shared with the batch simulator
+STAND, HIT, DOUBLE, SPLIT, SURRENDER = range(5)
+ACTIONS = ("Stand", "Hit", "Double", "Split", "Surrender")
+
+# Table bounds: totals 0-21 (busted hands always stand), upcards 2-11
+MAX_TOTAL = 21
+MAX_CARD_VALUE = 11
+
 
 def get_card_value(card: str) -> int:
     """Get the numeric value of a card"""
-    rank = card[:-1]  # Remove suit
-    if rank in ['J', 'Q', 'K']:
-        return 10
-    elif rank == 'A':
-        return 11
-    else:
-        return int(rank)
+    points = CARD_POINTS[card]
+    return 11 if points == 1 else points
 
 
 def is_soft_hand(hand: list) -> bool:
     """Check if hand is soft (contains Ace counted as 11)"""
-    has_ace = any(card[:-1] == 'A' for card in hand)
-    if not has_ace:
-        return False
-
-    # Calculate with Ace as 11
-    total = sum(get_card_value(card) for card in hand)
-    # Adjust for other Aces
-    ace_count = sum(1 for card in hand if card[:-1] == 'A')
-    total -= (ace_count - 1) * 10  # Convert extra Aces to 1
-
-    return total <= 21
+    _, is_soft = evaluate_hand(hand)
+    return is_soft
 
 
 def is_pair(hand: list) -> bool:
@@ -37,105 +40,73 @@ def is_pair(hand: list) -> bool:
     if len(hand) != 2:
         return False
 
-    rank1 = hand[0][:-1]
-    rank2 = hand[1][:-1]
-
-    # Same rank
-    if rank1 == rank2:
-        return True
-
-    # Both 10-value cards
-    if rank1 in ['10', 'J', 'Q', 'K'] and rank2 in ['10', 'J', 'Q', 'K']:
-        return True
-
-    return False
+    # Same rank, or both 10-value cards
+    return CARD_POINTS[hand[0]] == CARD_POINTS[hand[1]]
 
 
 def calculate_hand_value(hand: list) -> int:
     """Calculate the value of a hand"""
-    value = 0
-    aces = 0
-
-    for card in hand:
-        rank = card[:-1]
-        if rank in ['J', 'Q', 'K']:
-            value += 10
-        elif rank == 'A':
-            aces += 1
-            value += 11
-        else:
-            value += int(rank)
+    value, _ = evaluate_hand(hand)
+    return value
 
-    # Adjust for Aces
-    while value > 21 and aces > 0:
-        value -= 10
-        aces -= 1
 
-    return value
+def _pair_label(pair_value: int) -> str:
+    """Rank label used in split reasons ('A' for Aces, '10' for any ten-value card)"""
+    return 'A' if pair_value == 11 else str(pair_value)
 
 
-def get_basic_strategy_action(player_hand: list, dealer_upcard: str, can_double: bool = True, can_split: bool = True, can_surrender: bool = True) -> dict:
+def _decide_pair(pair_value: int, dealer_value: int) -> Optional[Tuple[int, str]]:
     """
-    Get the basic strategy recommendation for a blackjack hand.
-
-    Args:
-        player_hand: List of card strings (e.g., ["A♠", "K♥"])
-        dealer_upcard: Dealer's visible card (e.g., "7♣")
-        can_double: Whether double down is available
-        can_split: Whether split is available
-        can_surrender: Whether surrender is available
+    Pair splitting rules.
 
-    Returns:
-        Dictionary with 'action' and 'reason' keys
+    Returns (action, reason) when the pair should be split, or None to fall
+    through to the regular hand strategy.
     """
-    player_value = calculate_hand_value(player_hand)
-    dealer_value = get_card_value(dealer_upcard)
-    is_pair_hand = is_pair(player_hand) and can_split
-    is_soft = is_soft_hand(player_hand)
+    pair_rank = _pair_label(pair_value)
 
-    # Blackjack - always stand
-    if len(player_hand) == 2 and player_value == 21:
-        return {"action": "Stand", "reason": "You have Blackjack!"}
+    # Always split Aces and 8s
+    if pair_rank in ['A', '8']:
+        return SPLIT, f"Always split {pair_rank}s"
+
+    # Never split 5s and 10s
+    if pair_rank in ['5', '10']:
+        return None
 
-    # Pair splitting strategy
-    if is_pair_hand:
-        pair_rank = player_hand[0][:-1]
-        if pair_rank in ['10', 'J', 'Q', 'K']:
-            pair_rank = '10'
+    # Split 2s, 3s, 7s vs 2-7
+    if pair_rank in ['2', '3', '7'] and 2 <= dealer_value <= 7:
+        return SPLIT, f"Split {pair_rank}s vs {dealer_value}"
 
-        # Always split Aces and 8s
-        if pair_rank in ['A', '8']:
-            return {"action": "Split", "reason": f"Always split {pair_rank}s"}
+    # Split 4s vs 5-6
+    if pair_rank == '4' and 5 <= dealer_value <= 6:
+        return SPLIT, "Split 4s vs dealer 5-6"
 
-        # Never split 5s and 10s
-        if pair_rank in ['5', '10']:
-            pass  # Fall through to hard hand strategy
+    # Split 6s vs 2-6
+    if pair_rank == '6' and 2 <= dealer_value <= 6:
+        return SPLIT, "Split 6s vs dealer 2-6"
 
-        # Split 2s, 3s, 7s vs 2-7
-        elif pair_rank in ['2', '3', '7'] and 2 <= dealer_value <= 7:
-            return {"action": "Split", "reason": f"Split {pair_rank}s vs {dealer_value}"}
+    # Split 9s vs 2-9 except 7
+    if pair_rank == '9' and (2 <= dealer_value <= 6 or 8 <= dealer_value <= 9):
+        return SPLIT, "Split 9s vs dealer 2-6, 8-9"
 
-        # Split 4s vs 5-6
-        elif pair_rank == '4' and 5 <= dealer_value <= 6:
-            return {"action": "Split", "reason": "Split 4s vs dealer 5-6"}
+    return None
 
-        # Split 6s vs 2-6
-        elif pair_rank == '6' and 2 <= dealer_value <= 6:
-            return {"action": "Split", "reason": "Split 6s vs dealer 2-6"}
 
-        # Split 9s vs 2-9 except 7
-        elif pair_rank == '9' and (2 <= dealer_value <= 6 or 8 <= dealer_value <= 9):
-            return {"action": "Split", "reason": "Split 9s vs dealer 2-6, 8-9"}
+def _decide_hand(player_value: int, is_soft: bool, dealer_value: int, can_double: bool, can_surrender: bool) -> Tuple[int, str]:
+    """
+    Regular (non-split) strategy rules.
 
+    can_surrender must already account for the hand having exactly two cards.
+    Returns (action, reason).
+    """
     # Surrender strategy (late surrender)
-    if can_surrender and len(player_hand) == 2:
+    if can_surrender:
         # Surrender 16 vs 9, 10, A
         if player_value == 16 and dealer_value >= 9 and not is_soft:
-            return {"action": "Surrender", "reason": "Surrender hard 16 vs 9, 10, or Ace"}
+            return SURRENDER, "Surrender hard 16 vs 9, 10, or Ace"
 
         # Surrender 15 vs 10
         if player_value == 15 and dealer_value == 10 and not is_soft:
-            return {"action": "Surrender", "reason": "Surrender hard 15 vs 10"}
+            return SURRENDER, "Surrender hard 15 vs 10"
 
     # Soft hand strategy
     if is_soft and player_value < 21:
@@ -143,84 +114,176 @@ def get_basic_strategy_action(player_hand: list, dealer_upcard: str, can_double:
 
         # Soft 19-21: Always stand
         if soft_value >= 19:
-            return {"action": "Stand", "reason": f"Stand on soft {soft_value}"}
+            return STAND, f"Stand on soft {soft_value}"
 
         # Soft 18: Stand vs 2-8, Hit vs 9-A
         if soft_value == 18:
             if can_double and 3 <= dealer_value <= 6:
-                return {"action": "Double", "reason": "Double soft 18 vs 3-6"}
+                return DOUBLE, "Double soft 18 vs 3-6"
             elif dealer_value >= 9:
-                return {"action": "Hit", "reason": "Hit soft 18 vs 9-A"}
+                return HIT, "Hit soft 18 vs 9-A"
             else:
-                return {"action": "Stand", "reason": "Stand on soft 18"}
+                return STAND, "Stand on soft 18"
 
         # Soft 17: Double vs 3-6, otherwise hit
         if soft_value == 17:
             if can_double and 3 <= dealer_value <= 6:
-                return {"action": "Double", "reason": "Double soft 17 vs 3-6"}
+                return DOUBLE, "Double soft 17 vs 3-6"
             else:
-                return {"action": "Hit", "reason": "Hit soft 17"}
+                return HIT, "Hit soft 17"
 
         # Soft 15-16: Double vs 4-6, otherwise hit
         if soft_value in [15, 16]:
             if can_double and 4 <= dealer_value <= 6:
-                return {"action": "Double", "reason": f"Double soft {soft_value} vs 4-6"}
+                return DOUBLE, f"Double soft {soft_value} vs 4-6"
             else:
-                return {"action": "Hit", "reason": f"Hit soft {soft_value}"}
+                return HIT, f"Hit soft {soft_value}"
 
         # Soft 13-14: Double vs 5-6, otherwise hit
         if soft_value in [13, 14]:
             if can_double and 5 <= dealer_value <= 6:
-                return {"action": "Double", "reason": f"Double soft {soft_value} vs 5-6"}
+                return DOUBLE, f"Double soft {soft_value} vs 5-6"
             else:
-                return {"action": "Hit", "reason": f"Hit soft {soft_value}"}
+                return HIT, f"Hit soft {soft_value}"
 
     # Hard hand strategy
     # 17-21: Always stand
     if player_value >= 17:
-        return {"action": "Stand", "reason": f"Stand on {player_value}"}
+        return STAND, f"Stand on {player_value}"
 
     # 13-16: Stand vs 2-6, Hit vs 7-A
     if 13 <= player_value <= 16:
         if 2 <= dealer_value <= 6:
-            return {"action": "Stand", "reason": f"Stand on {player_value} vs weak dealer"}
+            return STAND, f"Stand on {player_value} vs weak dealer"
         else:
-            return {"action": "Hit", "reason": f"Hit {player_value} vs strong dealer"}
+            return HIT, f"Hit {player_value} vs strong dealer"
 
     # 12: Stand vs 4-6, Hit otherwise
     if player_value == 12:
         if 4 <= dealer_value <= 6:
-            return {"action": "Stand", "reason": "Stand on 12 vs 4-6"}
+            return STAND, "Stand on 12 vs 4-6"
         else:
-            return {"action": "Hit", "reason": "Hit 12 vs 2-3 or 7-A"}
+            return HIT, "Hit 12 vs 2-3 or 7-A"
 
     # 11: Always double if possible, otherwise hit
     if player_value == 11:
         if can_double:
-            return {"action": "Double", "reason": "Always double on 11"}
+            return DOUBLE, "Always double on 11"
         else:
-            return {"action": "Hit", "reason": "Hit on 11 (can't double)"}
+            return HIT, "Hit on 11 (can't double)"
 
     # 10: Double vs 2-9, otherwise hit
     if player_value == 10:
         if can_double and dealer_value <= 9:
-            return {"action": "Double", "reason": "Double 10 vs 2-9"}
+            return DOUBLE, "Double 10 vs 2-9"
         else:
-            return {"action": "Hit", "reason": "Hit on 10"}
+            return HIT, "Hit on 10"
 
     # 9: Double vs 3-6, otherwise hit
     if player_value == 9:
         if can_double and 3 <= dealer_value <= 6:
-            return {"action": "Double", "reason": "Double 9 vs 3-6"}
+            return DOUBLE, "Double 9 vs 3-6"
         else:
-            return {"action": "Hit", "reason": "Hit on 9"}
+            return HIT, "Hit on 9"
 
     # 5-8: Always hit
-    if player_value <= 8:
-        return {"action": "Hit", "reason": f"Always hit on {player_value}"}
+    return HIT, f"Always hit on {player_value}"
+
+
+def _build_strategy_table() -> tuple:
+    """STRATEGY_TABLE[total][soft][dealer][can_double][can_surrender] -> (action, reason)"""
+    return tuple(
+        tuple(
+            tuple(
+                tuple(
+                    tuple(
+                        _decide_hand(total, bool(soft), dealer, bool(can_double), bool(can_surrender))
+                        for can_surrender in (0, 1)
+                    )
+                    for can_double in (0, 1)
+                )
+                for dealer in range(MAX_CARD_VALUE + 1)
+            )
+            for soft in (0, 1)
+        )
+        for total in range(MAX_TOTAL + 1)
+    )
+
+
+def _build_pair_table() -> tuple:
+    """PAIR_TABLE[pair_value][dealer] -> (action, reason) or None"""
+    return tuple(
+        tuple(
+            _decide_pair(pair_value, dealer) if pair_value >= 2 else None
+            for dealer in range(MAX_CARD_VALUE + 1)
+        )
+        for pair_value in range(MAX_CARD_VALUE + 1)
+    )
+
+
+STRATEGY_TABLE = _build_strategy_table()
+PAIR_TABLE = _build_pair_table()
+
+
+def lookup_action(player_value: int, is_soft: bool, pair_value: int, dealer_value: int,
+                  can_double: bool = True, can_surrender: bool = True) -> Tuple[int, str]:
+    """
+    Look up the basic strategy decision from the precomputed tables.
+
+    Args:
+        player_value: Best hand total
+        is_soft: Whether an Ace is being counted as 11
+        pair_value: Card value of a splittable pair (2-11), or 0 if not a splittable pair
+        dealer_value: Dealer upcard value (2-11)
+        can_double: Whether double down is available
+        can_surrender: Whether surrender is available (two-card hands only)
+
+    Returns:
+        Tuple of (action code, reason)
+    """
+    if player_value > MAX_TOTAL:
+        return STAND, f"Stand on {player_value}"
+    if pair_value:
+        split = PAIR_TABLE[pair_value][dealer_value]
+        if split is not None:
+            return split
+    return STRATEGY_TABLE[player_value][is_soft][dealer_value][can_double][can_surrender]
+
+
+def get_basic_strategy_action(player_hand: list, dealer_upcard: str, can_double: bool = True, can_split: bool = True, can_surrender: bool = True) -> dict:
+    """
+    Get the basic strategy recommendation for a blackjack hand.
+
+    Args:
+        player_hand: List of card strings (e.g., ["A♠", "K♥"])
+        dealer_upcard: Dealer's visible card (e.g., "7♣")
+        can_double: Whether double down is available
+        can_split: Whether split is available
+        can_surrender: Whether surrender is available
+
+    Returns:
+        Dictionary with 'action' and 'reason' keys
+    """
+    player_value, is_soft = evaluate_hand(player_hand)
+    two_cards = len(player_hand) == 2
+
+    # Blackjack - always stand
+    if two_cards and player_value == 21:
+        return {"action": "Stand", "reason": "You have Blackjack!"}
 
-    # Default: Hit
-    return {"action": "Hit", "reason": "Default action"}
+    pair_value = 0
+    if can_split and is_pair(player_hand):
+        pair_value = get_card_value(player_hand[0])
+
+    action, reason = lookup_action(
+        player_value,
+        is_soft,
+        pair_value,
+        get_card_value(dealer_upcard),
+        can_double,
+        can_surrender and two_cards
+    )
+    return {"action": ACTIONS[action], "reason": reason}
 
 
 def format_strategy_hint(player_hand: list, dealer_upcard: str, can_double: bool = True, can_split: bool = True, can_surrender: bool = True) -> str:
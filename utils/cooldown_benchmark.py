@@ -0,0 +1,101 @@
+"""
+Cooldown tracking benchmark.
+
+Simulates message traffic from a large set of active members and compares:
+
+- legacy:  the old LevelingSystem approach, a dict of "guild_user" string keys
+           to datetime objects, scanned for expired entries on every check
+- service: CooldownService (integer tuple keys, monotonic deadlines,
+           timing-wheel expiry)
+
+The legacy scan is O(active users) per check, so it is timed on a sample of
+checks and reported per operation.
+
+Usage:
+    python -m utils.cooldown_benchmark --users 100000 --checks 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from Services.CooldownService import XP_BUCKET, CooldownService
+
+GUILDS = 50
+COOLDOWN_SECONDS = 3
+
+
+class LegacyCooldowns:
+    """The per-message scan previously done in LevelingSystem.is_user_on_cooldown."""
+
+    def __init__(self):
+        self.user_cooldowns = {}
+
+    def is_user_on_cooldown(self, user_id, guild_id, cooldown_seconds):
+        now = datetime.now()
+        expired_keys = [
+            key for key, timestamp in self.user_cooldowns.items()
+            if (now - timestamp).total_seconds() > cooldown_seconds
+        ]
+        for key in expired_keys:
+            del self.user_cooldowns[key]
+
+        cooldown_key = f"{guild_id}_{user_id}"
+        if cooldown_key not in self.user_cooldowns:
+            return False
+        return (now - self.user_cooldowns[cooldown_key]).total_seconds() < cooldown_seconds
+
+    def set_user_cooldown(self, user_id, guild_id):
+        self.user_cooldowns[f"{guild_id}_{user_id}"] = datetime.now()
+
+
+def make_traffic(users: int, checks: int) -> list:
+    """Random (guild_id, user_id) pairs drawn from the active member set."""
+    members = [(random.randrange(GUILDS), 10_000_000 + i) for i in range(users)]
+    return [random.choice(members) for _ in range(checks)], members
+
+
+def run_legacy(members, traffic) -> float:
+    legacy = LegacyCooldowns()
+    for guild_id, user_id in members:
+        legacy.set_user_cooldown(user_id, guild_id)
+
+    started = time.perf_counter()
+    for guild_id, user_id in traffic:
+        if not legacy.is_user_on_cooldown(user_id, guild_id, COOLDOWN_SECONDS):
+            legacy.set_user_cooldown(user_id, guild_id)
+    return (time.perf_counter() - started) / len(traffic)
+
+
+def run_service(members, traffic) -> float:
+    service = CooldownService()
+    for guild_id, user_id in members:
+        service.trigger(XP_BUCKET, guild_id, user_id, COOLDOWN_SECONDS)
+
+    started = time.perf_counter()
+    for guild_id, user_id in traffic:
+        service.try_acquire(XP_BUCKET, guild_id, user_id, COOLDOWN_SECONDS)
+    return (time.perf_counter() - started) / len(traffic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-member cooldown tracking")
+    parser.add_argument("--users", type=int, default=100_000, help="Active members holding a cooldown")
+    parser.add_argument("--checks", type=int, default=1_000_000, help="Cooldown checks for the service")
+    parser.add_argument("--legacy-checks", type=int, default=100, help="Cooldown checks for the legacy scan")
+    args = parser.parse_args()
+
+    traffic, members = make_traffic(args.users, args.checks)
+
+    service_per_op = run_service(members, traffic)
+    legacy_per_op = run_legacy(members, traffic[:args.legacy_checks])
+
+    print(f"{args.users:,} active users")
+    print(f"{'strategy':<10} {'us/check':>12} {'checks/s':>14}")
+    print(f"{'legacy':<10} {legacy_per_op * 1e6:>12.2f} {1 / legacy_per_op:>14,.0f}")
+    print(f"{'service':<10} {service_per_op * 1e6:>12.2f} {1 / service_per_op:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
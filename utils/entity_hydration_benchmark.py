@@ -0,0 +1,104 @@
+"""
+Entity hydration benchmark.
+
+Compares the ways a DAO can turn GuildUsers rows into entities:
+
+- legacy:   dict(zip(columns, row)) + from_dict into a __dict__-backed entity
+            (how GuildUser was stored before it was slotted)
+- init:     GuildUser(**kwargs) through the property setters, as
+            get_guild_users used to do
+- from_row: the cached per-shape hydrator on the slotted GuildUser
+
+Usage:
+    python -m utils.entity_hydration_benchmark --rows 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from Entities.BaseEntity import BaseEntity
+from Entities.GuildUser import GuildUser
+
+COLUMNS = (
+    'user_id', 'guild_id', 'name', 'nickname', 'level',
+    'streak', 'highest_streak', 'exp', 'exp_gained', 'exp_lost', 'currency',
+    'slots_free_spins_remaining', 'slots_locked_bet_amount', 'slots_bonus_total_won',
+    'messages_sent', 'reactions_sent', 'joined_at', 'last_active',
+    'daily', 'last_daily', 'is_active'
+)
+
+# Same fields as GuildUser, stored in a per-instance __dict__
+DictGuildUser = type('DictGuildUser', (BaseEntity,), {})
+
+
+def make_rows(count: int) -> list:
+    """Build synthetic GuildUsers rows shaped like the real SELECT."""
+    now = datetime.now()
+    return [
+        (100000 + i, 1, f"user{i}", f"nick{i}", i % 80,
+         i % 30, i % 60, i * 37, i * 40, i * 3, 1000 + i,
+         0, 0, 0,
+         i * 5, i * 2, now, now,
+         i % 2, None, 1)
+        for i in range(count)
+    ]
+
+
+def hydrate_legacy(rows):
+    return [DictGuildUser.from_dict(dict(zip(COLUMNS, row))) for row in rows]
+
+
+def hydrate_init(rows):
+    return [GuildUser(**dict(zip(COLUMNS, row))) for row in rows]
+
+
+def hydrate_from_row(rows):
+    hydrate = GuildUser.row_hydrator(COLUMNS)
+    return [hydrate(row) for row in rows]
+
+
+def measure(name: str, func, rows) -> dict:
+    """Time one hydration strategy and measure memory retained by its entities."""
+    gc.collect()
+    started = time.perf_counter()
+    func(rows)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    entities = func(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+
+    return {
+        "name": name,
+        "seconds": elapsed,
+        "rows_per_sec": len(rows) / elapsed,
+        "bytes_per_entity": retained / len(rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GuildUser row hydration")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows to hydrate per strategy")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = [
+        measure("legacy", hydrate_legacy, rows),
+        measure("init", hydrate_init, rows),
+        measure("from_row", hydrate_from_row, rows),
+    ]
+
+    print(f"{args.rows:,} rows")
+    print(f"{'strategy':<10} {'time (s)':>10} {'rows/s':>12} {'bytes/entity':>14}")
+    for result in results:
+        print(f"{result['name']:<10} {result['seconds']:>10.3f} {result['rows_per_sec']:>12,.0f} {result['bytes_per_entity']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Table-driven XP level curves.
+
+A guild's leveling settings (exp_formula, base_exp, exp_growth_factor,
+max_level) are compiled once into a table of cumulative XP thresholds, so
+level lookups are a bisect instead of formula math on every message.
+
+The curve settings only apply once a guild opts in with custom_level_curve.
+Older dashboards saved them (with max_level 100) without the bot ever using
+them, so every other guild keeps the default, uncapped curve.
+
+    curve = level_curve_for_config(config)
+    level = curve.level_for_exp(guild_user.exp)
+    remaining = curve.exp_to_next_level(guild_user.exp)
+
+Formulas (XP needed to go from level L-1 to L):
+- linear:      base_exp
+- quadratic:   base_exp * (2L - 1), i.e. base_exp * L^2 in total. With the
+               default base_exp of 100 this is the original
+               floor(sqrt(exp / 100)) curve
+- exponential: base_exp * exp_growth_factor^(L - 1)
+
+Curves are cached by their parameters, so every guild on the same settings
+shares one table. Global levels always use the default curve.
+"""
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from logger import AppLogger
+from models.base_models import ExpFormula
+
+logger = AppLogger(__name__).get_logger()
+
+DEFAULT_FORMULA = ExpFormula.QUADRATIC
+DEFAULT_BASE_EXP = 100
+DEFAULT_GROWTH_FACTOR = 1.2
+
+# Used when a guild hasn't configured max_level (quadratic: 10 billion XP)
+DEFAULT_MAX_LEVEL = 10000
+
+# Exp columns are BIGINT; tables stop at the first level past this
+MAX_EXP = 2 ** 63 - 1
+
+
+@dataclass(frozen=True, eq=False)
+class LevelCurve:
+    """Cumulative XP thresholds for every level of one curve."""
+
+    formula: ExpFormula
+    base_exp: int
+    growth_factor: float
+    thresholds: array  # thresholds[level] = total XP needed to reach level
+
+    @property
+    def max_level(self) -> int:
+        return len(self.thresholds) - 1
+
+    def level_for_exp(self, exp: int) -> int:
+        """Get the level reached with this much XP."""
+        if exp <= 0:
+            return 0
+        if exp >= MAX_EXP:
+            return self.max_level
+        return bisect_right(self.thresholds, exp) - 1
+
+    def exp_for_level(self, level: int) -> int:
+        """Get the total XP needed to reach a level (capped at max_level)."""
+        return self.thresholds[max(0, min(level, self.max_level))]
+
+    def exp_to_next_level(self, exp: int) -> int:
+        """Get the XP still needed for the next level; 0 at max_level."""
+        level = self.level_for_exp(exp)
+        if level >= self.max_level:
+            return 0
+        return self.thresholds[level + 1] - max(exp, 0)
+
+
+def _level_cost(formula: ExpFormula, base_exp: int, growth_factor: float, level: int) -> float:
+    if formula == ExpFormula.LINEAR:
+        return base_exp
+    if formula == ExpFormula.EXPONENTIAL:
+        return base_exp * growth_factor ** (level - 1)
+    return base_exp * (2 * level - 1)
+
+
+@lru_cache(maxsize=64)
+def get_level_curve(
+    formula: ExpFormula = DEFAULT_FORMULA,
+    base_exp: int = DEFAULT_BASE_EXP,
+    growth_factor: float = DEFAULT_GROWTH_FACTOR,
+    max_level: int = DEFAULT_MAX_LEVEL
+) -> LevelCurve:
+    """
+    Build (or reuse) the threshold table for a set of curve parameters.
+
+    Returns:
+        LevelCurve covering levels 0..max_level, or fewer if the XP needed
+        would overflow MAX_EXP
+    """
+    thresholds = array('q', [0])
+    total = 0
+    for level in range(1, max_level + 1):
+        try:
+            total += max(1, round(_level_cost(formula, base_exp, growth_factor, level)))
+        except OverflowError:
+            break
+        if total > MAX_EXP:
+            break
+        thresholds.append(total)
+
+    return LevelCurve(formula, base_exp, growth_factor, thresholds)
+
+
+def get_default_level_curve() -> LevelCurve:
+    """Get the default curve, used for global levels."""
+    return get_level_curve(DEFAULT_FORMULA, DEFAULT_BASE_EXP, DEFAULT_GROWTH_FACTOR, DEFAULT_MAX_LEVEL)
+
+
+def level_curve_for_config(config: Optional[dict]) -> LevelCurve:
+    """
+    Get the curve for a guild's leveling config (as returned by ConfigCache).
+
+    Guilds without custom_level_curve get the default curve. Otherwise
+    missing or invalid settings fall back to the defaults; a missing or
+    None max_level means no cap.
+    """
+    if not config or not config.get("custom_level_curve"):
+        return get_default_level_curve()
+
+    try:
+        formula = ExpFormula(config.get("exp_formula") or DEFAULT_FORMULA)
+        base_exp = int(config.get("base_exp") or DEFAULT_BASE_EXP)
+        growth_factor = float(config.get("exp_growth_factor") or DEFAULT_GROWTH_FACTOR)
+        max_level = config.get("max_level")
+        max_level = DEFAULT_MAX_LEVEL if max_level is None else int(max_level)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Invalid level curve settings, using defaults: {e}")
+        return get_default_level_curve()
+
+    if base_exp < 1 or growth_factor < 1.0 or max_level < 1:
+        logger.warning(
+            f"Out-of-range level curve settings (base_exp={base_exp}, "
+            f"exp_growth_factor={growth_factor}, max_level={max_level}), using defaults"
+        )
+        return get_default_level_curve()
+
+    if formula != ExpFormula.EXPONENTIAL:
+        # Only the exponential curve uses the growth factor; don't build duplicate tables
+        growth_factor = DEFAULT_GROWTH_FACTOR
+
+    return get_level_curve(formula, base_exp, growth_factor, max_level)
@@ -0,0 +1,450 @@
+"""
+Message pipeline benchmark.
+
+Replays synthetic guild traffic through the real on_message listeners, the
+same set the bot dispatches for every message:
+
+- on_message:      Cogs/On_Message (config, word filter, daily reward check)
+- leveling:        LevelingSystem.process_message_exp (XP sessions)
+- custom_commands: Cogs/CustomCommands
+- ai_controls:     Cogs/AIControls (mention handling)
+
+Messages come from fake guilds, members and channels that only implement the
+attributes the listeners touch; sends, reactions and role changes are
+counted instead of going to Discord. Everything else is real: the DAOs run
+against MySQL (DB_* environment, use a scratch database) and sessions
+against Redis (REDIS_URL), or an in-process fakeredis with --fakeredis.
+
+Each listener runs as its own task per message, as bot.dispatch does, and
+messages arrive at --rate per second (0 = as fast as possible). Reported:
+
+- messages/s over the replay
+- per-stage latency (p50/p95/p99/max) and exceptions
+- MySQL statements per message (server Questions counter, so only run this
+  against a database nothing else is using)
+- Redis round trips per message, per stage (a pipeline counts once)
+- the same counts for the session flush that follows, amortized per message
+
+Seeded guilds and users use IDs from SEED_ID_BASE upwards and are deleted
+afterwards unless --keep-data is given.
+
+Usage:
+    python -m utils.message_pipeline_benchmark --guilds 20 --users 2000 --messages 20000
+    python -m utils.message_pipeline_benchmark --fakeredis --rate 200 --warmup 500
+"""
+
+import argparse
+import asyncio
+import contextvars
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from Dao.BaseDao import BaseDao
+from Services.ConfigCache import initialize_config_cache
+from Services.SessionManager import get_session_manager
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+SEED_ID_BASE = 900_000_000_000_000_000
+GUILD_ID_BASE = SEED_ID_BASE
+USER_ID_BASE = SEED_ID_BASE + 10_000_000
+BOT_USER_ID = SEED_ID_BASE + 99_999_999
+
+WORDS = (
+    "hello there anyone up for a game tonight the raid starts at nine "
+    "did you see the stream yesterday gg well played lol nice clip "
+    "what time is it over there brb coffee first"
+).split()
+
+_current_stage = contextvars.ContextVar("current_stage", default="other")
+
+
+# --- Fake Discord objects ----------------------------------------------------
+
+class FakeCounters:
+    """Discord side effects the listeners would have performed."""
+
+    def __init__(self):
+        self.sends = 0
+        self.reactions = 0
+        self.deletes = 0
+        self.role_changes = 0
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name, counters):
+        self.id = channel_id
+        self.name = name
+        self.mention = f"<#{channel_id}>"
+        self._counters = counters
+
+    def permissions_for(self, member):
+        return FakePermissions()
+
+    async def send(self, *args, **kwargs):
+        self._counters.sends += 1
+
+
+class FakePermissions:
+    send_messages = True
+    manage_roles = True
+
+
+class FakeMember:
+    def __init__(self, user_id, name, guild, counters, bot=False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.bot = bot
+        self.avatar = None
+        self.created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.joined_at = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self.mention = f"<@{user_id}>"
+        self.guild = guild
+        self.roles = []
+        self._counters = counters
+
+    def get_role(self, role_id):
+        return None
+
+    async def add_roles(self, *roles, **kwargs):
+        self._counters.role_changes += 1
+
+    async def remove_roles(self, *roles, **kwargs):
+        self._counters.role_changes += 1
+
+    async def send(self, *args, **kwargs):
+        self._counters.sends += 1
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id, counters, bot_user_id):
+        self.id = guild_id
+        self.name = f"bench-guild-{guild_id - GUILD_ID_BASE}"
+        self.text_channels = [FakeChannel(guild_id + 1, "general", counters)]
+        self.me = FakeMember(bot_user_id, "bench-bot", self, counters, bot=True)
+        self.members = {}
+
+    def get_channel(self, channel_id):
+        for channel in self.text_channels:
+            if channel.id == channel_id:
+                return channel
+        return None
+
+    def get_role(self, role_id):
+        return None
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class FakeMessage:
+    def __init__(self, message_id, content, author, guild, mentions, counters):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.guild = guild
+        self.channel = guild.text_channels[0]
+        self.mentions = mentions
+        self._counters = counters
+
+    async def delete(self):
+        self._counters.deletes += 1
+
+    async def add_reaction(self, emoji):
+        self._counters.reactions += 1
+
+
+class FakeBot:
+    """The attributes of commands.Bot the message listeners use."""
+
+    def __init__(self, guilds, counters):
+        self.loop = asyncio.get_running_loop()
+        self.user = FakeMember(BOT_USER_ID, "bench-bot", None, counters, bot=True)
+        self._guilds = {guild.id: guild for guild in guilds}
+
+    def get_guild(self, guild_id):
+        return self._guilds.get(guild_id)
+
+    def get_user(self, user_id):
+        for guild in self._guilds.values():
+            member = guild.get_member(user_id)
+            if member:
+                return member
+        return None
+
+    def is_closed(self):
+        return False
+
+
+# --- Instrumentation ----------------------------------------------------------
+
+class RedisRoundTrips:
+    """Counts Redis round trips on a client, attributed to the running stage."""
+
+    def __init__(self, client):
+        self.by_stage = defaultdict(int)
+        execute_command = client.execute_command
+        pipeline = client.pipeline
+
+        async def counted_execute_command(*args, **kwargs):
+            self.by_stage[_current_stage.get()] += 1
+            return await execute_command(*args, **kwargs)
+
+        def counted_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def counted_execute(*a, **kw):
+                self.by_stage[_current_stage.get()] += 1
+                return await execute(*a, **kw)
+
+            pipe.execute = counted_execute
+            return pipe
+
+        client.execute_command = counted_execute_command
+        client.pipeline = counted_pipeline
+
+    def total(self) -> int:
+        return sum(self.by_stage.values())
+
+    def reset(self):
+        self.by_stage.clear()
+
+
+class BenchDao(BaseDao):
+    """Reads server counters and removes seeded rows."""
+
+    def __init__(self):
+        super().__init__(None, "Users")
+
+    def questions(self) -> int:
+        rows = self.execute_query("SHOW GLOBAL STATUS LIKE 'Questions'")
+        return int(rows[0][1]) if rows else 0
+
+    def questions_since(self, before: int) -> int:
+        # Don't count this status query itself
+        return self.questions() - before - 1
+
+    def delete_seeded_rows(self):
+        upper = SEED_ID_BASE + 100_000_000
+        self.execute_write("DELETE FROM GuildUsers WHERE guild_id BETWEEN %s AND %s", (SEED_ID_BASE, upper))
+        self.execute_write("DELETE FROM Users WHERE id BETWEEN %s AND %s", (SEED_ID_BASE, upper))
+
+
+# --- Pipeline -----------------------------------------------------------------
+
+def build_stages(bot):
+    """Instantiate the real listeners; a listener that fails to load is reported and skipped."""
+    stages = {}
+
+    def load(name, factory):
+        try:
+            stages[name] = factory()
+        except Exception as e:
+            print(f"! {name} not loaded: {e}")
+
+    def on_message():
+        from Cogs.On_Message import On_Message
+        return On_Message(bot).on_message
+
+    def leveling():
+        from Leveling import LevelingSystem
+        return LevelingSystem(bot).process_message_exp
+
+    def custom_commands():
+        from Cogs.CustomCommands import CustomCommands
+        return CustomCommands(bot).on_message
+
+    def ai_controls():
+        from Cogs.AIControls import AIControls
+        return AIControls(bot).on_message
+
+    load("on_message", on_message)
+    load("leveling", leveling)
+    load("custom_commands", custom_commands)
+    load("ai_controls", ai_controls)
+    return stages
+
+
+def make_traffic(guilds, args, counters, bot_user):
+    """Synthetic messages: random members, short chatter, optional commands and mentions."""
+    members = []
+    for i in range(args.users):
+        guild = guilds[i % len(guilds)]
+        member = FakeMember(USER_ID_BASE + i, f"bench-user-{i}", guild, counters)
+        guild.members[member.id] = member
+        members.append(member)
+
+    messages = []
+    for i in range(args.warmup + args.messages):
+        author = random.choice(members)
+        content = " ".join(random.choices(WORDS, k=random.randint(3, 12)))
+        mentions = []
+        roll = random.random()
+        if roll < args.command_ratio:
+            content = "!" + content
+        elif roll < args.command_ratio + args.mention_ratio:
+            content = f"<@{bot_user.id}> {content}"
+            mentions = [bot_user]
+        messages.append(FakeMessage(i, content, author, author.guild, mentions, counters))
+    return messages
+
+
+class StageTimings:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def run(self, name, listener, message):
+        _current_stage.set(name)
+        started = time.perf_counter()
+        try:
+            await listener(message)
+        except Exception as e:
+            self.errors[name] += 1
+            if self.errors[name] == 1:
+                print(f"! {name} raised: {type(e).__name__}: {e}")
+        self.latencies[name].append(time.perf_counter() - started)
+
+
+async def replay(stages, messages, rate, timings):
+    """Dispatch each message to every listener as separate tasks, paced at rate/s."""
+    tasks = []
+    started = time.perf_counter()
+    for i, message in enumerate(messages):
+        if rate:
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        for name, listener in stages.items():
+            tasks.append(asyncio.create_task(timings.run(name, listener, message)))
+        # Let the listeners start, as the gateway reader would between events
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(args, elapsed, timings, stages, redis_trips, questions, flush, counters):
+    count = args.messages
+    print(f"{len(stages)} listeners, {args.guilds} guilds, {args.users:,} users, {count:,} messages")
+    print(f"throughput: {count / elapsed:,.0f} messages/s ({elapsed:.2f}s)")
+    print()
+    print(f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'redis/msg':>10} {'errors':>7}")
+    for name in stages:
+        latencies = timings.latencies[name]
+        if not latencies:
+            continue
+        print(f"{name:<16} {percentile(latencies, 0.50) * 1e3:>9.2f} {percentile(latencies, 0.95) * 1e3:>9.2f} "
+              f"{percentile(latencies, 0.99) * 1e3:>9.2f} {max(latencies) * 1e3:>9.2f} "
+              f"{redis_trips.get(name, 0) / count:>10.2f} {timings.errors[name]:>7}")
+    print()
+    if questions is not None:
+        print(f"mysql statements/msg: {questions / count:.2f}")
+    print(f"redis round trips/msg: {sum(redis_trips.values()) / count:.2f}")
+    if flush:
+        flush_elapsed, flush_questions, flush_trips = flush
+        print(f"session flush: {flush_elapsed:.2f}s, "
+              f"{(flush_questions or 0) / count:.2f} mysql statements/msg, {flush_trips / count:.2f} redis round trips/msg")
+    print(f"discord calls: {counters.sends} sends, {counters.reactions} reactions, "
+          f"{counters.deletes} deletes, {counters.role_changes} role changes")
+
+
+async def connect_redis(args):
+    """Connect the session manager to Redis (or fakeredis) like setup_hook does."""
+    manager = get_session_manager()
+    if args.fakeredis:
+        from fakeredis import aioredis as fake_aioredis
+        manager.redis = fake_aioredis.FakeRedis(decode_responses=True)
+        manager.redis_available = True
+    else:
+        await manager.initialize()
+    if not manager.redis_available:
+        print("! Redis unavailable, leveling runs the immediate-DB fallback path")
+    return manager
+
+
+async def run(args):
+    random.seed(args.seed)
+    counters = FakeCounters()
+
+    await initialize_config_cache()
+    manager = await connect_redis(args)
+    try:
+        from Services.PerformanceMonitor import initialize_performance_monitor
+        await initialize_performance_monitor()
+    except Exception as e:
+        print(f"! performance monitor unavailable: {e}")
+
+    guilds = [FakeGuild(GUILD_ID_BASE + i * 10, counters, BOT_USER_ID) for i in range(args.guilds)]
+    bot = FakeBot(guilds, counters)
+    stages = build_stages(bot)
+    messages = make_traffic(guilds, args, counters, bot.user)
+
+    redis_trips = RedisRoundTrips(manager.redis) if manager.redis_available else None
+    bench_dao = BenchDao()
+
+    try:
+        if args.warmup:
+            await replay(stages, messages[:args.warmup], args.rate, StageTimings())
+
+        timings = StageTimings()
+        if redis_trips:
+            redis_trips.reset()
+        questions_before = bench_dao.questions()
+        elapsed = await replay(stages, messages[args.warmup:], args.rate, timings)
+        questions = bench_dao.questions_since(questions_before)
+        trips = dict(redis_trips.by_stage) if redis_trips else {}
+
+        flush = None
+        if manager.redis_available:
+            redis_trips.reset()
+            _current_stage.set("flush")
+            questions_before = bench_dao.questions()
+            flush_started = time.perf_counter()
+            await manager.flush_dirty_sessions()
+            flush = (time.perf_counter() - flush_started, bench_dao.questions_since(questions_before), redis_trips.total())
+
+        report(args, elapsed, timings, stages, trips, questions, flush, counters)
+    finally:
+        if manager.redis_available:
+            await manager.invalidate_guild_sessions([guild.id for guild in guilds])
+        if not args.keep_data:
+            bench_dao.delete_seeded_rows()
+        bench_dao.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the on_message listener pipeline")
+    parser.add_argument("--guilds", type=int, default=10, help="Synthetic guilds")
+    parser.add_argument("--users", type=int, default=1000, help="Synthetic members, spread across the guilds")
+    parser.add_argument("--messages", type=int, default=5000, help="Measured messages")
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured messages replayed first (fills sessions and caches)")
+    parser.add_argument("--rate", type=float, default=0, help="Messages per second (0 = unthrottled)")
+    parser.add_argument("--command-ratio", type=float, default=0.02, help="Fraction of messages starting with '!'")
+    parser.add_argument("--mention-ratio", type=float, default=0.0, help="Fraction of messages mentioning the bot")
+    parser.add_argument("--fakeredis", action="store_true", help="Use an in-process fakeredis instead of REDIS_URL")
+    parser.add_argument("--keep-data", action="store_true", help="Keep the seeded users and guild users")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the traffic")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compiled level -> role plans.
+
+A guild's `roles` settings (role_mappings keyed by level, cumulative or
+progressive mode) are compiled once into sorted thresholds with precomputed
+role-ID sets, so finding the roles a member should hold at a level is a
+bisect instead of a walk over every mapping.
+
+    plan = compile_role_plan(settings["roles"])
+    granted, withheld = plan.roles_for_level(12)
+
+- granted:  role IDs the member qualifies for (every threshold <= level)
+- withheld: role IDs the member should not hold; only populated in
+            progressive mode (thresholds above the level)
+
+Plans are cached by ConfigCache and rebuilt when the guild config changes.
+The version is derived from the thresholds, role IDs and mode: recompiling an
+unchanged config (e.g. after the cache entry expires) keeps per-member memos
+keyed on it valid, while any mapping change expires them.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+DEFAULT_ROLE_ANNOUNCEMENT = "🎉 {mention} reached level {level} and earned the {role} role!"
+
+
+@dataclass(frozen=True)
+class RolePlan:
+    """Precomputed role sets for every level band of a guild."""
+
+    version: int
+    progressive: bool
+    thresholds: List[int]
+    granted: List[FrozenSet[int]]
+    withheld: List[FrozenSet[int]]
+    role_announcement: bool = False
+    announcement_channel_id: Optional[int] = None
+    announcement_templates: Dict[int, str] = field(default_factory=dict)
+    default_announcement: str = DEFAULT_ROLE_ANNOUNCEMENT
+
+    def roles_for_level(self, level: int) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        """Get (granted, withheld) role IDs for a level."""
+        band = bisect_right(self.thresholds, level)
+        return self.granted[band], self.withheld[band]
+
+    def announcement_template(self, level: int) -> str:
+        """Get the role announcement template for a level."""
+        return self.announcement_templates.get(level, self.default_announcement)
+
+
+def compile_role_plan(roles_config: Optional[dict]) -> Optional[RolePlan]:
+    """
+    Compile a guild's `roles` settings into a RolePlan.
+
+    Accepts both mapping formats: {"5": [role_ids]} and
+    {"5": {"role_ids": [...], "announcement_message": "..."}}.
+
+    Returns:
+        RolePlan, or None if the role system is disabled or has no mappings
+    """
+    if not roles_config or not roles_config.get("enabled", False):
+        return None
+
+    role_mappings = roles_config.get("role_mappings") or {}
+    roles_by_level: Dict[int, set] = {}
+    templates: Dict[int, str] = {}
+
+    for level_str, role_data in role_mappings.items():
+        try:
+            level = int(level_str)
+            if isinstance(role_data, dict):
+                role_ids = role_data.get("role_ids", [])
+                templates[level] = role_data.get("announcement_message", DEFAULT_ROLE_ANNOUNCEMENT)
+            else:
+                role_ids = role_data  # Old format (array)
+            roles_by_level.setdefault(level, set()).update(int(role_id) for role_id in role_ids)
+        except (TypeError, ValueError):
+            logger.warning(f"Skipping invalid role mapping {level_str!r}: {role_data!r}")
+
+    if not roles_by_level:
+        return None
+
+    thresholds = sorted(roles_by_level)
+    progressive = roles_config.get("mode", "cumulative") == "progressive"
+
+    # granted[k] = roles for the first k thresholds, withheld[k] = roles for the rest
+    granted = [frozenset()]
+    for level in thresholds:
+        granted.append(granted[-1] | roles_by_level[level])
+
+    withheld = [frozenset()] * (len(thresholds) + 1)
+    if progressive:
+        above = frozenset()
+        for band in range(len(thresholds) - 1, -1, -1):
+            above = above | roles_by_level[thresholds[band]]
+            withheld[band] = above - granted[band]
+
+    announcement_channel_id = roles_config.get("announcement_channel_id")
+
+    # Ints and bools hash the same in every process, so the version is stable across restarts too
+    version = hash((progressive, tuple((level, tuple(sorted(roles_by_level[level]))) for level in thresholds)))
+
+    return RolePlan(
+        version=version,
+        progressive=progressive,
+        thresholds=thresholds,
+        granted=granted,
+        withheld=withheld,
+        role_announcement=bool(roles_config.get("role_announcement", False)),
+        announcement_channel_id=int(announcement_channel_id) if announcement_channel_id else None,
+        announcement_templates=templates,
+        default_announcement=roles_config.get("role_announcement_message", DEFAULT_ROLE_ANNOUNCEMENT),
+    )
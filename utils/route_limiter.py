@@ -0,0 +1,50 @@
+"""
+Per-route concurrency limiter for fan-out Discord sends.
+
+discord.py already waits on Discord's per-route rate-limit buckets, but a
+burst of gathered sends still all hits the HTTP client at once. RouteLimiter
+keeps at most one request in flight per route key (e.g. a channel ID, which
+is what the message-create bucket is keyed on) and a bounded number in
+flight overall, so a large fan-out drains steadily instead of piling into
+429 retries.
+
+Usage:
+    limiter = RouteLimiter(max_concurrent=10)
+    async with limiter.route(channel.id):
+        await channel.send(...)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable
+
+
+class RouteLimiter:
+    """Bounded global concurrency plus one in-flight request per route."""
+
+    def __init__(self, max_concurrent: int = 10):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._route_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._route_waiters: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def route(self, key: Hashable):
+        """Hold the route's slot (and a global slot) for the duration of the block."""
+        lock = self._route_locks.get(key)
+        if lock is None:
+            lock = self._route_locks[key] = asyncio.Lock()
+        self._route_waiters[key] = self._route_waiters.get(key, 0) + 1
+
+        try:
+            async with lock:
+                async with self._semaphore:
+                    yield
+        finally:
+            # Drop the lock once nobody is queued on this route
+            self._route_waiters[key] -= 1
+            if not self._route_waiters[key]:
+                del self._route_waiters[key]
+                del self._route_locks[key]
+
+    def __len__(self) -> int:
+        return len(self._route_locks)
@@ -0,0 +1,72 @@
+"""
+Shard layout helpers.
+
+The bot can run as several processes (see launcher.py), each connecting a
+contiguous range of shards. Discord routes a guild to shard
+(guild_id >> 22) % shard_count, so a process can tell which guilds are its
+own before they show up in its gateway cache.
+
+    ranges = shard_ranges(shard_count=8, process_count=3)  # [[0, 1, 2], [3, 4, 5], [6, 7]]
+    if owns_guild(bot, announcement['guild_id']):
+        ...
+"""
+
+import os
+from typing import List, Optional
+
+
+def shard_id_for_guild(guild_id: int, shard_count: int) -> int:
+    """Get the shard Discord delivers a guild's events on."""
+    return (guild_id >> 22) % shard_count
+
+
+def shard_ranges(shard_count: int, process_count: int) -> List[List[int]]:
+    """
+    Split shards 0..shard_count-1 into contiguous ranges, one per process.
+
+    Earlier processes get one extra shard when the split is uneven.
+    """
+    if shard_count < 1 or process_count < 1:
+        raise ValueError("shard_count and process_count must be at least 1")
+    if process_count > shard_count:
+        raise ValueError(f"Can't split {shard_count} shards across {process_count} processes")
+
+    per_process, extra = divmod(shard_count, process_count)
+    ranges = []
+    start = 0
+    for index in range(process_count):
+        size = per_process + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def shard_config_from_env() -> tuple:
+    """
+    Read this process's shard layout from SHARD_COUNT and SHARD_IDS.
+
+    SHARD_IDS is a comma-separated list; without it the process runs every
+    shard. Without SHARD_COUNT discord.py picks the recommended count.
+
+    Returns:
+        (shard_ids or None, shard_count or None)
+    """
+    shard_count: Optional[int] = int(os.environ['SHARD_COUNT']) if os.getenv('SHARD_COUNT') else None
+    shard_ids: Optional[List[int]] = None
+    if os.getenv('SHARD_IDS'):
+        shard_ids = [int(shard_id) for shard_id in os.environ['SHARD_IDS'].split(',')]
+        if shard_count is None:
+            raise ValueError("SHARD_IDS requires SHARD_COUNT")
+    return shard_ids, shard_count
+
+
+def owns_guild(bot, guild_id: int) -> bool:
+    """
+    Check whether a guild is on one of this process's shards.
+
+    Always True for a process that runs every shard.
+    """
+    shard_ids = getattr(bot, 'shard_ids', None)
+    if shard_ids is None:
+        return True
+    return shard_id_for_guild(guild_id, bot.shard_count or 1) in shard_ids
@@ -0,0 +1,63 @@
+"""
+Startup profiler.
+
+Records how long each step of a cold start takes (cog loads, task module
+imports) and when startup milestones were reached, measured
+from when this module was first imported. bot.py imports it before anything
+heavy, so the clock starts close to process launch.
+
+    profiler = StartupProfiler()
+    with profiler.measure("cog load", "Rank"):
+        await bot.load_extension("Cogs.Rank")
+    profiler.mark("ready")
+    logger.info(profiler.report())
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """Per-step timings and milestones for one startup."""
+
+    def __init__(self):
+        self.timings: List[Tuple[str, str, float]] = []  # (phase, name, seconds)
+        self.milestones: Dict[str, float] = {}  # milestone -> seconds since PROCESS_START
+
+    @contextmanager
+    def measure(self, phase: str, name: str):
+        """Time the enclosed block as one step of a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((phase, name, time.perf_counter() - started))
+
+    def mark(self, milestone: str):
+        """Record that a milestone was reached (the first time only)."""
+        self.milestones.setdefault(milestone, time.perf_counter() - PROCESS_START)
+
+    def phase_totals(self) -> Dict[str, float]:
+        """Total seconds spent in each phase."""
+        totals: Dict[str, float] = {}
+        for phase, _, seconds in self.timings:
+            totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+    def slowest(self, count: int = 10) -> List[Tuple[str, str, float]]:
+        """The slowest individual steps, slowest first."""
+        return sorted(self.timings, key=lambda timing: timing[2], reverse=True)[:count]
+
+    def report(self, count: int = 10) -> str:
+        """Format milestones, phase totals and the slowest steps for the log."""
+        lines = ["Startup profile:"]
+        for milestone, seconds in sorted(self.milestones.items(), key=lambda item: item[1]):
+            lines.append(f"  {seconds:8.3f}s  {milestone}")
+        for phase, seconds in sorted(self.phase_totals().items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"  {seconds:8.3f}s  total {phase}")
+        for phase, name, seconds in self.slowest(count):
+            lines.append(f"  {seconds:8.3f}s  {phase}: {name}")
+        return "\n".join(lines)
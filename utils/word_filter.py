@@ -0,0 +1,157 @@
+"""
+Compiled inappropriate-word filter.
+
+All words of a list are merged into a prefix trie and emitted as a single
+regular expression, so a message is scanned once, left to right, and each
+position only follows the trie branches that match (backtracking is bounded
+by the longest word instead of the number of words).
+
+Options:
+- word_boundary: only match whole words ("ass" no longer matches "class")
+- leetspeak:     normalise common substitutions before matching
+                 ("h3ll0" -> "hello", "$hit" -> "shit"); symbols only
+                 count as letters when a word character follows them, so
+                 trailing punctuation ("bad!") still ends a word
+
+The bot-wide list comes from the INAPPROPRIATE_WORDS environment variable
+(JSON array). Guilds can extend it with moderation.word_filter in their
+settings; those filters are compiled and cached by ConfigCache.
+"""
+
+import json
+import os
+import re
+from typing import Iterable, Optional
+
+from logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+LEET_TABLE = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b',
+})
+
+LEET_SYMBOLS = {'@': 'a', '$': 's', '!': 'i', '|': 'l', '+': 't'}
+_LEET_SYMBOL_REGEX = re.compile(r"[@$!|+](?=\w)")
+
+
+def _trie_pattern(node: dict) -> str:
+    """Convert a character trie into a regex fragment."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    if len(branches) == 1:
+        body = branches[0]
+    elif all(len(branch) == 1 for branch in branches):
+        body = '[' + ''.join(branches) + ']'
+    else:
+        body = '(?:' + '|'.join(branches) + ')'
+
+    # A word ending here makes the rest of the branch optional
+    if '' in node:
+        single = len(body) == 1 or (body.startswith('[') and body.endswith(']') and len(branches) > 1)
+        return body + '?' if single else '(?:' + body + ')?'
+    return body
+
+
+def build_pattern(words: Iterable[str]) -> Optional[str]:
+    """Build one trie-shaped alternation matching any of the words."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    if not trie:
+        return None
+    return _trie_pattern(trie)
+
+
+class WordFilter:
+    """A word list compiled into a single-pass matcher."""
+
+    def __init__(self, words: Iterable[str], word_boundary: bool = False, leetspeak: bool = False):
+        self.word_boundary = word_boundary
+        self.leetspeak = leetspeak
+
+        normalized = {self.normalize(word) for word in words if word and word.strip()}
+        self.words = frozenset(normalized)
+
+        pattern = build_pattern(sorted(self.words))
+        if pattern and word_boundary:
+            pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+        self._regex = re.compile(pattern) if pattern else None
+
+    def normalize(self, text: str) -> str:
+        """Lowercase (and de-leet if enabled) text the same way for words and messages."""
+        text = text.lower()
+        if self.leetspeak:
+            text = text.translate(LEET_TABLE)
+            text = _LEET_SYMBOL_REGEX.sub(lambda match: LEET_SYMBOLS[match.group(0)], text)
+        return text
+
+    def find(self, text: str) -> Optional[str]:
+        """Get the first listed word found in the text, or None."""
+        if self._regex is None or not text:
+            return None
+        match = self._regex.search(self.normalize(text))
+        return match.group(0) if match else None
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def __repr__(self):
+        return f"WordFilter(words={len(self.words)}, word_boundary={self.word_boundary}, leetspeak={self.leetspeak})"
+
+
+def load_default_words() -> list:
+    """Read the bot-wide word list from INAPPROPRIATE_WORDS."""
+    words_str = os.getenv('INAPPROPRIATE_WORDS')
+    if not words_str:
+        return []
+    try:
+        return json.loads(words_str)
+    except ValueError as e:
+        logger.error(f"INAPPROPRIATE_WORDS is not a JSON list: {e}")
+        return []
+
+
+# Bot-wide filter, compiled on first use
+_default_filter = None
+
+
+def get_default_word_filter() -> WordFilter:
+    """Get the filter compiled from the bot-wide word list."""
+    global _default_filter
+    if _default_filter is None:
+        _default_filter = WordFilter(load_default_words())
+    return _default_filter
+
+
+def compile_guild_word_filter(filter_config: Optional[dict]) -> WordFilter:
+    """
+    Compile a guild's moderation.word_filter settings.
+
+    Settings shape (all keys optional):
+        {"enabled": true, "words": [...], "word_boundary": false, "leetspeak": false}
+
+    Guild words extend the bot-wide list; "enabled": false turns off the
+    guild's own words and options, never the bot-wide list.
+
+    Returns:
+        WordFilter for the guild (falsy if there are no words at all)
+    """
+    default_filter = get_default_word_filter()
+    if not filter_config or not filter_config.get("enabled", True):
+        return default_filter
+
+    words = filter_config.get("words") or []
+    word_boundary = bool(filter_config.get("word_boundary", False))
+    leetspeak = bool(filter_config.get("leetspeak", False))
+
+    if not words and not word_boundary and not leetspeak:
+        return default_filter
+
+    return WordFilter(list(default_filter.words) + list(words), word_boundary=word_boundary, leetspeak=leetspeak)
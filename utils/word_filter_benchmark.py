@@ -0,0 +1,82 @@
+"""
+Inappropriate-word filter benchmark.
+
+Compares the old per-word substring loop from On_Message with the compiled
+WordFilter on synthetic word lists and chat-like messages.
+
+Usage:
+    python -m utils.word_filter_benchmark --words 500 --messages 20000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from utils.word_filter import WordFilter
+
+FILLER = ("yo", "gg", "lol", "anyone", "playing", "tonight", "the", "new", "patch", "is", "wild",
+          "what", "time", "raid", "later", "bro", "that", "was", "insane", "clip", "it")
+
+
+def make_words(count: int) -> list:
+    rng = random.Random(7)
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))) for _ in range(count)]
+
+
+def make_messages(count: int, words: list, hit_rate: float) -> list:
+    rng = random.Random(11)
+    messages = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(rng.randint(3, 30))]
+        if rng.random() < hit_rate:
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(words).upper())
+        messages.append(" ".join(tokens))
+    return messages
+
+
+def legacy_find(words, content):
+    """The loop previously run in On_Message.on_message."""
+    message_content_lower = content.lower()
+    for word in words:
+        if word.lower() in message_content_lower:
+            return word
+    return None
+
+
+def run(name, find, messages) -> dict:
+    started = time.perf_counter()
+    hits = sum(1 for message in messages if find(message))
+    elapsed = time.perf_counter() - started
+    return {"name": name, "msgs_per_sec": len(messages) / elapsed, "hits": hits}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inappropriate-word filter")
+    parser.add_argument("--words", type=int, default=500, help="Words in the list")
+    parser.add_argument("--messages", type=int, default=20_000, help="Messages to scan")
+    parser.add_argument("--hit-rate", type=float, default=0.01, help="Fraction of messages containing a listed word")
+    args = parser.parse_args()
+
+    words = make_words(args.words)
+    messages = make_messages(args.messages, words, args.hit_rate)
+
+    started = time.perf_counter()
+    compiled = WordFilter(words)
+    bounded = WordFilter(words, word_boundary=True, leetspeak=True)
+    compile_ms = (time.perf_counter() - started) * 1000 / 2
+
+    results = [
+        run("legacy", lambda message: legacy_find(words, message), messages),
+        run("compiled", compiled.find, messages),
+        run("boundary+leet", bounded.find, messages),
+    ]
+
+    print(f"{args.words:,} words, {args.messages:,} messages, compile {compile_ms:.1f} ms")
+    print(f"{'strategy':<14} {'msgs/s':>12} {'hits':>8}")
+    for result in results:
+        print(f"{result['name']:<14} {result['msgs_per_sec']:>12,.0f} {result['hits']:>8}")
+
+
+if __name__ == "__main__":
+    main()